@@ -11,7 +11,10 @@ setup(
     install_requires=[
         "requests>=2.31.0",
         "pandas>=2.0.0",
+        "geopandas>=1.0.0", # For GeoParquet bbox covering and filtered reads
+        "shapely>=2.1.0",   # For vectorized geometry functions
         "pyarrow>=14.0.1",  # For parquet support
+        "pyogrio>=0.7.0",   # For vectorized shapefile/GeoPackage I/O
         "numpy>=1.24.0",    # For numerical operations
         "pyyaml>=6.0.0",    # For YAML configuration files
         "scipy>=1.10.0",    # For statistical analysis
@@ -16,6 +16,7 @@ from statsmodels.nonparametric.smoothers_lowess import lowess
 import argparse
 
 from .data_quality import DataQualityAnalyzer
+from ..noaa.historical.flood_matrix import FloodMatrix, ensure_flood_matrix
 
 def load_station_names(region: str) -> Dict[str, str]:
     """Load station names from configuration file."""
@@ -34,20 +35,12 @@ def load_station_metadata(region: str) -> Dict[str, Dict]:
         config = yaml.safe_load(f)
     return config
 
-def generate_flood_days_heatmap(data: pd.DataFrame, station_names: Dict[str, str], region: str, output_dir: Path) -> None:
+def generate_flood_days_heatmap(matrix: FloodMatrix, station_names: Dict[str, str], region: str, output_dir: Path) -> None:
     """Generate a heatmap of flood days by station and year."""
-    # Create pivot tables
-    pivot_data = data.pivot(
-        index='station_id',
-        columns='year',
-        values='flood_days'
-    ).fillna(0)
+    # Station x year tables straight from the shared matrix
+    pivot_data = matrix.pivot('flood_days', region=region).fillna(0)
     
-    missing_mask = data.pivot(
-        index='station_id',
-        columns='year',
-        values='missing_days'
-    ).fillna(0) > 180  # Consider data missing if more than half year is missing
+    missing_mask = matrix.pivot('missing_days', region=region).fillna(0) > 180  # Consider data missing if more than half year is missing
     
     # Replace station IDs with names
     pivot_data.index = [f"{station_names.get(str(idx), idx)} ({idx})" for idx in pivot_data.index]
@@ -276,7 +269,8 @@ def generate_analysis_outputs(region: str = 'gulf_coast') -> None:
     output_dir.mkdir(parents=True, exist_ok=True)
     
     # Load data
-    data = pd.read_parquet(f'output/historical/historical_htf_{region}.parquet')
+    matrix = ensure_flood_matrix(Path('output/historical'))
+    data = matrix.to_frame(region=region)
     
     # Load station names
     station_names = load_station_names(region)
@@ -286,7 +280,7 @@ def generate_analysis_outputs(region: str = 'gulf_coast') -> None:
     analysis_results = analyzer.analyze_regional_data(data=data, region=region)
     
     # Generate visualizations
-    generate_flood_days_heatmap(data, station_names, region, output_dir)
+    generate_flood_days_heatmap(matrix, station_names, region, output_dir)
     generate_completeness_plot(analysis_results, station_names, region, output_dir)
     generate_flood_days_timeseries(data, station_names, load_station_metadata(region), region, output_dir)
     
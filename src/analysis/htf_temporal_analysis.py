@@ -17,10 +17,12 @@ import logging
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from ..noaa.historical.flood_matrix import ensure_flood_matrix
+
 logger = logging.getLogger(__name__)
 
 def load_regional_data(historical_dir: Path) -> pd.DataFrame:
-    """Load and combine all regional HTF data.
+    """Load all regional HTF data from the shared flood matrix.
     
     Args:
         historical_dir: Directory containing historical HTF data files
@@ -28,16 +30,8 @@ def load_regional_data(historical_dir: Path) -> pd.DataFrame:
     Returns:
         Combined DataFrame with all regional data
     """
-    region_files = list(historical_dir.glob("historical_htf_*.parquet"))
-    if not region_files:
-        raise FileNotFoundError(f"No historical HTF files found in {historical_dir}")
-    
-    dfs = []
-    for file in region_files:
-        df = pd.read_parquet(file)
-        dfs.append(df)
-    
-    return pd.concat(dfs, ignore_index=True)
+    matrix = ensure_flood_matrix(historical_dir)
+    return matrix.to_frame()
 
 def analyze_temporal_trends(df: pd.DataFrame) -> Dict:
     """Analyze temporal trends in HTF data.
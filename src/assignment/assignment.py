@@ -12,11 +12,12 @@ Notes on HTF Data:
 import pandas as pd
 import logging
 from pathlib import Path
-from typing import Dict, Optional, Generator
+from typing import Dict, Optional
 import numpy as np
 import gc
 import psutil
-from tqdm import tqdm
+
+from .common.reweighting import DynamicReweighter
 
 logger = logging.getLogger(__name__)
 
@@ -51,104 +52,17 @@ def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
     
     return df
 
-def process_in_chunks(
-    htf_df: pd.DataFrame,
-    mapping_df: pd.DataFrame,
-    chunk_size: int = 100,
-    start_year: int = 1970
-) -> Generator[pd.DataFrame, None, None]:
-    """Process HTF data in chunks to manage memory usage.
-    
-    Notes:
-        - Missing days indicate periods before station installation
-        - Zero flood days are valid measurements (no flooding)
-        - We keep all records from start_year onwards, as zeros are valid data
-    
-    Args:
-        htf_df: Historical HTF data
-        mapping_df: Gauge-county mapping with weights
-        chunk_size: Number of stations to process at once
-        start_year: Start year for analysis (inclusive)
-    """
-    # Filter by year
-    htf_df = htf_df[htf_df['year'] >= start_year].copy()
-    logger.info(f"Processing {len(htf_df)} records from {start_year} onwards")
-    
-    # Log data completeness
-    total_records = len(htf_df)
-    missing_records = len(htf_df[htf_df['missing_days'] == 365])
-    zero_flood_records = len(htf_df[htf_df['flood_days'] == 0])
-    logger.info(f"Data overview:")
-    logger.info(f"  - Total records: {total_records}")
-    logger.info(f"  - Records with no floods: {zero_flood_records} ({zero_flood_records/total_records*100:.1f}%)")
-    logger.info(f"  - Records before station installation: {missing_records} ({missing_records/total_records*100:.1f}%)")
-    
-    # Get unique stations
-    stations = htf_df['station_id'].unique()
-    
-    # Keep only necessary columns
-    htf_cols = ['station_id', 'year', 'flood_days', 'missing_days']
-    mapping_cols = ['station_id', 'county_fips', 'weight', 'region']
-    
-    htf_df = htf_df[htf_cols].copy()
-    mapping_df = mapping_df[mapping_cols].copy()
-    
-    # Process stations in chunks
-    for i in range(0, len(stations), chunk_size):
-        chunk_stations = stations[i:i + chunk_size]
-        
-        # Filter data for current chunk
-        chunk_htf = htf_df[htf_df['station_id'].isin(chunk_stations)]
-        chunk_mapping = mapping_df[mapping_df['station_id'].isin(chunk_stations)]
-        
-        # Ensure numeric types
-        chunk_htf = optimize_dtypes(chunk_htf)
-        chunk_mapping = optimize_dtypes(chunk_mapping)
-        
-        # Process chunk
-        merged_df = pd.merge(
-            chunk_mapping,
-            chunk_htf,
-            on='station_id',
-            how='left'
-        )
-        
-        # Calculate weighted values
-        # Note: missing_days of 365 indicate no station data, but flood_days of 0 are valid measurements
-        merged_df['weighted_flood_days'] = merged_df['flood_days'] * merged_df['weight']
-        merged_df['weighted_missing_days'] = merged_df['missing_days'] * merged_df['weight']
-        
-        # Group by county and year
-        county_htf = merged_df.groupby(['county_fips', 'year']).agg({
-            'weighted_flood_days': 'sum',
-            'weighted_missing_days': 'sum',
-            'weight': 'sum',
-            'region': 'first'
-        }).reset_index()
-        
-        # Calculate final values
-        county_htf['flood_days'] = (county_htf['weighted_flood_days'] / county_htf['weight']).astype(np.float32)
-        county_htf['missing_days'] = (county_htf['weighted_missing_days'] / county_htf['weight']).astype(np.float32)
-        
-        # Drop intermediate columns
-        county_htf = county_htf.drop(columns=[
-            'weighted_flood_days', 'weighted_missing_days', 'weight'
-        ])
-        
-        yield county_htf
-        
-        # Clean up memory
-        del chunk_htf, chunk_mapping, merged_df, county_htf
-        gc.collect()
-
 def calculate_county_htf(
     htf_df: pd.DataFrame,
     mapping_df: pd.DataFrame,
-    chunk_size: int = 100,
     start_year: int = 1970
 ) -> pd.DataFrame:
     """Calculate county-level HTF values using weighted station data.
     
+    Station weights are renormalized per reference point and year over the
+    stations that reported, so station-years before installation
+    (missing_days of 365) do not pull county values towards zero.
+    
     Notes:
         - Zero flood days are valid measurements indicating no flooding
         - Missing days (365) indicate periods before station installation
@@ -157,27 +71,23 @@ def calculate_county_htf(
     logger.info("Calculating county-level HTF values")
     log_memory_usage()
     
-    # Process data in chunks
-    results = []
-    for chunk_result in tqdm(
-        process_in_chunks(htf_df, mapping_df, chunk_size, start_year),
-        desc="Processing stations in chunks",
-        total=len(htf_df['station_id'].unique()) // chunk_size + 1
-    ):
-        results.append(chunk_result)
-        
-        # Log memory usage periodically
-        if len(results) % 10 == 0:
-            log_memory_usage()
+    # Filter by year
+    htf_df = htf_df[htf_df['year'] >= start_year]
+    logger.info(f"Processing {len(htf_df)} records from {start_year} onwards")
     
-    # Combine results
-    county_htf = pd.concat(results, ignore_index=True)
+    # Log data completeness
+    total_records = len(htf_df)
+    missing_records = len(htf_df[htf_df['missing_days'] >= 365])
+    zero_flood_records = len(htf_df[htf_df['flood_days'] == 0])
+    logger.info(f"Data overview:")
+    logger.info(f"  - Total records: {total_records}")
+    logger.info(f"  - Records with no floods: {zero_flood_records} ({zero_flood_records/total_records*100:.1f}%)")
+    logger.info(f"  - Records before station installation: {missing_records} ({missing_records/total_records*100:.1f}%)")
     
-    # Final aggregation if needed
-    county_htf = county_htf.groupby(['county_fips', 'year', 'region']).agg({
-        'flood_days': 'mean',
-        'missing_days': 'mean'
-    }).reset_index()
+    # Reweight over reporting stations for all years at once
+    reweighter = DynamicReweighter(mapping_df)
+    county_htf, coverage_gaps = reweighter.aggregate_frame(htf_df)
+    county_htf = county_htf[['county_fips', 'year', 'region', 'flood_days', 'missing_days']]
     
     # Ensure final dtypes
     county_htf = optimize_dtypes(county_htf)
@@ -185,6 +95,8 @@ def calculate_county_htf(
     # Log completion statistics
     logger.info(f"Calculated HTF values for {county_htf['county_fips'].nunique()} counties")
     logger.info(f"Year range: {county_htf['year'].min()} - {county_htf['year'].max()}")
+    if len(coverage_gaps):
+        logger.info(f"County-years without any reporting station: {len(coverage_gaps)}")
     
     # Calculate trend statistics
     early_years = county_htf[county_htf['year'] <= 1980]['flood_days'].mean()
@@ -1,5 +1,6 @@
 """Common utilities for HTF data assignment."""
 
 from .weights import WeightCalculator
+from .reweighting import DynamicReweighter, station_validity
 
-__all__ = ['WeightCalculator']
+__all__ = ['WeightCalculator', 'DynamicReweighter', 'station_validity']
@@ -0,0 +1,261 @@
+"""
+Missing-data-aware renormalization of station weights.
+
+The imputation structure assigns each reference point static weights over its
+nearby stations. Stations do not report every year: years before installation
+or with gaps in the record have missing_days up to the length of the year, and
+multiplying their flood_days by a static weight biases the county values.
+
+This module renormalizes the static weights per point and year over the
+stations that reported. With W the sparse (point x station) weight matrix, V
+the (station x year) validity mask and X the flood days:
+
+    value[p, y] = (W @ (X * V))[p, y] / (W @ V)[p, y]
+
+so the whole record is reweighted with a few sparse matrix products instead of
+a loop over years. Points whose stations all failed in a year get no value, and
+county-years where that happens to every point are reported as coverage gaps.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from typing import Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+def days_in_year(years: np.ndarray) -> np.ndarray:
+    """Get the number of days in each year (365 or 366)."""
+    years = np.asarray(years)
+    leap = (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+    return np.where(leap, 366, 365)
+
+def station_completeness(missing_days: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """
+    Get the share of each station-year with observations.
+
+    Args:
+        missing_days: (station x year) missing days, NaN where a station has no record
+        years: Year of each column
+
+    Returns:
+        (station x year) completeness between 0 and 1
+    """
+    n_days = days_in_year(years)[None, :]
+    missing = np.where(np.isnan(missing_days), n_days, missing_days)
+    return np.clip(1.0 - missing / n_days, 0.0, 1.0)
+
+def station_validity(flood_days: np.ndarray,
+                     missing_days: np.ndarray,
+                     years: np.ndarray,
+                     min_completeness: float = 0.0) -> np.ndarray:
+    """
+    Get the (station x year) mask of usable station records.
+
+    A station-year is valid when it has a flood day count and its completeness
+    exceeds min_completeness, so a year with missing_days equal to the length
+    of the year is never used.
+
+    Args:
+        flood_days: (station x year) flood days, NaN where missing
+        missing_days: (station x year) missing days, NaN where missing
+        years: Year of each column
+        min_completeness: Completeness a station-year must exceed
+
+    Returns:
+        Boolean (station x year) mask
+    """
+    completeness = station_completeness(missing_days, years)
+    return ~np.isnan(flood_days) & (completeness > min_completeness)
+
+class DynamicReweighter:
+    """Renormalizes static station weights per year over reporting stations."""
+
+    def __init__(self, mapping_df: pd.DataFrame):
+        """
+        Initialize reweighter from an imputation structure.
+
+        Args:
+            mapping_df: DataFrame with county_fips, station_id and weight columns,
+                plus reference_point_id (without it, each county is one point)
+                and optionally region
+        """
+        point_column = 'reference_point_id' if 'reference_point_id' in mapping_df.columns else 'county_fips'
+
+        point_idx, self.point_ids = pd.factorize(mapping_df[point_column])
+        station_idx, station_ids = pd.factorize(mapping_df['station_id'].astype(str))
+        self.station_ids = np.asarray(station_ids)
+
+        # County and region of each point (first occurrence)
+        first = np.unique(point_idx, return_index=True)[1]
+        county_idx, self.county_fips = pd.factorize(mapping_df['county_fips'].to_numpy()[first])
+        if 'region' in mapping_df.columns:
+            regions = mapping_df['region'].to_numpy()[first]
+            self.county_regions = regions[np.unique(county_idx, return_index=True)[1]]
+        else:
+            self.county_regions = np.full(len(self.county_fips), None, dtype=object)
+
+        n_points, n_stations = len(self.point_ids), len(self.station_ids)
+        self.weights = sparse.csr_matrix(
+            (mapping_df['weight'].to_numpy(dtype=np.float64), (point_idx, station_idx)),
+            shape=(n_points, n_stations)
+        )
+
+        # County membership of points and stations linked to each county
+        self.county_points = sparse.csr_matrix(
+            (np.ones(n_points), (county_idx, np.arange(n_points))),
+            shape=(len(self.county_fips), n_points)
+        )
+        self.county_stations = (self.county_points @ (self.weights > 0)).astype(bool).astype(np.float64)
+
+        logger.info(f"Reweighter: {n_points} points in {len(self.county_fips)} counties, "
+                    f"{n_stations} stations, {self.weights.nnz} weights")
+
+    def align(self, station_ids: np.ndarray, matrix: np.ndarray, fill=np.nan) -> np.ndarray:
+        """
+        Reorder the rows of a (station x year) matrix to the weight matrix columns.
+
+        Args:
+            station_ids: Station ID of each row of matrix
+            matrix: (station x year) matrix
+            fill: Value for stations of the weight matrix missing from matrix
+
+        Returns:
+            (weight station x year) matrix
+        """
+        rows = pd.Index(np.asarray(station_ids).astype(str)).get_indexer(self.station_ids)
+        aligned = np.full((len(self.station_ids), matrix.shape[1]), fill, dtype=np.asarray(matrix).dtype)
+        aligned[rows >= 0] = np.asarray(matrix)[rows[rows >= 0]]
+        return aligned
+
+    def coverage(self, valid: np.ndarray) -> np.ndarray:
+        """
+        Get the static weight of each point that is available in each year.
+
+        Args:
+            valid: (station x year) validity mask aligned to the weight matrix
+
+        Returns:
+            (point x year) sum of weights over valid stations
+        """
+        return np.asarray(self.weights @ valid.astype(np.float64))
+
+    def point_values(self, values: np.ndarray, valid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get weighted means at every point with weights renormalized per year.
+
+        Args:
+            values: (station x year) values aligned to the weight matrix
+            valid: (station x year) validity mask aligned to the weight matrix
+
+        Returns:
+            Tuple of (point x year) values, NaN where no station is valid, and
+            (point x year) coverage
+        """
+        coverage = self.coverage(valid)
+        weighted = np.asarray(self.weights @ np.where(valid, values, 0.0))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(coverage > 0, weighted / coverage, np.nan), coverage
+
+    def aggregate(self,
+                  station_ids: np.ndarray,
+                  years: np.ndarray,
+                  flood_days: np.ndarray,
+                  missing_days: np.ndarray,
+                  min_completeness: float = 0.0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Aggregate station flood days to counties with per-year renormalized weights.
+
+        County values are the mean over the county's covered reference points.
+
+        Args:
+            station_ids: Station ID of each matrix row
+            years: Year of each matrix column
+            flood_days: (station x year) flood days, NaN where missing
+            missing_days: (station x year) missing days, NaN where missing
+            min_completeness: Completeness a station-year must exceed to be used
+
+        Returns:
+            Tuple of (county-year DataFrame, coverage gap DataFrame). The county
+            frame has county_fips, year, region, flood_days, missing_days,
+            completeness, coverage, n_stations and n_reference_points columns
+            for covered county-years; the gap frame lists the county_fips and
+            year of county-years where no station reported.
+        """
+        years = np.asarray(years)
+        flood = self.align(station_ids, np.asarray(flood_days, dtype=np.float64))
+        missing = self.align(station_ids, np.asarray(missing_days, dtype=np.float64))
+
+        valid = station_validity(flood, missing, years, min_completeness)
+        completeness = station_completeness(missing, years)
+
+        point_flood, point_coverage = self.point_values(flood, valid)
+        point_missing, _ = self.point_values(missing, valid)
+        point_completeness, _ = self.point_values(completeness, valid)
+
+        covered = point_coverage > 0
+        county_points = self.county_points @ covered.astype(np.float64)
+
+        def county_mean(values: np.ndarray) -> np.ndarray:
+            total = self.county_points @ np.where(covered, values, 0.0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.where(county_points > 0, total / county_points, np.nan)
+
+        # Share of the static weight available, over all points of the county
+        point_totals = np.asarray(self.weights.sum(axis=1))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share = np.where(point_totals > 0, point_coverage / point_totals, 0.0)
+        n_points = np.asarray(self.county_points.sum(axis=1))
+
+        county_idx, year_idx = np.nonzero(county_points > 0)
+        county_df = pd.DataFrame({
+            'county_fips': np.asarray(self.county_fips)[county_idx],
+            'year': years[year_idx],
+            'region': self.county_regions[county_idx],
+            'flood_days': county_mean(point_flood)[county_idx, year_idx],
+            'missing_days': county_mean(point_missing)[county_idx, year_idx],
+            'completeness': county_mean(point_completeness)[county_idx, year_idx],
+            'coverage': ((self.county_points @ share) / n_points)[county_idx, year_idx],
+            'n_stations': (self.county_stations @ valid.astype(np.float64))[county_idx, year_idx].astype(np.int64),
+            'n_reference_points': county_points[county_idx, year_idx].astype(np.int64)
+        })
+
+        gap_county, gap_year = np.nonzero(county_points == 0)
+        gaps = pd.DataFrame({
+            'county_fips': np.asarray(self.county_fips)[gap_county],
+            'year': years[gap_year],
+            'region': self.county_regions[gap_county]
+        })
+
+        if len(gaps):
+            logger.warning(f"{len(gaps)} county-years in {gaps['county_fips'].nunique()} counties "
+                           f"have no reporting station")
+        logger.info(f"Reweighted {len(county_df)} county-years over {len(years)} years")
+        return county_df, gaps
+
+    def aggregate_frame(self,
+                        station_df: pd.DataFrame,
+                        min_completeness: float = 0.0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Aggregate long station data (station_id, year, flood_days, missing_days).
+
+        Args:
+            station_df: Station flood days by year
+            min_completeness: Completeness a station-year must exceed to be used
+
+        Returns:
+            Same as aggregate()
+        """
+        station_idx, station_ids = pd.factorize(station_df['station_id'].astype(str))
+        year_values = station_df['year'].to_numpy(dtype=np.int64)
+        years = np.arange(year_values.min(), year_values.max() + 1) if len(year_values) else np.empty(0, np.int64)
+
+        shape = (len(station_ids), len(years))
+        flood_days = np.full(shape, np.nan)
+        missing_days = np.full(shape, np.nan)
+        year_idx = year_values - (years[0] if len(years) else 0)
+        flood_days[station_idx, year_idx] = station_df['flood_days'].to_numpy(dtype=np.float64)
+        missing_days[station_idx, year_idx] = station_df['missing_days'].to_numpy(dtype=np.float64)
+
+        return self.aggregate(np.asarray(station_ids), years, flood_days, missing_days, min_completeness)
@@ -9,9 +9,10 @@ import logging
 from typing import Dict, Optional
 import yaml
 import numpy as np
-from pyproj import CRS, Transformer
+from pyproj import CRS
 
 from src.config import CONFIG_DIR
+from src.projections import ProjectionRegistry, reproject
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +36,7 @@ class WeightCalculator:
         # Load region configuration
         with open(self.config_dir / "region_mappings.yaml") as f:
             self.region_config = yaml.safe_load(f)
+        self.projections = ProjectionRegistry(self.region_config.get('regions', {}))
             
         logger.info("Initialized weight calculator without distance or weight restrictions")
         logger.info(f"Using regional filter approach only")
@@ -46,28 +48,9 @@ class WeightCalculator:
             region: Name of the region
             
         Returns:
-            CRS object for the region's projection
+            CRS object for the region's configured projection
         """
-        # Special handling for Alaska
-        if region.lower() == "alaska":
-            return CRS("EPSG:3338")  # Alaska Albers Equal Area
-        
-        # Special handling for Hawaii
-        elif region.lower() == "hawaii":
-            return CRS("EPSG:6628")  # Hawaii Albers Equal Area
-        
-        # Default to appropriate UTM zone based on region config
-        region_info = self.region_config.get(region, {})
-        utm_zone = region_info.get("utm_zone")
-        
-        if utm_zone:
-            # Northern hemisphere by default
-            epsg = f"EPSG:326{utm_zone:02d}"
-            return CRS(epsg)
-        
-        # Fallback to Web Mercator
-        logger.warning(f"No specific projection found for {region}, using Web Mercator")
-        return CRS("EPSG:3857")
+        return CRS.from_user_input(self.projections.crs(region))
     
     def calculate_weights(
         self,
@@ -91,8 +74,8 @@ class WeightCalculator:
         projection = self.get_region_projection(region)
         
         # Project geometries
-        stations_proj = stations.to_crs(projection)
-        ref_points_proj = reference_points.to_crs(projection)
+        stations_proj = reproject(stations, projection)
+        ref_points_proj = reproject(reference_points, projection)
         
         # Calculate distances and weights
         weights = []
@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Tuple, Dict
 import logging
 
+from src.noaa.historical.flood_matrix import ensure_flood_matrix
+
 logger = logging.getLogger(__name__)
 
 def load_gauge_county_mapping(filepath: str | Path) -> pd.DataFrame:
@@ -47,17 +49,10 @@ def load_historical_htf(filepath: str | Path) -> pd.DataFrame:
     """
     filepath = Path(filepath)
     
-    # Load all regional files
-    dfs = []
-    for file in filepath.glob("historical_htf_*.parquet"):
-        df = pd.read_parquet(file)
-        dfs.append(df)
-    
-    if not dfs:
+    # Read from the shared station x year matrix instead of re-concatenating regional files
+    if not list(filepath.glob("historical_htf_*.parquet")):
         raise FileNotFoundError(f"No historical HTF files found in {filepath}")
-    
-    # Combine all regions
-    df = pd.concat(dfs, ignore_index=True)
+    df = ensure_flood_matrix(filepath).to_frame()
     
     # Verify we have the required columns
     required_cols = [
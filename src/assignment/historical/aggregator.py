@@ -35,6 +35,9 @@ coastal segments.
 import pandas as pd
 import numpy as np
 import logging
+from typing import Dict, Tuple
+
+from src.assignment.common.reweighting import DynamicReweighter
 
 logger = logging.getLogger(__name__)
 
@@ -81,23 +84,8 @@ class HistoricalAggregator:
         if 'year' not in station_data.columns or 'flood_days' not in station_data.columns:
             raise ValueError("Missing required columns in station data")
         
-        # Filter by region/subregion if required
-        filtered_df = imputation_df.copy()
-        if self.require_same_region:
-            filtered_df = filtered_df[
-                filtered_df['station_region'] == filtered_df['county_region']
-            ]
-            logger.info(f"Filtered to {len(filtered_df)} station-county pairs in same region")
-        
-        if self.require_same_subregion:
-            filtered_df = filtered_df[
-                filtered_df['station_subregion'] == filtered_df['county_subregion']
-            ]
-            logger.info(f"Filtered to {len(filtered_df)} station-county pairs in same subregion")
-        
-        # No minimum weight filter - using all weighted relationships from regional filtering
+        filtered_df = self._filter_relationships(imputation_df)
         if len(filtered_df) == 0:
-            logger.warning("No valid station-county relationships found after filtering")
             return pd.DataFrame()
         
         # Join station data to imputation structure
@@ -135,4 +123,74 @@ class HistoricalAggregator:
         
         logger.info(f"Generated flood day estimates for {len(county_data)} county-year combinations")
         
-        return county_data 
\ No newline at end of file
+        return county_data
+    
+    def _filter_relationships(self, imputation_df: pd.DataFrame) -> pd.DataFrame:
+        """Apply the region/subregion requirements to station-county pairs.
+        
+        Args:
+            imputation_df: DataFrame with imputation structure
+            
+        Returns:
+            Filtered imputation structure
+        """
+        # Filter by region/subregion if required
+        filtered_df = imputation_df.copy()
+        if self.require_same_region:
+            filtered_df = filtered_df[
+                filtered_df['station_region'] == filtered_df['county_region']
+            ]
+            logger.info(f"Filtered to {len(filtered_df)} station-county pairs in same region")
+        
+        if self.require_same_subregion:
+            filtered_df = filtered_df[
+                filtered_df['station_subregion'] == filtered_df['county_subregion']
+            ]
+            logger.info(f"Filtered to {len(filtered_df)} station-county pairs in same subregion")
+        
+        # No minimum weight filter - using all weighted relationships from regional filtering
+        if len(filtered_df) == 0:
+            logger.warning("No valid station-county relationships found after filtering")
+        
+        return filtered_df
+    
+    def aggregate_with_validity(
+        self,
+        imputation_df: pd.DataFrame,
+        station_data: Dict[str, np.ndarray],
+        min_completeness: float = 0.0
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Aggregate flood days by county and year, skipping missing station-years.
+        
+        Static weights are renormalized per reference point and year over the
+        stations with a valid record (see DynamicReweighter), so stations that
+        were not installed or did not report in a year carry no weight.
+        
+        Args:
+            imputation_df: DataFrame with imputation structure
+            station_data: Station x year block from FloodMatrix.select()
+            min_completeness: Completeness a station-year must exceed to be used
+            
+        Returns:
+            Tuple of (county-year DataFrame, county-years without any reporting station)
+        """
+        logger.info("Aggregating historical HTF data by county with per-year reweighting")
+        
+        if 'county_fips' not in imputation_df.columns:
+            raise ValueError("Missing required column 'county_fips' in imputation data")
+        
+        filtered_df = self._filter_relationships(imputation_df)
+        if len(filtered_df) == 0:
+            return pd.DataFrame(), pd.DataFrame()
+        
+        reweighter = DynamicReweighter(filtered_df)
+        county_data, gaps = reweighter.aggregate(
+            station_ids=station_data['stations'],
+            years=station_data['years'],
+            flood_days=station_data['flood_days'],
+            missing_days=station_data['missing_days'],
+            min_completeness=min_completeness
+        )
+        
+        logger.info(f"Generated flood day estimates for {len(county_data)} county-year combinations")
+        return county_data, gaps
@@ -5,8 +5,10 @@ Script to combine regional imputation files into a single dataset.
 import pandas as pd
 from pathlib import Path
 import logging
+import yaml
 
-from src.config import IMPUTATION_DIR
+from src.config import IMPUTATION_DIR, REGION_CONFIG
+from src.imputation.structure_cache import latest_structure_file
 
 logger = logging.getLogger(__name__)
 
@@ -19,15 +21,17 @@ def combine_imputation_files(output_path: Path = None) -> Path:
     Returns:
         Path to combined file
     """
-    # Find all regional imputation files
-    imputation_files = list(IMPUTATION_DIR.glob("imputation_structure_*_2*.parquet"))
+    # Find the latest imputation structure for each region
+    with open(REGION_CONFIG) as f:
+        regions = yaml.safe_load(f)['regions']
+    imputation_files = [
+        path for path in (latest_structure_file(region, IMPUTATION_DIR) for region in regions)
+        if path is not None
+    ]
     
     if not imputation_files:
         raise FileNotFoundError("No imputation files found")
     
-    # Sort by timestamp to get most recent for each region
-    imputation_files.sort()
-    
     # Read and combine all files
     dfs = []
     for file in imputation_files:
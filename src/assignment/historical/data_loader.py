@@ -10,6 +10,7 @@ import logging
 import yaml
 
 from src.config import CONFIG_DIR
+from src.imputation.data_loader import level_filters
 
 logger = logging.getLogger(__name__)
 
@@ -128,8 +129,8 @@ class HistoricalDataLoader:
         Returns:
             GeoDataFrame with reference points
         """
-        gdf = gpd.read_parquet(filepath)
-        return gdf[gdf['region'] == region].copy()
+        # Predicate pushdown skips row groups of other regions and pyramid levels
+        return gpd.read_parquet(filepath, filters=[('region', '==', region)] + level_filters(filepath))
     
     def _create_stations_from_htf(self, htf_df: pd.DataFrame) -> pd.DataFrame:
         """Create stations DataFrame from HTF data.
@@ -8,7 +8,9 @@ from typing import Optional
 import logging
 import pandas as pd
 
-from src.config import ASSIGNMENT_SETTINGS, NOAA_HISTORICAL_DIR, IMPUTATION_DIR
+from src.config import ASSIGNMENT_SETTINGS, IMPUTATION_DIR, HISTORICAL_DIR
+from src.noaa.historical.flood_matrix import ensure_flood_matrix
+from src.imputation.structure_cache import latest_structure_file
 from src.assignment.historical.data_loader import HistoricalDataLoader
 from src.assignment.historical.aggregator import HistoricalAggregator
 
@@ -44,38 +46,27 @@ def process_historical_htf(
     output_dir.mkdir(parents=True, exist_ok=True)
     
     # Get imputation structure for region
-    imputation_files = list(IMPUTATION_DIR.glob(f"imputation_structure_{region}_*.parquet"))
-    if not imputation_files:
+    imputation_file = latest_structure_file(region, IMPUTATION_DIR)
+    if imputation_file is None:
         raise FileNotFoundError(f"No imputation structure found for region: {region}")
-    imputation_file = sorted(imputation_files)[-1]  # Use most recent
     
     try:
         # Load imputation structure
         logger.info(f"Loading imputation structure from {imputation_file}")
         imputation_df = pd.read_parquet(imputation_file)
         
-        # Load historical data for all stations in the region
+        # Load historical data for all stations in the region from the shared matrix
         logger.info("Loading historical station data")
-        station_data = []
-        for station_id in imputation_df['station_id'].unique():
-            station_file = NOAA_HISTORICAL_DIR / region / f"station_{station_id}.parquet"
-            if station_file.exists():
-                df = pd.read_parquet(station_file)
-                # Filter to specified years and minor floods only
-                df = df[
-                    (df['year'] >= start_year) & 
-                    (df['year'] <= end_year)
-                ].copy()
-                # Only keep minor flood counts
-                df['flood_days'] = df['minCount']
-                df = df.drop(columns=['majCount', 'modCount', 'minCount'])
-                station_data.append(df)
+        matrix = ensure_flood_matrix(HISTORICAL_DIR)
+        station_data = matrix.select(
+            station_ids=imputation_df['station_id'].unique(),
+            start_year=start_year,
+            end_year=end_year
+        )
         
-        if not station_data:
+        if not len(station_data['stations']) or not len(station_data['years']):
             raise ValueError(f"No historical data found for region: {region}")
         
-        station_df = pd.concat(station_data, ignore_index=True)
-        
         # Create aggregator
         aggregator = HistoricalAggregator(
             require_same_region=ASSIGNMENT_SETTINGS['common']['require_same_region'],
@@ -83,10 +74,11 @@ def process_historical_htf(
                                                                                                ASSIGNMENT_SETTINGS['common']['require_same_subregion']['default'])
         )
         
-        # Aggregate flood days by county
-        county_htf = aggregator.aggregate_by_county(
+        # Aggregate flood days by county, renormalizing weights over reporting stations each year
+        county_htf, coverage_gaps = aggregator.aggregate_with_validity(
             imputation_df=imputation_df,
-            station_data=station_df
+            station_data=station_data,
+            min_completeness=settings.get('min_completeness', 0.0)
         )
         
         # Verify county-year level aggregation
@@ -113,14 +105,19 @@ def process_historical_htf(
         # Save CSV (human-readable, widely compatible)
         county_htf.to_csv(csv_file, index=False)
         
+        # County-years where none of the county's stations reported
+        gaps_file = output_dir / f"{output_base}_coverage_gaps.csv"
+        coverage_gaps.to_csv(gaps_file, index=False)
+        
         logger.info(f"Saved results to:")
         logger.info(f"  - Parquet: {parquet_file}")
         logger.info(f"  - CSV: {csv_file}")
+        logger.info(f"  - Coverage gaps ({len(coverage_gaps)} county-years): {gaps_file}")
         
         # Generate summary statistics
         stats = {
             'total_counties': county_htf['county_fips'].nunique(),
-            'total_stations': station_df['stnId'].nunique(),
+            'total_stations': len(station_data['stations']),
             'year_range': f"{county_htf['year'].min()}-{county_htf['year'].max()}",
             'mean_flood_days': county_htf['flood_days'].mean(),
             'max_flood_days': county_htf['flood_days'].max(),
@@ -12,6 +12,8 @@ OUTPUT_DIR = PROJECT_ROOT / "output"
 # Data subdirectories
 RAW_DATA_DIR = DATA_DIR / "raw"
 CACHE_DIR = DATA_DIR / "cache"
+VECTOR_CACHE_DIR = CACHE_DIR / "vector"  # GeoParquet extracts of source shapefiles
+SHORELINE_CACHE_DIR = CACHE_DIR / "shoreline"  # Simplified regional shorelines
 
 # Output subdirectories
 PROCESSED_DIR = OUTPUT_DIR / "processed"
@@ -43,9 +45,11 @@ SHORELINE_DIR = PROCESSED_DIR / "regional_shorelines"
 COUNTY_FILE = PROCESSED_DIR / "county.parquet"
 COASTAL_COUNTIES_FILE = PROCESSED_DIR / "coastal_counties.parquet"
 REFERENCE_POINTS_FILE = COUNTY_SHORELINE_REF_POINTS_DIR / "coastal_reference_points.parquet"
+PREPROCESSING_MANIFEST = PROCESSED_DIR / "preprocessing_manifest.json"  # Input fingerprints of per-region outputs
 
 # Historical data paths
 HISTORICAL_DATA_DIR = HISTORICAL_DIR / "data"
+FLOOD_MATRIX_DIR = HISTORICAL_DIR / "flood_matrix"
 HISTORICAL_REFERENCE_POINTS = HISTORICAL_DATA_DIR / "reference_points.parquet"
 HISTORICAL_TIDE_GAUGE_MAP = HISTORICAL_DATA_DIR / "tide_gauge_county_map.json"
 
@@ -62,14 +66,37 @@ IMPUTATION_MAPS_DIR = MAPS_DIR / "imputation"
 # Spatial reference systems
 ALBERS_CRS = "+proj=aea +lat_1=20 +lat_2=60 +lat_0=40 +lon_0=-96 +x_0=0 +y_0=0 +ellps=GRS80 +datum=NAD83 +units=m +no_defs"
 WGS84_EPSG = 4326
+DEFAULT_REGION_PROJECTION = "EPSG:5070"  # NAD83 / Conus Albers, for regions without a projection
 
 # Point spacing for reference points (in meters)
 POINT_SPACING = 5000  # 5km spacing between coastal reference points
 
+# Nested reference point pyramid levels (in meters), each a multiple of the previous:
+# 1km for validation maps, POINT_SPACING for county assignment, 25km for national previews
+REFERENCE_POINT_SPACINGS = [1000, POINT_SPACING, 25000]
+
+# Shoreline simplification tolerance (in meters), small against the point spacing
+SHORELINE_SIMPLIFY_TOLERANCE = POINT_SPACING / 50
+
 # Data settings from NOAA config
 HISTORICAL_SETTINGS = NOAA_SETTINGS['data']['historical']
 PROJECTED_SETTINGS = NOAA_SETTINGS['data']['projected']
 
+# County assignment settings
+ASSIGNMENT_SETTINGS = {
+    'historical': {
+        'start_year': 1970,
+        'end_year': HISTORICAL_SETTINGS['end_year'],
+        'min_completeness': 0.0  # Station-years at or below this share of observed days are skipped
+    },
+    'common': {
+        'require_same_region': True,
+        'require_same_subregion': {
+            'default': False
+        }
+    }
+}
+
 # Ensure directories exist
 def ensure_directories():
     """Create all necessary directories if they don't exist."""
@@ -13,6 +13,7 @@ from .main import ImputationManager
 from .data_loader import DataLoader
 from .spatial_ops import NearestGaugeFinder
 from .weight_calculator import WeightCalculator
+from .geodesic_index import GeodesicGaugeIndex
 
 __version__ = "0.1.0"
 __author__ = "RPA SLR Team"
@@ -23,6 +24,7 @@ __all__ = [
     "DataLoader",
     "NearestGaugeFinder",
     "WeightCalculator",
+    "GeodesicGaugeIndex",
 ]
 
 # Module metadata
@@ -5,19 +5,23 @@ Handles loading and basic validation of input data.
 
 import geopandas as gpd
 import pandas as pd
+import pyarrow.parquet as pq
 from pathlib import Path
 import json
 import yaml
 import logging
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
 
 from src.config import (
     COASTAL_COUNTIES_FILE,
     REFERENCE_POINTS_FILE,
     TIDE_STATIONS_DIR,
     REGION_CONFIG,
-    WGS84_EPSG
+    WGS84_EPSG,
+    POINT_SPACING
 )
+from src.preprocessing.vector_io import read_geoparquet
+from .spatial_ops import LEVEL_COLUMN, REGION_COLUMN
 
 logger = logging.getLogger(__name__)
 
@@ -99,19 +103,47 @@ class GaugeStationLoader:
         logger.info(f"Loaded {len(gdf)} total gauge stations across all regions")
         return gdf
 
+def level_filters(points_file: Path, spacing: Optional[float] = POINT_SPACING) -> list:
+    """
+    Get the parquet filters selecting one level of a reference point pyramid.
+    
+    Args:
+        points_file: Reference points parquet file
+        spacing: Level spacing in meters (None reads every point)
+        
+    Returns:
+        List of filters, empty for files without pyramid levels
+    """
+    if spacing is None or LEVEL_COLUMN not in pq.read_schema(points_file).names:
+        return []
+    return [(LEVEL_COLUMN, '>=', spacing)]
+
 class ReferencePointLoader:
     """Loads and validates coastal reference points."""
     
-    def __init__(self, points_file: Path = REFERENCE_POINTS_FILE, region: str = None):
+    def __init__(self,
+                 points_file: Path = REFERENCE_POINTS_FILE,
+                 region: str = None,
+                 spacing: Optional[float] = POINT_SPACING):
         self.points_file = points_file
         self.region = region
+        self.spacing = spacing
         self.state_fips_to_code = get_state_fips_to_code_mapping()
     
-    def load(self) -> gpd.GeoDataFrame:
+    def load(self,
+             regions: Optional[List[str]] = None,
+             bbox: Optional[Tuple[float, float, float, float]] = None) -> gpd.GeoDataFrame:
         """
         Load reference points from parquet file.
         
         If a region is specified, it tries to load region-specific points file.
+        Only the points of the loader's pyramid level are read.
+        
+        Args:
+            regions: Optional imputation regions to read. When the file has the
+                precomputed region membership column, only those rows are read.
+            bbox: Optional WGS84 (minx, miny, maxx, maxy) of the regions; only
+                the row groups intersecting it are read
         
         Returns:
             GeoDataFrame containing reference points
@@ -132,7 +164,11 @@ class ReferencePointLoader:
                 logger.warning(f"Using default points file: {self.points_file}")
         
         try:
-            points_gdf = gpd.read_parquet(self.points_file)
+            filters = level_filters(self.points_file, self.spacing)
+            if regions and REGION_COLUMN in pq.read_schema(self.points_file).names:
+                filters.append((REGION_COLUMN, 'in', list(regions)))
+                logger.info(f"Reading reference points for regions: {', '.join(regions)}")
+            points_gdf = read_geoparquet(self.points_file, bbox=bbox, filters=filters or None)
             logger.info(f"Loaded {len(points_gdf)} reference points")
             
             # Verify required columns
@@ -161,18 +197,20 @@ class ReferencePointLoader:
 class DataLoader:
     """Main data loading interface."""
     
-    def __init__(self, region: str = None):
+    def __init__(self, region: str = None, spacing: Optional[float] = POINT_SPACING):
         self.gauge_loader = GaugeStationLoader()
-        self.points_loader = ReferencePointLoader(region=region)
+        self.points_loader = ReferencePointLoader(region=region, spacing=spacing)
         self.region = region
     
     def load_gauge_stations(self) -> gpd.GeoDataFrame:
         """Load all gauge stations."""
         return self.gauge_loader.load()
     
-    def load_reference_points(self) -> gpd.GeoDataFrame:
-        """Load reference points."""
-        return self.points_loader.load()
+    def load_reference_points(self,
+                              regions: Optional[List[str]] = None,
+                              bbox: Optional[Tuple[float, float, float, float]] = None) -> gpd.GeoDataFrame:
+        """Load reference points, optionally only those of the given regions or bbox."""
+        return self.points_loader.load(regions=regions, bbox=bbox)
     
     def load_all(self) -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
         """
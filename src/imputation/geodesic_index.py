@@ -0,0 +1,208 @@
+"""
+Global geodesic spatial index for tide gauge stations.
+
+Stations are stored as 3-D unit vectors (Earth-centered, Earth-fixed coordinates
+scaled to the unit sphere) in a single KD-tree. Straight-line (chord) distances
+between unit vectors increase monotonically with great-circle distance, so
+nearest-neighbor and radius queries on the tree give the same neighbors as a
+geodesic search. Chord lengths are converted back to great-circle meters.
+
+Compared with per-region planar projections this:
+- Needs no coordinate reprojection (works directly on longitude/latitude)
+- Has no seams at the antimeridian (e.g. Pacific Islands)
+- Uses one tree for all stations, with region/subregion filters applied as masks
+"""
+
+import numpy as np
+import geopandas as gpd
+from scipy.spatial import cKDTree
+from typing import Dict, Optional, Tuple
+import logging
+
+from src.projections import GEOGRAPHIC_CRS, reproject
+
+logger = logging.getLogger(__name__)
+
+# Mean Earth radius (IUGG) in meters
+EARTH_RADIUS_METERS = 6371008.8
+
+def to_unit_vectors(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    """
+    Convert longitude/latitude in degrees to unit-sphere ECEF coordinates.
+
+    Args:
+        lon: Longitudes in degrees
+        lat: Latitudes in degrees
+
+    Returns:
+        (N x 3) array of unit vectors
+    """
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+def chord_to_meters(chord: np.ndarray, radius: float = EARTH_RADIUS_METERS) -> np.ndarray:
+    """Convert unit-sphere chord lengths to great-circle distances in meters."""
+    return 2 * radius * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+def meters_to_chord(distance: float, radius: float = EARTH_RADIUS_METERS) -> float:
+    """Convert a great-circle distance in meters to a unit-sphere chord length."""
+    return 2 * np.sin(min(distance / (2 * radius), np.pi / 2))
+
+def geographic_coordinates(gdf: gpd.GeoDataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get longitude/latitude arrays for point geometries.
+
+    Args:
+        gdf: GeoDataFrame of points (geographic CRS expected)
+
+    Returns:
+        Tuple of (longitude, latitude) arrays
+    """
+    if gdf.crs is not None and not gdf.crs.is_geographic:
+        gdf = reproject(gdf, GEOGRAPHIC_CRS)
+    return gdf.geometry.x.to_numpy(), gdf.geometry.y.to_numpy()
+
+class GeodesicGaugeIndex:
+    """Nearest-gauge index over all stations on the unit sphere."""
+
+    def __init__(self,
+                 gauge_stations: gpd.GeoDataFrame,
+                 region_stations: Optional[Dict[str, Dict[str, dict]]] = None,
+                 radius: float = EARTH_RADIUS_METERS):
+        """
+        Build the index.
+
+        Args:
+            gauge_stations: GeoDataFrame of gauge stations with a 'station_id' column
+            region_stations: Station configuration by region, as loaded by
+                NearestGaugeFinder (region -> station_id -> {'name', 'sub_region', ...})
+            radius: Sphere radius in meters used for distance conversion
+        """
+        self.radius = radius
+        self.station_ids = gauge_stations['station_id'].astype(str).to_numpy()
+
+        # Region, subregion and name of each station from the tide station configs
+        lookup = {}
+        for region, stations in (region_stations or {}).items():
+            for station_id, info in stations.items():
+                lookup.setdefault(str(station_id), (region, info.get('sub_region', ''), info.get('name', '')))
+        info = [lookup.get(sid, ('', '', '')) for sid in self.station_ids]
+        self.station_regions = np.array([i[0] for i in info], dtype=object)
+        self.station_subregions = np.array([i[1] for i in info], dtype=object)
+        self.station_names = np.array([i[2] for i in info], dtype=object)
+
+        lon, lat = geographic_coordinates(gauge_stations)
+        self.tree = cKDTree(to_unit_vectors(lon, lat))
+
+        logger.info(f"Built geodesic index over {len(self.station_ids)} stations")
+
+    def __len__(self) -> int:
+        return len(self.station_ids)
+
+    def station_mask(self,
+                     region: Optional[str] = None,
+                     sub_region: Optional[str] = None) -> np.ndarray:
+        """
+        Get a boolean mask of stations matching a region and subregion.
+
+        Args:
+            region: Region identifier (None matches all regions)
+            sub_region: Subregion name (None matches all subregions)
+
+        Returns:
+            Boolean array with one entry per station
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if region is not None:
+            mask &= self.station_regions == region
+        if sub_region is not None:
+            mask &= self.station_subregions == sub_region
+        return mask
+
+    def query(self,
+              lon: np.ndarray,
+              lat: np.ndarray,
+              k: int = 3,
+              mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k nearest stations for each point.
+
+        When a station mask is given, the tree is queried with a growing number of
+        neighbors until every point has k matching stations (or all stations have
+        been considered).
+
+        Args:
+            lon: Point longitudes in degrees
+            lat: Point latitudes in degrees
+            k: Number of neighbors
+            mask: Optional boolean station mask
+
+        Returns:
+            Tuple of (distances in meters, station positions), both (N x k), sorted by
+            distance. Rows with fewer than k candidates are padded with inf and -1.
+        """
+        xyz = to_unit_vectors(lon, lat)
+        n_points = len(xyz)
+        n_candidates = len(self) if mask is None else int(mask.sum())
+        k = min(k, n_candidates)
+
+        distances = np.full((n_points, k), np.inf)
+        positions = np.full((n_points, k), -1, dtype=np.int64)
+        if n_points == 0 or k == 0:
+            return distances, positions
+
+        k_query = k
+        while True:
+            chord, idx = self.tree.query(xyz, k=[i + 1 for i in range(k_query)])
+            if mask is None:
+                break
+            keep = mask[idx]
+            # Enough matches for every point, or nothing left to search
+            if (keep.sum(axis=1) >= k).all() or k_query == len(self):
+                break
+            k_query = min(2 * k_query, len(self))
+
+        if mask is not None:
+            # Stable sort moves matching stations to the front in distance order
+            order = np.argsort(~keep, axis=1, kind='stable')[:, :k]
+            chord = np.take_along_axis(np.where(keep, chord, np.inf), order, axis=1)
+            idx = np.take_along_axis(np.where(keep, idx, -1), order, axis=1)
+
+        found = np.isfinite(chord)
+        distances[found] = chord_to_meters(chord[found], self.radius)
+        positions[:] = np.where(found, idx, -1)
+        return distances, positions
+
+    def query_radius(self,
+                     lon: np.ndarray,
+                     lat: np.ndarray,
+                     max_distance_meters: float,
+                     mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find all stations within a great-circle distance of each point.
+
+        Args:
+            lon: Point longitudes in degrees
+            lat: Point latitudes in degrees
+            max_distance_meters: Search radius in meters
+            mask: Optional boolean station mask
+
+        Returns:
+            Tuple of (point positions, station positions, distances in meters) for
+            every point-station pair within range
+        """
+        xyz = to_unit_vectors(lon, lat)
+        neighbors = self.tree.query_ball_point(xyz, r=meters_to_chord(max_distance_meters, self.radius))
+
+        counts = np.fromiter((len(n) for n in neighbors), dtype=np.int64, count=len(neighbors))
+        point_pos = np.repeat(np.arange(len(xyz)), counts)
+        station_pos = (np.concatenate(neighbors) if counts.sum() else np.empty(0)).astype(np.int64)
+
+        if mask is not None:
+            keep = mask[station_pos]
+            point_pos, station_pos = point_pos[keep], station_pos[keep]
+
+        chord = np.linalg.norm(xyz[point_pos] - self.tree.data[station_pos], axis=1)
+        return point_pos, station_pos, chord_to_meters(chord, self.radius)
@@ -41,19 +41,32 @@ from src.config import (
     REFERENCE_POINTS_FILE,
     OUTPUT_DIR,
     TIDE_STATIONS_DIR,
-    REGION_CONFIG
+    REGION_CONFIG,
+    POINT_SPACING
 )
 
+from src.preprocessing.vector_io import region_bbox
+
 from .data_loader import DataLoader
-from .spatial_ops import NearestGaugeFinder
-from .weight_calculator import WeightCalculator
+from .spatial_ops import NearestGaugeFinder, REGION_COLUMN
+from .weight_calculator import WeightCalculator, WeightMethod, WEIGHT_METHODS
+from .neighbor_matrix import save_neighbor_matrices
+from .structure_cache import ImputationStructureCache, structure_key
+from .streaming import StreamingImputer
+
+NEIGHBOR_MODES = ('knn', 'radius')
 
 logger = logging.getLogger(__name__)
 
 def process_region(region: str,
                   region_info: dict,
                   reference_points: gpd.GeoDataFrame,
-                  gauge_stations: gpd.GeoDataFrame) -> Optional[pd.DataFrame]:
+                  gauge_stations: gpd.GeoDataFrame,
+                  weight_method: WeightMethod = 'idw',
+                  geodesic: bool = False,
+                  neighbor_mode: str = 'knn',
+                  max_distance_meters: float = 100000,
+                  gauge_finder: Optional[NearestGaugeFinder] = None) -> Optional[pd.DataFrame]:
     """
     Process a single region.
     
@@ -62,6 +75,12 @@ def process_region(region: str,
         region_info: Region configuration dictionary
         reference_points: Reference points GeoDataFrame
         gauge_stations: Gauge stations GeoDataFrame
+        weight_method: Distance decay kernel used for station weights
+        geodesic: Use great-circle distances from the global geodesic index
+        neighbor_mode: 'knn' for the 3 nearest stations per subregion, or 'radius'
+            for all stations within max_distance_meters
+        max_distance_meters: Maximum distance for station weights
+        gauge_finder: Preloaded gauge finder (created from the configs if not given)
         
     Returns:
         DataFrame containing imputation structure for the region or None if error
@@ -71,44 +90,50 @@ def process_region(region: str,
         logger.info(f"States included: {', '.join(region_info['state_codes'])}")
         
         # Initialize components for this region
-        gauge_finder = NearestGaugeFinder(region_config=REGION_CONFIG)
+        if gauge_finder is None:
+            gauge_finder = NearestGaugeFinder(region_config=REGION_CONFIG, geodesic=geodesic)
         weight_calculator = WeightCalculator(
-            max_distance_meters=100000,  # 100km max distance
+            max_distance_meters=max_distance_meters,
             power=2,  # inverse distance power
-            min_weight=0.1
-        )
-        
-        # Find nearest gauges for reference points in this region
-        mappings = gauge_finder.find_nearest(
-            reference_points=reference_points,
-            gauge_stations=gauge_stations,
-            region=region
+            min_weight=0.1,
+            method=weight_method
         )
         
-        if not mappings:
-            logger.warning(f"No mappings found for region {region}")
-            return None
+        if neighbor_mode == 'radius':
+            # All gauges within range, with the distance limit applied in the tree query
+            neighbors = gauge_finder.find_within_radius(
+                reference_points=reference_points,
+                gauge_stations=gauge_stations,
+                region=region,
+                max_distance_meters=max_distance_meters
+            )
             
-        # Calculate weights for gauge stations
-        weighted_mappings = weight_calculator.calculate_weights(mappings)
-        
-        # Convert to DataFrame
-        records = []
-        for mapping in weighted_mappings:
-            for gauge in mapping['mappings']:
-                records.append({
-                    'reference_point_id': mapping['reference_point_id'],
-                    'county_fips': mapping['county_fips'],
-                    'region': region,
-                    'region_name': region_info['name'],
-                    'station_id': gauge['station_id'],
-                    'station_name': gauge['station_name'],
-                    'sub_region': gauge['sub_region'],
-                    'distance_meters': gauge['distance_meters'],
-                    'weight': gauge['weight']
-                })
+            if neighbors['distances'].nnz == 0:
+                logger.warning(f"No mappings found for region {region}")
+                return None
                 
-        df = pd.DataFrame.from_records(records)
+            weights = weight_calculator.compute_sparse_weights(neighbors['distances'])
+            weighted = gauge_finder.neighbors_to_frame(neighbors, weights, region)
+        else:
+            # Find nearest gauges for reference points in this region
+            mappings = gauge_finder.find_nearest(
+                reference_points=reference_points,
+                gauge_stations=gauge_stations,
+                region=region
+            )
+            
+            if mappings.empty:
+                logger.warning(f"No mappings found for region {region}")
+                return None
+                
+            # Calculate weights for gauge stations
+            weighted = weight_calculator.calculate_weights(mappings)
+        
+        # Convert to imputation structure layout
+        df = weighted.assign(region_name=region_info['name'])[[
+            'reference_point_id', 'county_fips', 'region', 'region_name', 'station_id',
+            'station_name', 'sub_region', 'distance_meters', 'weight'
+        ]]
         
         # Log statistics with improved clarity
         if not df.empty:
@@ -145,6 +170,83 @@ def process_region(region: str,
         logger.error(f"Error processing region {region}: {str(e)}")
         return None
 
+# Per-region tasks prepared by the parent process. Forked workers inherit this
+# table, so only the region name crosses the process boundary.
+_REGION_TASKS: Dict[str, dict] = {}
+
+def partition_reference_points(reference_points: gpd.GeoDataFrame,
+                               region_config: Dict[str, dict]) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Split reference points into per-region coordinate arrays.
+    
+    Only the columns needed for the nearest gauge search are kept, as plain arrays
+    rather than shapely geometries. Points are assigned by the precomputed region
+    membership column when present, otherwise by state code.
+    
+    Args:
+        reference_points: Reference points GeoDataFrame
+        region_config: Region definitions with state codes
+        
+    Returns:
+        Dictionary mapping region to arrays 'reference_point_id', 'county_fips',
+        'state_code', 'x' and 'y'
+    """
+    ids = reference_points.index.to_numpy()
+    county_fips = reference_points['county_fips'].to_numpy()
+    state_codes = reference_points['state_code'].to_numpy()
+    x = reference_points.geometry.x.to_numpy()
+    y = reference_points.geometry.y.to_numpy()
+    
+    regions = reference_points[REGION_COLUMN].to_numpy() if REGION_COLUMN in reference_points.columns else None
+    
+    partitions = {}
+    for region, region_info in region_config.items():
+        if regions is not None:
+            mask = regions == region
+        else:
+            mask = np.isin(state_codes, region_info['state_codes'])
+        partitions[region] = {
+            'reference_point_id': ids[mask],
+            'county_fips': county_fips[mask],
+            'state_code': state_codes[mask],
+            'x': x[mask],
+            'y': y[mask]
+        }
+    return partitions
+
+def _run_region_task(region: str, task: Optional[dict] = None) -> Optional[pd.DataFrame]:
+    """
+    Run process_region for a prepared region task.
+    
+    Args:
+        region: Region identifier
+        task: Region task; looked up in the fork-inherited task table if not given
+        
+    Returns:
+        DataFrame containing imputation structure for the region or None if error
+    """
+    task = task if task is not None else _REGION_TASKS[region]
+    points = task['points']
+    
+    reference_points = gpd.GeoDataFrame(
+        {
+            'county_fips': points['county_fips'],
+            'state_code': points['state_code']
+        },
+        geometry=gpd.points_from_xy(points['x'], points['y']),
+        index=pd.Index(points['reference_point_id'], name=task['index_name']),
+        crs=task['crs']
+    )
+    
+    return process_region(
+        region,
+        task['region_info'],
+        reference_points,
+        task['gauge_stations'],
+        gauge_finder=task['gauge_finder'],
+        **task['options']
+    )
+
 class ImputationManager:
     """
     Manages the imputation process across all regions.
@@ -161,7 +263,14 @@ class ImputationManager:
                  output_dir: Path = IMPUTATION_DIR / "data",
                  region_config: Path = REGION_CONFIG,
                  n_processes: int = None,
-                 region: str = None):
+                 region: str = None,
+                 weight_method: WeightMethod = 'idw',
+                 geodesic: bool = False,
+                 neighbor_mode: str = 'knn',
+                 max_distance_meters: float = 100000,
+                 use_cache: bool = True,
+                 max_versions: int = 2,
+                 spacing: int = POINT_SPACING):
         """
         Initialize imputation manager.
         
@@ -172,22 +281,43 @@ class ImputationManager:
             region_config: Path to region configuration file
             n_processes: Number of processes to use for parallel processing
             region: Specific region to process (if None, process all regions)
+            weight_method: Distance decay kernel for station weights
+                ('idw', 'gaussian', 'linear' or 'hybrid')
+            geodesic: Find nearest gauges by great-circle distance on the unit sphere
+                instead of in region-specific projections
+            neighbor_mode: 'knn' (3 nearest stations per subregion) or 'radius' (all
+                stations within max_distance_meters, also saved as sparse matrices)
+            max_distance_meters: Maximum distance for station weights
+            use_cache: Reuse structures whose inputs and parameters are unchanged
+            max_versions: Number of structures kept per region, including the latest
+            spacing: Reference point pyramid level to impute, in meters
         """
+        if neighbor_mode not in NEIGHBOR_MODES:
+            raise ValueError(f"Unknown neighbor mode: {neighbor_mode}. Choose from {', '.join(NEIGHBOR_MODES)}")
+            
         self.reference_points_file = reference_points_file
         self.gauge_stations_file = gauge_stations_file
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.n_processes = n_processes or max(1, mp.cpu_count() - 2)
         self.region = region
+        self.weight_method = weight_method
+        self.geodesic = geodesic
+        self.neighbor_mode = neighbor_mode
+        self.max_distance_meters = max_distance_meters
+        self.use_cache = use_cache
+        self.spacing = spacing
+        self.structure_cache = ImputationStructureCache(self.output_dir, max_versions=max_versions)
         
         # Load region configuration
+        self.region_config_file = region_config
         with open(region_config) as f:
             config = yaml.safe_load(f)
             self.region_config = config['regions']
             self.metadata = config.get('metadata', {})
             
         # Initialize data loader
-        self.data_loader = DataLoader(region=region)
+        self.data_loader = DataLoader(region=region, spacing=spacing)
         
         self._setup_logging()
         
@@ -224,13 +354,16 @@ class ImputationManager:
 
     def save_imputation_structure(self,
                                 df: pd.DataFrame,
-                                region: str) -> Path:
+                                region: str,
+                                key: Optional[str] = None) -> Path:
         """
         Save imputation structure for a region.
         
         Args:
             df: DataFrame containing imputation structure
             region: Region identifier
+            key: Structure cache key; the structure is stored under the key and
+                becomes the region's latest. Without a key a timestamped file is written.
             
         Returns:
             Path to saved file
@@ -240,15 +373,47 @@ class ImputationManager:
             return None
             
         # Create output filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"imputation_structure_{region}_{timestamp}.parquet"
-        output_path = self.output_dir / filename
+        if key is not None:
+            output_path = self.structure_cache.structure_path(region, key)
+        else:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = self.output_dir / f"imputation_structure_{region}_{timestamp}.parquet"
         
         # Save to parquet
         df.to_parquet(output_path)
         logger.info(f"Saved imputation structure for region {region} to {output_path}")
+        artifacts = [output_path]
+        
+        # Sparse (reference points x stations) distance and weight matrices alongside
+        if self.neighbor_mode == 'radius':
+            artifacts.append(save_neighbor_matrices(df, output_path.with_suffix('.npz')))
+        
+        if key is not None:
+            self.structure_cache.commit(region, key, artifacts)
         
         return output_path
+    
+    def _structure_key(self,
+                       region: str,
+                       points: Dict[str, np.ndarray],
+                       gauge_stations: gpd.GeoDataFrame) -> str:
+        """Compute the structure cache key for a region's inputs and parameters."""
+        return structure_key(
+            points,
+            gauge_stations,
+            self.region_config[region],
+            TIDE_STATIONS_DIR / f"{region}_tide_stations.yaml",
+            self._region_options()
+        )
+
+    def _region_options(self) -> dict:
+        """Get the keyword options passed to process_region."""
+        return {
+            'weight_method': self.weight_method,
+            'geodesic': self.geodesic,
+            'neighbor_mode': self.neighbor_mode,
+            'max_distance_meters': self.max_distance_meters
+        }
 
     def run(self) -> Dict[str, Path]:
         """
@@ -264,7 +429,11 @@ class ImputationManager:
         
         try:
             # Load data once for all regions
-            reference_points = self.data_loader.load_reference_points()
+            single_region = self.region_config.get(self.region) if self.region else None
+            reference_points = self.data_loader.load_reference_points(
+                regions=[self.region] if self.region else None,
+                bbox=region_bbox(single_region['bounds']) if single_region else None
+            )
             gauge_stations = self.data_loader.load_gauge_stations()
             
             if reference_points is None or reference_points.empty:
@@ -275,6 +444,11 @@ class ImputationManager:
                 logger.error("Failed to load gauge stations")
                 return output_files
             
+            # Load station and region configs once for all regions
+            gauge_finder = NearestGaugeFinder(region_config=self.region_config_file, geodesic=self.geodesic)
+            if self.geodesic:
+                gauge_finder.get_geodesic_index(gauge_stations)
+            
             # Process only a specific region if requested
             if self.region:
                 if self.region not in self.region_config:
@@ -283,15 +457,27 @@ class ImputationManager:
                     
                 logger.info(f"Processing single region: {self.region}")
                 try:
+                    points = partition_reference_points(
+                        reference_points, {self.region: self.region_config[self.region]}
+                    )[self.region]
+                    key = self._structure_key(self.region, points, gauge_stations)
+                    cached = self.structure_cache.lookup(self.region, key) if self.use_cache else None
+                    if cached is not None:
+                        logger.info(f"Inputs unchanged for region {self.region}, reusing {cached}")
+                        output_files[self.region] = cached
+                        return output_files
+                    
                     df = process_region(
                         self.region, 
                         self.region_config[self.region],
                         reference_points,
-                        gauge_stations
+                        gauge_stations,
+                        gauge_finder=gauge_finder,
+                        **self._region_options()
                     )
                     
                     if df is not None:
-                        output_path = self.save_imputation_structure(df, self.region)
+                        output_path = self.save_imputation_structure(df, self.region, key)
                         if output_path:
                             output_files[self.region] = output_path
                 except Exception as e:
@@ -300,34 +486,70 @@ class ImputationManager:
                     
                 return output_files
             
+            # Pre-partition reference points so workers only see their own region
+            partitions = partition_reference_points(reference_points, self.region_config)
+            
+            # Reuse cached structures for regions whose inputs are unchanged
+            keys = {
+                region: self._structure_key(region, partitions[region], gauge_stations)
+                for region in self.region_config
+            }
+            pending = []
+            for region, key in keys.items():
+                cached = self.structure_cache.lookup(region, key) if self.use_cache else None
+                if cached is not None:
+                    logger.info(f"Inputs unchanged for region {region}, reusing {cached}")
+                    output_files[region] = cached
+                else:
+                    pending.append(region)
+            
+            tasks = {
+                region: {
+                    'region_info': self.region_config[region],
+                    'points': partitions[region],
+                    'index_name': reference_points.index.name,
+                    'crs': reference_points.crs,
+                    'gauge_stations': gauge_stations,
+                    'gauge_finder': gauge_finder,
+                    'options': self._region_options()
+                }
+                for region in pending
+            }
+            del reference_points
+            
+            # With fork, workers inherit the task table and receive only the region name;
+            # otherwise each worker is sent its own region's task
+            use_fork = 'fork' in mp.get_all_start_methods()
+            mp_context = mp.get_context('fork') if use_fork else None
+            if use_fork:
+                _REGION_TASKS.update(tasks)
+            
             # Process all regions in parallel if no specific region requested
             logger.info("Processing all regions in parallel")
-            with ProcessPoolExecutor(max_workers=self.n_processes) as executor:
-                # Submit all regions
-                future_to_region = {
-                    executor.submit(
-                        process_region,
-                        region,
-                        self.region_config[region],
-                        reference_points,
-                        gauge_stations
-                    ): region 
-                    for region in self.region_config
-                }
-                
-                # Process results as they complete
-                for future in tqdm(as_completed(future_to_region), 
-                                 total=len(self.region_config),
-                                 desc="Processing regions"):
-                    region = future_to_region[future]
-                    try:
-                        df = future.result()
-                        if df is not None:
-                            output_path = self.save_imputation_structure(df, region)
-                            if output_path:
-                                output_files[region] = output_path
-                    except Exception as e:
-                        logger.error(f"Error processing region {region}: {str(e)}")
+            try:
+                with ProcessPoolExecutor(max_workers=self.n_processes, mp_context=mp_context) as executor:
+                    # Submit all regions
+                    future_to_region = {
+                        (executor.submit(_run_region_task, region) if use_fork
+                         else executor.submit(_run_region_task, region, tasks[region])): region
+                        for region in tasks
+                    }
+                    
+                    # Process results as they complete
+                    for future in tqdm(as_completed(future_to_region), 
+                                     total=len(future_to_region),
+                                     desc="Processing regions"):
+                        region = future_to_region[future]
+                        try:
+                            df = future.result()
+                            if df is not None:
+                                output_path = self.save_imputation_structure(df, region, keys[region])
+                                if output_path:
+                                    output_files[region] = output_path
+                        except Exception as e:
+                            logger.error(f"Error processing region {region}: {str(e)}")
+            finally:
+                _REGION_TASKS.clear()
             
             return output_files
             
@@ -336,6 +558,52 @@ class ImputationManager:
             logger.error(traceback.format_exc())
             return output_files
 
+    def run_streaming(self,
+                      batch_size: int = 250000,
+                      dataset_dir: Optional[Path] = None) -> Dict[str, Path]:
+        """
+        Run imputation out of core for very dense reference point sets.
+        
+        Reference points are read in batches of coordinates and keys, matched against
+        a station index built once, and appended to a region-partitioned parquet dataset.
+        
+        Args:
+            batch_size: Number of reference points per batch
+            dataset_dir: Output dataset directory (defaults to <output_dir>/imputation_structure)
+            
+        Returns:
+            Dictionary mapping region names to partition files
+        """
+        dataset_dir = Path(dataset_dir) if dataset_dir else self.output_dir / "imputation_structure"
+        points_file = self.data_loader.points_loader.points_file
+        if self.region:
+            region_file = Path(str(points_file).replace(
+                "coastal_reference_points.parquet", f"reference_points_{self.region}.parquet"
+            ))
+            if region_file.exists():
+                points_file = region_file
+        
+        logger.info(f"Streaming reference points from {points_file} in batches of {batch_size:,}")
+        gauge_stations = self.data_loader.load_gauge_stations()
+        
+        imputer = StreamingImputer(
+            gauge_stations,
+            gauge_finder=NearestGaugeFinder(region_config=self.region_config_file, geodesic=True),
+            weight_calculator=WeightCalculator(
+                max_distance_meters=self.max_distance_meters,
+                power=2,
+                min_weight=0.1,
+                method=self.weight_method
+            )
+        )
+        return imputer.run(
+            points_file,
+            dataset_dir,
+            regions=[self.region] if self.region else None,
+            batch_size=batch_size,
+            spacing=self.spacing
+        )
+
 if __name__ == "__main__":
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="Run imputation process for a specific region")
@@ -351,6 +619,53 @@ if __name__ == "__main__":
         default=None,
         help="Directory to save output files (defaults to config settings)"
     )
+    parser.add_argument(
+        "--weight-method",
+        type=str,
+        choices=WEIGHT_METHODS,
+        default='idw',
+        help="Distance decay kernel for station weights"
+    )
+    parser.add_argument(
+        "--neighbor-mode",
+        type=str,
+        choices=NEIGHBOR_MODES,
+        default='knn',
+        help="Select the 3 nearest stations per subregion (knn) or all stations within --max-distance (radius)"
+    )
+    parser.add_argument(
+        "--max-distance",
+        type=float,
+        default=100000,
+        help="Maximum station distance in meters"
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Process reference points out of core in batches (for dense point sets)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=250000,
+        help="Reference points per batch in streaming mode"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute imputation structures even when inputs are unchanged"
+    )
+    parser.add_argument(
+        "--spacing",
+        type=int,
+        default=POINT_SPACING,
+        help="Reference point pyramid level to impute, in meters"
+    )
+    parser.add_argument(
+        "--geodesic",
+        action="store_true",
+        help="Use great-circle distances from a single global gauge index instead of projected coordinates"
+    )
     
     args = parser.parse_args()
     
@@ -364,11 +679,17 @@ if __name__ == "__main__":
     # Initialize and run imputation manager for the specified region
     manager = ImputationManager(
         output_dir=output_dir,
-        region=args.region
+        region=args.region,
+        weight_method=args.weight_method,
+        geodesic=args.geodesic,
+        neighbor_mode=args.neighbor_mode,
+        max_distance_meters=args.max_distance,
+        use_cache=not args.no_cache,
+        spacing=args.spacing
     )
     
     # Run the imputation process
-    output_files = manager.run()
+    output_files = manager.run_streaming(batch_size=args.batch_size) if args.streaming else manager.run()
     
     # Print results
     if output_files:
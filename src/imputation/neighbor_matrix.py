@@ -0,0 +1,101 @@
+"""
+Sparse storage of point-to-gauge relationships.
+
+The imputation structure is a long table with one row per reference point and
+station pair. For matrix-based consumers the same relationships are stored as
+CSR matrices (reference points x stations) of distances and weights, saved as
+a compressed .npz file next to the parquet imputation structure.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from pathlib import Path
+from typing import Dict, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+def frame_to_csr(df: pd.DataFrame) -> Dict:
+    """
+    Build CSR distance and weight matrices from an imputation structure table.
+
+    Args:
+        df: DataFrame with reference_point_id, county_fips, station_id,
+            distance_meters and weight columns
+
+    Returns:
+        Dictionary with 'distances' and 'weights' CSR matrices and the row/column
+        labels 'reference_point_ids', 'county_fips' and 'station_ids'
+    """
+    rows, reference_point_ids = pd.factorize(df['reference_point_id'])
+    cols, station_ids = pd.factorize(df['station_id'])
+    shape = (len(reference_point_ids), len(station_ids))
+
+    # County of each row (first occurrence of each reference point)
+    first = np.unique(rows, return_index=True)[1]
+
+    def to_csr(values: np.ndarray) -> sparse.csr_matrix:
+        matrix = sparse.csr_matrix((values.astype(np.float64), (rows, cols)), shape=shape)
+        matrix.sort_indices()
+        return matrix
+
+    return {
+        'distances': to_csr(df['distance_meters'].to_numpy()),
+        'weights': to_csr(df['weight'].to_numpy()),
+        'reference_point_ids': np.asarray(reference_point_ids).astype(str),
+        'county_fips': df['county_fips'].to_numpy()[first].astype(str),
+        'station_ids': np.asarray(station_ids).astype(str)
+    }
+
+def save_neighbor_matrices(df: pd.DataFrame, output_path: Union[str, Path]) -> Path:
+    """
+    Save the CSR distance and weight matrices for an imputation structure.
+
+    Both matrices share one sparsity structure, so the index arrays are stored once.
+
+    Args:
+        df: Imputation structure DataFrame
+        output_path: Path of the .npz file
+
+    Returns:
+        Path to saved file
+    """
+    output_path = Path(output_path)
+    matrices = frame_to_csr(df)
+    distances, weights = matrices['distances'], matrices['weights']
+
+    np.savez_compressed(
+        output_path,
+        indices=distances.indices,
+        indptr=distances.indptr,
+        shape=np.array(distances.shape),
+        distances=distances.data,
+        weights=weights.data,
+        reference_point_ids=matrices['reference_point_ids'],
+        county_fips=matrices['county_fips'],
+        station_ids=matrices['station_ids']
+    )
+    logger.info(f"Saved {distances.nnz} point-to-station pairs to {output_path}")
+    return output_path
+
+def load_neighbor_matrices(path: Union[str, Path]) -> Dict:
+    """
+    Load CSR distance and weight matrices saved by save_neighbor_matrices().
+
+    Args:
+        path: Path to the .npz file
+
+    Returns:
+        Dictionary in the same layout as frame_to_csr()
+    """
+    with np.load(path) as data:
+        shape = tuple(data['shape'])
+        structure = (data['indices'], data['indptr'])
+        return {
+            'distances': sparse.csr_matrix((data['distances'], *structure), shape=shape),
+            'weights': sparse.csr_matrix((data['weights'], *structure), shape=shape),
+            'reference_point_ids': data['reference_point_ids'],
+            'county_fips': data['county_fips'],
+            'station_ids': data['station_ids']
+        }
@@ -12,12 +12,15 @@ from typing import Dict, List, Tuple
 import yaml
 import pandas as pd
 from shapely.geometry import Point, box
-import pyproj
 
 from src.config import OUTPUT_DIR, CONFIG_DIR
+from src.projections import GEOGRAPHIC_CRS, get_transformer, reproject
 
 logger = logging.getLogger(__name__)
 
+# Basemap tiles are in Web Mercator
+WEB_MERCATOR = "EPSG:3857"
+
 class RegionMapper:
     """Generates regional maps showing gauge-county relationships."""
     
@@ -35,11 +38,7 @@ class RegionMapper:
             self.field_mappings = config['field_mappings']
         
         # Initialize coordinate transformers
-        self.transformer = pyproj.Transformer.from_crs(
-            "EPSG:4326",  # WGS84 (lat/lon)
-            "EPSG:3857",  # Web Mercator
-            always_xy=True
-        )
+        self.transformer = get_transformer(GEOGRAPHIC_CRS, WEB_MERCATOR)
     
     def _transform_bounds(self, bounds: Dict[str, float]) -> Tuple[float, float, float, float]:
         """
@@ -138,8 +137,8 @@ class RegionMapper:
         
         # Project to Web Mercator for basemap compatibility
         try:
-            region_counties = region_counties.to_crs(epsg=3857)
-            region_gauges = gauge_stations.to_crs(epsg=3857)
+            region_counties = reproject(region_counties, WEB_MERCATOR)
+            region_gauges = reproject(gauge_stations, WEB_MERCATOR)
         except Exception as e:
             logger.error(f"Error projecting data for region {region}: {str(e)}")
             return None
@@ -26,6 +26,8 @@ The module is a key component for:
 
 import geopandas as gpd
 import numpy as np
+import pandas as pd
+from scipy import sparse
 from scipy.spatial import cKDTree
 from typing import Tuple, List, Dict
 import logging
@@ -33,31 +35,111 @@ from tqdm import tqdm
 import pyproj
 from pathlib import Path
 from src.config import CONFIG_DIR
+from src.projections import ProjectionRegistry
+from .geodesic_index import GeodesicGaugeIndex, geographic_coordinates
 import yaml
-from shapely.geometry import box
 
 logger = logging.getLogger(__name__)
 
+# Columns of the point-to-gauge mapping table returned by find_nearest
+MAPPING_COLUMNS = [
+    'reference_point_id', 'county_fips', 'region', 'station_id',
+    'station_name', 'sub_region', 'distance_meters', 'rank'
+]
+
+# Optional reference point column naming the imputation region of each point,
+# written during preprocessing so region filtering can be pushed into the read
+REGION_COLUMN = 'imputation_region'
+
+# Reference point column holding the coarsest pyramid spacing (meters) that
+# includes each point; the points of a level are those with level >= spacing
+LEVEL_COLUMN = 'level'
+
+def bounds_mask(lon: np.ndarray, lat: np.ndarray, bounds: Dict[str, float]) -> np.ndarray:
+    """
+    Get the mask of coordinates strictly inside a region's bounding box.
+    
+    Args:
+        lon: Longitudes
+        lat: Latitudes
+        bounds: Region bounds with min_lon, max_lon, min_lat and max_lat
+        
+    Returns:
+        Boolean mask, matching a 'within' test against the bounds polygon
+    """
+    return (
+        (lon > bounds['min_lon']) & (lon < bounds['max_lon']) &
+        (lat > bounds['min_lat']) & (lat < bounds['max_lat'])
+    )
+
+def point_coordinates(gdf: gpd.GeoDataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get longitude/latitude arrays, using precomputed coordinate columns when present.
+    
+    Args:
+        gdf: GeoDataFrame of points with optional lon/lat or longitude/latitude columns
+        
+    Returns:
+        Tuple of (longitude, latitude) float arrays
+    """
+    for lon_column, lat_column in (('lon', 'lat'), ('longitude', 'latitude')):
+        if lon_column in gdf.columns and lat_column in gdf.columns:
+            return (
+                gdf[lon_column].to_numpy(dtype=np.float64),
+                gdf[lat_column].to_numpy(dtype=np.float64)
+            )
+    return geographic_coordinates(gdf)
+
+def assign_imputation_regions(lon: np.ndarray,
+                              lat: np.ndarray,
+                              state_codes: np.ndarray,
+                              regions: Dict[str, dict]) -> np.ndarray:
+    """
+    Get the imputation region of each point from region state codes and bounds.
+    
+    Args:
+        lon: Point longitudes
+        lat: Point latitudes
+        state_codes: Two-letter state code of each point
+        regions: Region definitions from the region configuration
+        
+    Returns:
+        Object array of region identifiers, None for points outside every region.
+        Points matching several regions are assigned the first in configuration order.
+    """
+    assigned = np.full(len(lon), None, dtype=object)
+    for region, region_def in regions.items():
+        mask = np.isin(state_codes, region_def['state_codes']) & bounds_mask(lon, lat, region_def['bounds'])
+        overlap = mask & (assigned != None)
+        if overlap.any():
+            logger.warning(f"{overlap.sum()} points also fall in region {region}; keeping their first region")
+        assigned[mask & ~overlap] = region
+    return assigned
+
 class NearestGaugeFinder:
     """Finds nearest gauge stations for reference points."""
     
     def __init__(self, 
-                 region_config: Path = CONFIG_DIR / "region_mappings.yaml"):
+                 region_config: Path = CONFIG_DIR / "region_mappings.yaml",
+                 geodesic: bool = False):
+        """
+        Initialize gauge finder.
+        
+        Args:
+            region_config: Path to region configuration file
+            geodesic: Search on the unit sphere with a single GeodesicGaugeIndex
+                instead of per-subregion trees in a region-specific projection
+        """
+        self.geodesic = geodesic
+        self._geodesic_index = None
+        self._geodesic_index_source = None
+        
         # Load region definitions
         with open(region_config) as f:
             self.region_config = yaml.safe_load(f)
             
-        # Initialize region-specific projections
-        self.region_projections = {
-            'alaska': "+proj=aea +lat_1=55 +lat_2=65 +lat_0=50 +lon_0=-154 +x_0=0 +y_0=0 +ellps=GRS80 +datum=NAD83 +units=m +no_defs",
-            'hawaii': "+proj=aea +lat_1=8 +lat_2=18 +lat_0=13 +lon_0=-157 +x_0=0 +y_0=0 +ellps=GRS80 +datum=NAD83 +units=m +no_defs",
-            'pacific_islands': "+proj=aea +lat_1=0 +lat_2=20 +lat_0=10 +lon_0=160 +x_0=0 +y_0=0 +ellps=GRS80 +datum=NAD83 +units=m +no_defs",
-            'puerto_rico': "+proj=aea +lat_1=17 +lat_2=19 +lat_0=18 +lon_0=-66.5 +x_0=0 +y_0=0 +ellps=GRS80 +datum=NAD83 +units=m +no_defs",
-            'virgin_islands': "+proj=aea +lat_1=17 +lat_2=19 +lat_0=18 +lon_0=-64.75 +x_0=0 +y_0=0 +ellps=GRS80 +datum=NAD83 +units=m +no_defs",
-            'west_coast': "+proj=aea +lat_1=34 +lat_2=45.5 +lat_0=40 +lon_0=-120 +x_0=0 +y_0=0 +ellps=GRS80 +datum=NAD83 +units=m +no_defs",
-            # CONUS regions use standard Albers Equal Area
-            'default': "EPSG:5070"  # NAD83 / Conus Albers
-        }
+        # Region-specific projections, as configured in the region file
+        self.projections = ProjectionRegistry(self.region_config['regions'])
         
         # Load tide station configurations
         self.tide_stations_dir = CONFIG_DIR / "tide_stations"
@@ -117,56 +199,35 @@ class NearestGaugeFinder:
             raise ValueError(f"Unknown region: {region}")
             
         region_def = self.region_config['regions'][region]
-        
-        # Get state codes for the region
-        state_codes = region_def['state_codes']
-        
-        # Filter reference points by state codes
-        filtered_points = reference_points[
-            reference_points['state_code'].isin(state_codes)
-        ].copy()
-        
-        # Get region bounds
         bounds = region_def['bounds']
-        bounds_polygon = box(
-            bounds['min_lon'],
-            bounds['min_lat'],
-            bounds['max_lon'],
-            bounds['max_lat']
-        )
-        bounds_gdf = gpd.GeoDataFrame({'geometry': [bounds_polygon]}, crs="EPSG:4326")
-        
-        # Further filter points by region bounds
-        filtered_points = gpd.sjoin(
-            filtered_points,
-            bounds_gdf,
-            how='inner',
-            predicate='within'
-        )
         
-        # Get station IDs for the region
-        region_station_ids = set(self.region_stations[region].keys())
-        
-        # Filter gauge stations by region's station IDs and bounds
-        filtered_stations = gauge_stations[
-            gauge_stations['station_id'].isin(region_station_ids)
-        ].copy()
+        # Reference points: precomputed region membership, or state codes and region bounds
+        if REGION_COLUMN in reference_points.columns:
+            point_mask = (reference_points[REGION_COLUMN] == region).to_numpy()
+        else:
+            lon, lat = point_coordinates(reference_points)
+            point_mask = (
+                reference_points['state_code'].isin(region_def['state_codes']).to_numpy() &
+                bounds_mask(lon, lat, bounds)
+            )
+        filtered_points = reference_points[point_mask].copy()
         
-        # Add sub-region information to filtered stations
-        filtered_stations['sub_region'] = filtered_stations['station_id'].map(
-            lambda x: self.region_stations[region].get(x, {}).get('sub_region', '')
+        # Gauge stations: the region's station IDs within the region bounds
+        region_stations = self.region_stations[region]
+        lon, lat = point_coordinates(gauge_stations)
+        station_mask = (
+            gauge_stations['station_id'].isin(region_stations.keys()).to_numpy() &
+            bounds_mask(lon, lat, bounds)
         )
+        filtered_stations = gauge_stations[station_mask].copy()
         
-        # Add station names for better logging
-        filtered_stations['station_name'] = filtered_stations['station_id'].map(
-            lambda x: self.region_stations[region].get(x, {}).get('name', '')
+        # Add sub-region information and station names from the tide station config
+        station_ids = filtered_stations['station_id']
+        filtered_stations['sub_region'] = station_ids.map(
+            {station_id: info.get('sub_region', '') for station_id, info in region_stations.items()}
         )
-        
-        filtered_stations = gpd.sjoin(
-            filtered_stations,
-            bounds_gdf,
-            how='inner',
-            predicate='within'
+        filtered_stations['station_name'] = station_ids.map(
+            {station_id: info.get('name', '') for station_id, info in region_stations.items()}
         )
         
         if filtered_points.empty or filtered_stations.empty:
@@ -182,51 +243,45 @@ class NearestGaugeFinder:
 
     def _get_region_projection(self, region: str) -> str:
         """Get the appropriate projection for a region."""
-        return self.region_projections.get(region, self.region_projections['default'])
+        return self.projections.crs(region)
         
-    def _project_points(self,
-                      reference_points: gpd.GeoDataFrame,
-                      gauge_stations: gpd.GeoDataFrame,
-                      region: str) -> Tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
+    def _project_coordinates(self,
+                             reference_points: gpd.GeoDataFrame,
+                             gauge_stations: gpd.GeoDataFrame,
+                             region: str) -> Tuple[np.ndarray, np.ndarray]:
         """
         Project points to region-appropriate CRS for accurate distance calculations.
         
+        Coordinates are projected as arrays with the region's cached transformer,
+        without reprojecting the GeoDataFrames.
+        
         Args:
             reference_points: GeoDataFrame of reference points
             gauge_stations: GeoDataFrame of gauge stations
             region: Region identifier
             
         Returns:
-            Tuple of projected (reference_points, gauge_stations)
+            Tuple of projected coordinate arrays (reference_coords, gauge_coords)
         """
-        projection = self._get_region_projection(region)
         return (
-            reference_points.to_crs(projection),
-            gauge_stations.to_crs(projection)
+            self.projections.transform_xy(*point_coordinates(reference_points), region),
+            self.projections.transform_xy(*point_coordinates(gauge_stations), region)
         )
     
-    def _extract_coordinates(self,
-                          reference_points: gpd.GeoDataFrame,
-                          gauge_stations: gpd.GeoDataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    def get_geodesic_index(self, gauge_stations: gpd.GeoDataFrame) -> GeodesicGaugeIndex:
         """
-        Extract coordinates as numpy arrays for KDTree.
+        Get the geodesic index over all gauge stations, building it on first use.
         
         Args:
-            reference_points: GeoDataFrame of reference points
-            gauge_stations: GeoDataFrame of gauge stations
+            gauge_stations: GeoDataFrame of all gauge stations
             
         Returns:
-            Tuple of coordinate arrays (reference_coords, gauge_coords)
+            GeodesicGaugeIndex shared across regions
         """
-        ref_coords = np.column_stack([
-            reference_points.geometry.x,
-            reference_points.geometry.y
-        ])
-        gauge_coords = np.column_stack([
-            gauge_stations.geometry.x,
-            gauge_stations.geometry.y
-        ])
-        return ref_coords, gauge_coords
+        if self._geodesic_index is None or self._geodesic_index_source is not gauge_stations:
+            self._geodesic_index = GeodesicGaugeIndex(gauge_stations, self.region_stations)
+            self._geodesic_index_source = gauge_stations
+        return self._geodesic_index
     
     def _get_region_bounds(self, state_fips: str) -> Dict[str, float]:
         """
@@ -273,87 +328,246 @@ class NearestGaugeFinder:
     def find_nearest(self,
                     reference_points: gpd.GeoDataFrame,
                     gauge_stations: gpd.GeoDataFrame,
-                    region: str) -> List[dict]:
+                    region: str) -> pd.DataFrame:
         """
         Find nearest gauge stations for each reference point within the same region and subregion.
         
+        Every reference point is matched against the stations of each subregion, and the
+        result is built directly from the KD-tree distance/index arrays.
+        
         Args:
             reference_points: GeoDataFrame of reference points
             gauge_stations: GeoDataFrame of gauge stations
             region: Region identifier
             
         Returns:
-            List of dictionaries containing point-to-gauge mappings
+            DataFrame with one row per point-to-gauge mapping and columns reference_point_id,
+            county_fips, region, station_id, station_name, sub_region, distance_meters and
+            rank (0 = nearest station within the subregion). Use to_mapping_dicts() for the
+            nested dictionary format.
         """
         # Filter by region first
         ref_points, stations = self._filter_by_region(reference_points, gauge_stations, region)
         
         if ref_points.empty or stations.empty:
-            return []
+            return pd.DataFrame(columns=MAPPING_COLUMNS)
             
-        # Project coordinates
-        ref_points, stations = self._project_points(ref_points, stations, region)
+        # Project coordinates (the geodesic index works on longitude/latitude directly)
+        if self.geodesic:
+            index = self.get_geodesic_index(gauge_stations)
+            ref_lon, ref_lat = geographic_coordinates(ref_points)
+            index_to_station = pd.Index(stations['station_id'].astype(str)).get_indexer(index.station_ids)
+        else:
+            ref_coords, station_coords = self._project_coordinates(ref_points, stations, region)
+        
+        ref_ids = ref_points.index.to_numpy()
+        ref_fips = ref_points['county_fips'].to_numpy()
+        station_ids = stations['station_id'].to_numpy()
+        station_names = stations['station_name'].to_numpy()
+        station_subregions = stations['sub_region'].to_numpy()
         
         # Process each subregion separately
-        all_mappings = []
+        frames = []
         
         # Get unique subregions (including empty string for stations without subregion)
         subregions = stations['sub_region'].unique()
         
         for subregion in subregions:
-            # Filter stations for this subregion
-            subregion_stations = stations[stations['sub_region'] == subregion].copy()
+            # Positions of this subregion's stations
+            subregion_idx = np.flatnonzero(station_subregions == subregion)
             
-            if len(subregion_stations) == 0:
+            if len(subregion_idx) == 0:
                 continue
                 
-            # Extract coordinates for KD-tree
-            ref_coords, station_coords = self._extract_coordinates(ref_points, subregion_stations)
-            
-            # Build KD-tree for efficient nearest neighbor search
-            tree = cKDTree(station_coords)
-            
-            # Find k nearest neighbors for each reference point
             # k is min(3, number of available stations) to ensure we don't exceed available stations
-            k = min(3, len(subregion_stations))
-            distances, indices = tree.query(ref_coords, k=k)
+            k = min(3, len(subregion_idx))
             
-            # Convert to meters and create mapping dictionaries
-            for i, (dist, idx) in enumerate(zip(distances, indices)):
-                point_mappings = {
-                    'reference_point_id': ref_points.iloc[i].name,
-                    'county_fips': ref_points.iloc[i]['county_fips'],
-                    'region': region,
-                    'mappings': []
-                }
-                
-                # Handle case where k=1 (only one station available)
-                if not isinstance(dist, np.ndarray):
-                    dist = [dist]
-                    idx = [idx]
-                    
-                for d, j in zip(dist, idx):
-                    station = subregion_stations.iloc[j]
-                    point_mappings['mappings'].append({
-                        'station_id': station['station_id'],
-                        'station_name': station['station_name'],
-                        'sub_region': station['sub_region'],
-                        'distance_meters': float(d),
-                        'weight': 1.0  # Initial weight, will be adjusted by weight calculator
-                    })
+            if self.geodesic:
+                # Great-circle search in the global tree, restricted to this subregion's stations
+                mask = np.isin(index_to_station, subregion_idx)
+                distances, indices = index.query(ref_lon, ref_lat, k=k, mask=mask)
+                station_pos = index_to_station[indices.ravel()]
+            else:
+                # Build KD-tree for efficient nearest neighbor search
+                tree = cKDTree(station_coords[subregion_idx])
                 
-                all_mappings.append(point_mappings)
+                # Find k nearest neighbors for each reference point
+                distances, indices = tree.query(ref_coords, k=[i + 1 for i in range(k)])
+                station_pos = subregion_idx[indices.ravel()]
+            
+            # Flatten (points x k) arrays row-major into one row per mapping
+            point_pos = np.repeat(np.arange(len(ref_ids)), k)
+            
+            frames.append(pd.DataFrame({
+                'reference_point_id': ref_ids[point_pos],
+                'county_fips': ref_fips[point_pos],
+                'region': region,
+                'station_id': station_ids[station_pos],
+                'station_name': station_names[station_pos],
+                'sub_region': station_subregions[station_pos],
+                'distance_meters': distances.ravel().astype(np.float64),
+                'rank': np.tile(np.arange(k, dtype=np.int8), len(ref_ids))
+            }))
+        
+        result = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=MAPPING_COLUMNS)
         
         # Log summary statistics
-        if all_mappings:
+        if not result.empty:
             logger.info(f"\nGenerated mappings for region {region}:")
-            for subregion in subregions:
+            point_counts = result[result['rank'] == 0].groupby('sub_region', sort=False).size()
+            for subregion, count in point_counts.items():
                 subregion_name = subregion if subregion else 'main'
-                subregion_mappings = [m for m in all_mappings 
-                                    if any(sm['sub_region'] == subregion for sm in m['mappings'])]
-                if subregion_mappings:
-                    logger.info(f"  Subregion {subregion_name}: {len(subregion_mappings)} reference point mappings")
+                logger.info(f"  Subregion {subregion_name}: {count} reference point mappings")
                     
+        return result
+    
+    def find_within_radius(self,
+                           reference_points: gpd.GeoDataFrame,
+                           gauge_stations: gpd.GeoDataFrame,
+                           region: str,
+                           max_distance_meters: float = 100000) -> Dict:
+        """
+        Find all gauge stations within a maximum distance of each reference point.
+        
+        The distance limit is applied inside the tree query, so stations out of range
+        are never returned. Points without any station in range fall back to their
+        single nearest station, matching the weight calculator's fallback.
+        
+        Args:
+            reference_points: GeoDataFrame of reference points
+            gauge_stations: GeoDataFrame of gauge stations
+            region: Region identifier
+            max_distance_meters: Search radius in meters
+            
+        Returns:
+            Dictionary with a CSR 'distances' matrix (reference points x stations, in
+            meters) and the row/column labels 'reference_point_ids', 'county_fips',
+            'station_ids', 'station_names' and 'sub_regions'
+        """
+        ref_points, stations = self._filter_by_region(reference_points, gauge_stations, region)
+        
+        neighbors = {
+            'reference_point_ids': ref_points.index.to_numpy(),
+            'county_fips': ref_points['county_fips'].to_numpy(),
+            'station_ids': stations['station_id'].to_numpy(),
+            'station_names': stations['station_name'].to_numpy(),
+            'sub_regions': stations['sub_region'].to_numpy()
+        }
+        shape = (len(ref_points), len(stations))
+        
+        if ref_points.empty or stations.empty:
+            neighbors['distances'] = sparse.csr_matrix(shape, dtype=np.float64)
+            return neighbors
+        
+        if self.geodesic:
+            index = self.get_geodesic_index(gauge_stations)
+            ref_lon, ref_lat = geographic_coordinates(ref_points)
+            index_to_station = pd.Index(stations['station_id'].astype(str)).get_indexer(index.station_ids)
+            mask = index_to_station >= 0
+            rows, cols, dists = index.query_radius(ref_lon, ref_lat, max_distance_meters, mask=mask)
+            cols = index_to_station[cols]
+            
+            missing = np.setdiff1d(np.arange(shape[0]), rows)
+            if len(missing):
+                fallback_dists, fallback_cols = index.query(ref_lon[missing], ref_lat[missing], k=1, mask=mask)
+                fallback_cols = index_to_station[fallback_cols[:, 0]]
+                fallback_dists = fallback_dists[:, 0]
+        else:
+            ref_coords, station_coords = self._project_coordinates(ref_points, stations, region)
+            station_tree = cKDTree(station_coords)
+            
+            # Pairs within range as a (row, col, distance) record array
+            pairs = cKDTree(ref_coords).sparse_distance_matrix(
+                station_tree, max_distance_meters, output_type='ndarray'
+            )
+            rows, cols, dists = pairs['i'], pairs['j'], pairs['v']
+            
+            missing = np.setdiff1d(np.arange(shape[0]), rows)
+            if len(missing):
+                fallback_dists, fallback_cols = station_tree.query(ref_coords[missing], k=1)
+        
+        if len(missing):
+            logger.info(f"{len(missing)} reference points have no station within "
+                        f"{max_distance_meters/1000:.1f}km, using nearest station")
+            rows = np.concatenate([rows, missing])
+            cols = np.concatenate([cols, fallback_cols])
+            dists = np.concatenate([dists, fallback_dists])
+        
+        # Explicit zeros (stations at a reference point) are kept as stored entries
+        neighbors['distances'] = sparse.csr_matrix(
+            (dists.astype(np.float64), (rows, cols)), shape=shape
+        )
+        neighbors['distances'].sort_indices()
+        
+        logger.info(f"Found {neighbors['distances'].nnz} point-to-station pairs within "
+                    f"{max_distance_meters/1000:.1f}km for region {region}")
+        return neighbors
+    
+    @staticmethod
+    def neighbors_to_frame(neighbors: Dict,
+                           weights: sparse.csr_matrix,
+                           region: str) -> pd.DataFrame:
+        """
+        Convert radius search results to the point-to-gauge mapping table.
+        
+        Args:
+            neighbors: Dictionary returned by find_within_radius()
+            weights: CSR weight matrix with the same sparsity structure as the distances
+            region: Region identifier
+            
+        Returns:
+            DataFrame with one row per stored point-station pair and a 'weight' column
+        """
+        distances = neighbors['distances']
+        rows = np.repeat(np.arange(distances.shape[0]), np.diff(distances.indptr))
+        cols = distances.indices
+        return pd.DataFrame({
+            'reference_point_id': neighbors['reference_point_ids'][rows],
+            'county_fips': neighbors['county_fips'][rows],
+            'region': region,
+            'station_id': neighbors['station_ids'][cols],
+            'station_name': neighbors['station_names'][cols],
+            'sub_region': neighbors['sub_regions'][cols],
+            'distance_meters': distances.data,
+            'weight': weights.data
+        })
+    
+    @staticmethod
+    def to_mapping_dicts(mappings: pd.DataFrame) -> List[dict]:
+        """
+        Convert a columnar find_nearest() result to the nested dictionary format.
+        
+        Args:
+            mappings: DataFrame returned by find_nearest()
+            
+        Returns:
+            List of dictionaries, one per reference point and subregion, each with a
+            'mappings' list of station entries ordered by distance
+        """
+        if mappings.empty:
+            return []
+        
+        records = mappings.to_dict('records')
+        starts = np.flatnonzero(mappings['rank'].to_numpy() == 0).tolist() + [len(records)]
+        
+        all_mappings = []
+        for start, end in zip(starts[:-1], starts[1:]):
+            first = records[start]
+            all_mappings.append({
+                'reference_point_id': first['reference_point_id'],
+                'county_fips': first['county_fips'],
+                'region': first['region'],
+                'mappings': [
+                    {
+                        'station_id': r['station_id'],
+                        'station_name': r['station_name'],
+                        'sub_region': r['sub_region'],
+                        'distance_meters': float(r['distance_meters']),
+                        'weight': 1.0  # Initial weight, will be adjusted by weight calculator
+                    }
+                    for r in records[start:end]
+                ]
+            })
         return all_mappings
 
 def process_spatial_data(
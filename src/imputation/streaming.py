@@ -0,0 +1,312 @@
+"""
+Out-of-core imputation for dense reference point sets.
+
+At parcel-level spacing (100-500 m) the reference point file holds tens of
+millions of points, too many to load as a GeoDataFrame. The streaming imputer
+instead:
+
+1. Reads the reference point parquet in record batches, keeping only the keys
+   and coordinates (point geometries are decoded from WKB straight into
+   NumPy arrays, without creating shapely objects)
+2. Queries a station index built once up front (GeodesicGaugeIndex), with
+   region and subregion filters applied as masks
+3. Computes weights for the whole batch with WeightCalculator.compute_weights
+4. Appends each batch to a region-partitioned parquet dataset
+   (`<output_dir>/region=<region>/part-0.parquet`)
+
+Memory use is bounded by the batch size rather than the number of points.
+"""
+
+import json
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import shapely
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import logging
+from tqdm import tqdm
+
+from src.config import POINT_SPACING
+from src.preprocessing.vector_io import intersecting_row_groups, region_bbox
+
+from .data_loader import get_state_fips_to_code_mapping
+from .geodesic_index import GeodesicGaugeIndex, geographic_coordinates
+from .spatial_ops import LEVEL_COLUMN, NearestGaugeFinder, REGION_COLUMN, bounds_mask
+from .weight_calculator import WeightCalculator
+
+logger = logging.getLogger(__name__)
+
+# Length of a 2-D little-endian WKB point: byte order + geometry type + 2 doubles
+WKB_POINT_LENGTH = 21
+
+# Output columns (the region is encoded in the partition directory)
+STREAMING_COLUMNS = [
+    'reference_point_id', 'county_fips', 'region_name', 'station_id',
+    'station_name', 'sub_region', 'distance_meters', 'weight'
+]
+
+def decode_wkb_points(values: pa.Array) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode WKB point geometries to coordinate arrays.
+
+    Little-endian 2-D points are read directly from the Arrow buffers; any
+    other encoding falls back to shapely for those rows only.
+
+    Args:
+        values: Arrow binary array of WKB points
+
+    Returns:
+        Tuple of (x, y) arrays, NaN for null or empty geometries
+    """
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    if pa.types.is_large_binary(values.type):
+        offset_type = np.int64
+    else:
+        values = values.cast(pa.binary())
+        offset_type = np.int32
+
+    n = len(values)
+    x = np.full(n, np.nan)
+    y = np.full(n, np.nan)
+    if n == 0:
+        return x, y
+
+    _, offsets_buffer, data_buffer = values.buffers()
+    offsets = np.frombuffer(offsets_buffer, dtype=offset_type)[values.offset:values.offset + n + 1]
+    data = np.frombuffer(data_buffer, dtype=np.uint8) if data_buffer is not None else np.empty(0, np.uint8)
+    starts = offsets[:-1].astype(np.int64)
+    valid = ~np.asarray(values.is_null().to_numpy(zero_copy_only=False), dtype=bool)
+
+    # Fast path: little-endian (1) 2-D point (type 1)
+    fast = valid & (np.diff(offsets) == WKB_POINT_LENGTH)
+    fast_starts = starts[fast]
+    fast_header = data[fast_starts[:, None] + np.arange(5)]
+    is_point = (fast_header[:, 0] == 1) & (np.ascontiguousarray(fast_header[:, 1:]).view('<u4')[:, 0] == 1)
+    fast[np.flatnonzero(fast)[~is_point]] = False
+
+    coords = data[starts[fast][:, None] + np.arange(5, WKB_POINT_LENGTH)].view('<f8')
+    x[fast], y[fast] = coords[:, 0], coords[:, 1]
+
+    slow = np.flatnonzero(valid & ~fast)
+    if len(slow):
+        geoms = shapely.from_wkb(values.take(pa.array(slow)).to_numpy(zero_copy_only=False))
+        x[slow], y[slow] = shapely.get_x(geoms), shapely.get_y(geoms)
+    return x, y
+
+def iter_reference_point_batches(path: Union[str, Path],
+                                 batch_size: int = 250000,
+                                 bboxes: Optional[List[Tuple[float, float, float, float]]] = None,
+                                 spacing: Optional[float] = None) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Read reference points in batches as key and coordinate arrays.
+
+    With bboxes, only the row groups whose bbox covering statistics intersect
+    one of them are read. Files without stored point ids are always read in
+    full, since their ids are row positions.
+
+    Args:
+        path: Reference point GeoParquet file
+        batch_size: Maximum number of points per batch
+        bboxes: Optional WGS84 (minx, miny, maxx, maxy) boxes of the regions
+        spacing: Optional pyramid level spacing in meters; only the points of
+            that level are yielded (files without levels yield every point)
+
+    Yields:
+        Dictionaries with 'reference_point_id', 'county_fips', 'state_code',
+        'lon' and 'lat' arrays, plus the precomputed region membership when the
+        file has one
+    """
+    parquet_file = pq.ParquetFile(path)
+    schema = parquet_file.schema_arrow
+    metadata = schema.metadata or {}
+
+    geo = json.loads(metadata[b'geo']) if b'geo' in metadata else {}
+    geometry_column = geo.get('primary_column', 'geometry')
+
+    # Reference point ids are the GeoDataFrame index: a stored column or a range
+    pandas_meta = json.loads(metadata[b'pandas']) if b'pandas' in metadata else {}
+    index_columns = pandas_meta.get('index_columns', [])
+    index_column = index_columns[0] if index_columns and isinstance(index_columns[0], str) else None
+    index_range = index_columns[0] if index_columns and isinstance(index_columns[0], dict) else {'start': 0, 'step': 1}
+
+    if 'state_code' in schema.names:
+        state_column = 'state_code'
+    elif 'state_fips' in schema.names:
+        state_column = 'state_fips'
+    else:
+        raise ValueError(f"Reference points file has no state_code or state_fips column: {path}")
+
+    region_columns = [REGION_COLUMN] if REGION_COLUMN in schema.names else []
+    level_column = LEVEL_COLUMN if spacing is not None and LEVEL_COLUMN in schema.names else None
+    columns = (['county_fips', state_column, geometry_column] + ([index_column] if index_column else [])
+               + region_columns + ([level_column] if level_column else []))
+    state_fips_to_code = get_state_fips_to_code_mapping()
+
+    row_groups = intersecting_row_groups(parquet_file, bboxes) if bboxes and index_column else None
+    if row_groups is not None:
+        logger.info(f"Reading {len(row_groups)} of {parquet_file.metadata.num_row_groups} row groups")
+
+    row_offset = 0
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns, row_groups=row_groups):
+        n = batch.num_rows
+        lon, lat = decode_wkb_points(batch.column(geometry_column))
+
+        if index_column:
+            ids = batch.column(index_column).to_numpy(zero_copy_only=False)
+        else:
+            ids = index_range.get('start', 0) + index_range.get('step', 1) * np.arange(row_offset, row_offset + n)
+
+        states = batch.column(state_column).to_numpy(zero_copy_only=False)
+        if state_column == 'state_fips':
+            states = pd.Series(states).map(state_fips_to_code).to_numpy()
+
+        row_offset += n
+        arrays = {
+            'reference_point_id': ids,
+            'county_fips': batch.column('county_fips').to_numpy(zero_copy_only=False),
+            'state_code': states,
+            'lon': lon,
+            'lat': lat
+        }
+        for column in region_columns:
+            arrays[column] = batch.column(column).to_numpy(zero_copy_only=False)
+        if level_column:
+            in_level = batch.column(level_column).to_numpy(zero_copy_only=False) >= spacing
+            arrays = {name: values[in_level] for name, values in arrays.items()}
+        yield arrays
+
+class StreamingImputer:
+    """Builds imputation structures batch by batch with bounded memory."""
+
+    def __init__(self,
+                 gauge_stations,
+                 gauge_finder: Optional[NearestGaugeFinder] = None,
+                 weight_calculator: Optional[WeightCalculator] = None,
+                 k: int = 3):
+        """
+        Initialize the streaming imputer.
+
+        Args:
+            gauge_stations: GeoDataFrame of all gauge stations
+            gauge_finder: Gauge finder providing the region and tide station configs
+            weight_calculator: Weight calculator (defaults to 100km IDW)
+            k: Maximum number of stations per reference point and subregion
+        """
+        self.gauge_finder = gauge_finder or NearestGaugeFinder()
+        self.weight_calculator = weight_calculator or WeightCalculator()
+        self.k = k
+
+        # Prebuilt station index shared by every batch
+        self.index = GeodesicGaugeIndex(gauge_stations, self.gauge_finder.region_stations)
+        self.station_lon, self.station_lat = geographic_coordinates(gauge_stations)
+
+    def _region_mask(self, region: str, lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+        """Mask of coordinates within a region's bounds."""
+        return bounds_mask(lon, lat, self.gauge_finder.region_config['regions'][region]['bounds'])
+
+    def process_batch(self, batch: Dict[str, np.ndarray], region: str) -> Optional[pa.Table]:
+        """
+        Build the imputation structure rows for one batch and region.
+
+        Args:
+            batch: Batch from iter_reference_point_batches()
+            region: Region identifier
+
+        Returns:
+            Arrow table with STREAMING_COLUMNS, or None if no point maps to the region
+        """
+        region_def = self.gauge_finder.region_config['regions'][region]
+        if REGION_COLUMN in batch:
+            point_mask = batch[REGION_COLUMN] == region
+        else:
+            point_mask = np.isin(batch['state_code'], region_def['state_codes'])
+            point_mask &= self._region_mask(region, batch['lon'], batch['lat'])
+        if not point_mask.any():
+            return None
+
+        lon, lat = batch['lon'][point_mask], batch['lat'][point_mask]
+        ids = batch['reference_point_id'][point_mask]
+        county_fips = batch['county_fips'][point_mask]
+
+        # Region stations within the region bounds, as in NearestGaugeFinder
+        station_mask = self.index.station_mask(region) & self._region_mask(region, self.station_lon, self.station_lat)
+
+        parts = []
+        for sub_region in pd.unique(self.index.station_subregions[station_mask]):
+            mask = station_mask & (self.index.station_subregions == sub_region)
+            distances, positions = self.index.query(lon, lat, k=self.k, mask=mask)
+            weights = self.weight_calculator.compute_weights(distances)
+
+            keep = ~np.isnan(weights)
+            rows = np.nonzero(keep)[0]
+            stations = positions[keep]
+            parts.append({
+                'reference_point_id': ids[rows],
+                'county_fips': county_fips[rows],
+                'station_id': self.index.station_ids[stations],
+                'station_name': self.index.station_names[stations],
+                'sub_region': self.index.station_subregions[stations],
+                'distance_meters': distances[keep],
+                'weight': weights[keep]
+            })
+
+        if not parts:
+            return None
+
+        columns = {name: np.concatenate([p[name] for p in parts]) for name in parts[0]}
+        columns['region_name'] = np.full(len(columns['weight']), region_def['name'], dtype=object)
+        return pa.Table.from_pydict({name: columns[name] for name in STREAMING_COLUMNS})
+
+    def run(self,
+            points_file: Union[str, Path],
+            output_dir: Union[str, Path],
+            regions: Optional[list] = None,
+            batch_size: int = 250000,
+            spacing: Optional[float] = POINT_SPACING) -> Dict[str, Path]:
+        """
+        Stream reference points through the imputation and write a partitioned dataset.
+
+        Args:
+            points_file: Reference point GeoParquet file
+            output_dir: Dataset directory (one region=<region> partition per region)
+            regions: Regions to process (defaults to all configured regions)
+            batch_size: Number of reference points per batch
+            spacing: Reference point pyramid level in meters (None for every point)
+
+        Returns:
+            Dictionary mapping region names to the written partition files
+        """
+        output_dir = Path(output_dir)
+        regions = regions or list(self.gauge_finder.region_config['regions'])
+        bboxes = [region_bbox(self.gauge_finder.region_config['regions'][r]['bounds']) for r in regions]
+
+        writers = {}
+        paths = {}
+        rows_written = {region: 0 for region in regions}
+        try:
+            with tqdm(desc="Imputing reference points", unit="pts") as progress:
+                for batch in iter_reference_point_batches(points_file, batch_size=batch_size,
+                                                          bboxes=bboxes, spacing=spacing):
+                    for region in regions:
+                        table = self.process_batch(batch, region)
+                        if table is None:
+                            continue
+                        if region not in writers:
+                            partition_dir = output_dir / f"region={region}"
+                            partition_dir.mkdir(parents=True, exist_ok=True)
+                            paths[region] = partition_dir / "part-0.parquet"
+                            writers[region] = pq.ParquetWriter(paths[region], table.schema)
+                        # Batches with different inferred string types are unified to the file schema
+                        writers[region].write_table(table.cast(writers[region].schema))
+                        rows_written[region] += table.num_rows
+                    progress.update(len(batch['reference_point_id']))
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        for region, path in paths.items():
+            logger.info(f"Wrote {rows_written[region]} mappings for region {region} to {path}")
+        return paths
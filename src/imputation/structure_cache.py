@@ -0,0 +1,232 @@
+"""
+Content-addressed cache of imputation structures.
+
+Each region's imputation structure is keyed by a hash of everything it is
+computed from:
+- The region's reference points (ids, counties and coordinates)
+- The gauge stations and the region's tide station configuration
+- The region definition from the region configuration
+- The imputation parameters (weight method, neighbor mode, distances)
+- STRUCTURE_VERSION, bumped whenever the imputation code changes its output
+
+Structures are written as `imputation_structure_<region>_<key>.parquet`. A
+per-region pointer file (`imputation_structure_<region>_latest.json`) records
+the current key and its artifacts, so consumers do not need to glob and sort
+timestamps. Superseded artifacts beyond the configured number of versions are
+pruned when a new structure is committed.
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import logging
+
+from src.config import IMPUTATION_DIR, IMPUTATION_DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bump when a code change alters imputation output for identical inputs
+STRUCTURE_VERSION = 1
+
+# Number of hex digits of the key used in file names
+KEY_LENGTH = 16
+
+def _update_with_array(digest, values: np.ndarray) -> None:
+    """Feed an array into a hash, hashing object arrays element-wise."""
+    values = np.asarray(values)
+    if values.dtype == object or values.dtype.kind in 'US':
+        values = pd.util.hash_array(values.astype(str).astype(object), categorize=False)
+    digest.update(str(values.dtype).encode())
+    digest.update(np.ascontiguousarray(values).tobytes())
+
+def file_digest(path: Union[str, Path]) -> str:
+    """
+    Get the SHA-256 digest of a file's contents.
+
+    Args:
+        path: File to hash (a missing file hashes as empty)
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    path = Path(path)
+    if path.exists():
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+def structure_key(points: Dict[str, np.ndarray],
+                  gauge_stations: pd.DataFrame,
+                  region_info: dict,
+                  station_file: Union[str, Path],
+                  params: dict) -> str:
+    """
+    Compute the cache key of a region's imputation structure.
+
+    Args:
+        points: Region reference point arrays (see partition_reference_points)
+        gauge_stations: Gauge stations GeoDataFrame
+        region_info: Region definition from the region configuration
+        station_file: Tide station YAML for the region
+        params: Imputation parameters
+
+    Returns:
+        Hex SHA-256 key
+    """
+    digest = hashlib.sha256()
+    digest.update(f"structure-v{STRUCTURE_VERSION}".encode())
+
+    for name in sorted(points):
+        digest.update(name.encode())
+        _update_with_array(digest, points[name])
+
+    _update_with_array(digest, gauge_stations['station_id'].to_numpy())
+    _update_with_array(digest, gauge_stations.geometry.x.to_numpy())
+    _update_with_array(digest, gauge_stations.geometry.y.to_numpy())
+
+    digest.update(json.dumps(region_info, sort_keys=True, default=str).encode())
+    digest.update(file_digest(station_file).encode())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+class ImputationStructureCache:
+    """Stores imputation structures by content key with a latest pointer per region."""
+
+    def __init__(self, directory: Union[str, Path], max_versions: int = 2):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding imputation structure files
+            max_versions: Number of structures kept per region, including the latest
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_versions = max(1, max_versions)
+
+    def structure_path(self, region: str, key: str) -> Path:
+        """Get the parquet path of a structure."""
+        return self.directory / f"imputation_structure_{region}_{key[:KEY_LENGTH]}.parquet"
+
+    def pointer_path(self, region: str) -> Path:
+        """Get the path of a region's latest pointer."""
+        return self.directory / f"imputation_structure_{region}_latest.json"
+
+    def _read_pointer(self, region: str) -> dict:
+        """Read a region's pointer, returning an empty pointer if missing or invalid."""
+        path = self.pointer_path(region)
+        if not path.exists():
+            return {'history': []}
+        try:
+            with open(path) as f:
+                pointer = json.load(f)
+            pointer.setdefault('history', [])
+            return pointer
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable pointer {path}: {str(e)}")
+            return {'history': []}
+
+    def lookup(self, region: str, key: str) -> Optional[Path]:
+        """
+        Find a cached structure for a key.
+
+        Args:
+            region: Region identifier
+            key: Structure key
+
+        Returns:
+            Path to the parquet structure, or None on a cache miss
+        """
+        pointer = self._read_pointer(region)
+        for entry in [pointer] + pointer['history']:
+            if entry.get('key') == key:
+                path = self.directory / entry['file']
+                if path.exists() and all((self.directory / a).exists() for a in entry.get('artifacts', [])):
+                    if entry is not pointer:
+                        # Reusing an older version makes it the latest again
+                        self.commit(region, key, [self.directory / a for a in entry['artifacts']])
+                    return path
+        return None
+
+    def latest(self, region: str) -> Optional[Path]:
+        """Get the latest structure for a region, if any."""
+        pointer = self._read_pointer(region)
+        if 'file' in pointer and (self.directory / pointer['file']).exists():
+            return self.directory / pointer['file']
+        return None
+
+    def commit(self, region: str, key: str, artifacts: List[Path]) -> None:
+        """
+        Point a region's latest structure at a key and prune superseded versions.
+
+        Args:
+            region: Region identifier
+            key: Structure key
+            artifacts: Files belonging to the structure, parquet first
+        """
+        pointer = self._read_pointer(region)
+        history = [e for e in [pointer] + pointer['history'] if e.get('key') and e['key'] != key]
+
+        entry = {
+            'key': key,
+            'file': Path(artifacts[0]).name,
+            'artifacts': [Path(a).name for a in artifacts],
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'structure_version': STRUCTURE_VERSION
+        }
+
+        keep = history[:self.max_versions - 1]
+        current = set(entry['artifacts']) | {a for e in keep for a in e.get('artifacts', [])}
+        for superseded in history[self.max_versions - 1:]:
+            for name in superseded.get('artifacts', []):
+                if name not in current:
+                    (self.directory / name).unlink(missing_ok=True)
+                    logger.info(f"Pruned superseded imputation artifact {name}")
+
+        entry['history'] = [{k: e[k] for k in ('key', 'file', 'artifacts', 'created') if k in e} for e in keep]
+
+        # Write atomically so readers never see a partial pointer
+        path = self.pointer_path(region)
+        tmp_path = path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, path)
+
+def latest_structure_file(region: str,
+                          directory: Optional[Union[str, Path]] = None) -> Optional[Path]:
+    """
+    Resolve the latest imputation structure for a region.
+
+    Uses the region's latest pointer, falling back to the most recently written
+    timestamped structure from runs before the cache existed.
+
+    Args:
+        region: Region identifier
+        directory: Directory to search (defaults to the imputation output and data directories)
+
+    Returns:
+        Path to the parquet structure, or None if there is none
+    """
+    directories = [Path(directory)] if directory else [IMPUTATION_DIR, IMPUTATION_DATA_DIR]
+    for base in directories:
+        if not base.exists():
+            continue
+        latest = ImputationStructureCache(base).latest(region)
+        if latest is not None:
+            return latest
+
+    for base in directories:
+        if not base.exists():
+            continue
+        # Legacy files: imputation_structure_<region>_<YYYYmmdd_HHMMSS>.parquet
+        legacy = sorted(base.glob(f"imputation_structure_{region}_2*_*.parquet"))
+        if legacy:
+            return legacy[-1]
+    return None
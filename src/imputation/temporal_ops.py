@@ -6,158 +6,280 @@ This module is responsible for:
 1. Loading and processing gauge water level time series
 2. Handling missing data and different temporal resolutions
 3. Applying spatial weights to compute water levels at reference points
+
+Gauge series are binned onto a common time axis as a (time x gauge) float32
+matrix, memory-mapped to disk for long records. The imputation structure becomes
+one sparse (points x gauges) weight matrix, so water levels at every reference
+point are a sparse matrix product, evaluated in chunks along the time axis.
+Gauges with missing readings are dropped from a point's weighted average for
+that time step by renormalizing over the gauges that reported.
 """
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scipy import sparse
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 import logging
 from datetime import datetime, timedelta
+from tqdm import tqdm
+
+from src.noaa.core.water_levels import WaterLevelIngestor
 
 logger = logging.getLogger(__name__)
 
+# Gauge matrices larger than this are memory-mapped to disk
+MEMMAP_THRESHOLD_BYTES = 512 * 1024 ** 2
+
+# Supported gauge data file extensions
+GAUGE_FILE_SUFFIXES = ('.csv', '.txt', '.gz', '.parquet', '.json')
+
 class WaterLevelProcessor:
     """Processes and imputes water level data from gauge stations to reference points."""
-    
+
     def __init__(self,
                  imputation_structure_file: Path,
-                 output_dir: Path):
+                 output_dir: Path,
+                 memmap_threshold_bytes: int = MEMMAP_THRESHOLD_BYTES):
         """
         Initialize water level processor.
-        
+
         Args:
             imputation_structure_file: Path to imputation structure from spatial phase
             output_dir: Directory for output files
+            memmap_threshold_bytes: Gauge matrices above this size are memory-mapped
         """
         self.imputation_structure_file = imputation_structure_file
-        self.output_dir = output_dir
-        
+        self.output_dir = Path(output_dir)
+        self.memmap_threshold_bytes = memmap_threshold_bytes
+
         # Load imputation structure
         self.imputation_df = pd.read_parquet(imputation_structure_file)
-        
+
         # Create output directory
         self.output_dir.mkdir(parents=True, exist_ok=True)
-    
+
+        self._build_weight_matrix()
+
+    def _build_weight_matrix(self):
+        """Build the sparse (points x gauges) weight matrix from the imputation structure."""
+        df = self.imputation_df
+        point_idx, self.point_ids = pd.factorize(df['reference_point_id'])
+        gauge_idx, gauge_ids = pd.factorize(df['station_id'].astype(str))
+        self.gauge_ids = np.asarray(gauge_ids)
+
+        # County of each point (first occurrence)
+        first = np.unique(point_idx, return_index=True)[1]
+        self.point_county_fips = df['county_fips'].to_numpy()[first]
+
+        self.weights = sparse.csr_matrix(
+            (df['weight'].to_numpy(dtype=np.float32), (point_idx, gauge_idx)),
+            shape=(len(self.point_ids), len(self.gauge_ids))
+        )
+        logger.info(f"Weight matrix: {self.weights.shape[0]} points x {self.weights.shape[1]} gauges, "
+                    f"{self.weights.nnz} links")
+
+    def _gauge_files(self, gauge_data_dir: Path) -> Dict[str, List[Path]]:
+        """Find the data files of each gauge in the imputation structure."""
+        wanted = set(self.gauge_ids)
+        files = {}
+        for path in sorted(Path(gauge_data_dir).iterdir()):
+            if path.suffix.lower() not in GAUGE_FILE_SUFFIXES:
+                continue
+            station_id = path.name.split('.')[0].split('_')[0]
+            if station_id in wanted:
+                files.setdefault(station_id, []).append(path)
+        return files
+
+    def _allocate(self, name: str, shape: Tuple[int, int], dtype, fill) -> np.ndarray:
+        """Allocate an in-memory or memory-mapped matrix."""
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if nbytes > self.memmap_threshold_bytes:
+            path = self.output_dir / f"{name}.npy"
+            logger.info(f"Memory-mapping {nbytes / 1024**2:,.0f} MB {name} matrix to {path}")
+            matrix = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+            matrix[:] = fill
+            return matrix
+        return np.full(shape, fill, dtype=dtype)
+
+    def load_gauge_matrix(self,
+                          gauge_data_dir: Path,
+                          start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None,
+                          resample_freq: str = '1h') -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """
+        Load gauge water levels into a (time x gauge) float32 matrix.
+
+        Readings are averaged within each resample_freq bin. Gauge files are found
+        by station ID prefix (e.g. 8534720.csv, 8534720_2020.parquet) and read in
+        chunks; columns follow the gauge order of the weight matrix.
+
+        Args:
+            gauge_data_dir: Directory containing gauge data files
+            start_date: Optional start date for filtering
+            end_date: Optional end date for filtering
+            resample_freq: Frequency to resample data to (e.g. '1h' for hourly)
+
+        Returns:
+            Tuple of (time index, matrix) with NaN where a gauge has no reading
+        """
+        ingestor = WaterLevelIngestor()
+        files = self._gauge_files(gauge_data_dir)
+        missing = [g for g in self.gauge_ids if g not in files]
+        if missing:
+            logger.warning(f"No water level data for {len(missing)} gauges: {', '.join(missing[:10])}")
+
+        gauge_pos = {g: i for i, g in enumerate(self.gauge_ids)}
+        freq = pd.tseries.frequencies.to_offset(resample_freq)
+
+        # First pass for the record length when no period is given
+        if start_date is None or end_date is None:
+            times = [
+                (chunk['time'].min(), chunk['time'].max())
+                for paths in files.values() for path in paths
+                for chunk in ingestor.iter_chunks(path, path.name.split('.')[0].split('_')[0])
+                if chunk['time'].notna().any()
+            ]
+            if not times:
+                raise ValueError(f"No water level data found in {gauge_data_dir}")
+            start_date = start_date or min(t[0] for t in times)
+            end_date = end_date or max(t[1] for t in times)
+
+        time_index = pd.date_range(pd.Timestamp(start_date).floor(freq), pd.Timestamp(end_date), freq=freq)
+        shape = (len(time_index), len(self.gauge_ids))
+        t0 = time_index[0].value
+        step = pd.Timedelta(freq).value
+
+        sums = self._allocate('gauge_levels', shape, np.float32, 0.0)
+        counts = self._allocate('gauge_counts', shape, np.uint32, 0)
+
+        for station_id, paths in tqdm(files.items(), desc="Loading gauge data"):
+            col = gauge_pos[station_id]
+            for path in paths:
+                for chunk in ingestor.iter_chunks(path, station_id):
+                    chunk = chunk[chunk['value'].notna() & chunk['time'].notna()]
+                    rows = (chunk['time'].to_numpy('datetime64[ns]').astype(np.int64) - t0) // step
+                    keep = (rows >= 0) & (rows < shape[0])
+                    rows = rows[keep]
+                    values = chunk['value'].to_numpy(dtype=np.float64)[keep]
+                    sums[:, col] += np.bincount(rows, weights=values, minlength=shape[0]).astype(np.float32)
+                    counts[:, col] += np.bincount(rows, minlength=shape[0]).astype(np.uint32)
+
+        # Bin means, in time chunks to keep memory-mapped matrices out of core
+        for start in range(0, shape[0], 100000):
+            block = slice(start, start + 100000)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                sums[block] = np.where(counts[block] > 0, sums[block] / counts[block], np.nan)
+
+        logger.info(f"Loaded {len(files)} gauges over {len(time_index)} time steps "
+                    f"({time_index[0]} to {time_index[-1]})")
+        return time_index, sums
+
     def load_gauge_data(self,
                        gauge_data_dir: Path,
                        start_date: Optional[datetime] = None,
                        end_date: Optional[datetime] = None,
-                       resample_freq: str = '1H') -> pd.DataFrame:
+                       resample_freq: str = '1h') -> pd.DataFrame:
         """
         Load and preprocess gauge water level data.
-        
+
         Args:
             gauge_data_dir: Directory containing gauge data files
             start_date: Optional start date for filtering
             end_date: Optional end date for filtering
-            resample_freq: Frequency to resample data to (e.g. '1H' for hourly)
-            
+            resample_freq: Frequency to resample data to (e.g. '1h' for hourly)
+
         Returns:
             DataFrame with gauge water levels indexed by time
         """
-        # Implementation will depend on gauge data format
-        raise NotImplementedError
-    
-    def _validate_gauge_coverage(self,
-                               point_data: pd.Series,
-                               available_gauges: set) -> bool:
-        """
-        Validate that both required gauges are available for a point.
-        
-        Args:
-            point_data: Series containing point data
-            available_gauges: Set of available gauge IDs
-            
-        Returns:
-            True if both gauges are available, False otherwise
-        """
-        return (point_data['gauge_id_1'] in available_gauges and 
-                point_data['gauge_id_2'] in available_gauges)
-    
-    def _impute_point_water_level(self,
-                                point_data: pd.Series,
-                                gauge_levels: pd.DataFrame,
-                                time_index: pd.DatetimeIndex) -> pd.Series:
+        time_index, matrix = self.load_gauge_matrix(gauge_data_dir, start_date, end_date, resample_freq)
+        return pd.DataFrame(np.asarray(matrix), index=time_index, columns=self.gauge_ids)
+
+    def impute_chunk(self, gauge_levels: np.ndarray) -> np.ndarray:
         """
-        Impute water levels for a single point using weighted gauge data.
-        
+        Impute water levels at all reference points for a block of time steps.
+
+        Each point's value is the weighted mean of its gauges that have a reading,
+        with weights renormalized over those gauges; points without any reporting
+        gauge are NaN.
+
         Args:
-            point_data: Series containing point data and weights
-            gauge_levels: DataFrame of gauge water levels
-            time_index: Time index for output series
-            
+            gauge_levels: (time x gauge) water levels with NaN for missing readings
+
         Returns:
-            Series of imputed water levels
+            (time x point) float32 water levels
         """
-        # Get gauge IDs and weights
-        gauge1 = point_data['gauge_id_1']
-        gauge2 = point_data['gauge_id_2']
-        weight1 = point_data['weight_1']
-        weight2 = point_data['weight_2']
-        
-        # Calculate weighted average
-        water_levels = (
-            gauge_levels[gauge1] * weight1 +
-            gauge_levels[gauge2] * weight2
-        )
-        
-        return water_levels
-    
+        valid = ~np.isnan(gauge_levels)
+        filled = np.where(valid, gauge_levels, 0.0).astype(np.float32)
+
+        weighted = np.asarray(self.weights @ filled.T).T
+        coverage = np.asarray(self.weights @ valid.T.astype(np.float32)).T
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(coverage > 0, weighted / coverage, np.nan).astype(np.float32)
+
     def process_water_levels(self,
                            gauge_data_dir: Path,
                            output_file: Path,
                            start_date: Optional[datetime] = None,
                            end_date: Optional[datetime] = None,
-                           resample_freq: str = '1H') -> Path:
+                           resample_freq: str = '1h',
+                           time_chunk: int = 24 * 30) -> Path:
         """
         Process and impute water levels for all reference points.
-        
+
+        Results are written as a long-format columnar dataset with one row per
+        reference point and time step (time, reference_point_id, county_fips,
+        water_level), one parquet row group per time chunk. Point/time pairs
+        without any reporting gauge are omitted.
+
         Args:
             gauge_data_dir: Directory containing gauge data files
             output_file: Path to save results
             start_date: Optional start date for filtering
             end_date: Optional end date for filtering
             resample_freq: Frequency to resample data to
-            
+            time_chunk: Number of time steps imputed per chunk
+
         Returns:
             Path to output file
         """
         logger.info("Loading gauge data...")
-        gauge_levels = self.load_gauge_data(
+        time_index, gauge_levels = self.load_gauge_matrix(
             gauge_data_dir,
             start_date,
             end_date,
             resample_freq
         )
-        
-        available_gauges = set(gauge_levels.columns)
-        time_index = gauge_levels.index
-        
+
         logger.info("Imputing water levels for reference points...")
-        results = []
-        
-        for idx, point in self.imputation_df.iterrows():
-            if self._validate_gauge_coverage(point, available_gauges):
-                water_levels = self._impute_point_water_level(
-                    point,
-                    gauge_levels,
-                    time_index
-                )
-                
-                results.append({
-                    'county_fips': point['county_fips'],
-                    'county_name': point['county_name'],
-                    'state_fips': point['state_fips'],
-                    'geometry': point['geometry'],
-                    'water_levels': water_levels
-                })
-        
-        # Convert results to DataFrame
-        result_df = pd.DataFrame(results)
-        
-        # Save results
-        result_df.to_parquet(output_file)
-        logger.info(f"Saved results to {output_file}")
-        
-        return output_file 
\ No newline at end of file
+        n_points = len(self.point_ids)
+        point_ids = np.asarray(self.point_ids)
+        schema = pa.schema([
+            ('time', pa.timestamp('ns')),
+            ('reference_point_id', pa.from_numpy_dtype(point_ids.dtype) if point_ids.dtype != object else pa.string()),
+            ('county_fips', pa.string()),
+            ('water_level', pa.float32())
+        ])
+
+        rows_written = 0
+        with pq.ParquetWriter(output_file, schema) as writer:
+            for start in tqdm(range(0, len(time_index), time_chunk), desc="Imputing water levels"):
+                block = slice(start, start + time_chunk)
+                levels = self.impute_chunk(np.asarray(gauge_levels[block]))
+
+                t_pos, p_pos = np.nonzero(~np.isnan(levels))
+                table = pa.table({
+                    'time': time_index[block].to_numpy()[t_pos],
+                    'reference_point_id': point_ids[p_pos],
+                    'county_fips': self.point_county_fips[p_pos].astype(str),
+                    'water_level': levels[t_pos, p_pos]
+                }, schema=schema)
+                writer.write_table(table)
+                rows_written += table.num_rows
+
+        logger.info(f"Saved {rows_written:,} imputed values for {n_points} points to {output_file}")
+
+        return output_file
@@ -17,7 +17,8 @@ It is needed because:
    - Allows selecting optimal method for different scenarios
 
 3. Robust Imputation:
-   - Handles missing data by redistributing weights
+   - Weights are static; missing station-years are handled downstream by
+     renormalizing them per year (src/assignment/common/reweighting.py)
    - Close stations get higher weights than distant ones
    - Prevents any single station from dominating
 
@@ -28,13 +29,18 @@ The module is critical for:
 """
 
 import numpy as np
-from typing import List, Dict, Literal
+import pandas as pd
+from scipy import sparse
+from typing import List, Dict, Literal, Optional, Union
 import logging
-from tqdm import tqdm
 
 logger = logging.getLogger(__name__)
 
 WeightMethod = Literal['idw', 'gaussian', 'linear', 'hybrid']
+WEIGHT_METHODS = ('idw', 'gaussian', 'linear', 'hybrid')
+
+# Distance floor for inverse distance kernels
+MIN_DISTANCE_METERS = 1e-6
 
 class WeightCalculator:
     """Calculate weights for tide gauge stations."""
@@ -42,7 +48,9 @@ class WeightCalculator:
     def __init__(self, 
                  max_distance_meters: float = 100000,  # 100km max distance
                  power: float = 2,  # inverse distance power
-                 min_weight: float = 0.1):
+                 min_weight: float = 0.1,
+                 method: WeightMethod = 'idw',
+                 bandwidth_meters: Optional[float] = None):
         """
         Initialize weight calculator.
         
@@ -50,57 +58,166 @@ class WeightCalculator:
             max_distance_meters: Maximum distance to consider for weights
             power: Power parameter for inverse distance weighting
             min_weight: Minimum weight to assign
+            method: Distance decay kernel ('idw', 'gaussian', 'linear' or 'hybrid')
+            bandwidth_meters: Gaussian bandwidth (defaults to a third of max_distance_meters)
         """
+        if method not in WEIGHT_METHODS:
+            raise ValueError(f"Unknown weight method: {method}. Choose from {', '.join(WEIGHT_METHODS)}")
+            
         self.max_distance = max_distance_meters
         self.power = power
         self.min_weight = min_weight
+        self.method = method
+        self.bandwidth = bandwidth_meters or max_distance_meters / 3
         
         logger.info(f"Initialized WeightCalculator")
+        logger.info(f"Weight method: {self.method}")
         logger.info(f"Max distance: {self.max_distance/1000:.1f}km")
         logger.info(f"IDW power: {self.power}")
         
-    def _calculate_single_mapping_weights(self, mapping: Dict) -> Dict:
+    def _kernel(self, distances: np.ndarray) -> np.ndarray:
         """
-        Calculate weights for a single reference point mapping.
+        Evaluate the distance decay kernel.
+        
+        Args:
+            distances: Array of distances in meters
+            
+        Returns:
+            Array of unnormalized weights
+        """
+        if self.method == 'gaussian':
+            return np.exp(-0.5 * (distances / self.bandwidth) ** 2)
+        if self.method == 'linear':
+            return np.clip(1 - distances / self.max_distance, 0, None)
+            
+        # Guard against stations located exactly at the reference point
+        inverse = 1 / (np.maximum(distances, MIN_DISTANCE_METERS) ** self.power)
+        if self.method == 'idw':
+            return inverse
+        # hybrid: inverse distance near the point with a Gaussian taper at range
+        return inverse * np.exp(-0.5 * (distances / self.bandwidth) ** 2)
+        
+    def compute_weights(self, distances: np.ndarray) -> np.ndarray:
+        """
+        Calculate weights for all reference points at once.
+        
+        Each row holds the distances from one reference point to its candidate
+        stations; NaN marks padding for rows with fewer stations. Stations beyond
+        the maximum distance are masked out unless no station in the row is
+        within range, in which case all of the row's stations are used.
         
         Args:
-            mapping: Dictionary containing reference point to gauge mappings
+            distances: (N x k) array of distances in meters
             
         Returns:
-            Updated mapping dictionary with calculated weights
+            (N x k) array of weights summing to 1 per row, NaN where masked out
         """
-        distances = np.array([m['distance_meters'] for m in mapping['mappings']])
+        distances = np.atleast_2d(np.asarray(distances, dtype=np.float64))
+        present = ~np.isnan(distances)
         
-        # Filter by max distance
-        valid_mask = distances <= self.max_distance
-        if not any(valid_mask):
-            # If no stations within max distance, use all stations
-            valid_mask = np.ones_like(distances, dtype=bool)
+        # Filter by max distance, falling back to all stations when none are in range
+        valid = present & (distances <= self.max_distance)
+        valid |= present & ~valid.any(axis=1, keepdims=True)
+        
+        raw = np.where(valid, self._kernel(np.where(valid, distances, 1.0)), 0.0)
+        
+        # Rows where the kernel vanishes everywhere (e.g. linear decay beyond range) get equal weights
+        totals = raw.sum(axis=1, keepdims=True)
+        raw = np.where(totals > 0, raw, valid.astype(np.float64))
+        
+        with np.errstate(invalid='ignore'):
+            # Normalize weights to sum to 1 (rows without any station stay NaN)
+            weights = raw / raw.sum(axis=1, keepdims=True)
             
-        valid_distances = distances[valid_mask]
+            # Apply minimum weight threshold
+            weights = np.where(valid, np.maximum(weights, self.min_weight), 0.0)
+            weights = weights / weights.sum(axis=1, keepdims=True)  # Renormalize
+        
+        return np.where(valid, weights, np.nan)
+    
+    def compute_sparse_weights(self, distances: sparse.csr_matrix) -> sparse.csr_matrix:
+        """
+        Calculate weights for a sparse (reference points x stations) distance matrix.
         
-        # Calculate inverse distance weights
-        weights = 1 / (valid_distances ** self.power)
+        The maximum distance is expected to have been applied by the neighbor query,
+        so every stored entry is a candidate station. Weights are normalized per row
+        with the same floor and renormalization as compute_weights().
+        
+        Args:
+            distances: CSR matrix of distances in meters
+            
+        Returns:
+            CSR matrix of weights with the same sparsity structure
+        """
+        distances = distances.tocsr()
+        counts = np.diff(distances.indptr)
+        rows = np.repeat(np.arange(distances.shape[0]), counts)
+        n_rows = distances.shape[0]
         
-        # Normalize weights to sum to 1
-        weights = weights / np.sum(weights)
+        raw = self._kernel(distances.data.astype(np.float64))
         
-        # Apply minimum weight threshold
+        # Rows where the kernel vanishes everywhere get equal weights
+        totals = np.bincount(rows, weights=raw, minlength=n_rows)
+        raw = np.where(totals[rows] > 0, raw, 1.0)
+        
+        # Normalize, apply minimum weight threshold and renormalize
+        weights = raw / np.bincount(rows, weights=raw, minlength=n_rows)[rows]
         weights = np.maximum(weights, self.min_weight)
-        weights = weights / np.sum(weights)  # Renormalize
+        weights = weights / np.bincount(rows, weights=weights, minlength=n_rows)[rows]
+        
+        return sparse.csr_matrix((weights, distances.indices.copy(), distances.indptr.copy()),
+                                 shape=distances.shape)
+    
+    @staticmethod
+    def _group_positions(mappings: pd.DataFrame) -> tuple:
+        """
+        Get (row, column) positions of each mapping in the padded distance array.
         
-        # Update mapping with weights
-        valid_mappings = [m for i, m in enumerate(mapping['mappings']) if valid_mask[i]]
-        for m, w in zip(valid_mappings, weights):
-            m['weight'] = float(w)
+        Args:
+            mappings: Point-to-gauge mappings with a 'rank' column
             
-        mapping['mappings'] = valid_mappings
-        return mapping
+        Returns:
+            Tuple of (row index array, rank array, number of rows, number of columns)
+        """
+        rank = mappings['rank'].to_numpy().astype(np.int64)
+        rows = np.cumsum(rank == 0) - 1
+        return rows, rank, int(rows[-1]) + 1, int(rank.max()) + 1
     
-    def calculate_weights(self, mappings: List[Dict]) -> List[Dict]:
+    def calculate_weights(self, mappings: Union[pd.DataFrame, List[Dict]]) -> Union[pd.DataFrame, List[Dict]]:
         """
         Calculate weights for all reference point mappings.
         
+        Args:
+            mappings: Mapping table from NearestGaugeFinder.find_nearest(), or a list
+                of nested mapping dictionaries
+            
+        Returns:
+            Mappings with a 'weight' for each station, with stations masked out by
+            the maximum distance removed
+        """
+        if isinstance(mappings, list):
+            return self._calculate_dict_weights(mappings)
+            
+        if mappings.empty:
+            return mappings.assign(weight=pd.Series(dtype=np.float64))
+            
+        logger.info(f"Processing {int((mappings['rank'] == 0).sum())} mappings")
+        
+        rows, rank, n_rows, n_cols = self._group_positions(mappings)
+        distances = np.full((n_rows, n_cols), np.nan)
+        distances[rows, rank] = mappings['distance_meters'].to_numpy(dtype=np.float64)
+        
+        weights = self.compute_weights(distances)[rows, rank]
+        keep = ~np.isnan(weights)
+        
+        result = mappings.assign(weight=weights)[keep].reset_index(drop=True)
+        logger.info(f"Completed weight calculation for {n_rows} mappings")
+        return result
+    
+    def _calculate_dict_weights(self, mappings: List[Dict]) -> List[Dict]:
+        """
+        Calculate weights for nested mapping dictionaries.
+        
         Args:
             mappings: List of mapping dictionaries
             
@@ -110,17 +227,18 @@ class WeightCalculator:
         if not mappings:
             return []
             
-        logger.info(f"Processing {len(mappings)} mappings")
-        
-        # Process all mappings sequentially with progress bar
-        weighted_mappings = []
-        for mapping in tqdm(mappings, desc="Calculating weights"):
-            try:
-                weighted_mapping = self._calculate_single_mapping_weights(mapping)
-                weighted_mappings.append(weighted_mapping)
-            except Exception as e:
-                logger.error(f"Error processing mapping: {str(e)}")
-                continue
-        
-        logger.info(f"Completed weight calculation for {len(weighted_mappings)} mappings")
-        return weighted_mappings 
\ No newline at end of file
+        n_cols = max(len(m['mappings']) for m in mappings)
+        distances = np.full((len(mappings), n_cols), np.nan)
+        for i, mapping in enumerate(mappings):
+            distances[i, :len(mapping['mappings'])] = [m['distance_meters'] for m in mapping['mappings']]
+            
+        weights = self.compute_weights(distances)
+        for mapping, row in zip(mappings, weights):
+            valid_mappings = []
+            for m, w in zip(mapping['mappings'], row):
+                if not np.isnan(w):
+                    m['weight'] = float(w)
+                    valid_mappings.append(m)
+            mapping['mappings'] = valid_mappings
+            
+        return mappings
@@ -1,17 +1,23 @@
 """
 NOAA Core Functionality.
 
-This module provides core functionality for interacting with NOAA APIs
-and managing data caching.
+This module provides core functionality for interacting with NOAA APIs,
+managing data caching, and deriving flood counts from raw water levels.
 """
 
 from .noaa_client import NOAAClient, NOAAApiError
 from .cache_manager import NOAACache
 from .rate_limiter import RateLimiter
+from .water_levels import WaterLevelIngestor
+from .daily_flood_store import DailyFloodStore
+from .standin_server import NOAAStandInServer
 
 __all__ = [
     'NOAAClient',
     'NOAAApiError',
     'NOAACache',
-    'RateLimiter'
+    'RateLimiter',
+    'WaterLevelIngestor',
+    'DailyFloodStore',
+    'NOAAStandInServer'
 ]
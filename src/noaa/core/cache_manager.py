@@ -120,6 +120,10 @@ class NOAACache:
                             'latitude': str(data.get('latitude')),
                             'longitude': str(data.get('longitude'))
                         })
+                    
+                    # Optional station-specific flood thresholds
+                    if 'thresholds' in data:
+                        station['thresholds'] = data['thresholds']
                         
                     stations.append(station)
             except Exception as e:
@@ -0,0 +1,299 @@
+"""
+Bit-packed store of daily flood states per station-year.
+
+Each station-year is kept as three 366-bit planes (flood, dry, missing) laid out on a
+fixed leap-year calendar, so a day always occupies the same bit position regardless
+of year. In non-leap years the February 29 slot is left empty in all planes.
+Counts over any set of days are computed for every station-year at once by masking
+the packed bytes and summing a popcount lookup table.
+
+Query results use the same station_id, year, flood_days, missing_days columns as the
+historical HTF datasets, so they can feed county assignment directly.
+"""
+
+from typing import Dict, Iterable, List, Optional
+from datetime import date
+import logging
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from .cache_manager import NOAACache
+
+logger = logging.getLogger(__name__)
+
+PLANES = ['flood', 'dry', 'missing']
+FLOOD, DRY, MISSING = range(len(PLANES))
+
+N_SLOTS = 366
+N_BYTES = (N_SLOTS + 7) // 8
+FEB29_SLOT = 59
+
+SEASONS = {
+    'winter': (12, 1, 2),
+    'spring': (3, 4, 5),
+    'summer': (6, 7, 8),
+    'fall': (9, 10, 11)
+}
+
+# Number of set bits for every byte value
+POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint16)
+
+# Month and day of every slot on the leap-year calendar
+_SLOT_DATES = pd.date_range('2000-01-01', '2000-12-31', freq='D')
+SLOT_MONTHS = _SLOT_DATES.month.to_numpy()
+
+def is_leap(years: np.ndarray) -> np.ndarray:
+    """Return a boolean array marking leap years."""
+    years = np.asarray(years)
+    return (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+
+def date_slots(dates: pd.Series) -> np.ndarray:
+    """Map dates to their slot on the leap-year calendar."""
+    dates = pd.to_datetime(dates)
+    day_of_year = dates.dt.dayofyear.to_numpy() - 1
+    # Shift days after February in non-leap years past the February 29 slot
+    return day_of_year + ((~is_leap(dates.dt.year.to_numpy())) & (dates.dt.month.to_numpy() > 2))
+
+def slot_mask(slots: np.ndarray) -> np.ndarray:
+    """Pack a boolean array of 366 slots into a 46-byte mask."""
+    return np.packbits(np.asarray(slots, dtype=bool), axis=-1, bitorder='little')
+
+class DailyFloodStore:
+    """Compact daily flood/dry/missing store alongside the NOAA cache."""
+
+    def __init__(self, cache: NOAACache):
+        """Initialize the store.
+
+        Args:
+            cache: NOAACache instance; packed files are stored under its cache directory
+        """
+        self.cache = cache
+        self.store_dir = Path(self.cache.cache_dir) / "daily"
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+        # station_id -> {'years': int32 array, 'bits': uint8 array (years, planes, bytes)}
+        self._stations: Dict[str, Dict[str, np.ndarray]] = {}
+
+    def _station_file(self, station_id: str) -> Path:
+        """Get the packed file path for a station."""
+        return self.store_dir / f"{station_id}.npz"
+
+    def add_daily(self, daily: pd.DataFrame):
+        """Add daily flood flags, replacing any stored years they cover.
+
+        Args:
+            daily: DataFrame with station_id, date, flooded and (optionally) valid columns.
+                Days that are absent or not valid are stored as missing.
+        """
+        if daily.empty:
+            return
+
+        df = pd.DataFrame({
+            'station_id': daily['station_id'].astype(str).to_numpy(),
+            'year': pd.to_datetime(daily['date']).dt.year.to_numpy(),
+            'slot': date_slots(daily['date']),
+            'valid': daily['valid'].to_numpy(dtype=bool) if 'valid' in daily.columns else True,
+            'flooded': daily['flooded'].to_numpy(dtype=bool)
+        })
+
+        for station_id, station_df in df.groupby('station_id', sort=False):
+            year_codes, years = pd.factorize(station_df['year'], sort=True)
+            slots = station_df['slot'].to_numpy()
+            valid = station_df['valid'].to_numpy()
+            flooded = station_df['flooded'].to_numpy() & valid
+
+            planes = np.zeros((len(years), len(PLANES), N_SLOTS), dtype=bool)
+            planes[year_codes[flooded], FLOOD, slots[flooded]] = True
+            planes[year_codes[valid & ~flooded], DRY, slots[valid & ~flooded]] = True
+
+            # Every calendar day without a valid observation is missing
+            calendar = np.ones((len(years), N_SLOTS), dtype=bool)
+            calendar[~is_leap(np.asarray(years)), FEB29_SLOT] = False
+            planes[:, MISSING, :] = calendar & ~planes[:, FLOOD, :] & ~planes[:, DRY, :]
+
+            self._merge(station_id, np.asarray(years, dtype=np.int32), slot_mask(planes))
+
+    def add_daily_summary(self, daily: pd.DataFrame, ingestor, level: str = 'minor'):
+        """Add a WaterLevelIngestor daily summary using the ingestor's station thresholds.
+
+        Args:
+            daily: Output of WaterLevelIngestor.daily_summary()
+            ingestor: WaterLevelIngestor providing the flood thresholds
+            level: Threshold level defining a flood day ('minor', 'moderate' or 'major')
+        """
+        if daily.empty:
+            return
+        station_ids = daily['station_id'].astype(str)
+        thresholds = {s: ingestor.get_thresholds(s)[level] for s in station_ids.unique()}
+        self.add_daily(daily.assign(flooded=daily['max_level'].to_numpy() >= station_ids.map(thresholds).to_numpy()))
+
+    def _merge(self, station_id: str, years: np.ndarray, bits: np.ndarray):
+        """Merge packed years into a station, new years replacing stored ones."""
+        existing = self._load_station(station_id)
+        if existing is not None:
+            keep = ~np.isin(existing['years'], years)
+            years = np.concatenate([existing['years'][keep], years])
+            bits = np.concatenate([existing['bits'][keep], bits])
+        order = np.argsort(years)
+        self._stations[station_id] = {'years': years[order], 'bits': bits[order]}
+
+    def _load_station(self, station_id: str) -> Optional[Dict[str, np.ndarray]]:
+        """Get a station's packed data from memory or disk."""
+        if station_id in self._stations:
+            return self._stations[station_id]
+
+        station_file = self._station_file(station_id)
+        if not station_file.exists():
+            return None
+        try:
+            with np.load(station_file) as data:
+                self._stations[station_id] = {'years': data['years'], 'bits': data['bits']}
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Error reading daily store file {station_file}: {e}")
+            return None
+        return self._stations[station_id]
+
+    def save(self, station_ids: Optional[Iterable[str]] = None):
+        """Write packed station data to disk.
+
+        Args:
+            station_ids: Stations to save. Defaults to all loaded stations.
+        """
+        for station_id in list(self._stations) if station_ids is None else station_ids:
+            data = self._stations[station_id]
+            np.savez_compressed(self._station_file(station_id), years=data['years'], bits=data['bits'])
+        logger.debug(f"Saved daily flood store to {self.store_dir}")
+
+    def get_stations(self) -> List[str]:
+        """List stations available in memory or on disk."""
+        on_disk = {f.stem for f in self.store_dir.glob("*.npz")}
+        return sorted(on_disk | set(self._stations))
+
+    def _stack(self, station_ids: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """Stack station-years into flat arrays for vectorized queries."""
+        station_ids = list(station_ids) if station_ids is not None else self.get_stations()
+        loaded = [(s, self._load_station(s)) for s in station_ids]
+        loaded = [(s, data) for s, data in loaded if data is not None and len(data['years'])]
+
+        if not loaded:
+            return {
+                'station_id': np.array([], dtype=str),
+                'year': np.array([], dtype=np.int32),
+                'bits': np.zeros((0, len(PLANES), N_BYTES), dtype=np.uint8)
+            }
+
+        return {
+            'station_id': np.concatenate([np.full(len(data['years']), s) for s, data in loaded]),
+            'year': np.concatenate([data['years'] for _, data in loaded]),
+            'bits': np.concatenate([data['bits'] for _, data in loaded])
+        }
+
+    @staticmethod
+    def _popcount(bits: np.ndarray, masks: np.ndarray) -> np.ndarray:
+        """Count set bits of each plane under a per-row (or shared) 46-byte mask."""
+        return POPCOUNT[bits & masks[..., None, :]].sum(axis=-1)
+
+    def _counts(self, stacked: Dict[str, np.ndarray], masks: np.ndarray) -> pd.DataFrame:
+        """Build the count frame for stacked station-years and masks."""
+        counts = self._popcount(stacked['bits'], masks)
+        return pd.DataFrame({
+            'station_id': stacked['station_id'],
+            'year': stacked['year'].astype(np.int64),
+            'flood_days': counts[:, FLOOD].astype(np.int64),
+            'dry_days': counts[:, DRY].astype(np.int64),
+            'missing_days': counts[:, MISSING].astype(np.int64)
+        })
+
+    def annual_counts(self, station_ids: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Count flood, dry and missing days per station-year."""
+        stacked = self._stack(station_ids)
+        return self._counts(stacked, slot_mask(np.ones(N_SLOTS, dtype=bool)))
+
+    def month_counts(self, months: Iterable[int], station_ids: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Count days per station-year within the given calendar months.
+
+        Args:
+            months: Months to include (1-12)
+            station_ids: Optional stations to query. Defaults to all stations.
+        """
+        stacked = self._stack(station_ids)
+        return self._counts(stacked, slot_mask(np.isin(SLOT_MONTHS, list(months))))
+
+    def season_counts(self, season: str, station_ids: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Count days per station-year within a season.
+
+        Seasons are taken within each calendar year, so winter combines January,
+        February and December of the same year.
+
+        Args:
+            season: One of 'winter', 'spring', 'summer' or 'fall'
+            station_ids: Optional stations to query. Defaults to all stations.
+        """
+        if season not in SEASONS:
+            raise ValueError(f"Invalid season: {season}. Available seasons: {', '.join(SEASONS)}")
+        return self.month_counts(SEASONS[season], station_ids)
+
+    def window_counts(self, start: date, end: date, station_ids: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Count days per station-year within an arbitrary date window.
+
+        Args:
+            start: First date of the window (inclusive)
+            end: Last date of the window (inclusive)
+            station_ids: Optional stations to query. Defaults to all stations.
+
+        Returns:
+            Counts for every stored station-year overlapping the window
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        stacked = self._stack(station_ids)
+        in_range = (stacked['year'] >= start.year) & (stacked['year'] <= end.year)
+        stacked = {key: values[in_range] for key, values in stacked.items()}
+
+        # One mask per year, selected for each row
+        years = np.arange(start.year, end.year + 1)
+        first = np.where(years == start.year, date_slots(pd.Series([start]))[0], 0)
+        last = np.where(years == end.year, date_slots(pd.Series([end]))[0], N_SLOTS - 1)
+        slots = np.arange(N_SLOTS)
+        masks = slot_mask((slots >= first[:, None]) & (slots <= last[:, None]))
+
+        return self._counts(stacked, masks[stacked['year'] - start.year])
+
+    def flood_runs(self, min_length: int = 1, station_ids: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Summarize runs of consecutive flood days per station-year.
+
+        Runs are measured within each calendar year.
+
+        Args:
+            min_length: Minimum run length (days) to count as an event
+            station_ids: Optional stations to query. Defaults to all stations.
+
+        Returns:
+            DataFrame with station_id, year, longest_run and run_count columns
+        """
+        stacked = self._stack(station_ids)
+        flood = np.unpackbits(stacked['bits'][:, FLOOD, :], axis=-1, count=N_SLOTS, bitorder='little').astype(bool)
+
+        # Drop the empty February 29 slot so runs continue from February 28 to March 1
+        leap = is_leap(stacked['year'])
+        longest = np.zeros(len(flood), dtype=np.int64)
+        run_count = np.zeros(len(flood), dtype=np.int64)
+        for rows, days in ((leap, flood[leap]), (~leap, np.delete(flood[~leap], FEB29_SLOT, axis=1))):
+            if not len(days):
+                continue
+            padded = np.pad(days.astype(np.int8), ((0, 0), (1, 1)))
+            edges = np.diff(padded, axis=1)
+            row_idx, starts = np.nonzero(edges == 1)
+            _, ends = np.nonzero(edges == -1)
+            lengths = ends - starts
+
+            row_numbers = np.flatnonzero(rows)[row_idx]
+            np.maximum.at(longest, row_numbers, lengths)
+            np.add.at(run_count, row_numbers, lengths >= min_length)
+
+        return pd.DataFrame({
+            'station_id': stacked['station_id'],
+            'year': stacked['year'].astype(np.int64),
+            'longest_run': longest,
+            'run_count': run_count
+        })
@@ -8,8 +8,10 @@ import logging
 from pathlib import Path
 import json
 from datetime import datetime, timedelta
+import pandas as pd
 
 from .rate_limiter import RateLimiter
+from .water_levels import WaterLevelIngestor
 
 logger = logging.getLogger(__name__)
 
@@ -182,45 +184,38 @@ class NOAAClient:
             logger.error(f"Failed to parse NOAA API response for station {station}: {str(e)}")
             raise NOAAApiError(f"Invalid response format: {str(e)}", response=response if 'response' in locals() else None)
 
-    def _process_water_level_data(self, data: List[Dict]) -> Dict:
+    def _process_water_level_data(
+        self,
+        data: List[Dict],
+        station_id: str = 'station',
+        thresholds: Optional[Dict[str, float]] = None,
+        interval_minutes: Optional[float] = None
+    ) -> Dict:
         """Process water level data to count flood events.
         
         Args:
-            data: List of water level measurements
+            data: List of water level measurements with 't' (time) and 'v' (value) fields
+            station_id: Station the measurements belong to
+            thresholds: Optional minor/moderate/major thresholds in the units and datum of the data
+            interval_minutes: Sampling interval of the data. If None, inferred from the timestamps.
             
         Returns:
-            Dict containing flood count statistics
+            Dict containing flood count statistics, with nanCount covering every
+            calendar day of the years spanned by the data
         """
-        # Count days where water level exceeds thresholds
-        minor_threshold = 0.5  # feet above MHHW
-        moderate_threshold = 0.8
-        major_threshold = 1.2
-        
-        flood_days = set()
-        moderate_flood_days = set()
-        major_flood_days = set()
-        
-        for record in data:
-            try:
-                water_level = float(record['v'])
-                date = record['t'].split()[0]  # Get just the date part
-                
-                if water_level >= major_threshold:
-                    major_flood_days.add(date)
-                    moderate_flood_days.add(date)
-                    flood_days.add(date)
-                elif water_level >= moderate_threshold:
-                    moderate_flood_days.add(date)
-                    flood_days.add(date)
-                elif water_level >= minor_threshold:
-                    flood_days.add(date)
-            except (ValueError, KeyError):
-                continue
+        if not data:
+            return {'minCount': 0, 'modCount': 0, 'majCount': 0, 'nanCount': 0}
+
+        ingestor = WaterLevelIngestor(
+            thresholds={station_id: thresholds} if thresholds else None,
+            interval_minutes=interval_minutes
+        )
+        daily = ingestor.daily_summary([pd.DataFrame.from_records(data).assign(station_id=station_id)])
+        annual = ingestor.annual_counts(daily)
         
         return {
-            'minCount': len(flood_days),
-            'modCount': len(moderate_flood_days),
-            'majCount': len(major_flood_days),
-            'nanCount': 0  # We'll need to calculate this based on expected vs actual data points
+            'minCount': int(annual['minCount'].sum()),
+            'modCount': int(annual['modCount'].sum()),
+            'majCount': int(annual['majCount'].sum()),
+            'nanCount': int(annual['nanCount'].sum())
         }
- 
\ No newline at end of file
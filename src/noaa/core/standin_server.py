@@ -0,0 +1,362 @@
+"""
+Offline stand-in for the NOAA HTF API.
+
+This module provides a local HTTP server that serves the annual and decadal HTF
+endpoints from recorded fixtures, so fetch-path performance can be measured without
+network access:
+- Replays htf_annual.json from per-station AnnualFloodCount files
+  (e.g. output/noaa/historical/*.json)
+- Replays htf_projection_decadal.json from per-station DecadalProjection files
+  (e.g. data/cache/projected/*.json)
+- Injects latency, server errors and 429 responses
+- Enforces a token-bucket rate limit with Retry-After
+- Optionally proxies unknown stations to the real API and records the responses
+
+Point NOAAClient, the fetchers or the CLIs at it with api_base_url.
+"""
+
+from typing import Dict, List, Optional
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+import requests
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+
+# Endpoint -> (response key, record period field, period step)
+ENDPOINTS = {
+    '/htf/htf_annual.json': ('AnnualFloodCount', 'year', 1),
+    '/htf/htf_projection_decadal.json': ('DecadalProjection', 'decade', 10)
+}
+
+DEFAULT_FIXTURE_DIRS = {
+    'AnnualFloodCount': PROJECT_ROOT / "output" / "noaa" / "historical",
+    'DecadalProjection': PROJECT_ROOT / "data" / "cache" / "projected"
+}
+
+class TokenBucket:
+    """Thread-safe token bucket used to enforce the stand-in rate limit."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens held
+        """
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token if available.
+
+        Returns:
+            0.0 if a token was taken, otherwise seconds until one is available
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return 0.0
+            return (1.0 - self.tokens) / self.rate
+
+class NOAAStandInServer:
+    """Local HTTP server mimicking the NOAA HTF API."""
+
+    def __init__(
+        self,
+        historical_dir: Optional[Path] = None,
+        projected_dir: Optional[Path] = None,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        rate_limit: Optional[float] = None,
+        burst: int = 1,
+        retry_after: int = 1,
+        upstream_url: Optional[str] = None,
+        record: bool = False,
+        seed: Optional[int] = None
+    ):
+        """Initialize the stand-in server.
+
+        Args:
+            historical_dir: Directory of {station}.json AnnualFloodCount fixtures
+            projected_dir: Directory of {station}.json DecadalProjection fixtures
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Seconds added to every response
+            latency_jitter: Maximum extra random seconds added to every response
+            error_rate: Fraction of requests answered with HTTP 500
+            throttle_rate: Fraction of requests answered with HTTP 429 regardless of the rate limit
+            rate_limit: Sustained requests per second allowed before answering 429. None disables it.
+            burst: Requests allowed in a burst when rate limiting
+            retry_after: Retry-After seconds sent with injected 429 responses
+            upstream_url: Real API base URL used for stations without fixtures
+            record: Whether to save upstream responses into the fixture directories
+            seed: Random seed for reproducible fault injection
+        """
+        self.fixture_dirs = {
+            'AnnualFloodCount': Path(historical_dir or DEFAULT_FIXTURE_DIRS['AnnualFloodCount']),
+            'DecadalProjection': Path(projected_dir or DEFAULT_FIXTURE_DIRS['DecadalProjection'])
+        }
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.bucket = TokenBucket(rate_limit, burst) if rate_limit else None
+        self.upstream_url = upstream_url.rstrip('/') if upstream_url else None
+        self.record = record
+
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.fixture_lock = threading.Lock()
+        self.stats = {
+            'requests': 0,
+            'served': 0,
+            'errors': 0,
+            'throttled': 0,
+            'rate_limited': 0,
+            'not_found': 0,
+            'proxied': 0,
+            'recorded': 0
+        }
+        self.stats_lock = threading.Lock()
+
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass as api_base_url."""
+        if self._server is None:
+            raise RuntimeError("Stand-in server is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, stat: str):
+        """Increment a request statistic."""
+        with self.stats_lock:
+            self.stats[stat] += 1
+
+    def _draw(self) -> float:
+        """Draw a uniform random number from the seeded generator."""
+        with self.random_lock:
+            return self.random.random()
+
+    def _load_fixture(self, response_key: str, station: str) -> Optional[List[Dict]]:
+        """Load a station's fixture records, or None if not recorded."""
+        fixture_file = self.fixture_dirs[response_key] / f"{station}.json"
+        if not fixture_file.exists():
+            return None
+        with open(fixture_file) as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get(response_key, [])
+        return data
+
+    def _record_fixture(self, response_key: str, period_field: str, station: str, records: List[Dict]):
+        """Merge upstream records into a station's fixture file."""
+        fixture_dir = self.fixture_dirs[response_key]
+        fixture_dir.mkdir(parents=True, exist_ok=True)
+        with self.fixture_lock:
+            existing = self._load_fixture(response_key, station) or []
+            merged = {record.get(period_field): record for record in existing}
+            merged.update({record.get(period_field): record for record in records})
+            with open(fixture_dir / f"{station}.json", 'w') as f:
+                json.dump(sorted(merged.values(), key=lambda r: r.get(period_field) or 0), f, indent=2)
+        self._count('recorded')
+
+    @staticmethod
+    def _filter_period(records: List[Dict], period_field: str, step: int, params: Dict[str, str]) -> List[Dict]:
+        """Apply the year/decade and range query parameters."""
+        start = params.get(period_field)
+        if start is None:
+            return records
+        start = int(start)
+        end = start + int(params.get('range', 0) or 0) * step
+        return [r for r in records if start <= int(r.get(period_field, -1)) <= end]
+
+    def handle(self, path: str, query: str) -> Dict:
+        """Produce a response for a request path and query string.
+
+        Returns:
+            Dict with status, headers and body (JSON-serializable)
+        """
+        self._count('requests')
+
+        delay = self.latency + (self._draw() * self.latency_jitter if self.latency_jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        if self.bucket is not None:
+            wait = self.bucket.acquire()
+            if wait > 0:
+                self._count('rate_limited')
+                return {
+                    'status': 429,
+                    'headers': {'Retry-After': str(max(1, int(wait + 0.999)))},
+                    'body': {'error': {'message': 'Rate limit exceeded'}}
+                }
+
+        if self.throttle_rate and self._draw() < self.throttle_rate:
+            self._count('throttled')
+            return {
+                'status': 429,
+                'headers': {'Retry-After': str(self.retry_after)},
+                'body': {'error': {'message': 'Too many requests'}}
+            }
+
+        if self.error_rate and self._draw() < self.error_rate:
+            self._count('errors')
+            return {'status': 500, 'headers': {}, 'body': {'error': {'message': 'Injected server error'}}}
+
+        endpoint = next((e for e in ENDPOINTS if path.endswith(e)), None)
+        if endpoint is None:
+            self._count('not_found')
+            return {'status': 404, 'headers': {}, 'body': {'error': {'message': f'Unknown endpoint: {path}'}}}
+
+        response_key, period_field, step = ENDPOINTS[endpoint]
+        params = {key: values[0] for key, values in parse_qs(query).items()}
+        station = params.get('station')
+        if not station:
+            return {'status': 400, 'headers': {}, 'body': {'error': {'message': 'station is required'}}}
+
+        records = self._load_fixture(response_key, station)
+        if records is None and self.upstream_url:
+            return self._proxy(endpoint, query, response_key, period_field, station)
+        if records is None:
+            self._count('not_found')
+            return {'status': 404, 'headers': {}, 'body': {'error': {'message': f'No data for station {station}'}}}
+
+        records = self._filter_period(records, period_field, step, params)
+        self._count('served')
+        return {'status': 200, 'headers': {}, 'body': {'count': len(records), response_key: records}}
+
+    def _proxy(self, endpoint: str, query: str, response_key: str, period_field: str, station: str) -> Dict:
+        """Forward a request to the real API, recording the records if enabled."""
+        self._count('proxied')
+        try:
+            response = requests.get(f"{self.upstream_url}{endpoint}?{query}", timeout=60)
+            body = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Upstream request failed for station {station}: {e}")
+            return {'status': 502, 'headers': {}, 'body': {'error': {'message': str(e)}}}
+
+        if self.record and response.ok and response_key in body:
+            self._record_fixture(response_key, period_field, station, body[response_key])
+        return {'status': response.status_code, 'headers': {}, 'body': body}
+
+    def start(self) -> 'NOAAStandInServer':
+        """Start serving in a background thread."""
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                result = stand_in.handle(parsed.path, parsed.query)
+                payload = json.dumps(result['body']).encode()
+                self.send_response(result['status'])
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for key, value in result['headers'].items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                logger.debug(f"{self.address_string()} - {format % args}")
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"NOAA stand-in server listening on {self.base_url}")
+        return self
+
+    def stop(self):
+        """Stop the server and wait for the thread to exit."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self) -> 'NOAAStandInServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Run an offline stand-in for the NOAA HTF API')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=8765, help='Port to bind')
+    parser.add_argument('--historical-dir', type=Path, help='Directory of annual flood count fixtures')
+    parser.add_argument('--projected-dir', type=Path, help='Directory of decadal projection fixtures')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--latency-jitter', type=float, default=0.0, help='Maximum random extra latency in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with HTTP 500')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered with HTTP 429')
+    parser.add_argument('--rate-limit', type=float, help='Sustained requests per second before answering 429')
+    parser.add_argument('--burst', type=int, default=1, help='Burst size for the rate limit')
+    parser.add_argument('--upstream-url', help='Real API base URL for stations without fixtures')
+    parser.add_argument('--record', action='store_true', help='Record upstream responses as fixtures')
+    parser.add_argument('--seed', type=int, help='Random seed for fault injection')
+    parser.add_argument('--verbose', action='store_true', help='Enable verbose logging')
+    return parser.parse_args()
+
+def main():
+    """Run the stand-in server until interrupted."""
+    args = parse_args()
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    server = NOAAStandInServer(
+        historical_dir=args.historical_dir,
+        projected_dir=args.projected_dir,
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        upstream_url=args.upstream_url,
+        record=args.record,
+        seed=args.seed
+    )
+
+    with server:
+        logger.info(f"Use --api-base-url {server.base_url} with the HTF CLIs")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            logger.info(f"Stopping stand-in server. Stats: {server.stats}")
+
+if __name__ == '__main__':
+    main()
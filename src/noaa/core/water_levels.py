@@ -0,0 +1,267 @@
+"""
+Water level ingestion for deriving high tide flood counts.
+
+This module turns raw hourly or 6-minute water level series into daily and annual
+flood statistics without relying on NOAA's annual HTF product:
+- Streams CSV, parquet or NOAA datagetter JSON in chunks
+- Reduces each chunk to per-station daily maxima and observation counts
+- Flags days with insufficient coverage as missing
+- Counts minor/moderate/major threshold exceedances per station-year
+
+Water levels and thresholds must share the same datum and units (e.g. meters above MHHW).
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+import json
+import logging
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Fallback thresholds when a station has none configured
+DEFAULT_THRESHOLDS = {
+    'minor': 0.5,
+    'moderate': 0.8,
+    'major': 1.2
+}
+
+FLOOD_LEVELS = ['minor', 'moderate', 'major']
+
+# Candidate column names for timestamps and water levels
+TIME_COLUMNS = ['t', 'time', 'timestamp', 'date_time']
+VALUE_COLUMNS = ['v', 'value', 'water_level']
+
+class WaterLevelIngestor:
+    """Derives daily and annual flood counts from raw water level series."""
+
+    def __init__(
+        self,
+        thresholds: Optional[Dict[str, Dict[str, float]]] = None,
+        default_thresholds: Optional[Dict[str, float]] = None,
+        interval_minutes: Optional[float] = None,
+        min_coverage: float = 0.75,
+        chunksize: int = 1_000_000
+    ):
+        """Initialize the ingestor.
+
+        Args:
+            thresholds: Optional dict mapping station IDs to {'minor', 'moderate', 'major'} levels
+            default_thresholds: Thresholds for stations without their own. Defaults to DEFAULT_THRESHOLDS.
+            interval_minutes: Sampling interval of the series. If None, inferred per station.
+            min_coverage: Minimum fraction of expected observations for a day to count as valid
+            chunksize: Number of rows read per chunk
+        """
+        self.thresholds = {str(k): v for k, v in (thresholds or {}).items()}
+        self.default_thresholds = dict(default_thresholds or DEFAULT_THRESHOLDS)
+        self.interval_minutes = interval_minutes
+        self.min_coverage = min_coverage
+        self.chunksize = chunksize
+
+    @classmethod
+    def from_cache(cls, cache, **kwargs) -> 'WaterLevelIngestor':
+        """Create an ingestor using station thresholds from the tide station configs.
+
+        Args:
+            cache: NOAACache instance whose stations may carry a 'thresholds' entry
+            **kwargs: Additional arguments passed to the constructor
+
+        Returns:
+            Configured WaterLevelIngestor
+        """
+        thresholds = {
+            station['id']: station['thresholds']
+            for station in cache.get_stations()
+            if station.get('thresholds')
+        }
+        return cls(thresholds=thresholds, **kwargs)
+
+    def get_thresholds(self, station_id: str) -> Dict[str, float]:
+        """Get flood thresholds for a station, falling back to the defaults."""
+        station_thresholds = self.thresholds.get(str(station_id), {})
+        return {level: float(station_thresholds.get(level, self.default_thresholds[level])) for level in FLOOD_LEVELS}
+
+    @staticmethod
+    def _normalize_chunk(chunk: pd.DataFrame, station_id: Optional[str] = None) -> pd.DataFrame:
+        """Coerce a raw chunk to station_id, time and value columns."""
+        time_col = next((c for c in TIME_COLUMNS if c in chunk.columns), None)
+        value_col = next((c for c in VALUE_COLUMNS if c in chunk.columns), None)
+        if time_col is None or value_col is None:
+            raise ValueError(f"Water level data needs time and value columns, found: {list(chunk.columns)}")
+
+        if 'station_id' in chunk.columns:
+            stations = chunk['station_id'].astype(str)
+        elif station_id is not None:
+            stations = pd.Series(str(station_id), index=chunk.index)
+        else:
+            raise ValueError("Water level data has no station_id column and no station was given")
+
+        return pd.DataFrame({
+            'station_id': stations.to_numpy(),
+            'time': pd.to_datetime(chunk[time_col], errors='coerce').to_numpy(),
+            'value': pd.to_numeric(chunk[value_col], errors='coerce').to_numpy(dtype=np.float64)
+        })
+
+    def iter_chunks(self, source: Union[Path, str], station_id: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """Stream a water level file as normalized chunks.
+
+        Args:
+            source: CSV, parquet or NOAA datagetter JSON file
+            station_id: Station ID for files without a station_id column. For JSON files
+                the metadata ID is used, and otherwise the file stem.
+
+        Yields:
+            DataFrames with station_id, time and value columns
+        """
+        path = Path(source)
+        suffix = path.suffix.lower()
+
+        if suffix == '.json':
+            with open(path) as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                station_id = station_id or data.get('metadata', {}).get('id')
+                data = data.get('data', [])
+            yield self._normalize_chunk(pd.DataFrame.from_records(data), station_id or path.stem)
+        elif suffix == '.parquet':
+            parquet_file = pq.ParquetFile(path)
+            for batch in parquet_file.iter_batches(batch_size=self.chunksize):
+                yield self._normalize_chunk(batch.to_pandas(), station_id or path.stem)
+        elif suffix in ('.csv', '.txt', '.gz'):
+            for chunk in pd.read_csv(path, chunksize=self.chunksize, skipinitialspace=True):
+                chunk.columns = [c.strip().lower() for c in chunk.columns]
+                yield self._normalize_chunk(chunk, station_id or path.stem)
+        else:
+            raise ValueError(f"Unsupported water level file format: {path.suffix}")
+
+    @staticmethod
+    def _reduce_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+        """Reduce a normalized chunk to partial daily aggregates."""
+        chunk = chunk[chunk['time'].notna() & np.isfinite(chunk['value'])]
+        return (
+            chunk.assign(date=chunk['time'].dt.normalize())
+            .groupby(['station_id', 'date'], sort=False)
+            .agg(max_level=('value', 'max'), n_obs=('value', 'size'))
+            .reset_index()
+        )
+
+    @staticmethod
+    def _update_intervals(chunk: pd.DataFrame, intervals: Dict[str, float]):
+        """Infer sampling intervals in minutes for stations first seen in this chunk."""
+        new = chunk[~chunk['station_id'].isin(intervals.keys()) & chunk['time'].notna()]
+        if new.empty:
+            return
+        new = new.sort_values(['station_id', 'time'])
+        seconds = new['time'].to_numpy().astype('datetime64[s]').astype(np.int64)
+        diffs = pd.Series(np.diff(seconds, prepend=seconds[0]), index=new.index)
+        same_station = new['station_id'].eq(new['station_id'].shift())
+        diffs = diffs[same_station & (diffs > 0)]
+        medians = diffs.groupby(new.loc[diffs.index, 'station_id']).median() / 60.0
+        intervals.update(medians.to_dict())
+
+    def daily_summary(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """Compute daily maxima and coverage from a stream of water level chunks.
+
+        Args:
+            chunks: Iterable of raw or normalized water level DataFrames
+
+        Returns:
+            DataFrame with station_id, date, max_level, n_obs, expected_obs and valid columns,
+            one row per station-day with at least one observation
+        """
+        partials = []
+        intervals = {}
+        for chunk in chunks:
+            if not {'station_id', 'time', 'value'}.issubset(chunk.columns):
+                chunk = self._normalize_chunk(chunk)
+            if self.interval_minutes is None:
+                self._update_intervals(chunk, intervals)
+            partials.append(self._reduce_chunk(chunk))
+
+        if not partials or all(p.empty for p in partials):
+            return pd.DataFrame(columns=['station_id', 'date', 'max_level', 'n_obs', 'expected_obs', 'valid'])
+
+        # Days split across chunk boundaries are merged here
+        daily = (
+            pd.concat(partials, ignore_index=True)
+            .groupby(['station_id', 'date'], sort=True)
+            .agg(max_level=('max_level', 'max'), n_obs=('n_obs', 'sum'))
+            .reset_index()
+        )
+
+        if self.interval_minutes is not None:
+            daily['expected_obs'] = 1440.0 / self.interval_minutes
+        else:
+            # Stations with a single observation fall back to hourly data
+            daily['expected_obs'] = 1440.0 / daily['station_id'].map(intervals).fillna(60.0)
+
+        daily['valid'] = daily['n_obs'] >= self.min_coverage * daily['expected_obs']
+        return daily
+
+    def annual_counts(self, daily: pd.DataFrame) -> pd.DataFrame:
+        """Count threshold exceedances and missing days per station-year.
+
+        Args:
+            daily: Output of daily_summary()
+
+        Returns:
+            DataFrame with stnId, year, minCount, modCount, majCount and nanCount columns.
+            nanCount includes calendar days with no observations at all.
+        """
+        columns = ['stnId', 'year', 'majCount', 'modCount', 'minCount', 'nanCount']
+        if daily.empty:
+            return pd.DataFrame(columns=columns)
+
+        station_ids = daily['station_id'].astype(str)
+        threshold_table = pd.DataFrame(
+            [self.get_thresholds(s) for s in station_ids.unique()],
+            index=station_ids.unique()
+        )
+        levels = threshold_table.reindex(station_ids.to_numpy())
+        valid = daily['valid'].to_numpy()
+        max_level = daily['max_level'].to_numpy()
+
+        flags = pd.DataFrame({
+            'stnId': station_ids.to_numpy(),
+            'year': daily['date'].dt.year.to_numpy(),
+            'minCount': valid & (max_level >= levels['minor'].to_numpy()),
+            'modCount': valid & (max_level >= levels['moderate'].to_numpy()),
+            'majCount': valid & (max_level >= levels['major'].to_numpy()),
+            'valid_days': valid
+        })
+
+        annual = flags.groupby(['stnId', 'year'], sort=True).sum().reset_index()
+        years = annual['year'].to_numpy()
+        days_in_year = np.where((years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0)), 366, 365)
+        annual['nanCount'] = days_in_year - annual.pop('valid_days').to_numpy()
+        return annual[columns].astype({c: np.int64 for c in columns[1:]})
+
+    def ingest(self, sources: Iterable[Union[Path, str]], station_id: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """Ingest one or more water level files.
+
+        Args:
+            sources: Paths to water level files
+            station_id: Station ID applied to files without station information
+
+        Returns:
+            Dict with 'daily' (daily_summary output) and 'annual' (annual_counts output)
+        """
+        def chunks():
+            for source in sources:
+                logger.debug(f"Reading water levels from {source}")
+                yield from self.iter_chunks(source, station_id=station_id)
+
+        daily = self.daily_summary(chunks())
+        annual = self.annual_counts(daily)
+        logger.info(f"Derived {len(annual)} station-years from {len(daily)} station-days")
+        return {'daily': daily, 'annual': annual}
+
+    @staticmethod
+    def to_records(annual: pd.DataFrame) -> List[Dict]:
+        """Convert annual counts to NOAA AnnualFloodCount-style records."""
+        return [
+            {key: (int(value) if key != 'stnId' else value) for key, value in record.items()}
+            for record in annual.to_dict('records')
+        ]
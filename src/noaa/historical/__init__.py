@@ -4,10 +4,18 @@ Historical HTF data handling.
 This module handles the retrieval and processing of historical high tide flooding data:
 - Fetching historical minor flood counts from NOAA API
 - Processing historical data by region
+- Shared memory-mapped station x year flood matrix
 - Command line interface for data retrieval
 """
 
 from .historical_htf_fetcher import HistoricalHTFFetcher
 from .historical_htf_processor import HistoricalHTFProcessor
+from .flood_matrix import FloodMatrix, build_flood_matrix, ensure_flood_matrix
 
-__all__ = ['HistoricalHTFFetcher', 'HistoricalHTFProcessor']
+__all__ = [
+    'HistoricalHTFFetcher',
+    'HistoricalHTFProcessor',
+    'FloodMatrix',
+    'build_flood_matrix',
+    'ensure_flood_matrix'
+]
@@ -0,0 +1,265 @@
+"""
+Memory-mapped station x year flood matrix.
+
+This module builds one canonical on-disk artifact from the regional historical HTF
+parquet files, which every downstream stage can share:
+- flood_days.npy and missing_days.npy: dense float32 (station x year) matrices,
+  NaN where a station has no record for a year
+- stations.npy, regions.npy and years.npy: index sidecars
+- sources.json: name and size of every regional file the matrices were built from
+
+The matrices are opened with np.load(mmap_mode='r'), so separate processes map the
+same pages instead of each holding its own DataFrame copy.
+"""
+
+from typing import Dict, Iterable, List, Optional
+import json
+import logging
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from src.config import HISTORICAL_DIR, FLOOD_MATRIX_DIR
+
+logger = logging.getLogger(__name__)
+
+MATRIX_FILES = ['flood_days', 'missing_days']
+INDEX_FILES = ['stations', 'regions', 'years']
+SOURCES_FILE = "sources.json"
+
+def _source_listing(region_files: Iterable[Path]) -> List[Dict]:
+    """List the name and size of each regional file, in name order."""
+    return [{'name': f.name, 'size': f.stat().st_size} for f in sorted(region_files)]
+
+def _save_array(path: Path, array: np.ndarray):
+    """Write an array atomically so readers never map a partial file."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+def build_flood_matrix(
+    historical_dir: Path = HISTORICAL_DIR,
+    matrix_dir: Path = FLOOD_MATRIX_DIR
+) -> Path:
+    """Build the station x year matrices from regional historical HTF files.
+
+    Args:
+        historical_dir: Directory containing historical_htf_{region}.parquet files
+        matrix_dir: Directory to write the matrices and index sidecars
+
+    Returns:
+        Path to the matrix directory
+
+    Raises:
+        FileNotFoundError: If no historical HTF files are found
+    """
+    historical_dir, matrix_dir = Path(historical_dir), Path(matrix_dir)
+    region_files = sorted(historical_dir.glob("historical_htf_*.parquet"))
+    if not region_files:
+        raise FileNotFoundError(f"No historical HTF files found in {historical_dir}")
+
+    columns = ['station_id', 'year', 'flood_days', 'missing_days']
+    dfs = []
+    for region_file in region_files:
+        df = pd.read_parquet(region_file)
+        if df.empty:
+            continue
+        region = region_file.stem.replace("historical_htf_", "")
+        df = df[columns + (['region'] if 'region' in df.columns else [])]
+        dfs.append(df if 'region' in df.columns else df.assign(region=region))
+
+    if dfs:
+        df = pd.concat(dfs, ignore_index=True)
+    else:
+        df = pd.DataFrame(columns=columns + ['region'])
+    df['station_id'] = df['station_id'].astype(str)
+    df['year'] = df['year'].astype(np.int64)
+
+    station_codes, stations = pd.factorize(df['station_id'], sort=True)
+    if len(df):
+        years = np.arange(df['year'].min(), df['year'].max() + 1, dtype=np.int16)
+    else:
+        years = np.array([], dtype=np.int16)
+    year_codes = df['year'].to_numpy() - (years[0] if len(years) else 0)
+
+    # First region listed for each station
+    regions = df.groupby('station_id', sort=True)['region'].first().reindex(stations).to_numpy(dtype=str)
+
+    matrix_dir.mkdir(parents=True, exist_ok=True)
+    for name in MATRIX_FILES:
+        matrix = np.full((len(stations), len(years)), np.nan, dtype=np.float32)
+        matrix[station_codes, year_codes] = pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=np.float32)
+        _save_array(matrix_dir / f"{name}.npy", matrix)
+
+    _save_array(matrix_dir / "stations.npy", np.asarray(stations, dtype=str))
+    _save_array(matrix_dir / "regions.npy", regions)
+    _save_array(matrix_dir / "years.npy", years)
+
+    # Written last, so an interrupted build is detected as stale
+    tmp_path = matrix_dir / f".{SOURCES_FILE}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(_source_listing(region_files), f, indent=2)
+    os.replace(tmp_path, matrix_dir / SOURCES_FILE)
+
+    logger.info(
+        f"Built flood matrix with {len(stations)} stations x {len(years)} years "
+        f"from {len(region_files)} regional files in {matrix_dir}"
+    )
+    return matrix_dir
+
+def ensure_flood_matrix(
+    historical_dir: Path = HISTORICAL_DIR,
+    matrix_dir: Optional[Path] = None
+) -> 'FloodMatrix':
+    """Open the flood matrix, rebuilding it if missing or out of date.
+
+    The matrix is rebuilt when a regional file is newer than it, or when the
+    regional files were added, removed, renamed or resized since it was built.
+
+    Args:
+        historical_dir: Directory containing historical_htf_{region}.parquet files
+        matrix_dir: Matrix directory. Defaults to FLOOD_MATRIX_DIR for the default
+            historical directory and to a 'flood_matrix' subdirectory otherwise.
+
+    Returns:
+        FloodMatrix backed by up-to-date files
+    """
+    historical_dir = Path(historical_dir)
+    if matrix_dir is None:
+        matrix_dir = FLOOD_MATRIX_DIR if historical_dir == HISTORICAL_DIR else historical_dir / "flood_matrix"
+    matrix_dir = Path(matrix_dir)
+
+    matrix_files = [matrix_dir / f"{name}.npy" for name in MATRIX_FILES + INDEX_FILES]
+    sources_file = matrix_dir / SOURCES_FILE
+    source_files = list(historical_dir.glob("historical_htf_*.parquet"))
+    stale = not all(f.exists() for f in matrix_files + [sources_file])
+    if not stale:
+        with open(sources_file) as f:
+            stale = json.load(f) != _source_listing(source_files)
+    if not stale and source_files:
+        built = min(f.stat().st_mtime for f in matrix_files)
+        stale = any(f.stat().st_mtime > built for f in source_files)
+
+    if stale:
+        logger.info(f"Flood matrix in {matrix_dir} is missing or stale, rebuilding")
+        build_flood_matrix(historical_dir, matrix_dir)
+
+    return FloodMatrix(matrix_dir)
+
+class FloodMatrix:
+    """Read-only view of the station x year flood matrices."""
+
+    def __init__(self, matrix_dir: Path = FLOOD_MATRIX_DIR, mmap_mode: Optional[str] = 'r'):
+        """Open the flood matrix.
+
+        Args:
+            matrix_dir: Directory containing the matrices and index sidecars
+            mmap_mode: Memory-map mode passed to np.load. None loads into memory.
+        """
+        self.matrix_dir = Path(matrix_dir)
+        if not (self.matrix_dir / "flood_days.npy").exists():
+            raise FileNotFoundError(f"No flood matrix found in {self.matrix_dir}")
+
+        self.stations = np.load(self.matrix_dir / "stations.npy")
+        self.regions = np.load(self.matrix_dir / "regions.npy")
+        self.years = np.load(self.matrix_dir / "years.npy").astype(np.int64)
+        self.flood_days = np.load(self.matrix_dir / "flood_days.npy", mmap_mode=mmap_mode)
+        self.missing_days = np.load(self.matrix_dir / "missing_days.npy", mmap_mode=mmap_mode)
+
+        self._station_index = pd.Index(self.stations)
+
+    @property
+    def shape(self):
+        """Shape of the (station x year) matrices."""
+        return self.flood_days.shape
+
+    def station_indexer(self, station_ids: Iterable[str]) -> np.ndarray:
+        """Get row positions for station IDs, -1 where a station is not in the matrix."""
+        return self._station_index.get_indexer([str(s) for s in station_ids])
+
+    def year_slice(self, start_year: Optional[int] = None, end_year: Optional[int] = None) -> slice:
+        """Get the column slice covering a year range (inclusive)."""
+        if not len(self.years):
+            return slice(0, 0)
+        first = self.years[0]
+        start = 0 if start_year is None else int(np.clip(start_year - first, 0, len(self.years)))
+        stop = len(self.years) if end_year is None else int(np.clip(end_year - first + 1, 0, len(self.years)))
+        return slice(start, max(start, stop))
+
+    def select(
+        self,
+        station_ids: Optional[Iterable[str]] = None,
+        region: Optional[str] = None,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """Select a block of the matrices.
+
+        Year ranges are column slices of the memmap; station selections gather rows.
+
+        Args:
+            station_ids: Optional stations to select. Unknown stations are skipped.
+            region: Optional region to select
+            start_year: Optional first year (inclusive)
+            end_year: Optional last year (inclusive)
+
+        Returns:
+            Dict with stations, regions, years, flood_days and missing_days arrays
+        """
+        rows = np.arange(len(self.stations))
+        if station_ids is not None:
+            rows = self.station_indexer(station_ids)
+            rows = rows[rows >= 0]
+        if region is not None:
+            rows = rows[self.regions[rows] == region]
+
+        columns = self.year_slice(start_year, end_year)
+        full_rows = len(rows) == len(self.stations) and np.array_equal(rows, np.arange(len(self.stations)))
+
+        def block(matrix):
+            return matrix[:, columns] if full_rows else matrix[rows][:, columns]
+
+        return {
+            'stations': self.stations[rows],
+            'regions': self.regions[rows],
+            'years': self.years[columns],
+            'flood_days': block(self.flood_days),
+            'missing_days': block(self.missing_days)
+        }
+
+    def pivot(self, values: str = 'flood_days', **selection) -> pd.DataFrame:
+        """Get a station x year DataFrame, as produced by pivoting the long data.
+
+        Args:
+            values: 'flood_days' or 'missing_days'
+            **selection: Arguments passed to select()
+        """
+        selected = self.select(**selection)
+        return pd.DataFrame(
+            np.asarray(selected[values]),
+            index=pd.Index(selected['stations'], name='station_id'),
+            columns=pd.Index(selected['years'], name='year')
+        )
+
+    def to_frame(self, **selection) -> pd.DataFrame:
+        """Get the long station_id, year, flood_days, missing_days, region frame.
+
+        Station-years without a record are omitted.
+
+        Args:
+            **selection: Arguments passed to select()
+        """
+        selected = self.select(**selection)
+        flood = np.asarray(selected['flood_days'])
+        missing = np.asarray(selected['missing_days'])
+        rows, cols = np.nonzero(~(np.isnan(flood) & np.isnan(missing)))
+
+        return pd.DataFrame({
+            'station_id': selected['stations'][rows],
+            'year': selected['years'][cols],
+            'flood_days': flood[rows, cols],
+            'missing_days': missing[rows, cols],
+            'region': selected['regions'][rows]
+        })
@@ -81,6 +81,11 @@ def parse_args():
         help='Output file format'
     )
     
+    parser.add_argument(
+        '--api-base-url',
+        help='NOAA API base URL (e.g. a local stand-in server)'
+    )
+    
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -118,8 +123,8 @@ def main():
     try:
         # Initialize components
         cache = NOAACache(config_dir=config_dir)
-        fetcher = HistoricalHTFFetcher(cache)
-        processor = HistoricalHTFProcessor(config_dir=config_dir)
+        fetcher = HistoricalHTFFetcher(cache, api_base_url=args.api_base_url)
+        processor = HistoricalHTFProcessor(config_dir=config_dir, api_base_url=args.api_base_url)
         
         # Fetch and process data
         logger.info(f"Processing historical data for region: {args.region}")
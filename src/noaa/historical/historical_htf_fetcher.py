@@ -23,14 +23,15 @@ logger = logging.getLogger(__name__)
 class HistoricalHTFFetcher:
     """Service for managing historical high tide flooding data."""
     
-    def __init__(self, cache: NOAACache):
+    def __init__(self, cache: NOAACache, api_base_url: Optional[str] = None):
         """Initialize the historical HTF service.
         
         Args:
             cache: NOAACache instance for data caching
+            api_base_url: Optional API base URL (e.g. a local stand-in server)
         """
         logger.debug("Initializing HistoricalHTFFetcher")
-        self.client = NOAAClient()
+        self.client = NOAAClient(api_base_url=api_base_url) if api_base_url else NOAAClient()
         self.cache = cache
         
         # Load NOAA settings for validation
@@ -21,17 +21,18 @@ logger = logging.getLogger(__name__)
 class HistoricalHTFProcessor:
     """Processes historical HTF data by region."""
     
-    def __init__(self, config_dir: Optional[Path] = None):
+    def __init__(self, config_dir: Optional[Path] = None, api_base_url: Optional[str] = None):
         """Initialize the processor.
         
         Args:
             config_dir: Optional custom config directory
+            api_base_url: Optional API base URL (e.g. a local stand-in server)
         """
         self.config_dir = config_dir or (Path(__file__).parent.parent.parent.parent / "config")
         logger.debug(f"Using config directory: {self.config_dir}")
         
         self.cache = NOAACache(config_dir=self.config_dir)
-        self.fetcher = HistoricalHTFFetcher(self.cache)
+        self.fetcher = HistoricalHTFFetcher(self.cache, api_base_url=api_base_url)
         
         # Load region mappings
         region_file = self.config_dir / "region_mappings.yaml"
@@ -11,7 +11,8 @@ import yaml
 from typing import Dict, List, Optional, Set
 from tqdm import tqdm
 
-from src.config import CONFIG_DIR, OUTPUT_DIR
+from src.config import CONFIG_DIR, OUTPUT_DIR, FLOOD_MATRIX_DIR
+from .flood_matrix import build_flood_matrix
 
 logger = logging.getLogger(__name__)
 
@@ -210,6 +211,9 @@ def main():
             except Exception as e:
                 logger.error(f"Error processing region {region}: {str(e)}")
                 continue
+        
+        # Build the shared station x year matrix for downstream stages
+        build_flood_matrix(historical_dir=output_dir, matrix_dir=FLOOD_MATRIX_DIR)
             
     except Exception as e:
         logger.error(f"Error processing flood data: {str(e)}")
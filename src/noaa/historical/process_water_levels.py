@@ -0,0 +1,94 @@
+"""
+Derive annual flood counts from raw water level files.
+
+Reads hourly or 6-minute water level series (CSV, parquet or NOAA datagetter JSON)
+and writes per-station JSON files in the same AnnualFloodCount format as the NOAA
+annual HTF product, so they can be processed by process_raw_flood_data.
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+
+from src.config import CONFIG_DIR, OUTPUT_DIR
+from ..core import NOAACache, WaterLevelIngestor
+
+logger = logging.getLogger(__name__)
+
+WATER_LEVEL_PATTERNS = ['*.csv', '*.parquet', '*.json']
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description='Derive annual flood counts from raw water level files'
+    )
+    parser.add_argument(
+        '--input-dir',
+        type=Path,
+        required=True,
+        help='Directory containing water level files (one or more stations per file)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        type=Path,
+        default=OUTPUT_DIR / "noaa" / "historical" / "water_levels",
+        help='Directory for per-station annual flood count JSON files '
+             '(kept apart from the fetched annual flood data, which uses the same file names)'
+    )
+    parser.add_argument(
+        '--interval-minutes',
+        type=float,
+        help='Sampling interval of the series (inferred if omitted)'
+    )
+    parser.add_argument(
+        '--min-coverage',
+        type=float,
+        default=0.75,
+        help='Minimum fraction of expected observations for a valid day'
+    )
+    parser.add_argument(
+        '--chunksize',
+        type=int,
+        default=1_000_000,
+        help='Rows read per chunk'
+    )
+    return parser.parse_args()
+
+def main():
+    """Derive annual flood counts from water level files."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    args = parse_args()
+
+    cache = NOAACache(config_dir=CONFIG_DIR)
+    ingestor = WaterLevelIngestor.from_cache(
+        cache,
+        interval_minutes=args.interval_minutes,
+        min_coverage=args.min_coverage,
+        chunksize=args.chunksize
+    )
+
+    sources = sorted(f for pattern in WATER_LEVEL_PATTERNS for f in args.input_dir.glob(pattern))
+    if not sources:
+        logger.warning(f"No water level files found in {args.input_dir}")
+        return
+
+    result = ingestor.ingest(sources)
+    annual = result['annual']
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    station_names = {s['id']: s['name'] for s in cache.get_stations()}
+    for station_id, station_df in annual.groupby('stnId'):
+        records = ingestor.to_records(station_df)
+        for record in records:
+            record['stnName'] = station_names.get(station_id, station_id)
+        output_file = args.output_dir / f"{station_id}.json"
+        with open(output_file, 'w') as f:
+            json.dump(records, f, indent=2)
+        logger.info(f"Saved {len(records)} years for station {station_id} to {output_file}")
+
+if __name__ == "__main__":
+    main()
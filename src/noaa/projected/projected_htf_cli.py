@@ -4,6 +4,7 @@ Command line interface for projected HTF data processing.
 This module provides a CLI for processing projected high tide flooding data:
 - Fetches data for specified regions and decades
 - Validates and processes the data by scenario
+- Optionally interpolates decadal projections to annual values
 - Outputs processed data to CSV/parquet files
 """
 
@@ -11,10 +12,12 @@ import argparse
 import logging
 from pathlib import Path
 import sys
+import pandas as pd
 import yaml
 
 from .projected_htf_fetcher import ProjectedHTFFetcher
 from .projected_htf_processor import ProjectedHTFProcessor
+from .projected_htf_interpolator import ProjectedHTFInterpolator, INTERPOLATION_METHODS
 from ..core import NOAACache
 
 logger = logging.getLogger(__name__)
@@ -73,6 +76,23 @@ def parse_args():
         help='Output file format'
     )
     
+    parser.add_argument(
+        '--annualize',
+        choices=INTERPOLATION_METHODS,
+        help='Also write annual values interpolated from the decadal projections'
+    )
+    
+    parser.add_argument(
+        '--historical-file',
+        type=Path,
+        help='Historical HTF parquet file to splice into the annual series'
+    )
+    
+    parser.add_argument(
+        '--api-base-url',
+        help='NOAA API base URL (e.g. a local stand-in server)'
+    )
+    
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -110,7 +130,7 @@ def main():
     try:
         # Initialize components
         cache = NOAACache(config_dir=config_dir)
-        fetcher = ProjectedHTFFetcher(cache=cache, region=args.region)
+        fetcher = ProjectedHTFFetcher(cache=cache, region=args.region, api_base_url=args.api_base_url)
         
         # Get dataset status
         status = fetcher.get_dataset_status()
@@ -152,6 +172,25 @@ def main():
             
         logger.info(f"\nOutput saved to: {output_file}")
         
+        # Interpolate to annual values if requested
+        if args.annualize:
+            historical = pd.read_parquet(args.historical_file) if args.historical_file else None
+            interpolator = ProjectedHTFInterpolator(cache=cache, method=args.annualize)
+            result = interpolator.interpolate(
+                dataset,
+                historical=historical,
+                start_year=None if historical is not None else args.start_decade,
+                end_year=args.end_decade + 9
+            )
+            annual_df = interpolator.to_dataframe(result)
+            
+            annual_file = args.output_dir / f"projected_htf_annual_{args.region}.{args.format}"
+            if args.format == 'csv':
+                annual_df.to_csv(annual_file, index=False)
+            else:
+                annual_df.to_parquet(annual_file, index=False)
+            logger.info(f"Annual output saved to: {annual_file}")
+        
     except Exception as e:
         logger.error(f"Error processing data: {e}")
         sys.exit(1)
@@ -26,15 +26,16 @@ logger = logging.getLogger(__name__)
 class ProjectedHTFFetcher:
     """Service for managing projected high tide flooding data."""
     
-    def __init__(self, cache: NOAACache, region: str):
+    def __init__(self, cache: NOAACache, region: str, api_base_url: Optional[str] = None):
         """Initialize the projected HTF service.
         
         Args:
             cache: NOAACache instance for data caching
             region: Region identifier (e.g., 'gulf_coast', 'hawaii')
+            api_base_url: Optional API base URL (e.g. a local stand-in server)
         """
         logger.debug(f"Initializing ProjectedHTFFetcher for region: {region}")
-        self.client = NOAAClient()
+        self.client = NOAAClient(api_base_url=api_base_url) if api_base_url else NOAAClient()
         self.cache = cache
         self.region = region.lower()
         
@@ -0,0 +1,339 @@
+"""
+Annualized Projected High Tide Flooding Interpolation.
+
+This module turns NOAA's decadal HTF projections into annual series. All stations
+and scenarios are interpolated in a single array operation:
+- Linear interpolation between decadal anchors
+- Monotone cubic (PCHIP) interpolation, which never overshoots the decadal values
+- Step interpolation, which holds each decadal value for every year of its decade
+
+The observed historical record can optionally be spliced in ahead of the projections.
+Results are cached as compressed arrays keyed by a hash of all inputs.
+"""
+
+from typing import Dict, List, Optional
+import hashlib
+import logging
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from scipy.interpolate import PchipInterpolator
+
+from ..core.cache_manager import NOAACache
+
+logger = logging.getLogger(__name__)
+
+# NOAA response fields and the column names used in generated datasets
+SCENARIO_FIELDS = ['low', 'intLow', 'intermediate', 'intHigh', 'high']
+SCENARIO_COLUMNS = {
+    'low': 'low_scenario',
+    'intLow': 'intermediate_low_scenario',
+    'intermediate': 'intermediate_scenario',
+    'intHigh': 'intermediate_high_scenario',
+    'high': 'high_scenario'
+}
+
+INTERPOLATION_METHODS = ('linear', 'monotone_cubic', 'step')
+
+# Bump when the interpolation output changes so stale cache entries are not reused
+CACHE_VERSION = 2
+
+class ProjectedHTFInterpolator:
+    """Interpolates decadal HTF projections to annual values."""
+
+    def __init__(
+        self,
+        cache: NOAACache,
+        method: str = 'linear',
+        anchor_offset: float = 5.0,
+        use_cache: bool = True
+    ):
+        """Initialize the interpolator.
+
+        Args:
+            cache: NOAACache instance; annual products are stored under its cache directory
+            method: Interpolation method ('linear', 'monotone_cubic' or 'step')
+            anchor_offset: Years after the decade start at which each decadal value is
+                anchored for linear and monotone cubic interpolation (5 = decade midpoint)
+            use_cache: Whether to read and write the annual array cache
+        """
+        if method not in INTERPOLATION_METHODS:
+            raise ValueError(f"Invalid interpolation method: {method}. Available methods: {', '.join(INTERPOLATION_METHODS)}")
+
+        self.cache = cache
+        self.method = method
+        self.anchor_offset = float(anchor_offset)
+        self.use_cache = use_cache
+
+        # Default year range follows the projected data settings
+        settings = self.cache.settings.get('data', {}).get('projected', {})
+        self.start_year = settings.get('start_decade', 2020)
+        self.end_year = settings.get('end_decade', 2100)
+
+        self.cache_dir = Path(self.cache.cache_dir) / "projected_annual"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def build_decadal_array(dataset: Dict[str, List[Dict]]) -> Dict:
+        """Convert fetcher output into a dense (station x decade x scenario) array.
+
+        Args:
+            dataset: Dict mapping station IDs to decadal projection records, as returned
+                by ProjectedHTFFetcher.get_regional_dataset()
+
+        Returns:
+            Dict containing:
+            - station_ids: Sorted array of station IDs
+            - decades: Sorted array of decades
+            - values: float64 array of shape (stations, decades, scenarios), NaN where missing
+        """
+        records = [
+            dict(record, station_id=station_id)
+            for station_id, station_records in dataset.items()
+            for record in station_records
+        ]
+
+        if not records:
+            return {
+                'station_ids': np.array([], dtype=str),
+                'decades': np.array([], dtype=np.int64),
+                'values': np.empty((0, 0, len(SCENARIO_FIELDS)))
+            }
+
+        df = pd.DataFrame.from_records(records)
+        for field in SCENARIO_FIELDS:
+            if field not in df.columns:
+                df[field] = np.nan
+
+        station_codes, station_ids = pd.factorize(df['station_id'].astype(str), sort=True)
+        decade_codes, decades = pd.factorize(df['decade'].astype(np.int64), sort=True)
+
+        values = np.full((len(station_ids), len(decades), len(SCENARIO_FIELDS)), np.nan)
+        values[station_codes, decade_codes, :] = df[SCENARIO_FIELDS].apply(
+            pd.to_numeric, errors='coerce'
+        ).to_numpy(dtype=np.float64)
+
+        return {
+            'station_ids': np.asarray(station_ids, dtype=str),
+            'decades': np.asarray(decades, dtype=np.int64),
+            'values': values
+        }
+
+    def _interpolate_array(self, decades: np.ndarray, values: np.ndarray, years: np.ndarray) -> np.ndarray:
+        """Interpolate a (station x decade x scenario) array to (station x year x scenario).
+
+        Years before a station's first available decade start are NaN. Years between
+        that decade start and the first anchor (or after the last anchor) hold the
+        nearest decadal value.
+        """
+        n_stations, n_decades, n_scenarios = values.shape
+        result = np.full((n_stations, len(years), n_scenarios), np.nan)
+        if n_stations == 0 or n_decades == 0:
+            return result
+
+        if self.method == 'step' or n_decades == 1:
+            in_range = years >= decades[0]
+            idx = np.searchsorted(decades, years[in_range], side='right') - 1
+            result[:, in_range, :] = values[:, idx, :]
+            return result
+
+        anchors = decades.astype(np.float64) + self.anchor_offset
+        self._interpolate_rows(decades, anchors, values, years, result)
+        return result
+
+    def _interpolate_rows(
+        self,
+        decades: np.ndarray,
+        anchors: np.ndarray,
+        values: np.ndarray,
+        years: np.ndarray,
+        result: np.ndarray
+    ) -> None:
+        """Fill result with linear or PCHIP interpolation over each row's finite decadal values.
+
+        A missing decade must not blank out the years around it, and PCHIP needs finite
+        anchors, so station-scenario rows are grouped by which decades they have and each
+        group is interpolated over its own anchors. A row with a single decade holds that
+        value, and a row without any stays NaN.
+        """
+        n_stations, n_decades, n_scenarios = values.shape
+        rows = values.transpose(0, 2, 1).reshape(-1, n_decades)
+        row_result = np.full((rows.shape[0], len(years)), np.nan)
+
+        patterns, inverse = np.unique(np.isfinite(rows), axis=0, return_inverse=True)
+        for pattern_idx, pattern in enumerate(patterns):
+            available = np.flatnonzero(pattern)
+            if len(available) == 0:
+                continue
+            members = np.flatnonzero(inverse.reshape(-1) == pattern_idx)
+            in_range = years >= decades[available[0]]
+            if len(available) == 1:
+                row_result[np.ix_(members, in_range)] = rows[members, available[0]][:, None]
+                continue
+
+            group_anchors = anchors[available]
+            group_values = rows[np.ix_(members, available)]
+            clamped = np.clip(years[in_range], group_anchors[0], group_anchors[-1])
+
+            if self.method == 'linear':
+                idx = np.clip(np.searchsorted(group_anchors, clamped, side='right') - 1, 0, len(available) - 2)
+                t = (clamped - group_anchors[idx]) / (group_anchors[idx + 1] - group_anchors[idx])
+                row_result[np.ix_(members, in_range)] = (
+                    group_values[:, idx] * (1.0 - t)[None, :] +
+                    group_values[:, idx + 1] * t[None, :]
+                )
+            else:
+                # PCHIP preserves monotonicity of the decadal values
+                interpolator = PchipInterpolator(group_anchors, group_values, axis=1, extrapolate=False)
+                row_result[np.ix_(members, in_range)] = interpolator(clamped)
+
+        result[:] = row_result.reshape(n_stations, n_scenarios, len(years)).transpose(0, 2, 1)
+
+    @staticmethod
+    def _historical_array(
+        historical: pd.DataFrame,
+        station_ids: np.ndarray,
+        years: np.ndarray,
+        max_missing_days: int
+    ) -> np.ndarray:
+        """Build a (station x year) array of observed flood days, NaN where unavailable."""
+        observed = np.full((len(station_ids), len(years)), np.nan)
+
+        df = historical[historical['year'].between(years[0], years[-1])]
+        if 'missing_days' in df.columns:
+            df = df[df['missing_days'].fillna(0) <= max_missing_days]
+        df = df[df['flood_days'].notna()]
+
+        station_idx = pd.Index(station_ids).get_indexer(df['station_id'].astype(str))
+        valid = station_idx >= 0
+        observed[station_idx[valid], df['year'].to_numpy()[valid] - years[0]] = df['flood_days'].to_numpy(dtype=np.float64)[valid]
+        return observed
+
+    def _cache_key(self, decadal: Dict, years: np.ndarray, observed: Optional[np.ndarray]) -> str:
+        """Hash every input that influences the annual product."""
+        digest = hashlib.sha256()
+        digest.update(f"v{CACHE_VERSION}|{self.method}|{self.anchor_offset}".encode())
+        digest.update("|".join(decadal['station_ids']).encode())
+        digest.update(np.ascontiguousarray(decadal['decades']).tobytes())
+        digest.update(np.ascontiguousarray(decadal['values']).tobytes())
+        digest.update(np.ascontiguousarray(years).tobytes())
+        if observed is not None:
+            digest.update(np.ascontiguousarray(observed).tobytes())
+        return digest.hexdigest()
+
+    def interpolate(
+        self,
+        dataset: Dict[str, List[Dict]],
+        historical: Optional[pd.DataFrame] = None,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        max_missing_days: int = 182
+    ) -> Dict:
+        """Interpolate decadal projections for all stations to annual values.
+
+        Args:
+            dataset: Dict mapping station IDs to decadal projection records
+            historical: Optional observed record with station_id, year, flood_days and
+                (optionally) missing_days columns. Observed years take precedence over
+                the projection and extend the series backwards.
+            start_year: First output year. Defaults to the first observed year when
+                splicing, otherwise the configured start decade.
+            end_year: Last output year (inclusive). Defaults to the configured end decade.
+            max_missing_days: Observed years with more missing days than this are ignored
+
+        Returns:
+            Dict containing:
+            - station_ids: Array of station IDs
+            - years: Array of years
+            - scenarios: List of scenario fields
+            - values: float32 array of shape (stations, years, scenarios)
+            - observed: bool array of shape (stations, years), True where spliced from history
+            - method: Interpolation method used
+            - key: Cache key of the product
+        """
+        decadal = self.build_decadal_array(dataset)
+
+        if start_year is None:
+            start_year = self.start_year
+            if historical is not None and not historical.empty:
+                start_year = min(start_year, int(historical['year'].min()))
+        end_year = end_year if end_year is not None else self.end_year
+        years = np.arange(start_year, end_year + 1, dtype=np.int64)
+
+        observed = None
+        if historical is not None and not historical.empty:
+            observed = self._historical_array(historical, decadal['station_ids'], years, max_missing_days)
+
+        key = self._cache_key(decadal, years, observed)
+        cache_file = self.cache_dir / f"{key}.npz"
+
+        if self.use_cache and cache_file.exists():
+            try:
+                with np.load(cache_file) as cached:
+                    logger.debug(f"Cache hit: annual projection product {key[:12]}")
+                    return {
+                        'station_ids': cached['station_ids'],
+                        'years': cached['years'],
+                        'scenarios': list(SCENARIO_FIELDS),
+                        'values': cached['values'],
+                        'observed': cached['observed'],
+                        'method': self.method,
+                        'key': key
+                    }
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Discarding unreadable annual projection cache {cache_file}: {e}")
+                cache_file.unlink(missing_ok=True)
+
+        values = self._interpolate_array(decadal['decades'], decadal['values'], years)
+
+        observed_mask = np.zeros((len(decadal['station_ids']), len(years)), dtype=bool)
+        if observed is not None:
+            observed_mask = ~np.isnan(observed)
+            values = np.where(observed_mask[:, :, None], observed[:, :, None], values)
+
+        values = values.astype(np.float32)
+        logger.info(
+            f"Interpolated {len(decadal['station_ids'])} stations to {len(years)} annual values "
+            f"({years[0]}-{years[-1]}) using {self.method} interpolation"
+        )
+
+        if self.use_cache:
+            np.savez_compressed(
+                cache_file,
+                station_ids=decadal['station_ids'],
+                years=years,
+                values=values,
+                observed=observed_mask
+            )
+            logger.debug(f"Cached annual projection product {key[:12]}")
+
+        return {
+            'station_ids': decadal['station_ids'],
+            'years': years,
+            'scenarios': list(SCENARIO_FIELDS),
+            'values': values,
+            'observed': observed_mask,
+            'method': self.method,
+            'key': key
+        }
+
+    @staticmethod
+    def to_dataframe(result: Dict) -> pd.DataFrame:
+        """Flatten an annual projection product into one row per station-year.
+
+        Args:
+            result: Output of interpolate()
+
+        Returns:
+            DataFrame with station_id, year, one column per scenario and an observed flag
+        """
+        n_stations, n_years, _ = result['values'].shape
+        df = pd.DataFrame({
+            'station_id': np.repeat(result['station_ids'], n_years),
+            'year': np.tile(result['years'], n_stations)
+        })
+        flat = result['values'].reshape(n_stations * n_years, -1)
+        for i, field in enumerate(result['scenarios']):
+            df[SCENARIO_COLUMNS[field]] = flat[:, i]
+        df['observed'] = result['observed'].reshape(-1)
+        return df
@@ -4,10 +4,11 @@ Preprocessing modules for preparing coastal data.
 
 from .shapefile_converter import convert_shapefiles
 from .coastal_counties_finder import find_coastal_counties
-from .coastal_points import generate_coastal_points
+from .coastal_points import generate_coastal_points, simplify_shorelines
 
 __all__ = [
     'convert_shapefiles',
     'find_coastal_counties',
-    'generate_coastal_points'
+    'generate_coastal_points',
+    'simplify_shorelines'
 ] 
\ No newline at end of file
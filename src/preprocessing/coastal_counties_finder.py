@@ -4,9 +4,8 @@ Uses region definitions from region_mappings.yaml for proper regional processing
 """
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
-import multiprocessing as mp
-from functools import partial
 import yaml
 from pathlib import Path
 import logging
@@ -16,9 +15,17 @@ from src.config import (
     COUNTY_FILE,
     COASTAL_COUNTIES_FILE
 )
+from src.projections import GEOGRAPHIC_CRS, region_crs, reproject
+from src.imputation.structure_cache import file_digest
+from src.preprocessing.manifest import PreprocessingManifest, fingerprint, write_region_partition
+from src.preprocessing.vector_io import write_geoparquet
 
 logger = logging.getLogger(__name__)
 
+# Per-region coastal counties combined into COASTAL_COUNTIES_FILE
+COASTAL_COUNTIES_REGION_DIR = COASTAL_COUNTIES_FILE.parent / "coastal_counties_shoreline_regions"
+COASTAL_COUNTIES_STEP = 'coastal_counties_shoreline'
+
 def load_region_config():
     """Load region configuration from YAML."""
     with open(CONFIG_DIR / "region_mappings.yaml") as f:
@@ -46,38 +53,9 @@ def get_region_projection(region_name: str, region_def: dict) -> str:
         region_def: Region definition from config
     
     Returns:
-        Projection string for the region
+        The region's configured projection, or the CONUS Albers Equal Area default
     """
-    # Use region-specific projection if defined in config
-    if 'projection' in region_def:
-        return region_def['projection']
-    
-    # Default projections for specific regions
-    if region_name == 'alaska':
-        return ("+proj=aea +lat_1=55 +lat_2=65 +lat_0=50 +lon_0=-154 "
-                "+x_0=0 +y_0=0 +ellps=GRS80 +datum=NAD83 +units=m +no_defs")
-    elif region_name == 'hawaii':
-        return ("+proj=aea +lat_1=8 +lat_2=18 +lat_0=13 +lon_0=-157 "
-                "+x_0=0 +y_0=0 +ellps=GRS80 +datum=NAD83 +units=m +no_defs")
-    elif region_name == 'pacific_islands':
-        return ("+proj=aea +lat_1=0 +lat_2=20 +lat_0=10 +lon_0=160 "
-                "+x_0=0 +y_0=0 +ellps=GRS80 +datum=NAD83 +units=m +no_defs")
-    elif region_name == 'puerto_rico':
-        return ("+proj=aea +lat_1=17 +lat_2=19 +lat_0=18 +lon_0=-66.5 "
-                "+x_0=0 +y_0=0 +ellps=GRS80 +datum=NAD83 +units=m +no_defs")
-    elif region_name == 'virgin_islands':
-        return ("+proj=aea +lat_1=17 +lat_2=19 +lat_0=18 +lon_0=-64.75 "
-                "+x_0=0 +y_0=0 +ellps=GRS80 +datum=NAD83 +units=m +no_defs")
-    elif region_name == 'west_coast':
-        return ("+proj=aea +lat_1=34 +lat_2=45.5 +lat_0=40 +lon_0=-120 "
-                "+x_0=0 +y_0=0 +ellps=GRS80 +datum=NAD83 +units=m +no_defs")
-    
-    # Default to WGS84 for other regions (CONUS regions use standard Albers Equal Area)
-    return "EPSG:4326"
-
-def process_chunk(counties_chunk, ocean_shoreline_union):
-    """Process a chunk of counties in parallel."""
-    return counties_chunk[counties_chunk.geometry.intersects(ocean_shoreline_union)]
+    return region_crs(region_def)
 
 def find_coastal_counties_for_region(shoreline_gdf: gpd.GeoDataFrame, 
                                    counties: gpd.GeoDataFrame, 
@@ -85,11 +63,17 @@ def find_coastal_counties_for_region(shoreline_gdf: gpd.GeoDataFrame,
                                    region_def: dict) -> gpd.GeoDataFrame:
     """Find counties that intersect with a specific region's shoreline.
     
+    Counties are matched to shoreline segments with one bulk query of the
+    shoreline's STRtree, so the shoreline is never unioned.
+    
     Args:
         shoreline_gdf: GeoDataFrame containing the region's shoreline
         counties: GeoDataFrame containing all counties
         region_name: Name of the region being processed
         region_def: Region definition from config
+    
+    Returns:
+        GeoDataFrame of coastal counties in WGS84
     """
     logger.info(f"\nProcessing region: {region_name}")
     
@@ -110,45 +94,18 @@ def find_coastal_counties_for_region(shoreline_gdf: gpd.GeoDataFrame,
     
     # Transform to region-specific projection
     logger.info(f"Using projection: {projection}")
-    shoreline_gdf = shoreline_gdf.to_crs(projection)
-    counties = counties.to_crs(projection)
-    
-    # Create shoreline union
-    logger.info("Creating shoreline union...")
-    shoreline_union = shoreline_gdf.geometry.union_all()
-    
-    # Configure parallel processing
-    n_cores = mp.cpu_count()
-    logger.info(f"System has {n_cores} cores available")
-    
-    # For optimal performance, use slightly fewer processes
-    n_processes = min(50, n_cores - 2)
-    
-    # Calculate chunk size
-    min_chunk_size = 20
-    n_counties = len(counties)
-    chunk_size = max(min_chunk_size, n_counties // n_processes)
-    n_chunks = (n_counties + chunk_size - 1) // chunk_size
-    
-    logger.info(f"Processing with {n_processes} parallel processes")
-    logger.info(f"Splitting {n_counties} counties into {n_chunks} chunks of ~{chunk_size} counties each")
-    
-    # Split counties into chunks
-    chunks = [counties.iloc[i:i + chunk_size] for i in range(0, n_counties, chunk_size)]
+    shoreline_gdf = reproject(shoreline_gdf, projection)
+    counties = reproject(counties, projection)
     
-    # Process chunks in parallel
-    logger.info(f"Finding coastal counties using {n_processes} processes...")
-    with mp.Pool(processes=n_processes, maxtasksperchild=100) as pool:
-        process_func = partial(process_chunk, ocean_shoreline_union=shoreline_union)
-        coastal_chunks = pool.map(process_func, chunks)
+    # Bulk spatial index query: (county, shoreline segment) pairs that intersect
+    logger.info(f"Querying {len(shoreline_gdf)} shoreline features against {len(counties)} counties...")
+    county_idx, _ = shoreline_gdf.sindex.query(counties.geometry, predicate='intersects')
     
-    # Filter out empty chunks and combine results
-    coastal_chunks = [chunk for chunk in coastal_chunks if not chunk.empty]
-    if not coastal_chunks:
+    if len(county_idx) == 0:
         logger.warning(f"No coastal counties found in region {region_name}")
         return gpd.GeoDataFrame()
-        
-    coastal_counties = gpd.GeoDataFrame(pd.concat(coastal_chunks, ignore_index=True))
+    
+    coastal_counties = counties.iloc[np.unique(county_idx)].reset_index(drop=True)
     logger.info(f"Found {len(coastal_counties)} coastal counties in {region_name}")
     
     # Add region information
@@ -156,19 +113,24 @@ def find_coastal_counties_for_region(shoreline_gdf: gpd.GeoDataFrame,
     coastal_counties['region_display'] = region_def.get('display_name', region_name.replace('_', ' ').title())
     
     # Convert back to WGS84
-    if projection != "EPSG:4326":
-        coastal_counties = coastal_counties.to_crs("EPSG:4326")
+    coastal_counties = reproject(coastal_counties, GEOGRAPHIC_CRS)
     
     return coastal_counties
 
-def find_coastal_counties():
-    """Find counties that intersect with the coastline."""
+def find_coastal_counties(force: bool = False):
+    """Find counties that intersect with the coastline.
+    
+    Each region's counties are kept as a separate output, rebuilt only when the
+    region definition, its shoreline or the county geometries changed.
+    
+    Args:
+        force: Rebuild every region regardless of the preprocessing manifest
+    """
     # Load region configuration
     regions_config = load_region_config()
-    
-    # Load county geometries
-    logger.info("Loading county geometries...")
-    counties = gpd.read_parquet(COUNTY_FILE)
+    manifest = PreprocessingManifest()
+    county_digest = file_digest(COUNTY_FILE)
+    counties = None
     
     coastal_counties = []
     
@@ -183,6 +145,24 @@ def find_coastal_counties():
             logger.warning(f"Shoreline file not found for {region_name}")
             continue
         
+        inputs = {
+            'region': region_def,
+            'shoreline_digest': file_digest(region_file),
+            'county_digest': county_digest
+        }
+        region_fingerprint = fingerprint(inputs)
+        if not force and manifest.is_current(COASTAL_COUNTIES_STEP, region_name, region_fingerprint):
+            logger.info(f"Reusing coastal counties for {region_name} - inputs unchanged")
+            regional_coastal_counties = manifest.read_output(COASTAL_COUNTIES_STEP, region_name)
+            if regional_coastal_counties is not None:
+                coastal_counties.append(regional_coastal_counties)
+            continue
+        
+        # Load county geometries once, for the first region that needs them
+        if counties is None:
+            logger.info("Loading county geometries...")
+            counties = gpd.read_parquet(COUNTY_FILE)
+        
         logger.info(f"\nReading {region_name} shoreline data...")
         shoreline = gpd.read_parquet(region_file)
         
@@ -191,7 +171,13 @@ def find_coastal_counties():
             shoreline, counties, region_name, region_def
         )
         
-        if not regional_coastal_counties.empty:
+        partition = COASTAL_COUNTIES_REGION_DIR / f"{region_name}.parquet"
+        if regional_coastal_counties.empty:
+            partition.unlink(missing_ok=True)
+            manifest.record(COASTAL_COUNTIES_STEP, region_name, region_fingerprint)
+        else:
+            write_region_partition(regional_coastal_counties, partition)
+            manifest.record(COASTAL_COUNTIES_STEP, region_name, region_fingerprint, [partition])
             coastal_counties.append(regional_coastal_counties)
     
     if not coastal_counties:
@@ -209,7 +195,7 @@ def find_coastal_counties():
     logger.info(coastal_counties_gdf['region_display'].value_counts())
     
     # Save coastal counties
-    coastal_counties_gdf.to_parquet(COASTAL_COUNTIES_FILE)
+    write_geoparquet(coastal_counties_gdf, COASTAL_COUNTIES_FILE)
     logger.info(f"\nSaved to {COASTAL_COUNTIES_FILE}")
     
     return coastal_counties_gdf
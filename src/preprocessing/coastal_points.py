@@ -1,19 +1,41 @@
 """
 Generate evenly spaced reference points along the coastline for coastal counties.
-Points are spaced 5km apart using region-specific projections for accurate distances.
+Points are spaced using region-specific projections for accurate distances, as a
+nested pyramid of levels (1km, 5km and 25km by default) generated in one pass:
+every point carries the coarsest spacing that includes it in a 'level' column,
+so coarser levels are subsets of finer ones with the same point ids.
 Uses county_region_mappings.yaml for county definitions and region_mappings.yaml for projections.
 """
 
 import geopandas as gpd
-from shapely.geometry import Point, LineString
+import numpy as np
+import shapely
+from shapely.geometry import Point
 from pathlib import Path
 import yaml
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
 import argparse
 import pandas as pd
 import os
 import sys
+import time
+
+from src.imputation.data_loader import get_state_fips_to_code_mapping
+from src.config import REFERENCE_POINT_SPACINGS, SHORELINE_SIMPLIFY_TOLERANCE
+from src.imputation.structure_cache import file_digest
+from src.imputation.spatial_ops import LEVEL_COLUMN, REGION_COLUMN, assign_imputation_regions
+from src.projections import GEOGRAPHIC_CRS, reproject, utm_crs
+from src.preprocessing.manifest import (
+    PreprocessingManifest,
+    fingerprint,
+    frame_digest,
+    source_digest,
+    write_region_partition
+)
+from src.preprocessing.shoreline_simplify import SIMPLIFY_VERSION, format_report, load_simplified_shoreline
+from src.preprocessing.vector_io import read_vector, write_geoparquet
 
 # Set up logging manually
 logging.basicConfig(
@@ -25,6 +47,15 @@ logger = logging.getLogger(__name__)
 # Point spacing in meters (5km)
 POINT_SPACING_M = 5000
 
+# Shapely geometry type ids of LineString and LinearRing
+LINE_TYPE_IDS = [1, 2]
+
+# Maximum shoreline features per task when splitting regions across workers
+SHORELINE_TILE_FEATURES = 20000
+
+# Coastal counties decoded once per worker process
+_WORKER_COUNTIES = None
+
 # Define paths directly to avoid import issues
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 CONFIG_DIR = PROJECT_ROOT / "config"
@@ -44,6 +75,17 @@ SHORELINE_DIR = PROCESSED_DIR / "regional_shorelines"
 COASTAL_COUNTIES_FILE = PROCESSED_DIR / "coastal_counties.parquet"
 REFERENCE_POINTS_FILE = COUNTY_SHORELINE_REF_POINTS_DIR / "coastal_reference_points.parquet"
 
+# Per-region outputs combined into the files above, rebuilt only when their
+# inputs change (see src.preprocessing.manifest)
+COASTAL_COUNTIES_REGION_DIR = PROCESSED_DIR / "coastal_counties_regions"
+REFERENCE_POINTS_REGION_DIR = COUNTY_SHORELINE_REF_POINTS_DIR / "regions"
+COUNTIES_STEP = 'coastal_counties'
+POINTS_STEP = 'reference_points'
+
+# Bump when a code change alters the per-region outputs for identical inputs
+COUNTIES_VERSION = 1
+POINTS_VERSION = 1
+
 # Shoreline region mapping
 SHORELINE_REGION_MAP = {
     "west_coast": "Western",
@@ -74,27 +116,10 @@ def get_region_projection(region_name: str, region_def: dict) -> str:
         region_def: Region definition dictionary
         
     Returns:
-        EPSG code for the region's UTM zone
+        EPSG code for the UTM zone at the center of the region
     """
-    bounds = region_def.get('bounds', {})
-    # Default to center of region for UTM zone calculation
-    center_lon = (bounds.get('min_lon', -98) + bounds.get('max_lon', -80)) / 2
-    
-    # Calculate UTM zone from longitude (simplified)
-    utm_zone = int((center_lon + 180) // 6) + 1
-    
-    # North/South UTM
-    center_lat = (bounds.get('min_lat', 25) + bounds.get('max_lat', 45)) / 2
-    hem = "north" if center_lat >= 0 else "south"
-    
-    logger.info(f"Using UTM zone {utm_zone}{hem} for {region_name}")
-    
-    # EPSG code for UTM zone
-    if hem == "north":
-        epsg = f"EPSG:{32600 + utm_zone}"
-    else:
-        epsg = f"EPSG:{32700 + utm_zone}"
-    
+    epsg = utm_crs(region_def.get('bounds', {}))
+    logger.info(f"Using UTM projection {epsg} for {region_name}")
     return epsg
 
 def load_county_mappings():
@@ -113,7 +138,7 @@ def load_census_counties():
     if not Path(CENSUS_COUNTY_SHAPEFILE).exists():
         raise FileNotFoundError(f"Census county file not found: {CENSUS_COUNTY_SHAPEFILE}")
     
-    counties = gpd.read_file(CENSUS_COUNTY_SHAPEFILE)
+    counties = read_vector(CENSUS_COUNTY_SHAPEFILE)
     logger.info(f"Loaded {len(counties)} counties from Census data")
     
     return counties
@@ -154,7 +179,7 @@ def process_shoreline(region_name):
     for shapefile in shapefiles:
         try:
             logger.info(f"Loading shapefile: {shapefile.name}")
-            gdf = gpd.read_file(shapefile)
+            gdf = read_vector(shapefile, columns=[], cache=False)
             
             # Check if it's empty
             if gdf.empty:
@@ -184,16 +209,77 @@ def process_shoreline(region_name):
     
     # Create output file
     output_file = SHORELINE_DIR / f"{region_name}.parquet"
-    shoreline_gdf.to_parquet(output_file, compression='snappy', index=False)
+    write_geoparquet(shoreline_gdf, output_file, index=False)
     logger.info(f"Saved processed shoreline to {output_file}")
     
     return output_file
 
-def generate_coastal_counties(region_filter=None):
+def build_region_counties(counties_gdf: gpd.GeoDataFrame,
+                          region_name: str,
+                          region_def: dict) -> Optional[gpd.GeoDataFrame]:
+    """Select a region's coastal counties from the Census county geometries.
+    
+    Args:
+        counties_gdf: Census county geometries
+        region_name: Name of the region
+        region_def: Region definition from county_region_mappings.yaml
+        
+    Returns:
+        GeoDataFrame of the region's coastal counties, or None if there are none
+    """
+    logger.info(f"Processing region: {region_name}")
+    
+    region_counties = region_def.get("counties", [])
+    if not region_counties:
+        logger.warning(f"No counties defined for region: {region_name}")
+        return None
+    
+    # Extract FIPS codes for this region
+    county_fips_list = [county.get("fips") for county in region_counties]
+    county_names = {county.get("fips"): county.get("name") for county in region_counties}
+    
+    logger.info(f"Found {len(county_fips_list)} counties in region definition")
+    
+    # Convert county FIPS to match Census GEOID format if needed
+    formatted_fips = []
+    for fips in county_fips_list:
+        if fips and len(fips) == 5:  # Already in correct format
+            formatted_fips.append(fips)
+        else:
+            logger.warning(f"Invalid FIPS code format: {fips}")
+    
+    # Filter counties by FIPS
+    region_counties_gdf = counties_gdf[counties_gdf["GEOID"].isin(formatted_fips)].copy()
+    
+    if len(region_counties_gdf) == 0:
+        logger.warning(f"No counties found in Census data for region: {region_name}")
+        return None
+    
+    logger.info(f"Found {len(region_counties_gdf)} matching counties in Census data")
+    
+    # Add region information
+    region_counties_gdf["region"] = region_name
+    region_counties_gdf["region_display"] = region_def.get("name", region_name)
+    
+    # Add county names from our mapping
+    region_counties_gdf["county_name"] = region_counties_gdf["GEOID"].map(county_names)
+    region_counties_gdf["county_fips"] = region_counties_gdf["GEOID"]
+    
+    return region_counties_gdf
+
+def generate_coastal_counties(region_filter=None,
+                              manifest: Optional[PreprocessingManifest] = None,
+                              force: bool = False):
     """Generate coastal counties from predefined list.
     
+    Each region's counties are kept as a separate output, rebuilt only when the
+    region's section of county_region_mappings.yaml or the Census county
+    shapefile changed; the combined file is assembled from these outputs.
+    
     Args:
         region_filter: Optional region name to filter processing
+        manifest: Preprocessing manifest (defaults to PREPROCESSING_MANIFEST)
+        force: Rebuild every region regardless of the manifest
     
     Returns:
         GeoDataFrame of coastal counties
@@ -213,53 +299,43 @@ def generate_coastal_counties(region_filter=None):
         else:
             regions_to_process = region_config
         
-        # Load Census county geometries
-        counties_gdf = load_census_counties()
+        # Fingerprint each region's inputs
+        manifest = manifest or PreprocessingManifest()
+        census_digest = source_digest(CENSUS_COUNTY_SHAPEFILE)
+        region_inputs = {
+            region_name: {'version': COUNTIES_VERSION, 'region': region_def, 'census_digest': census_digest}
+            for region_name, region_def in regions_to_process.items()
+        }
+        fingerprints = {region_name: fingerprint(inputs) for region_name, inputs in region_inputs.items()}
+        stale = list(fingerprints) if force else manifest.stale_regions(COUNTIES_STEP, fingerprints)
+        logger.info(f"Coastal counties: rebuilding {len(stale)} of {len(fingerprints)} regions")
+        
+        # Load Census county geometries, only if a region needs them
+        counties_gdf = load_census_counties() if stale else None
         
         # Process each region and collect counties
         all_coastal_counties = []
         
         for region_name, region_def in regions_to_process.items():
-            logger.info(f"Processing region: {region_name}")
-            
-            region_counties = region_def.get("counties", [])
-            if not region_counties:
-                logger.warning(f"No counties defined for region: {region_name}")
-                continue
-            
-            # Extract FIPS codes for this region
-            county_fips_list = [county.get("fips") for county in region_counties]
-            county_names = {county.get("fips"): county.get("name") for county in region_counties}
-            
-            logger.info(f"Found {len(county_fips_list)} counties in region definition")
-            
-            # Convert county FIPS to match Census GEOID format if needed
-            formatted_fips = []
-            for fips in county_fips_list:
-                if fips and len(fips) == 5:  # Already in correct format
-                    formatted_fips.append(fips)
+            if region_name not in stale:
+                logger.info(f"Reusing coastal counties for {region_name} - inputs unchanged")
+                region_counties_gdf = manifest.read_output(COUNTIES_STEP, region_name)
+            else:
+                region_counties_gdf = build_region_counties(counties_gdf, region_name, region_def)
+                
+                partition = COASTAL_COUNTIES_REGION_DIR / f"{region_name}.parquet"
+                if region_counties_gdf is None:
+                    partition.unlink(missing_ok=True)
+                    outputs = []
                 else:
-                    logger.warning(f"Invalid FIPS code format: {fips}")
-            
-            # Filter counties by FIPS
-            region_counties_gdf = counties_gdf[counties_gdf["GEOID"].isin(formatted_fips)].copy()
-            
-            if len(region_counties_gdf) == 0:
-                logger.warning(f"No counties found in Census data for region: {region_name}")
-                continue
-            
-            logger.info(f"Found {len(region_counties_gdf)} matching counties in Census data")
-            
-            # Add region information
-            region_counties_gdf["region"] = region_name
-            region_counties_gdf["region_display"] = region_def.get("name", region_name)
-            
-            # Add county names from our mapping
-            region_counties_gdf["county_name"] = region_counties_gdf["GEOID"].map(county_names)
-            region_counties_gdf["county_fips"] = region_counties_gdf["GEOID"]
+                    write_region_partition(region_counties_gdf, partition)
+                    outputs = [partition]
+                manifest.record(COUNTIES_STEP, region_name, fingerprints[region_name], outputs,
+                                {'census_digest': census_digest})
             
             # Add to collection
-            all_coastal_counties.append(region_counties_gdf)
+            if region_counties_gdf is not None:
+                all_coastal_counties.append(region_counties_gdf)
         
         if not all_coastal_counties:
             logger.error("No coastal counties found for any region")
@@ -285,7 +361,7 @@ def generate_coastal_counties(region_filter=None):
         os.makedirs(output_file.parent, exist_ok=True)
         
         # Save to file
-        coastal_counties_gdf.to_parquet(output_file, compression="snappy", index=False)
+        write_geoparquet(coastal_counties_gdf, output_file, index=False)
         logger.info(f"Saved coastal counties to {output_file}")
         
         return coastal_counties_gdf
@@ -294,52 +370,104 @@ def generate_coastal_counties(region_filter=None):
         logger.error(f"Error generating coastal counties: {str(e)}")
         raise
 
-def create_reference_points(line: LineString, spacing: float = POINT_SPACING_M) -> List[Point]:
-    """Create evenly spaced points along a linestring.
+def shoreline_lines(geometries: np.ndarray) -> np.ndarray:
+    """Split shoreline geometries into their non-empty LineString parts.
     
     Args:
-        line: LineString to create points along
-        spacing: Spacing between points in projected units (meters)
+        geometries: Array of shoreline geometries (LineStrings and MultiLineStrings)
         
     Returns:
-        List of Points spaced evenly along the line
+        Array of LineStrings
     """
-    # Skip if line is empty
-    if line.is_empty:
-        return []
+    parts = shapely.get_parts(geometries)
+    is_line = np.isin(shapely.get_type_id(parts), LINE_TYPE_IDS) & ~shapely.is_empty(parts)
+    if not is_line.all():
+        logger.warning(f"Skipping {(~is_line).sum()} non-line shoreline geometries")
+    return parts[is_line]
+
+def interpolation_distances(lengths: np.ndarray, spacing: float = POINT_SPACING_M) -> tuple:
+    """Get the distances of evenly spaced points along lines of the given lengths.
     
-    # Get length of line
-    length = line.length
+    Each line gets max(1, int(length / spacing)) points, starting at its first vertex.
     
-    # Calculate number of points to create
-    n_points = max(1, int(length / spacing))
+    Args:
+        lengths: Length of each line in projected units (meters)
+        spacing: Spacing between points in projected units (meters)
+        
+    Returns:
+        Tuple of (line index, distance along the line) arrays, one entry per point
+    """
+    counts = np.maximum(1, (lengths / spacing).astype(np.int64))
+    line_idx = np.repeat(np.arange(len(lengths)), counts)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    return line_idx, (np.arange(len(line_idx)) - starts) * spacing
+
+def pyramid_distances(lengths: np.ndarray, spacings: List[float]) -> tuple:
+    """Get nested point distances along lines for several spacings at once.
+    
+    Points are placed at the finest spacing. A point belongs to a coarser level
+    when it falls on that level's spacing and within the level's point count
+    (as given by interpolation_distances()), so each level holds exactly the
+    points a single-spacing run would produce and coarser levels are subsets of
+    finer ones.
     
-    # Create evenly spaced points along the line
-    points = []
-    for i in range(n_points):
-        distance = i * spacing
-        # Get point at distance along line
-        if distance > length:
-            break
-        point = line.interpolate(distance)
-        points.append(point)
+    Args:
+        lengths: Length of each line in projected units (meters)
+        spacings: Level spacings, each an integer multiple of the previous one
+        
+    Returns:
+        Tuple of (line index, distance along the line, level) arrays, where the
+        level is the coarsest spacing that includes the point
+    """
+    spacings = sorted(spacings)
+    for finer, coarser in zip(spacings, spacings[1:]):
+        if coarser % finer:
+            raise ValueError(f"Pyramid spacings must be multiples of each other, got {finer} and {coarser}")
+    
+    finest = spacings[0]
+    line_idx, distances = interpolation_distances(lengths, finest)
+    steps = np.rint(distances / finest).astype(np.int64)
+    level = np.full(len(line_idx), finest, dtype=np.int64)
+    for spacing in spacings[1:]:
+        ratio = int(spacing // finest)
+        counts = np.maximum(1, (lengths / spacing).astype(np.int64))[line_idx]
+        level[(steps % ratio == 0) & (steps // ratio < counts)] = spacing
+    return line_idx, distances, level
+
+def create_reference_points(line, spacing: float = POINT_SPACING_M) -> List[Point]:
+    """Create evenly spaced points along a linestring.
     
-    return points
+    Args:
+        line: LineString (or MultiLineString) to create points along
+        spacing: Spacing between points in projected units (meters)
+        
+    Returns:
+        List of Points spaced evenly along the line
+    """
+    lines = shoreline_lines(np.array([line], dtype=object))
+    line_idx, distances = interpolation_distances(shapely.length(lines), spacing)
+    return list(shapely.line_interpolate_point(lines[line_idx], distances))
 
 def process_region(shoreline_gdf: gpd.GeoDataFrame, 
                   counties: gpd.GeoDataFrame, 
                   region_name: str,
-                  region_def: dict) -> List[Dict]:
+                  region_def: dict,
+                  spacings: Optional[List[float]] = None) -> gpd.GeoDataFrame:
     """Process a region to create reference points.
     
+    Points along all shoreline segments are interpolated in one vectorized call
+    and assigned to counties with a single spatial join.
+    
     Args:
         shoreline_gdf: GeoDataFrame with shoreline geometries for the region
         counties: GeoDataFrame with coastal counties
         region_name: Name of the region
         region_def: Configuration for the region
+        spacings: Pyramid level spacings in meters (defaults to POINT_SPACING_M only)
         
     Returns:
-        List of dictionaries with reference point information
+        GeoDataFrame of reference points in WGS84 with county, region and
+        pyramid level information
     """
     logger.info(f"Processing {len(shoreline_gdf)} shoreline features for {region_name}")
     
@@ -351,67 +479,256 @@ def process_region(shoreline_gdf: gpd.GeoDataFrame,
     
     if len(region_counties) == 0:
         logger.warning(f"No coastal counties found for {region_name}")
-        return []
+        return gpd.GeoDataFrame(geometry=[], crs="EPSG:4326")
         
     logger.info(f"Found {len(region_counties)} counties in {region_name}")
     
     # Reproject shoreline and counties to regional projection
-    shoreline_projected = shoreline_gdf.to_crs(region_proj)
-    counties_projected = region_counties.to_crs(region_proj)
+    shoreline_projected = reproject(shoreline_gdf, region_proj)
+    counties_projected = reproject(region_counties[['county_fips', 'county_name', 'geometry']], region_proj)
+    
+    # Interpolate points along every shoreline segment at once
+    lines = shoreline_lines(shoreline_projected.geometry.to_numpy())
+    line_idx, distances, levels = pyramid_distances(shapely.length(lines), spacings or [POINT_SPACING_M])
+    points_gdf = gpd.GeoDataFrame(
+        {LEVEL_COLUMN: levels},
+        geometry=shapely.line_interpolate_point(lines[line_idx], distances),
+        crs=region_proj
+    )
+    logger.info(f"Interpolated {len(points_gdf)} points along {len(lines)} shoreline segments")
+    
+    # Keep points within a county
+    joined = gpd.sjoin(points_gdf, counties_projected, how='inner', predicate='within')
+    joined = joined.sort_index().drop(columns='index_right').reset_index(drop=True)
+    
+    reference_points = reproject(joined, GEOGRAPHIC_CRS)
+    reference_points['region'] = region_name
+    reference_points['region_display'] = region_def.get('name', region_name)
+    reference_points = reference_points[['geometry', 'county_fips', 'county_name', 'region', 'region_display', LEVEL_COLUMN]]
     
-    # Create reference points
-    reference_points = []
+    logger.info(f"Created {len(reference_points)} reference points for {region_name}")
+    return reference_points
+
+def region_shoreline_file(region_name: str) -> Optional[Path]:
+    """Get a region's shoreline parquet, converting it from the source shapefiles if needed.
     
-    # Process each shoreline segment
-    for i, row in shoreline_projected.iterrows():
-        line = row['geometry']
-        if not isinstance(line, LineString):
-            logger.warning(f"Skipping non-LineString geometry: {type(line)}")
-            continue
-            
-        # Create points along shoreline
-        points = create_reference_points(line, POINT_SPACING_M)
+    Args:
+        region_name: Name of the region
         
-        if not points:
-            continue
-            
-        # Convert points to GeoSeries for spatial join
-        points_gdf = gpd.GeoDataFrame(geometry=points, crs=region_proj)
+    Returns:
+        Path to the regional shoreline, or None if unavailable
+    """
+    region_file = SHORELINE_DIR / f"{region_name}.parquet"
+    
+    # If shoreline file doesn't exist, try to process it from shapefiles
+    if not region_file.exists():
+        logger.info(f"Shoreline file not found: {region_file}")
+        logger.info(f"Attempting to process shoreline from source shapefiles...")
+        
+        region_file = process_shoreline(region_name)
+        if region_file is None or not region_file.exists():
+            logger.warning(f"Failed to process shoreline for {region_name}")
+            return None
+    return region_file
+
+def load_region_shoreline(region_name: str,
+                          region_def: Optional[dict] = None,
+                          simplify: bool = True) -> Tuple[Optional[gpd.GeoDataFrame], Optional[dict]]:
+    """Load a region's shoreline, simplified in the region's projection by default.
+    
+    Args:
+        region_name: Name of the region
+        region_def: Region definition dictionary (required to simplify)
+        simplify: Whether to load the cached topology-preserving simplification
         
-        # Spatial join with counties
-        joined = gpd.sjoin(points_gdf, counties_projected, how='left', predicate='within')
+    Returns:
+        Tuple of (GeoDataFrame of shoreline geometries, or None if unavailable,
+        and the simplification report, or None if not simplified)
+    """
+    region_file = region_shoreline_file(region_name)
+    if region_file is None:
+        return None, None
+    
+    logger.info(f"Loading shoreline for {region_name}...")
+    try:
+        if simplify and region_def is not None:
+            return load_simplified_shoreline(
+                region_name, region_file, get_region_projection(region_name, region_def)
+            )
+        return gpd.read_parquet(region_file), None
+    except Exception as e:
+        logger.error(f"Error loading shoreline for {region_name}: {str(e)}")
+        return None, None
+
+def simplify_shorelines(region_filter=None) -> List[dict]:
+    """Simplify regional shorelines into the shoreline cache and report the reduction.
+    
+    Args:
+        region_filter: Optional region name to filter processing (e.g., 'west_coast')
         
-        # Process each point
-        for j, point_row in joined.iterrows():
-            # Skip points not within any county
-            if pd.isna(point_row.get('index_right')):
-                continue
-                
-            # Create reference point dictionary
-            reference_point = {
-                'geometry': point_row['geometry'],
-                'county_fips': point_row['county_fips'],
-                'county_name': point_row['county_name'],
-                'region': region_name,
-                'region_display': region_def.get('name', region_name)
-            }
-            
-            reference_points.append(reference_point)
+    Returns:
+        List of simplification reports, one per region with a shoreline
+    """
+    regions_config = load_region_config()
+    if region_filter and region_filter not in regions_config:
+        available_regions = ", ".join(regions_config.keys())
+        raise ValueError(f"Invalid region: {region_filter}. Available regions: {available_regions}")
+    
+    reports = []
+    for region_name in [region_filter] if region_filter else list(regions_config.keys()):
+        _, report = load_region_shoreline(region_name, regions_config[region_name])
+        if report is not None:
+            reports.append(report)
+    
+    logger.info("\nShoreline simplification:\n" + format_report(reports))
+    return reports
+
+def tile_shoreline(shoreline: gpd.GeoDataFrame,
+                   tile_features: int = SHORELINE_TILE_FEATURES) -> List[gpd.GeoDataFrame]:
+    """Split a shoreline into spatially compact tiles of at most tile_features features.
     
-    logger.info(f"Created {len(reference_points)} reference points for {region_name}")
-    return reference_points
+    Features are ordered along a Hilbert curve, so each tile covers a compact
+    stretch of coast.
+    
+    Args:
+        shoreline: Shoreline GeoDataFrame
+        tile_features: Maximum number of features per tile
+        
+    Returns:
+        List of shoreline GeoDataFrames
+    """
+    if len(shoreline) <= tile_features:
+        return [shoreline]
+    order = np.argsort(shoreline.geometry.hilbert_distance().to_numpy(), kind='stable')
+    return [shoreline.iloc[order[i:i + tile_features]] for i in range(0, len(shoreline), tile_features)]
+
+def pack_geometries(gdf: gpd.GeoDataFrame) -> Dict:
+    """Pack a GeoDataFrame as WKB buffers and plain columns for cheap pickling.
+    
+    Args:
+        gdf: GeoDataFrame to pack
+        
+    Returns:
+        Dictionary with 'wkb', 'crs' and 'columns' entries
+    """
+    return {
+        'wkb': shapely.to_wkb(gdf.geometry.to_numpy()),
+        'crs': gdf.crs.to_wkt() if gdf.crs is not None else None,
+        'columns': {c: gdf[c].to_numpy() for c in gdf.columns if c != gdf.geometry.name}
+    }
+
+def unpack_geometries(packed: Dict) -> gpd.GeoDataFrame:
+    """Rebuild a GeoDataFrame packed by pack_geometries()."""
+    return gpd.GeoDataFrame(
+        packed['columns'],
+        geometry=shapely.from_wkb(packed['wkb']),
+        crs=packed['crs']
+    )
+
+def _init_worker(packed_counties: Dict):
+    """Decode the shared county geometries once per worker process."""
+    global _WORKER_COUNTIES
+    _WORKER_COUNTIES = unpack_geometries(packed_counties)
+
+def _process_tile(task: Dict) -> Dict:
+    """Generate reference points for one shoreline tile against the shared counties."""
+    start = time.perf_counter()
+    shoreline = unpack_geometries(task['shoreline'])
+    points = process_region(shoreline, _WORKER_COUNTIES, task['region'], task['region_def'], task.get('spacings'))
+    return {'region': task['region'], 'points': points, 'seconds': time.perf_counter() - start}
 
-def generate_coastal_points(region_filter=None) -> gpd.GeoDataFrame:
+def run_region_tiles(tasks: List[Dict], packed_counties: Dict, workers: int = 1) -> List[Dict]:
+    """Run shoreline tile tasks, in a process pool when workers > 1.
+    
+    Args:
+        tasks: Tile tasks with 'region', 'region_def', packed 'shoreline' and
+            optional pyramid 'spacings'
+        packed_counties: Coastal counties packed by pack_geometries()
+        workers: Number of worker processes
+        
+    Returns:
+        One result per task, in task order, with 'region', 'points' (None if the
+        tile failed) and 'seconds'
+    """
+    if workers <= 1:
+        _init_worker(packed_counties)
+        futures = None
+    else:
+        logger.info(f"Processing {len(tasks)} shoreline tiles with {workers} workers")
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(packed_counties,))
+        futures = [executor.submit(_process_tile, task) for task in tasks]
+    
+    results = []
+    try:
+        for i, task in enumerate(tasks):
+            try:
+                results.append(_process_tile(task) if futures is None else futures[i].result())
+            except Exception as e:
+                logger.error(f"Error processing region {task['region']}: {str(e)}")
+                results.append({'region': task['region'], 'points': None, 'seconds': 0.0})
+    finally:
+        if futures is not None:
+            executor.shutdown()
+    return results
+
+def region_points_inputs(region_name: str,
+                         region_def: dict,
+                         shoreline_file: Path,
+                         counties: gpd.GeoDataFrame,
+                         spacings: List[float],
+                         simplify: bool) -> Dict:
+    """Collect the inputs a region's reference points are generated from.
+    
+    Args:
+        region_name: Name of the region
+        region_def: Region definition from region_mappings.yaml
+        shoreline_file: Regional shoreline parquet
+        counties: Coastal counties of all regions
+        spacings: Pyramid level spacings in meters
+        simplify: Whether the simplified shoreline is used
+        
+    Returns:
+        JSON-serializable inputs for fingerprint()
+    """
+    region_counties = counties[counties['region'] == region_name]
+    return {
+        'version': POINTS_VERSION,
+        'region': region_def,
+        'shoreline_digest': file_digest(shoreline_file),
+        'counties_digest': frame_digest(region_counties[['county_fips', 'county_name', 'geometry']]),
+        'spacings': [float(spacing) for spacing in spacings],
+        'simplify': {'version': SIMPLIFY_VERSION, 'tolerance': SHORELINE_SIMPLIFY_TOLERANCE} if simplify else None
+    }
+
+def generate_coastal_points(region_filter=None,
+                            workers: int = 1,
+                            simplify: bool = True,
+                            spacings: Optional[List[float]] = None,
+                            force: bool = False) -> gpd.GeoDataFrame:
     """Generate reference points along the coastline for each coastal county.
-    Points are spaced 5km apart using region-specific projections.
+    Points are spaced using region-specific projections, as a nested pyramid
+    of levels (1, 5 and 25km by default) in a single pass.
+    
+    Regions, and tiles of large regions, are independent and can be processed
+    by a pool of worker processes. Each region's points are kept as a separate
+    output and regenerated only when the region's definition, shoreline,
+    coastal counties, spacings or simplification changed; the combined file
+    is assembled from these outputs.
     
     Args:
         region_filter: Optional region name to filter processing (e.g., 'west_coast')
+        workers: Number of worker processes (1 processes tiles in this process)
+        simplify: Whether to use the simplified shorelines (see shoreline_simplify)
+        spacings: Pyramid level spacings in meters (defaults to REFERENCE_POINT_SPACINGS)
+        force: Regenerate every region regardless of the preprocessing manifest
         
     Returns:
-        GeoDataFrame containing reference points with county and region metadata
+        GeoDataFrame containing reference points with county, region and level
+        metadata; the points of a level are those with level >= its spacing
     """
     try:
+        spacings = sorted(spacings or REFERENCE_POINT_SPACINGS)
+        
         # Load region configuration
         regions_config = load_region_config()
         
@@ -420,31 +737,23 @@ def generate_coastal_points(region_filter=None) -> gpd.GeoDataFrame:
             available_regions = ", ".join(regions_config.keys())
             raise ValueError(f"Invalid region: {region_filter}. Available regions: {available_regions}")
         
-        # Load coastal counties from file or generate them
+        # Coastal counties, rebuilt for regions whose county mappings changed
         logger.info("Loading coastal counties...")
-        
-        # First check if there's a region-specific coastal counties file
-        if region_filter:
+        manifest = PreprocessingManifest()
+        if Path(CENSUS_COUNTY_SHAPEFILE).exists():
+            counties = generate_coastal_counties(region_filter=region_filter, manifest=manifest, force=force)
+        else:
+            # Without the Census source the existing coastal counties cannot be checked
+            logger.warning(f"Census county file not found, using existing coastal counties: {COASTAL_COUNTIES_FILE}")
             region_counties_file = COASTAL_COUNTIES_FILE.parent / f"coastal_counties_{region_filter}.parquet"
-            if region_counties_file.exists():
-                logger.info(f"Found region-specific coastal counties file: {region_counties_file}")
+            if region_filter and region_counties_file.exists():
                 counties = gpd.read_parquet(region_counties_file)
-            else:
-                # Try to use the main coastal counties file or generate new ones
-                if not COASTAL_COUNTIES_FILE.exists():
-                    logger.info("Generating coastal counties from predefined list...")
-                    counties = generate_coastal_counties(region_filter=region_filter)
-                else:
-                    # Load the main file and filter by region
-                    counties = gpd.read_parquet(COASTAL_COUNTIES_FILE)
-                    counties = counties[counties['region'] == region_filter]
-        else:
-            # No region filter, use the main coastal counties file or generate new ones
-            if not COASTAL_COUNTIES_FILE.exists():
-                logger.info("Generating coastal counties from predefined list...")
-                counties = generate_coastal_counties()
-            else:
+            elif COASTAL_COUNTIES_FILE.exists():
                 counties = gpd.read_parquet(COASTAL_COUNTIES_FILE)
+            else:
+                raise FileNotFoundError(f"Census county file not found: {CENSUS_COUNTY_SHAPEFILE}")
+            if region_filter:
+                counties = counties[counties['region'] == region_filter]
         
         if counties.empty:
             logger.error("No coastal counties found")
@@ -452,58 +761,83 @@ def generate_coastal_points(region_filter=None) -> gpd.GeoDataFrame:
         
         logger.info(f"Loaded {len(counties)} coastal counties")
         
-        region_gdfs = []
-        
-        # Process each region from config, or just the filtered region
-        regions_to_process = [region_filter] if region_filter else regions_config.keys()
-        
+        # Split each stale region's shoreline into tiles of work
+        regions_to_process = [region_filter] if region_filter else list(regions_config.keys())
+        fingerprints = {}
+        region_points = {}
+        tasks = []
+        simplification_reports = []
         for region_name in regions_to_process:
-            region_def = regions_config[region_name]
-            logger.info(f"\n{'='*80}")
-            logger.info(f"Processing region: {region_name}")
-            logger.info(f"{'='*80}")
+            shoreline_file = region_shoreline_file(region_name)
+            if shoreline_file is None:
+                continue
+            inputs = region_points_inputs(
+                region_name, regions_config[region_name], shoreline_file, counties, spacings, simplify
+            )
+            fingerprints[region_name] = fingerprint(inputs)
+            if not force and manifest.is_current(POINTS_STEP, region_name, fingerprints[region_name]):
+                logger.info(f"Reusing reference points for {region_name} - inputs unchanged")
+                region_points[region_name] = manifest.read_output(POINTS_STEP, region_name)
+                continue
             
-            region_file = SHORELINE_DIR / f"{region_name}.parquet"
+            shoreline, report = load_region_shoreline(region_name, regions_config[region_name], simplify=simplify)
+            if shoreline is None:
+                continue
+            if report is not None:
+                simplification_reports.append(report)
+            tiles = tile_shoreline(shoreline)
+            logger.info(f"Queued {region_name}: {len(shoreline)} shoreline features in {len(tiles)} tiles")
+            tasks.extend(
+                {
+                    'region': region_name,
+                    'region_def': regions_config[region_name],
+                    'shoreline': pack_geometries(tile),
+                    'spacings': spacings
+                }
+                for tile in tiles
+            )
+        if simplification_reports:
+            logger.info("\nShoreline simplification:\n" + format_report(simplification_reports))
+        
+        # County geometries are sent to each worker once, as WKB
+        packed_counties = pack_geometries(counties[['county_fips', 'county_name', 'region', 'geometry']])
+        results = run_region_tiles(tasks, packed_counties, workers) if tasks else []
+        
+        for region_name in dict.fromkeys(r['region'] for r in results):
+            region_results = [r for r in results if r['region'] == region_name]
+            if any(r['points'] is None for r in region_results):
+                logger.error(f"Skipping region {region_name} after a failed shoreline tile")
+                manifest.forget(POINTS_STEP, region_name)
+                continue
             
-            # If shoreline file doesn't exist, try to process it from shapefiles
-            if not region_file.exists():
-                logger.info(f"Shoreline file not found: {region_file}")
-                logger.info(f"Attempting to process shoreline from source shapefiles...")
-                
-                region_file = process_shoreline(region_name)
-                if region_file is None or not region_file.exists():
-                    logger.warning(f"Failed to process shoreline for {region_name}")
-                    continue
+            region_gdf = pd.concat([r['points'] for r in region_results], ignore_index=True)
+            seconds = sum(r['seconds'] for r in region_results)
+            logger.info(f"{region_name}: {len(region_gdf)} points from {len(region_results)} tiles in {seconds:.1f}s")
             
-            # Load regional shoreline
-            logger.info(f"Loading shoreline for {region_name}...")
-            try:
-                shoreline = gpd.read_parquet(region_file)
-            except Exception as e:
-                logger.error(f"Error loading shoreline for {region_name}: {str(e)}")
+            partition = REFERENCE_POINTS_REGION_DIR / f"{region_name}.parquet"
+            if region_gdf.empty:
+                logger.warning(f"No points generated for {region_name}")
+                partition.unlink(missing_ok=True)
+                manifest.record(POINTS_STEP, region_name, fingerprints[region_name], [])
                 continue
-            
-            # Process this region
-            try:
-                region_points = process_region(shoreline, counties, region_name, region_def)
-                if not region_points:
-                    logger.warning(f"No points generated for {region_name}")
-                    continue
-                    
-                region_gdf = pd.DataFrame(region_points)
-                region_gdf = gpd.GeoDataFrame(region_gdf, geometry='geometry', crs="EPSG:4326")
-                
-                # Log region bounds
-                bounds = region_gdf.total_bounds
-                logger.info("\nRegion bounds (WGS84):")
-                logger.info(f"Longitude min/max: {bounds[0]:.2f}, {bounds[2]:.2f}")
-                logger.info(f"Latitude min/max: {bounds[1]:.2f}, {bounds[3]:.2f}")
-                
-                region_gdfs.append(region_gdf)
-                logger.info(f"Added {len(region_gdf)} points for {region_name}")
-            except Exception as e:
-                logger.error(f"Error processing region {region_name}: {str(e)}")
+            write_region_partition(region_gdf, partition)
+            manifest.record(POINTS_STEP, region_name, fingerprints[region_name], [partition],
+                            {'spacings': spacings, 'simplify': simplify})
+            region_points[region_name] = region_gdf
+        
+        region_gdfs = []
+        for region_name in regions_to_process:
+            region_gdf = region_points.get(region_name)
+            if region_gdf is None:
                 continue
+            
+            # Log region bounds
+            bounds = region_gdf.total_bounds
+            logger.info(f"\n{region_name} bounds (WGS84):")
+            logger.info(f"Longitude min/max: {bounds[0]:.2f}, {bounds[2]:.2f}")
+            logger.info(f"Latitude min/max: {bounds[1]:.2f}, {bounds[3]:.2f}")
+            
+            region_gdfs.append(region_gdf)
         
         # Combine all regions (or just the filtered region if specified)
         if not region_gdfs:
@@ -525,6 +859,9 @@ def generate_coastal_points(region_filter=None) -> gpd.GeoDataFrame:
         os.makedirs(output_file.parent, exist_ok=True)
         
         logger.info(f"\nGenerated {len(points_gdf)} total reference points")
+        for spacing in spacings:
+            n_level = int((points_gdf[LEVEL_COLUMN] >= spacing).sum())
+            logger.info(f"Level {spacing / 1000:g}km: {n_level} points")
         logger.info("\nPoints by region:")
         logger.info(points_gdf['region_display'].value_counts())
         
@@ -534,8 +871,20 @@ def generate_coastal_points(region_filter=None) -> gpd.GeoDataFrame:
         logger.info(f"Longitude min/max: {bounds[0]:.2f}, {bounds[2]:.2f}")
         logger.info(f"Latitude min/max: {bounds[1]:.2f}, {bounds[3]:.2f}")
         
+        # Coordinates and imputation region membership, so imputation can filter
+        # regions with column predicates instead of spatial operations
+        points_gdf['lon'] = points_gdf.geometry.x.to_numpy()
+        points_gdf['lat'] = points_gdf.geometry.y.to_numpy()
+        state_codes = points_gdf['county_fips'].str[:2].map(get_state_fips_to_code_mapping()).to_numpy()
+        points_gdf[REGION_COLUMN] = assign_imputation_regions(
+            points_gdf['lon'].to_numpy(), points_gdf['lat'].to_numpy(), state_codes, regions_config
+        )
+        
+        # Point ids are stored, so spatially sorted rows and filtered reads keep them
+        points_gdf.index = pd.RangeIndex(len(points_gdf), name='reference_point_id')
+        
         # Save to file
-        points_gdf.to_parquet(output_file, compression='snappy', index=False)
+        write_geoparquet(points_gdf, output_file, index=True)
         logger.info(f"\nSaved reference points to {output_file}")
         
         return points_gdf
@@ -547,6 +896,16 @@ def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description='Generate coastal reference points')
     parser.add_argument('--region', type=str, help='Region to process (e.g., west_coast)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes for regions and shoreline tiles')
+    parser.add_argument('--no-simplify', action='store_true',
+                        help='Use the full-resolution shorelines instead of the simplified ones')
+    parser.add_argument('--simplify-only', action='store_true',
+                        help='Only simplify the regional shorelines and report the reduction')
+    parser.add_argument('--spacings', type=int, nargs='+', default=None,
+                        help='Pyramid level spacings in meters, each a multiple of the previous')
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate every region, even if its inputs are unchanged')
     return parser.parse_args()
 
 def main():
@@ -555,8 +914,18 @@ def main():
     args = parse_args()
     
     try:
+        if args.simplify_only:
+            simplify_shorelines(region_filter=args.region)
+            return
+        
         # Generate points for all regions or filtered region
-        generate_coastal_points(region_filter=args.region)
+        generate_coastal_points(
+            region_filter=args.region,
+            workers=args.workers,
+            simplify=not args.no_simplify,
+            spacings=args.spacings,
+            force=args.force
+        )
     except Exception as e:
         logger.error(f"Error generating coastal points: {str(e)}")
         raise
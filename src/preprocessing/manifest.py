@@ -0,0 +1,218 @@
+"""
+Manifest of per-region preprocessing outputs and the inputs they were built from.
+
+Each preprocessing step records, for every region it builds, a fingerprint of
+its inputs (the region's configuration section, digests of the source files and
+parameters such as the point spacing) and the files it wrote. A later run
+rebuilds a region only when its fingerprint changed or one of its outputs is
+missing, instead of either regenerating every region or skipping regions
+whose output file merely exists.
+
+The manifest is a single JSON file:
+
+    {"steps": {"<step>": {"<region>": {"fingerprint": ..., "outputs": [...],
+                                        "inputs": {...}, "updated": ...}}}}
+"""
+
+import hashlib
+import json
+import os
+import geopandas as gpd
+import pandas as pd
+import shapely
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+import logging
+
+from src.config import PREPROCESSING_MANIFEST
+from src.imputation.structure_cache import file_digest
+from src.preprocessing.vector_io import write_geoparquet
+
+logger = logging.getLogger(__name__)
+
+# Bump when the manifest layout changes; older manifests are then ignored
+MANIFEST_VERSION = 1
+
+# Files making up a shapefile, hashed together as one source
+SHAPEFILE_SUFFIXES = ['.shp', '.shx', '.dbf', '.prj', '.cpg']
+
+def fingerprint(inputs: Dict) -> str:
+    """
+    Compute the fingerprint of a region's inputs.
+
+    Args:
+        inputs: JSON-serializable inputs (configuration sections, file digests, parameters)
+
+    Returns:
+        Hex SHA-256 fingerprint
+    """
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+def source_digest(path: Union[str, Path]) -> str:
+    """
+    Get the digest of a source file, including the sidecar files of a shapefile.
+
+    Args:
+        path: Source file (a missing file hashes as empty)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    path = Path(path)
+    if path.suffix.lower() != '.shp':
+        return file_digest(path)
+    digest = hashlib.sha256()
+    for suffix in SHAPEFILE_SUFFIXES:
+        digest.update(suffix.encode())
+        digest.update(file_digest(path.with_suffix(suffix)).encode())
+    return digest.hexdigest()
+
+def frame_digest(gdf: gpd.GeoDataFrame) -> str:
+    """
+    Get the digest of a GeoDataFrame's attributes and geometries.
+
+    Args:
+        gdf: GeoDataFrame to hash
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    attributes = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+    digest.update(json.dumps(list(map(str, attributes.columns))).encode())
+    digest.update(pd.util.hash_pandas_object(attributes.astype(str), index=False).to_numpy().tobytes())
+    for wkb in shapely.to_wkb(gdf.geometry.to_numpy()):
+        digest.update(wkb or b'')
+    return digest.hexdigest()
+
+def write_region_partition(gdf: gpd.GeoDataFrame, path: Union[str, Path]) -> None:
+    """
+    Write a region's output, keeping its row order in the stored index.
+
+    Args:
+        gdf: Region output
+        path: Partition parquet file
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_geoparquet(gdf.reset_index(drop=True), path, index=True)
+
+class PreprocessingManifest:
+    """Per-step, per-region input fingerprints and outputs of preprocessing."""
+
+    def __init__(self, path: Union[str, Path] = PREPROCESSING_MANIFEST):
+        """
+        Load the manifest.
+
+        Args:
+            path: Manifest JSON file (created on the first record)
+        """
+        self.path = Path(path)
+        self.steps = self._read()
+
+    def _read(self) -> Dict[str, Dict[str, dict]]:
+        """Read the manifest, returning no entries if missing, invalid or outdated."""
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable preprocessing manifest {self.path}: {str(e)}")
+            return {}
+        if manifest.get('version') != MANIFEST_VERSION:
+            logger.info(f"Ignoring preprocessing manifest version {manifest.get('version')}")
+            return {}
+        return manifest.get('steps', {})
+
+    def _write(self) -> None:
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'steps': self.steps}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def entry(self, step: str, region: str) -> Optional[dict]:
+        """Get the recorded entry of a region, if any."""
+        return self.steps.get(step, {}).get(region)
+
+    def is_current(self, step: str, region: str, region_fingerprint: str) -> bool:
+        """
+        Check whether a region's recorded outputs were built from the same inputs.
+
+        Args:
+            step: Preprocessing step name
+            region: Region identifier
+            region_fingerprint: Fingerprint of the region's current inputs
+
+        Returns:
+            True if the fingerprint matches and every recorded output exists
+        """
+        entry = self.entry(step, region)
+        return (
+            entry is not None and
+            entry.get('fingerprint') == region_fingerprint and
+            all(Path(output).exists() for output in entry.get('outputs', []))
+        )
+
+    def record(self,
+               step: str,
+               region: str,
+               region_fingerprint: str,
+               outputs: Sequence[Union[str, Path]] = (),
+               inputs: Optional[Dict] = None) -> None:
+        """
+        Record a rebuilt region and save the manifest.
+
+        Saved after every region, so an interrupted run keeps the regions it finished.
+
+        Args:
+            step: Preprocessing step name
+            region: Region identifier
+            region_fingerprint: Fingerprint of the inputs the outputs were built from
+            outputs: Files written for the region (none if the region produced no data)
+            inputs: Optional readable summary of the inputs
+        """
+        self.steps.setdefault(step, {})[region] = {
+            'fingerprint': region_fingerprint,
+            'outputs': [str(output) for output in outputs],
+            'inputs': inputs or {},
+            'updated': datetime.now().isoformat(timespec='seconds')
+        }
+        self._write()
+
+    def read_output(self, step: str, region: str) -> Optional[gpd.GeoDataFrame]:
+        """
+        Read a region's recorded partition in its original row order.
+
+        Args:
+            step: Preprocessing step name
+            region: Region identifier
+
+        Returns:
+            The region's output, or None if the region produced no data
+        """
+        outputs = (self.entry(step, region) or {}).get('outputs', [])
+        if not outputs:
+            return None
+        return gpd.read_parquet(outputs[0]).sort_index().reset_index(drop=True)
+
+    def forget(self, step: str, region: str) -> None:
+        """Drop a region's entry, so the next run rebuilds it."""
+        if self.steps.get(step, {}).pop(region, None) is not None:
+            self._write()
+
+    def stale_regions(self, step: str, fingerprints: Dict[str, str]) -> List[str]:
+        """
+        Get the regions whose outputs must be rebuilt.
+
+        Args:
+            step: Preprocessing step name
+            fingerprints: Current input fingerprint of each region
+
+        Returns:
+            Regions, in the given order, without current outputs
+        """
+        return [region for region, fp in fingerprints.items() if not self.is_current(step, region, fp)]
@@ -18,6 +18,7 @@ from src.config import (
     CENSUS_COUNTY_SHAPEFILE,
     COASTAL_COUNTIES_FILE
 )
+from src.preprocessing.vector_io import read_vector, write_geoparquet
 
 # Set up logging
 logging.basicConfig(
@@ -45,7 +46,7 @@ def load_census_counties():
     if not Path(CENSUS_COUNTY_SHAPEFILE).exists():
         raise FileNotFoundError(f"Census county file not found: {CENSUS_COUNTY_SHAPEFILE}")
     
-    counties = gpd.read_file(CENSUS_COUNTY_SHAPEFILE)
+    counties = read_vector(CENSUS_COUNTY_SHAPEFILE)
     logger.info(f"Loaded {len(counties)} counties from Census data")
     
     return counties
@@ -170,7 +171,7 @@ def generate_coastal_counties(region_filter=None):
         os.makedirs(output_file.parent, exist_ok=True)
         
         # Save to file
-        coastal_counties.to_parquet(output_file, compression="snappy", index=False)
+        write_geoparquet(coastal_counties, output_file, index=False)
         logger.info(f"Saved coastal counties to {output_file}")
         
         return coastal_counties
@@ -3,9 +3,9 @@ Script to convert shapefiles to parquet format with proper coordinate system han
 Uses configuration from region_mappings.yaml for regional processing.
 """
 
-import geopandas as gpd
 import yaml
 from pathlib import Path
+from typing import Optional
 import logging
 from src.config import (
     CONFIG_DIR,
@@ -14,9 +14,15 @@ from src.config import (
     COUNTY_FILE,
     SHORELINE_DIR
 )
+from src.projections import reproject
+from .manifest import PreprocessingManifest, fingerprint, source_digest
+from .vector_io import read_vector, region_bbox, within_bounds_mask, write_geoparquet
 
 logger = logging.getLogger(__name__)
 
+# Manifest step of the regional shoreline parquet files
+SHORELINE_STEP = 'regional_shoreline'
+
 def load_region_config():
     """Load region configuration from YAML."""
     with open(CONFIG_DIR / "region_mappings.yaml") as f:
@@ -33,7 +39,7 @@ def convert_shapefile_to_parquet(shapefile_path: Path, output_path: Path, target
     """
     # Read the shapefile
     logger.info(f"Reading shapefile: {shapefile_path}")
-    gdf = gpd.read_file(shapefile_path)
+    gdf = read_vector(shapefile_path, cache=False)
     
     # Check and transform CRS if needed
     if gdf.crs is None:
@@ -48,21 +54,32 @@ def convert_shapefile_to_parquet(shapefile_path: Path, output_path: Path, target
     
     # Convert to parquet
     logger.info(f"Converting to parquet: {output_path}")
-    gdf.to_parquet(output_path)
+    write_geoparquet(gdf, output_path)
     logger.info(f"Conversion complete: {output_path}")
     return gdf
 
-def process_shared_region(shapefile_path: Path, output_dir: Path, regions_config: dict, sub_regions: list):
+def process_shared_region(shapefile_path: Path,
+                          output_dir: Path,
+                          regions_config: dict,
+                          sub_regions: list,
+                          manifest: Optional[PreprocessingManifest] = None,
+                          force: bool = False):
     """Process a shapefile that contains multiple regions.
     
+    Each sub-region decodes only the features intersecting its bounds. Sub-regions
+    whose source shapefile and region definition are unchanged since their last
+    conversion (per the preprocessing manifest) are skipped.
+    
     Args:
         shapefile_path: Path to the input shapefile
         output_dir: Directory where parquet files will be saved
         regions_config: Region configuration dictionary
         sub_regions: List of sub-regions to extract from this shapefile
+        manifest: Preprocessing manifest (defaults to PREPROCESSING_MANIFEST)
+        force: Rebuild every sub-region regardless of the manifest
     """
-    # Read the shapefile once
-    gdf = gpd.read_file(shapefile_path)
+    manifest = manifest or PreprocessingManifest()
+    shapefile_digest = source_digest(shapefile_path)
     
     # Process each sub-region
     for sub_region in sub_regions:
@@ -71,44 +88,54 @@ def process_shared_region(shapefile_path: Path, output_dir: Path, regions_config
             continue
             
         output_path = output_dir / f"{sub_region}.parquet"
-        if output_path.exists():
-            logger.info(f"\nSkipping {sub_region} - parquet file already exists")
+        bounds = regions_config[sub_region]['bounds']
+        target_crs = regions_config[sub_region].get('crs', 'EPSG:4326')
+        inputs = {
+            'source': str(shapefile_path),
+            'source_digest': shapefile_digest,
+            'bounds': bounds,
+            'crs': target_crs
+        }
+        region_fingerprint = fingerprint(inputs)
+        if not force and manifest.is_current(SHORELINE_STEP, sub_region, region_fingerprint):
+            logger.info(f"\nSkipping {sub_region} - shoreline inputs unchanged")
             continue
             
         logger.info(f"\nProcessing sub-region: {sub_region}")
-        bounds = regions_config[sub_region]['bounds']
         
-        # Filter by bounds
-        mask = (
-            (gdf.geometry.bounds.minx >= bounds['min_lon']) &
-            (gdf.geometry.bounds.maxx <= bounds['max_lon']) &
-            (gdf.geometry.bounds.miny >= bounds['min_lat']) &
-            (gdf.geometry.bounds.maxy <= bounds['max_lat'])
-        )
-        sub_gdf = gdf[mask].copy()
+        # Read only features intersecting the region, then keep those inside its bounds
+        sub_gdf = read_vector(shapefile_path, bbox=region_bbox(bounds), cache=False)
+        sub_gdf = sub_gdf[within_bounds_mask(sub_gdf, bounds)].copy()
         
         if len(sub_gdf) == 0:
             logger.warning(f"No features found within bounds for {sub_region}")
+            # An output from earlier inputs would be stale
+            output_path.unlink(missing_ok=True)
+            manifest.record(SHORELINE_STEP, sub_region, region_fingerprint, [], inputs)
             continue
             
         # Convert to target CRS if specified
-        target_crs = regions_config[sub_region].get('crs', 'EPSG:4326')
         if sub_gdf.crs != target_crs:
             logger.info(f"Converting {sub_region} from {sub_gdf.crs} to {target_crs}")
-            sub_gdf = sub_gdf.to_crs(target_crs)
+            sub_gdf = reproject(sub_gdf, target_crs)
         
-        sub_gdf.to_parquet(output_path)
+        write_geoparquet(sub_gdf, output_path)
+        manifest.record(SHORELINE_STEP, sub_region, region_fingerprint, [output_path], inputs)
         logger.info(f"Saved {sub_region} to {output_path}")
 
-def convert_regional_shorefiles(input_dir: Path, output_dir: Path):
+def convert_regional_shorefiles(input_dir: Path, output_dir: Path, force: bool = False):
     """Convert regional shoreline shapefiles to parquet format.
     
+    Only regions whose inputs changed since their last conversion are rebuilt.
+    
     Args:
         input_dir: Directory containing regional shoreline directories
         output_dir: Directory where parquet files will be saved
+        force: Rebuild every region regardless of the preprocessing manifest
     """
     # Load region configuration
     regions_config = load_region_config()
+    manifest = PreprocessingManifest()
     
     # Create output directory if it doesn't exist
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -135,7 +162,7 @@ def convert_regional_shorefiles(input_dir: Path, output_dir: Path):
             continue
             
         # Process all sub-regions from this source
-        process_shared_region(shp_files[0], output_dir, regions_config, sub_regions)
+        process_shared_region(shp_files[0], output_dir, regions_config, sub_regions, manifest, force)
     
     # Process Gulf Coast (single region)
     gulf_path = input_dir / "Gulf_Of_Mexico"
@@ -143,25 +170,28 @@ def convert_regional_shorefiles(input_dir: Path, output_dir: Path):
         shp_files = list(gulf_path.glob("*.shp"))
         if shp_files:
             output_path = output_dir / "gulf_coast.parquet"
-            if not output_path.exists():
+            inputs = {'source': str(shp_files[0]), 'source_digest': source_digest(shp_files[0])}
+            region_fingerprint = fingerprint(inputs)
+            if force or not manifest.is_current(SHORELINE_STEP, 'gulf_coast', region_fingerprint):
                 logger.info("\nProcessing region: gulf_coast")
                 convert_shapefile_to_parquet(shp_files[0], output_path)
+                manifest.record(SHORELINE_STEP, 'gulf_coast', region_fingerprint, [output_path], inputs)
             else:
-                logger.info("\nSkipping gulf_coast - parquet file already exists")
+                logger.info("\nSkipping gulf_coast - shoreline inputs unchanged")
 
 def convert_shapefiles():
     """Convert shapefiles to parquet format."""
     # Convert county shapefile
     logger.info("\nConverting county shapefile...")
     county_gdf = convert_county_shapefile()
-    county_gdf.to_parquet(COUNTY_FILE)
+    write_geoparquet(county_gdf, COUNTY_FILE)
     logger.info(f"Saved county data to {COUNTY_FILE}")
     
     # Convert shoreline shapefile
     logger.info("\nConverting shoreline shapefile...")
     shoreline_gdf = convert_shoreline_shapefile()
     shoreline_file = PROCESSED_DIR / "shoreline.parquet"
-    shoreline_gdf.to_parquet(shoreline_file)
+    write_geoparquet(shoreline_gdf, shoreline_file)
     logger.info(f"Saved shoreline data to {shoreline_file}")
     
     # Ensure regional shorelines directory exists
@@ -0,0 +1,201 @@
+"""
+Topology-preserving simplification of regional shorelines.
+
+NOAA shorelines are digitized far more finely than the 5 km reference point
+spacing needs, and every downstream step (county intersection, interpolation,
+plotting) pays for the extra vertices. Regional shorelines are simplified in
+the region's projected CRS with a tolerance tied to POINT_SPACING, keeping the
+topology of each feature.
+
+Simplified layers are cached as GeoParquet keyed by a hash of the source file
+and the tolerance, each with a JSON report of the vertex-count reduction and
+the maximum displacement (the largest Hausdorff distance between an original
+feature and its simplification).
+"""
+
+import hashlib
+import json
+import os
+import geopandas as gpd
+import numpy as np
+import shapely
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+import logging
+
+from src.config import SHORELINE_CACHE_DIR, SHORELINE_SIMPLIFY_TOLERANCE
+from src.imputation.structure_cache import file_digest
+from src.projections import reproject
+from src.preprocessing.vector_io import write_geoparquet
+
+logger = logging.getLogger(__name__)
+
+# Bump when a code change alters simplified output for identical inputs
+SIMPLIFY_VERSION = 1
+
+# Number of hex digits of the cache key used in file names
+CACHE_KEY_LENGTH = 16
+
+def simplify_geometries(geometries: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Simplify geometries without changing their topology.
+
+    Args:
+        geometries: Shapely geometries in a projected CRS
+        tolerance: Simplification tolerance in CRS units
+
+    Returns:
+        Simplified geometries
+    """
+    return shapely.simplify(geometries, tolerance, preserve_topology=True)
+
+def simplification_report(original: np.ndarray, simplified: np.ndarray) -> Dict[str, float]:
+    """
+    Summarize how much a simplification changed a set of geometries.
+
+    Args:
+        original: Original geometries in a projected CRS
+        simplified: Simplified geometries in the same CRS
+
+    Returns:
+        Dictionary with features, vertices_before, vertices_after,
+        vertex_reduction (share of vertices removed), max_displacement_m and
+        length_change (relative change of total length)
+    """
+    vertices_before = int(shapely.get_num_coordinates(original).sum())
+    vertices_after = int(shapely.get_num_coordinates(simplified).sum())
+    length_before = float(shapely.length(original).sum())
+    length_after = float(shapely.length(simplified).sum())
+    displacement = shapely.hausdorff_distance(original, simplified)
+
+    return {
+        'features': int(len(original)),
+        'vertices_before': vertices_before,
+        'vertices_after': vertices_after,
+        'vertex_reduction': 1.0 - vertices_after / vertices_before if vertices_before else 0.0,
+        'max_displacement_m': float(np.nanmax(displacement)) if len(displacement) else 0.0,
+        'length_change': length_after / length_before - 1.0 if length_before else 0.0
+    }
+
+def simplify_shoreline(shoreline: gpd.GeoDataFrame,
+                       crs: str,
+                       tolerance: float = SHORELINE_SIMPLIFY_TOLERANCE) -> Tuple[gpd.GeoDataFrame, Dict[str, float]]:
+    """
+    Simplify a shoreline in a projected CRS.
+
+    Args:
+        shoreline: Shoreline GeoDataFrame
+        crs: Projected CRS to simplify in (meters)
+        tolerance: Simplification tolerance in meters
+
+    Returns:
+        Tuple of (simplified shoreline in the input CRS, simplification report)
+    """
+    projected = reproject(shoreline, crs)
+    original = projected.geometry.to_numpy()
+    simplified = simplify_geometries(original, tolerance)
+
+    report = simplification_report(original, simplified)
+    report['tolerance_m'] = float(tolerance)
+
+    result = projected.set_geometry(gpd.GeoSeries(simplified, index=projected.index, crs=crs))
+    return reproject(result, shoreline.crs), report
+
+def simplify_for_display(shoreline: gpd.GeoDataFrame,
+                         tolerance: float = SHORELINE_SIMPLIFY_TOLERANCE) -> gpd.GeoDataFrame:
+    """
+    Simplify a shoreline for plotting, in its estimated UTM zone.
+
+    Args:
+        shoreline: Shoreline GeoDataFrame in a geographic CRS
+        tolerance: Simplification tolerance in meters
+
+    Returns:
+        Simplified shoreline in the input CRS
+    """
+    if shoreline.empty:
+        return shoreline
+    projected = reproject(shoreline, shoreline.estimate_utm_crs())
+    projected = projected.set_geometry(projected.geometry.simplify(tolerance, preserve_topology=True))
+    return reproject(projected, shoreline.crs)
+
+def simplified_key(source_file: Union[str, Path], crs: str, tolerance: float) -> str:
+    """
+    Compute the cache key of a simplified shoreline.
+
+    Args:
+        source_file: Shoreline parquet the layer is simplified from
+        crs: Projected CRS the layer is simplified in
+        tolerance: Simplification tolerance in meters
+
+    Returns:
+        Hex SHA-256 key
+    """
+    digest = hashlib.sha256()
+    digest.update(f"simplify-v{SIMPLIFY_VERSION}".encode())
+    digest.update(file_digest(source_file).encode())
+    digest.update(json.dumps({'crs': str(crs), 'tolerance': float(tolerance)}, sort_keys=True).encode())
+    return digest.hexdigest()
+
+def load_simplified_shoreline(region_name: str,
+                              source_file: Union[str, Path],
+                              crs: str,
+                              tolerance: float = SHORELINE_SIMPLIFY_TOLERANCE,
+                              cache_dir: Union[str, Path] = SHORELINE_CACHE_DIR) -> Tuple[gpd.GeoDataFrame, Dict[str, float]]:
+    """
+    Get a region's simplified shoreline, simplifying and caching it on a miss.
+
+    Args:
+        region_name: Name of the region
+        source_file: Regional shoreline parquet
+        crs: Projected CRS of the region (meters)
+        tolerance: Simplification tolerance in meters
+        cache_dir: Directory for simplified layers and their reports
+
+    Returns:
+        Tuple of (simplified shoreline, simplification report)
+    """
+    cache_dir = Path(cache_dir)
+    key = simplified_key(source_file, crs, tolerance)[:CACHE_KEY_LENGTH]
+    layer_path = cache_dir / f"{region_name}_{key}.parquet"
+    report_path = layer_path.with_suffix('.json')
+
+    if layer_path.exists() and report_path.exists():
+        logger.info(f"Using cached simplified shoreline for {region_name}: {layer_path}")
+        with open(report_path) as f:
+            return gpd.read_parquet(layer_path), json.load(f)
+
+    shoreline = gpd.read_parquet(source_file)
+    simplified, report = simplify_shoreline(shoreline, crs, tolerance)
+    report.update({'region': region_name, 'source': str(source_file), 'crs': str(crs)})
+    logger.info(f"Simplified {region_name} shoreline at {tolerance:g} m: "
+                f"{report['vertices_before']:,} -> {report['vertices_after']:,} vertices "
+                f"({report['vertex_reduction']:.1%} fewer), "
+                f"max displacement {report['max_displacement_m']:.1f} m")
+
+    # Write the layer before its report, so a report always has its layer
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = layer_path.with_name(f".{layer_path.name}.tmp")
+    write_geoparquet(simplified, tmp_path, index=False)
+    os.replace(tmp_path, layer_path)
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return simplified, report
+
+def format_report(reports: List[Dict[str, float]]) -> str:
+    """
+    Format simplification reports as a text table.
+
+    Args:
+        reports: Reports from load_simplified_shoreline()
+
+    Returns:
+        Table with one row per region
+    """
+    lines = [f"{'Region':<18}{'Features':>10}{'Vertices before':>17}{'after':>12}{'Reduction':>11}{'Max disp. (m)':>15}"]
+    for r in reports:
+        lines.append(
+            f"{r.get('region', ''):<18}{r['features']:>10,}{r['vertices_before']:>17,}"
+            f"{r['vertices_after']:>12,}{r['vertex_reduction']:>11.1%}{r['max_displacement_m']:>15.1f}"
+        )
+    return "\n".join(lines)
@@ -9,12 +9,14 @@ import logging
 import numpy as np
 import pandas as pd
 import yaml
+import shapely
 from shapely.geometry import box
 from src.config import (
     CONFIG_DIR,
     PROCESSED_DIR,
     SHORELINE_DIR
 )
+from src.preprocessing.vector_io import write_geoparquet
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,20 +27,6 @@ def load_region_config():
         config = yaml.safe_load(f)
     return config['regions']
 
-def get_feature_centroid(geometry):
-    """Get the centroid coordinates of a geometry."""
-    try:
-        coords = np.array([(x, y) for x, y in geometry.coords])
-        return np.mean(coords[:, 0]), np.mean(coords[:, 1])
-    except:
-        # For MultiLineString geometries
-        all_coords = []
-        for line in geometry.geoms:
-            coords = np.array([(x, y) for x, y in line.coords])
-            all_coords.append(coords)
-        coords = np.vstack(all_coords)
-        return np.mean(coords[:, 0]), np.mean(coords[:, 1])
-
 def create_region_bounds(region_def):
     """Create a GeoDataFrame with region boundary."""
     bounds = region_def['bounds']
@@ -50,53 +38,63 @@ def create_region_bounds(region_def):
     )
     return gpd.GeoDataFrame({'geometry': [boundary]}, crs="EPSG:4326")
 
-def split_by_region(gdf, region_name, region_def):
-    """Split features by region definition."""
-    logger.info(f"Processing region: {region_name}")
+def intersects_bounds(geometries, bounds, feature_bounds=None) -> np.ndarray:
+    """Get the mask of geometries intersecting region bounds.
     
-    # Filter by state codes
-    state_mask = gdf['FIPS_ALPHA'].isin(region_def['state_codes'])
-    state_features = gdf[state_mask].copy()
+    Feature bounding boxes are compared with the bounds first, and only the
+    features whose boxes overlap are tested exactly against the bounds polygon.
     
-    # Create region boundary
-    bounds_gdf = create_region_bounds(region_def)
+    Args:
+        geometries: Array or GeoSeries of shapely geometries
+        bounds: Region bounds with min_lon, max_lon, min_lat and max_lat
+        feature_bounds: Optional precomputed shapely.bounds() of the geometries
+        
+    Returns:
+        Boolean mask, matching an 'intersects' test against the bounds polygon
+    """
+    geometries = np.asarray(geometries, dtype=object)
+    if feature_bounds is None:
+        feature_bounds = shapely.bounds(geometries)
+    with np.errstate(invalid='ignore'):
+        mask = (
+            (feature_bounds[:, 0] <= bounds['max_lon']) & (feature_bounds[:, 2] >= bounds['min_lon']) &
+            (feature_bounds[:, 1] <= bounds['max_lat']) & (feature_bounds[:, 3] >= bounds['min_lat'])
+        )
+    region_box = box(bounds['min_lon'], bounds['min_lat'], bounds['max_lon'], bounds['max_lat'])
+    mask[mask] = shapely.intersects(geometries[mask], region_box)
+    return mask
+
+def split_by_region(gdf, region_name, region_def, feature_bounds=None):
+    """Split features by region definition.
     
-    # Filter by region bounds
-    region_features = gpd.sjoin(
-        state_features,
-        bounds_gdf,
-        how='inner',
-        predicate='intersects'
-    )
+    Features belong to a region when their state is one of the region's states
+    and they intersect the region bounds.
+    """
+    logger.info(f"Processing region: {region_name}")
+    
+    mask = intersects_bounds(gdf.geometry.to_numpy(), region_def['bounds'], feature_bounds)
+    if 'FIPS_ALPHA' in gdf.columns:
+        mask = mask & gdf['FIPS_ALPHA'].isin(region_def['state_codes']).to_numpy()
+    region_features = gdf[mask]
     
     logger.info(f"Found {len(region_features)} features in {region_name}")
     return region_features
 
-def split_florida(gdf, regions_config):
-    """Special handling for Florida which spans two regions."""
-    logger.info("Processing Florida features...")
+def split_florida(gdf, regions_config, feature_bounds=None):
+    """Special handling for Florida which spans two regions.
     
-    florida_mask = gdf['FIPS_ALPHA'] == 'FL'
-    florida_df = gdf[florida_mask].copy()
+    Features crossing between the two regions' bounds are kept in both.
+    """
+    logger.info("Processing Florida features...")
     
-    # Get region bounds
-    sa_bounds = create_region_bounds(regions_config['south_atlantic'])
-    gc_bounds = create_region_bounds(regions_config['gulf_coast'])
+    geometries = gdf.geometry.to_numpy()
+    if feature_bounds is None:
+        feature_bounds = shapely.bounds(geometries)
+    florida = (gdf['FIPS_ALPHA'] == 'FL').to_numpy()
     
     # Split Florida features by region bounds
-    atlantic_features = gpd.sjoin(
-        florida_df,
-        sa_bounds,
-        how='inner',
-        predicate='intersects'
-    )
-    
-    gulf_features = gpd.sjoin(
-        florida_df,
-        gc_bounds,
-        how='inner',
-        predicate='intersects'
-    )
+    atlantic_features = gdf[florida & intersects_bounds(geometries, regions_config['south_atlantic']['bounds'], feature_bounds)]
+    gulf_features = gdf[florida & intersects_bounds(geometries, regions_config['gulf_coast']['bounds'], feature_bounds)]
     
     logger.info(f"Florida Atlantic features: {len(atlantic_features)}")
     logger.info(f"Florida Gulf features: {len(gulf_features)}")
@@ -118,15 +116,15 @@ def split_shoreline():
     logger.info("Loading shoreline data...")
     shoreline = gpd.read_parquet(shoreline_file)
     
+    # Bounding boxes of every feature, computed once for all regions
+    feature_bounds = shapely.bounds(shoreline.geometry.to_numpy())
+    
     # Process each region
     for region_name, region_def in regions_config.items():
         logger.info(f"\nProcessing region: {region_name}")
         
-        # Get region bounds
-        bounds = region_def['bounds']
-        
         # Filter shoreline for this region
-        region_shoreline = filter_shoreline_for_region(shoreline, bounds)
+        region_shoreline = split_by_region(shoreline, region_name, region_def, feature_bounds)
         
         if region_shoreline.empty:
             logger.warning(f"No shoreline found for region: {region_name}")
@@ -134,7 +132,7 @@ def split_shoreline():
         
         # Save regional shoreline
         output_file = SHORELINE_DIR / f"{region_name}.parquet"
-        region_shoreline.to_parquet(output_file)
+        write_geoparquet(region_shoreline, output_file)
         logger.info(f"Saved {region_name} shoreline to {output_file}")
 
 if __name__ == "__main__":
@@ -0,0 +1,278 @@
+"""
+Filtered reads of vector data and spatially indexed GeoParquet outputs.
+
+National shapefiles (Census counties, NOAA shorelines) are large, and most
+consumers only need one region or a few states. read_vector() pushes bounding
+box and attribute filters down to GDAL through the Arrow-based pyogrio engine,
+so only the matching features are decoded. Each distinct (source, filter)
+extract is cached as GeoParquet, keyed by the source file's size and
+modification time, so repeated runs read the small extract instead.
+
+Preprocessing outputs (counties, shorelines, reference points) are written by
+write_geoparquet() as GeoParquet 1.1 with a bbox covering column, rows in
+Hilbert curve order and bounded row groups. Nearby features then share row
+groups whose bbox statistics are tight, and read_geoparquet() with a region's
+bounds only reads the row groups that intersect it.
+"""
+
+import hashlib
+import json
+import geopandas as gpd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyogrio
+import shapely
+from pathlib import Path
+from pyproj import CRS
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import logging
+
+from src.config import VECTOR_CACHE_DIR
+from src.projections import GEOGRAPHIC_CRS, get_transformer
+
+logger = logging.getLogger(__name__)
+
+# Number of hex digits of the cache key used in file names
+CACHE_KEY_LENGTH = 16
+
+# Rows per GeoParquet row group: small enough that a region selects few groups,
+# large enough to keep per-group overhead low
+GEOPARQUET_ROW_GROUP_SIZE = 50000
+
+def region_bbox(bounds: Dict[str, float]) -> Tuple[float, float, float, float]:
+    """Convert region bounds from the region configuration to a (minx, miny, maxx, maxy) tuple."""
+    return (bounds['min_lon'], bounds['min_lat'], bounds['max_lon'], bounds['max_lat'])
+
+def attribute_in(column: str, values: Iterable) -> str:
+    """
+    Build an OGR SQL 'IN' filter.
+
+    Args:
+        column: Attribute column name
+        values: Accepted values
+
+    Returns:
+        WHERE clause such as "FIPS_ALPHA IN ('NJ', 'DE')"
+    """
+    quoted = ", ".join("'{}'".format(str(v).replace("'", "''")) for v in values)
+    return f"{column} IN ({quoted})"
+
+def within_bounds_mask(gdf: gpd.GeoDataFrame, bounds: Dict[str, float]) -> np.ndarray:
+    """
+    Get the mask of features whose bounding boxes lie inside region bounds.
+
+    Feature bounds are computed once for all four comparisons.
+
+    Args:
+        gdf: GeoDataFrame in geographic coordinates
+        bounds: Region bounds with min_lon, max_lon, min_lat and max_lat
+
+    Returns:
+        Boolean mask
+    """
+    feature_bounds = shapely.bounds(gdf.geometry.to_numpy())
+    return (
+        (feature_bounds[:, 0] >= bounds['min_lon']) &
+        (feature_bounds[:, 2] <= bounds['max_lon']) &
+        (feature_bounds[:, 1] >= bounds['min_lat']) &
+        (feature_bounds[:, 3] <= bounds['max_lat'])
+    )
+
+def _bbox_to_crs(bbox: Tuple[float, float, float, float], crs) -> Tuple[float, float, float, float]:
+    """Transform a WGS84 bbox to a dataset CRS (unchanged for geographic or unknown CRS)."""
+    if crs is None or CRS.from_user_input(crs).is_geographic:
+        return bbox
+    return get_transformer(GEOGRAPHIC_CRS, crs).transform_bounds(*bbox)
+
+def _source_bbox(path: Path, bbox: Tuple[float, float, float, float]) -> Tuple[float, float, float, float]:
+    """Transform a WGS84 bbox to the source dataset's CRS."""
+    return _bbox_to_crs(bbox, pyogrio.read_info(path).get('crs'))
+
+def _cache_path(path: Path, cache_dir: Path, **filters) -> Path:
+    """Get the cache file of a source extract."""
+    stat = path.stat()
+    digest = hashlib.sha256(json.dumps({
+        'source': str(path.resolve()),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        **filters
+    }, sort_keys=True, default=list).encode()).hexdigest()
+    return cache_dir / f"{path.stem}_{digest[:CACHE_KEY_LENGTH]}.parquet"
+
+def read_vector(path: Union[str, Path],
+                bbox: Optional[Tuple[float, float, float, float]] = None,
+                where: Optional[str] = None,
+                columns: Optional[List[str]] = None,
+                cache: bool = True,
+                cache_dir: Path = VECTOR_CACHE_DIR) -> gpd.GeoDataFrame:
+    """
+    Read features of a vector file, decoding only those matching the filters.
+
+    Args:
+        path: Shapefile or other OGR-readable vector file
+        bbox: Optional WGS84 (minx, miny, maxx, maxy); features whose bounding
+            boxes intersect it are read
+        where: Optional OGR SQL attribute filter (see attribute_in())
+        columns: Optional attribute columns to read ([] reads geometry only)
+        cache: Whether to reuse and write a GeoParquet extract of the result
+        cache_dir: Directory for cached extracts
+
+    Returns:
+        GeoDataFrame of the matching features
+    """
+    path = Path(path)
+    filters = {'bbox': list(bbox) if bbox is not None else None, 'where': where, 'columns': columns}
+
+    cache_path = _cache_path(path, Path(cache_dir), **filters) if cache else None
+    if cache_path is not None and cache_path.exists():
+        logger.info(f"Reading cached extract of {path.name}: {cache_path}")
+        return gpd.read_parquet(cache_path)
+
+    logger.info(f"Reading {path.name}" + (f" where {where}" if where else "") + (f" within {bbox}" if bbox else ""))
+    gdf = gpd.read_file(
+        path,
+        engine='pyogrio',
+        use_arrow=True,
+        bbox=_source_bbox(path, bbox) if bbox is not None else None,
+        where=where,
+        columns=columns
+    )
+    logger.info(f"Read {len(gdf)} features from {path.name}")
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f".{cache_path.name}.tmp")
+        gdf.to_parquet(tmp_path)
+        tmp_path.replace(cache_path)
+    return gdf
+
+def spatial_sort(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """
+    Order features along a Hilbert curve over their bounding box centers.
+
+    Missing and empty geometries are placed last.
+
+    Args:
+        gdf: GeoDataFrame to sort
+
+    Returns:
+        Sorted GeoDataFrame (the index is kept)
+    """
+    present = ~(gdf.geometry.isna() | gdf.geometry.is_empty).to_numpy()
+    if not present.any():
+        return gdf
+    distances = np.full(len(gdf), np.iinfo(np.uint32).max, dtype=np.int64)
+    distances[present] = gdf[present].hilbert_distance(total_bounds=gdf[present].total_bounds).to_numpy()
+    return gdf.iloc[np.argsort(distances, kind='stable')]
+
+def write_geoparquet(gdf: gpd.GeoDataFrame,
+                     path: Union[str, Path],
+                     index: Optional[bool] = None,
+                     row_group_size: int = GEOPARQUET_ROW_GROUP_SIZE) -> None:
+    """
+    Write a spatially sorted GeoParquet 1.1 file with a bbox covering column.
+
+    Args:
+        gdf: GeoDataFrame to write
+        path: Output parquet file
+        index: Whether to store the index (as in GeoDataFrame.to_parquet)
+        row_group_size: Maximum rows per row group
+    """
+    spatial_sort(gdf).to_parquet(
+        path,
+        index=index,
+        compression='snappy',
+        schema_version='1.1.0',
+        write_covering_bbox=True,
+        row_group_size=row_group_size
+    )
+
+def _geo_metadata(schema: pa.Schema) -> dict:
+    """Get the primary geometry column metadata of a GeoParquet schema."""
+    metadata = schema.metadata or {}
+    if b'geo' not in metadata:
+        return {}
+    geo = json.loads(metadata[b'geo'])
+    return geo.get('columns', {}).get(geo.get('primary_column', 'geometry'), {})
+
+def has_bbox_covering(path: Union[str, Path]) -> bool:
+    """Check whether a GeoParquet file has a bbox covering column for its primary geometry."""
+    return 'bbox' in _geo_metadata(pq.read_schema(path)).get('covering', {})
+
+def intersecting_row_groups(parquet_file: pq.ParquetFile,
+                            bboxes: List[Tuple[float, float, float, float]]) -> Optional[List[int]]:
+    """
+    Find the row groups whose bbox covering statistics intersect any of the bboxes.
+
+    Args:
+        parquet_file: Open GeoParquet file
+        bboxes: WGS84 (minx, miny, maxx, maxy) boxes
+
+    Returns:
+        Sorted row group indices, or None when the file has no bbox covering
+        statistics (every row group must be read)
+    """
+    column = _geo_metadata(parquet_file.schema_arrow)
+    covering = column.get('covering', {}).get('bbox')
+    if covering is None:
+        return None
+    bboxes = [_bbox_to_crs(bbox, column.get('crs', "EPSG:4326")) for bbox in bboxes]
+
+    paths = {key: '.'.join(covering[key]) for key in ('xmin', 'ymin', 'xmax', 'ymax')}
+    selected = []
+    for i in range(parquet_file.metadata.num_row_groups):
+        row_group = parquet_file.metadata.row_group(i)
+        stats = {}
+        for j in range(row_group.num_columns):
+            chunk = row_group.column(j)
+            if chunk.path_in_schema in paths.values() and chunk.statistics is not None and chunk.statistics.has_min_max:
+                stats[chunk.path_in_schema] = chunk.statistics
+        if len(stats) < 4:
+            selected.append(i)
+            continue
+        # Group extent: smallest feature minimum to largest feature maximum
+        minx, miny = stats[paths['xmin']].min, stats[paths['ymin']].min
+        maxx, maxy = stats[paths['xmax']].max, stats[paths['ymax']].max
+        if any(maxx >= b[0] and minx <= b[2] and maxy >= b[1] and miny <= b[3] for b in bboxes):
+            selected.append(i)
+    return selected
+
+def read_geoparquet(path: Union[str, Path],
+                    bbox: Optional[Tuple[float, float, float, float]] = None,
+                    columns: Optional[List[str]] = None,
+                    filters=None) -> gpd.GeoDataFrame:
+    """
+    Read a GeoParquet file, optionally only the features intersecting a bbox.
+
+    With a bbox covering column, only the row groups whose bbox statistics
+    intersect the bbox are read. Files written before covering columns were
+    added are read in full and filtered on feature bounds.
+
+    Args:
+        path: GeoParquet file
+        bbox: Optional WGS84 (minx, miny, maxx, maxy); features whose bounding
+            boxes intersect it are read
+        columns: Optional columns to read
+        filters: Optional pyarrow row filters
+
+    Returns:
+        GeoDataFrame of the matching features
+    """
+    if bbox is None:
+        return gpd.read_parquet(path, columns=columns, filters=filters)
+
+    column = _geo_metadata(pq.read_schema(path))
+    # GeoParquet defaults to WGS84 when the CRS is omitted
+    source_bbox = _bbox_to_crs(bbox, column.get('crs', "EPSG:4326"))
+    if 'bbox' in column.get('covering', {}):
+        return gpd.read_parquet(path, columns=columns, filters=filters, bbox=source_bbox)
+
+    logger.info(f"{Path(path).name} has no bbox covering column, reading all row groups")
+    gdf = gpd.read_parquet(path, columns=columns, filters=filters)
+    minx, miny, maxx, maxy = source_bbox
+    feature_bounds = shapely.bounds(gdf.geometry.to_numpy())
+    return gdf[
+        (feature_bounds[:, 2] >= minx) & (feature_bounds[:, 0] <= maxx) &
+        (feature_bounds[:, 3] >= miny) & (feature_bounds[:, 1] <= maxy)
+    ]
@@ -0,0 +1,229 @@
+"""
+Projection registry shared by preprocessing, imputation and assignment.
+
+Each region's projected CRS is defined once, by the 'projection' key of the
+region in region_mappings.yaml. Building a pyproj transformation pipeline is
+far more expensive than running it, so transformers are created once per CRS
+pair and reused; coordinate arrays can be projected directly with
+transform_xy(), and geometries with reproject(), without GeoDataFrame.to_crs()
+building a new pipeline on every call.
+"""
+
+import functools
+import geopandas as gpd
+import numpy as np
+import shapely
+import yaml
+from pathlib import Path
+from pyproj import CRS, Transformer
+from typing import Dict, Optional, Union
+import logging
+
+from src.config import DEFAULT_REGION_PROJECTION, REGION_CONFIG, WGS84_EPSG
+
+logger = logging.getLogger(__name__)
+
+GEOGRAPHIC_CRS = f"EPSG:{WGS84_EPSG}"
+
+@functools.lru_cache(maxsize=None)
+def get_transformer(source_crs, target_crs) -> Transformer:
+    """
+    Get the cached transformer between two coordinate reference systems.
+
+    Args:
+        source_crs: Source CRS (anything pyproj accepts, e.g. "EPSG:4326" or a CRS)
+        target_crs: Target CRS
+
+    Returns:
+        Transformer taking and returning coordinates in x/y (lon/lat) order
+    """
+    return Transformer.from_crs(source_crs, target_crs, always_xy=True)
+
+def transform_coordinates(x: np.ndarray, y: np.ndarray, source_crs, target_crs) -> np.ndarray:
+    """
+    Transform coordinate arrays between two coordinate reference systems.
+
+    Args:
+        x: X coordinates (longitudes for a geographic CRS)
+        y: Y coordinates (latitudes for a geographic CRS)
+        source_crs: CRS of the input coordinates
+        target_crs: CRS of the output coordinates
+
+    Returns:
+        Array of shape (n, 2) with the transformed x and y
+    """
+    tx, ty = get_transformer(source_crs, target_crs).transform(
+        np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    )
+    return np.column_stack([tx, ty])
+
+def reproject(gdf: Union[gpd.GeoDataFrame, gpd.GeoSeries], crs) -> Union[gpd.GeoDataFrame, gpd.GeoSeries]:
+    """
+    Reproject geometries with a cached transformer.
+
+    Equivalent to gdf.to_crs(crs) for data with a known CRS. Z coordinates are
+    kept unchanged.
+
+    Args:
+        gdf: GeoDataFrame or GeoSeries with a CRS
+        crs: Target CRS
+
+    Returns:
+        Copy of gdf in the target CRS
+    """
+    if gdf.crs is None:
+        raise ValueError("Cannot reproject geometries without a CRS")
+    target = CRS.from_user_input(crs)
+    if gdf.crs == target:
+        return gdf.copy()
+
+    transformer = get_transformer(gdf.crs, target)
+
+    def transform(coords: np.ndarray) -> np.ndarray:
+        result = coords.copy()
+        result[:, 0], result[:, 1] = transformer.transform(coords[:, 0], coords[:, 1])
+        return result
+
+    geometry = gdf.geometry if isinstance(gdf, gpd.GeoDataFrame) else gdf
+    projected = gpd.GeoSeries(
+        shapely.transform(geometry.to_numpy(), transform, include_z=None),
+        index=geometry.index, crs=target, name=geometry.name
+    )
+    if isinstance(gdf, gpd.GeoDataFrame):
+        return gdf.set_geometry(projected)
+    return projected
+
+def utm_crs(bounds: Dict[str, float]) -> str:
+    """
+    Get the UTM zone CRS at the center of a region's bounds.
+
+    Args:
+        bounds: Region bounds with min_lon, max_lon, min_lat and max_lat
+
+    Returns:
+        EPSG code of the UTM zone
+    """
+    center_lon = (bounds.get('min_lon', -98) + bounds.get('max_lon', -80)) / 2
+    center_lat = (bounds.get('min_lat', 25) + bounds.get('max_lat', 45)) / 2
+    utm_zone = int((center_lon + 180) // 6) + 1
+    return f"EPSG:{32600 + utm_zone}" if center_lat >= 0 else f"EPSG:{32700 + utm_zone}"
+
+def region_crs(region_def: Dict) -> str:
+    """
+    Get the projected CRS of a region definition.
+
+    Args:
+        region_def: Region definition from region_mappings.yaml
+
+    Returns:
+        The region's 'projection', or DEFAULT_REGION_PROJECTION when not set
+    """
+    return region_def.get('projection', DEFAULT_REGION_PROJECTION)
+
+class ProjectionRegistry:
+    """Region projections with cached transformers from geographic coordinates."""
+
+    def __init__(self, regions: Dict[str, dict]):
+        """
+        Initialize the registry.
+
+        Args:
+            regions: Region definitions, as under 'regions' in region_mappings.yaml
+        """
+        self.regions = regions
+
+    @classmethod
+    def from_config(cls, region_config: Union[str, Path] = REGION_CONFIG) -> 'ProjectionRegistry':
+        """
+        Build the registry from a region configuration file.
+
+        Args:
+            region_config: Path to region_mappings.yaml
+
+        Returns:
+            ProjectionRegistry over the configured regions
+        """
+        with open(region_config) as f:
+            return cls(yaml.safe_load(f).get('regions', {}))
+
+    def crs(self, region: str) -> str:
+        """
+        Get the projected CRS for distance calculations in a region.
+
+        Args:
+            region: Region identifier
+
+        Returns:
+            CRS string; DEFAULT_REGION_PROJECTION for unknown regions
+        """
+        if region not in self.regions:
+            logger.debug(f"No projection configured for {region}, using {DEFAULT_REGION_PROJECTION}")
+        return region_crs(self.regions.get(region, {}))
+
+    def utm_crs(self, region: str) -> str:
+        """
+        Get the UTM zone CRS at the center of a region.
+
+        Args:
+            region: Region identifier
+
+        Returns:
+            EPSG code of the UTM zone
+        """
+        return utm_crs(self.regions.get(region, {}).get('bounds', {}))
+
+    def transformer(self, region: str, inverse: bool = False) -> Transformer:
+        """
+        Get the cached transformer between geographic coordinates and a region's CRS.
+
+        Args:
+            region: Region identifier
+            inverse: Transform from the region's CRS back to geographic coordinates
+
+        Returns:
+            Transformer in x/y (lon/lat) order
+        """
+        if inverse:
+            return get_transformer(self.crs(region), GEOGRAPHIC_CRS)
+        return get_transformer(GEOGRAPHIC_CRS, self.crs(region))
+
+    def transform_xy(self, lon: np.ndarray, lat: np.ndarray, region: str) -> np.ndarray:
+        """
+        Project longitude/latitude arrays into a region's CRS.
+
+        Args:
+            lon: Longitudes
+            lat: Latitudes
+            region: Region identifier
+
+        Returns:
+            Array of shape (n, 2) with projected x and y in meters
+        """
+        return transform_coordinates(lon, lat, GEOGRAPHIC_CRS, self.crs(region))
+
+@functools.lru_cache(maxsize=None)
+def get_projection_registry(region_config: Optional[Path] = None) -> ProjectionRegistry:
+    """
+    Get the shared registry for a region configuration file.
+
+    Args:
+        region_config: Path to region_mappings.yaml, defaults to REGION_CONFIG
+
+    Returns:
+        ProjectionRegistry, loaded once per configuration file
+    """
+    return ProjectionRegistry.from_config(region_config or REGION_CONFIG)
+
+def transform_xy(lon: np.ndarray, lat: np.ndarray, region: str) -> np.ndarray:
+    """
+    Project longitude/latitude arrays into a region's configured CRS.
+
+    Args:
+        lon: Longitudes
+        lat: Latitudes
+        region: Region identifier from region_mappings.yaml
+
+    Returns:
+        Array of shape (n, 2) with projected x and y in meters
+    """
+    return get_projection_registry().transform_xy(lon, lat, region)
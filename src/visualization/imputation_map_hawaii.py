@@ -2,7 +2,6 @@
 Script to visualize Hawaii imputation coverage using choropleth maps.
 """
 
-import geopandas as gpd
 import pandas as pd
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
@@ -13,6 +12,8 @@ from pathlib import Path
 import logging
 import seaborn as sns
 
+from src.imputation.structure_cache import latest_structure_file
+from src.preprocessing.vector_io import read_geoparquet, region_bbox
 from src.config import (
     CONFIG_DIR,
     PROCESSED_DIR,
@@ -73,7 +74,7 @@ def plot_hawaii_coverage(
     # Load data
     print("Loading data...")
     imputation_df = pd.read_parquet(imputation_file)
-    counties = gpd.read_parquet(PROCESSED_DIR / "county.parquet")
+    counties = read_geoparquet(PROCESSED_DIR / "county.parquet", bbox=region_bbox(region_config['bounds']))
     
     # Filter for Hawaii
     region_counties = counties[counties['region'] == 'hawaii'].copy()
@@ -286,12 +287,10 @@ def plot_hawaii_coverage(
 def main():
     """Generate Hawaii imputation coverage visualization."""
     # Find most recent Hawaii imputation file
-    imputation_files = list(IMPUTATION_DIR.glob("imputation_structure_hawaii_*.parquet"))
-    if not imputation_files:
+    imputation_file = latest_structure_file("hawaii", IMPUTATION_DIR)
+    if imputation_file is None:
         print("No Hawaii imputation structure files found")
         return
-        
-    imputation_file = sorted(imputation_files)[-1]  # Get most recent
     
     # Set up output path
     output_dir = IMPUTATION_MAPS_DIR
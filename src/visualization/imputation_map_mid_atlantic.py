@@ -2,7 +2,6 @@
 Script to visualize Mid Atlantic imputation coverage using choropleth maps.
 """
 
-import geopandas as gpd
 import pandas as pd
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
@@ -13,6 +12,8 @@ from pathlib import Path
 import logging
 import seaborn as sns
 
+from src.imputation.structure_cache import latest_structure_file
+from src.preprocessing.vector_io import read_geoparquet, region_bbox
 from src.config import (
     CONFIG_DIR,
     PROCESSED_DIR,
@@ -77,7 +78,7 @@ def plot_mid_atlantic_coverage(
     
     # Load counties from main county file and filter for Mid Atlantic states
     print("\nLoading county geometries...")
-    counties = gpd.read_parquet(COUNTY_FILE)
+    counties = read_geoparquet(COUNTY_FILE, bbox=region_bbox(region_config['bounds']))
     
     # Get Mid Atlantic state FIPS codes
     mid_atlantic_states = {'10': 'DE', '24': 'MD', '34': 'NJ', '36': 'NY', '42': 'PA', '51': 'VA'}
@@ -301,12 +302,10 @@ def plot_mid_atlantic_coverage(
 def main():
     """Generate Mid Atlantic imputation coverage visualization."""
     # Find most recent Mid Atlantic imputation file
-    imputation_files = list(IMPUTATION_DIR.glob("imputation_structure_mid_atlantic_*.parquet"))
-    if not imputation_files:
+    imputation_file = latest_structure_file("mid_atlantic", IMPUTATION_DIR)
+    if imputation_file is None:
         print("No Mid Atlantic imputation structure files found")
         return
-        
-    imputation_file = sorted(imputation_files)[-1]  # Get most recent
     
     # Set up output path
     output_dir = IMPUTATION_MAPS_DIR
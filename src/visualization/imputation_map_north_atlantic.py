@@ -2,7 +2,6 @@
 Script to visualize North Atlantic imputation coverage using choropleth maps.
 """
 
-import geopandas as gpd
 import pandas as pd
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
@@ -13,6 +12,8 @@ from pathlib import Path
 import logging
 import seaborn as sns
 
+from src.imputation.structure_cache import latest_structure_file
+from src.preprocessing.vector_io import read_geoparquet, region_bbox
 from src.config import (
     CONFIG_DIR,
     PROCESSED_DIR,
@@ -77,7 +78,7 @@ def plot_north_atlantic_coverage(
     
     # Load counties from main county file and filter for North Atlantic states
     print("\nLoading county geometries...")
-    counties = gpd.read_parquet(COUNTY_FILE)
+    counties = read_geoparquet(COUNTY_FILE, bbox=region_bbox(region_config['bounds']))
     
     # Get North Atlantic state FIPS codes
     north_atlantic_states = {'09': 'CT', '23': 'ME', '25': 'MA', '33': 'NH', '44': 'RI'}
@@ -301,12 +302,10 @@ def plot_north_atlantic_coverage(
 def main():
     """Generate North Atlantic imputation coverage visualization."""
     # Find most recent North Atlantic imputation file
-    imputation_files = list(IMPUTATION_DIR.glob("imputation_structure_north_atlantic_*.parquet"))
-    if not imputation_files:
+    imputation_file = latest_structure_file("north_atlantic", IMPUTATION_DIR)
+    if imputation_file is None:
         print("No North Atlantic imputation structure files found")
         return
-        
-    imputation_file = sorted(imputation_files)[-1]  # Get most recent
     
     # Set up output path
     output_dir = IMPUTATION_MAPS_DIR
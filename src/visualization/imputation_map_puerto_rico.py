@@ -2,7 +2,6 @@
 Script to visualize Puerto Rico imputation coverage using choropleth maps.
 """
 
-import geopandas as gpd
 import pandas as pd
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
@@ -13,6 +12,8 @@ from pathlib import Path
 import logging
 import seaborn as sns
 
+from src.imputation.structure_cache import latest_structure_file
+from src.preprocessing.vector_io import read_geoparquet, region_bbox
 from src.config import (
     CONFIG_DIR,
     PROCESSED_DIR,
@@ -77,7 +78,7 @@ def plot_puerto_rico_coverage(
     
     # Load counties from main county file and filter for Puerto Rico
     print("\nLoading county geometries...")
-    counties = gpd.read_parquet(COUNTY_FILE)
+    counties = read_geoparquet(COUNTY_FILE, bbox=region_bbox(region_config['bounds']))
     
     # Get Puerto Rico state FIPS code
     puerto_rico_fips = '72'  # Puerto Rico state FIPS code
@@ -317,12 +318,10 @@ def plot_puerto_rico_coverage(
 def main():
     """Generate Puerto Rico imputation coverage visualization."""
     # Find most recent Puerto Rico imputation file
-    imputation_files = list(IMPUTATION_DIR.glob("imputation_structure_puerto_rico_*.parquet"))
-    if not imputation_files:
+    imputation_file = latest_structure_file("puerto_rico", IMPUTATION_DIR)
+    if imputation_file is None:
         print("No Puerto Rico imputation structure files found")
         return
-        
-    imputation_file = sorted(imputation_files)[-1]  # Get most recent
     
     # Set up output path
     output_dir = IMPUTATION_MAPS_DIR
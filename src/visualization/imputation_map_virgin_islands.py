@@ -2,7 +2,6 @@
 Script to visualize Virgin Islands imputation coverage using choropleth maps.
 """
 
-import geopandas as gpd
 import pandas as pd
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
@@ -13,6 +12,8 @@ from pathlib import Path
 import logging
 import seaborn as sns
 
+from src.imputation.structure_cache import latest_structure_file
+from src.preprocessing.vector_io import read_geoparquet, region_bbox
 from src.config import (
     CONFIG_DIR,
     PROCESSED_DIR,
@@ -77,7 +78,7 @@ def plot_virgin_islands_coverage(
     
     # Load counties from main county file and filter for Virgin Islands
     print("\nLoading county geometries...")
-    counties = gpd.read_parquet(COUNTY_FILE)
+    counties = read_geoparquet(COUNTY_FILE, bbox=region_bbox(region_config['bounds']))
     
     # Get Virgin Islands state FIPS code
     virgin_islands_fips = '78'  # Virgin Islands territory FIPS code
@@ -302,12 +303,10 @@ def plot_virgin_islands_coverage(
 def main():
     """Generate Virgin Islands imputation coverage visualization."""
     # Find most recent Virgin Islands imputation file
-    imputation_files = list(IMPUTATION_DIR.glob("imputation_structure_virgin_islands_*.parquet"))
-    if not imputation_files:
+    imputation_file = latest_structure_file("virgin_islands", IMPUTATION_DIR)
+    if imputation_file is None:
         print("No Virgin Islands imputation structure files found")
         return
-        
-    imputation_file = sorted(imputation_files)[-1]  # Get most recent
     
     # Set up output path
     output_dir = IMPUTATION_MAPS_DIR
@@ -2,7 +2,6 @@
 Script to visualize West Coast imputation coverage using choropleth maps.
 """
 
-import geopandas as gpd
 import pandas as pd
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
@@ -13,6 +12,8 @@ from pathlib import Path
 import logging
 import seaborn as sns
 
+from src.imputation.structure_cache import latest_structure_file
+from src.preprocessing.vector_io import read_geoparquet, region_bbox
 from src.config import (
     CONFIG_DIR,
     PROCESSED_DIR,
@@ -76,7 +77,7 @@ def plot_west_coast_coverage(
     
     # Load counties from main county file and filter for West Coast states
     print("\nLoading county geometries...")
-    counties = gpd.read_parquet(PROCESSED_DIR / "county.parquet")
+    counties = read_geoparquet(PROCESSED_DIR / "county.parquet", bbox=region_bbox(region_config['bounds']))
     
     # Get West Coast state FIPS codes
     west_coast_states = {'06': 'CA', '41': 'OR', '53': 'WA'}
@@ -308,12 +309,10 @@ def plot_west_coast_coverage(
 def main():
     """Generate West Coast imputation coverage visualization."""
     # Find most recent West Coast imputation file
-    imputation_files = list(IMPUTATION_DIR.glob("imputation_structure_west_coast_*.parquet"))
-    if not imputation_files:
+    imputation_file = latest_structure_file("west_coast", IMPUTATION_DIR)
+    if imputation_file is None:
         print("No West Coast imputation structure files found")
         return
-        
-    imputation_file = sorted(imputation_files)[-1]  # Get most recent
     
     # Set up output path
     output_dir = IMPUTATION_MAPS_DIR
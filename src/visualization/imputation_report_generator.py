@@ -16,6 +16,8 @@ from typing import Dict, List, Tuple
 import seaborn as sns
 import os
 
+from src.imputation.data_loader import level_filters
+from src.imputation.structure_cache import latest_structure_file
 from src.config import (
     CONFIG_DIR,
     PROCESSED_DIR,
@@ -23,7 +25,8 @@ from src.config import (
     IMPUTATION_DIR,
     COUNTY_FILE,
     COASTAL_COUNTIES_FILE,
-    REFERENCE_POINTS_FILE
+    REFERENCE_POINTS_FILE,
+    POINT_SPACING
 )
 
 logger = logging.getLogger(__name__)
@@ -328,7 +331,8 @@ def plot_imputation_structure(
 def generate_report(
     imputation_dir: Path = IMPUTATION_DIR,
     output_dir: Path = IMPUTATION_MAPS_DIR,
-    region: str = None
+    region: str = None,
+    spacing: int = POINT_SPACING
 ):
     """Generate visualization report for imputation structure.
     
@@ -336,30 +340,30 @@ def generate_report(
         imputation_dir: Directory containing imputation structure files
         output_dir: Directory to save output maps
         region: Specific region to generate report for
+        spacing: Reference point pyramid level to show, in meters
     """
     # Create output directory
     output_dir.mkdir(parents=True, exist_ok=True)
     
     # Load reference data
     logger.info("Loading reference data...")
-    reference_points = gpd.read_parquet(REFERENCE_POINTS_FILE)
+    reference_points = gpd.read_parquet(REFERENCE_POINTS_FILE, filters=level_filters(REFERENCE_POINTS_FILE, spacing) or None)
     counties = gpd.read_parquet(COASTAL_COUNTIES_FILE)
     
     # Find most recent imputation file for each region
-    imputation_files = list(imputation_dir.glob("imputation_structure_*.parquet"))
+    regions = [region] if region else list(load_region_mappings())
+    imputation_files = {
+        name: path for name, path in
+        ((name, latest_structure_file(name, imputation_dir)) for name in regions)
+        if path is not None
+    }
     if not imputation_files:
         logger.error("No imputation structure files found")
         return
     
     # Process each region's imputation structure
-    for imp_file in imputation_files:
+    for region, imp_file in imputation_files.items():
         try:
-            # Extract full region name from filename
-            # Format is imputation_structure_REGION_TIMESTAMP.parquet
-            parts = imp_file.stem.split('_')
-            timestamp_idx = next(i for i, part in enumerate(parts) if part.startswith('202'))
-            region = '_'.join(parts[2:timestamp_idx])  # Join all parts between 'structure' and timestamp
-            
             # Load imputation structure
             logger.info(f"Processing {region}...")
             imputation_df = pd.read_parquet(imp_file)
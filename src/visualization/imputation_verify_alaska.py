@@ -2,7 +2,6 @@
 Script to verify Alaska tide stations and counties.
 """
 
-import geopandas as gpd
 from pathlib import Path
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
@@ -10,6 +9,8 @@ import cartopy.feature as cfeature
 import numpy as np
 import yaml
 
+from src.preprocessing.vector_io import attribute_in, read_vector
+
 def plot_alaska_coverage(county_path: Path, stations_path: Path, output_path: Path):
     """Create a map of Alaska counties and tide stations.
     
@@ -20,8 +21,7 @@ def plot_alaska_coverage(county_path: Path, stations_path: Path, output_path: Pa
     """
     # Read and filter county shapefile for Alaska
     print("Reading county shapefile...")
-    counties = gpd.read_file(county_path)
-    ak_counties = counties[counties['STATEFP'] == '02'].copy()  # Alaska FIPS code is 02
+    ak_counties = read_vector(county_path, where=attribute_in('STATEFP', ['02']))  # Alaska FIPS code is 02
     print(f"Alaska counties: {len(ak_counties)}")
     
     # Read tide stations configuration
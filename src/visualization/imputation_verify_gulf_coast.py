@@ -2,7 +2,6 @@
 Script to verify Gulf Coast shoreline data with counties and tide stations.
 """
 
-import geopandas as gpd
 from pathlib import Path
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
@@ -10,6 +9,9 @@ import cartopy.feature as cfeature
 import numpy as np
 import yaml
 
+from src.preprocessing.shoreline_simplify import simplify_for_display
+from src.preprocessing.vector_io import attribute_in, read_vector
+
 def plot_gulf_coast_shoreline(shapefile_path: Path, county_path: Path, stations_path: Path, output_path: Path):
     """Create a focused map of Gulf Coast shoreline data from shapefile.
     
@@ -21,16 +23,15 @@ def plot_gulf_coast_shoreline(shapefile_path: Path, county_path: Path, stations_
     """
     # Read the shapefile and filter for Gulf Coast states
     print("Reading shoreline shapefile...")
-    shoreline = gpd.read_file(shapefile_path)
     gulf_states = ['FL', 'AL', 'MS', 'LA', 'TX']  # Gulf Coast states
-    gulf_shoreline = shoreline[shoreline['FIPS_ALPHA'].isin(gulf_states)].copy()
+    gulf_shoreline = read_vector(shapefile_path, where=attribute_in('FIPS_ALPHA', gulf_states))
+    gulf_shoreline = simplify_for_display(gulf_shoreline)
     print(f"Total Gulf Coast features: {len(gulf_shoreline)}")
     
     # Read and filter county shapefile for Gulf Coast states
     print("Reading county shapefile...")
-    counties = gpd.read_file(county_path)
     state_fips = ['12', '01', '28', '22', '48']  # FIPS codes for FL, AL, MS, LA, TX
-    gulf_counties = counties[counties['STATEFP'].isin(state_fips)].copy()
+    gulf_counties = read_vector(county_path, where=attribute_in('STATEFP', state_fips))
     print(f"Gulf Coast counties: {len(gulf_counties)}")
     
     # Read tide stations configuration
@@ -2,7 +2,6 @@
 Script to verify Hawaii shoreline data directly from shapefile.
 """
 
-import geopandas as gpd
 from pathlib import Path
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
@@ -10,6 +9,9 @@ import cartopy.feature as cfeature
 import numpy as np
 import yaml
 
+from src.preprocessing.shoreline_simplify import simplify_for_display
+from src.preprocessing.vector_io import attribute_in, read_vector
+
 def plot_hawaii_shoreline(shapefile_path: Path, county_path: Path, stations_path: Path, output_path: Path):
     """Create a focused map of Hawaiian shoreline data from shapefile.
     
@@ -21,14 +23,13 @@ def plot_hawaii_shoreline(shapefile_path: Path, county_path: Path, stations_path
     """
     # Read the shapefile and filter for Hawaii
     print("Reading shoreline shapefile...")
-    shoreline = gpd.read_file(shapefile_path)
-    hawaii_shoreline = shoreline[shoreline['FIPS_ALPHA'] == 'HI'].copy()
+    hawaii_shoreline = read_vector(shapefile_path, where=attribute_in('FIPS_ALPHA', ['HI']))
+    hawaii_shoreline = simplify_for_display(hawaii_shoreline)
     print(f"Total Hawaii features: {len(hawaii_shoreline)}")
     
     # Read and filter county shapefile for Hawaii
     print("Reading county shapefile...")
-    counties = gpd.read_file(county_path)
-    hawaii_counties = counties[counties['STATEFP'] == '15'].copy()
+    hawaii_counties = read_vector(county_path, where=attribute_in('STATEFP', ['15']))
     print(f"Hawaii counties: {len(hawaii_counties)}")
     
     # Read tide stations configuration
@@ -2,7 +2,6 @@
 Script to verify Mid-Atlantic shoreline data with counties and tide stations.
 """
 
-import geopandas as gpd
 from pathlib import Path
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
@@ -10,6 +9,9 @@ import cartopy.feature as cfeature
 import numpy as np
 import yaml
 
+from src.preprocessing.shoreline_simplify import simplify_for_display
+from src.preprocessing.vector_io import attribute_in, read_vector
+
 def plot_mid_atlantic_shoreline(shapefile_path: Path, county_path: Path, stations_path: Path, output_path: Path):
     """Create a focused map of Mid-Atlantic shoreline data from shapefile.
     
@@ -21,16 +23,15 @@ def plot_mid_atlantic_shoreline(shapefile_path: Path, county_path: Path, station
     """
     # Read the shapefile and filter for Mid-Atlantic states
     print("Reading shoreline shapefile...")
-    shoreline = gpd.read_file(shapefile_path)
     ma_states = ['NJ', 'DE', 'MD', 'VA']  # Mid-Atlantic states
-    ma_shoreline = shoreline[shoreline['FIPS_ALPHA'].isin(ma_states)].copy()
+    ma_shoreline = read_vector(shapefile_path, where=attribute_in('FIPS_ALPHA', ma_states))
+    ma_shoreline = simplify_for_display(ma_shoreline)
     print(f"Total Mid-Atlantic features: {len(ma_shoreline)}")
     
     # Read and filter county shapefile for Mid-Atlantic states
     print("Reading county shapefile...")
-    counties = gpd.read_file(county_path)
     state_fips = ['34', '10', '24', '51']  # FIPS codes for NJ, DE, MD, VA
-    ma_counties = counties[counties['STATEFP'].isin(state_fips)].copy()
+    ma_counties = read_vector(county_path, where=attribute_in('STATEFP', state_fips))
     print(f"Mid-Atlantic counties: {len(ma_counties)}")
     
     # Read tide stations configuration
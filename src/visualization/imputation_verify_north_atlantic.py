@@ -2,7 +2,6 @@
 Script to verify North Atlantic shoreline data with counties and tide stations.
 """
 
-import geopandas as gpd
 from pathlib import Path
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
@@ -10,6 +9,9 @@ import cartopy.feature as cfeature
 import numpy as np
 import yaml
 
+from src.preprocessing.shoreline_simplify import simplify_for_display
+from src.preprocessing.vector_io import attribute_in, read_vector
+
 def plot_north_atlantic_shoreline(shapefile_path: Path, county_path: Path, stations_path: Path, output_path: Path):
     """Create a focused map of North Atlantic shoreline data from shapefile.
     
@@ -21,16 +23,15 @@ def plot_north_atlantic_shoreline(shapefile_path: Path, county_path: Path, stati
     """
     # Read the shapefile and filter for North Atlantic states
     print("Reading shoreline shapefile...")
-    shoreline = gpd.read_file(shapefile_path)
     na_states = ['ME', 'NH', 'MA', 'RI', 'CT']  # North Atlantic states
-    na_shoreline = shoreline[shoreline['FIPS_ALPHA'].isin(na_states)].copy()
+    na_shoreline = read_vector(shapefile_path, where=attribute_in('FIPS_ALPHA', na_states))
+    na_shoreline = simplify_for_display(na_shoreline)
     print(f"Total North Atlantic features: {len(na_shoreline)}")
     
     # Read and filter county shapefile for North Atlantic states
     print("Reading county shapefile...")
-    counties = gpd.read_file(county_path)
     state_fips = ['23', '33', '25', '44', '09']  # FIPS codes for ME, NH, MA, RI, CT
-    na_counties = counties[counties['STATEFP'].isin(state_fips)].copy()
+    na_counties = read_vector(county_path, where=attribute_in('STATEFP', state_fips))
     print(f"North Atlantic counties: {len(na_counties)}")
     
     # Read tide stations configuration
@@ -2,7 +2,6 @@
 Script to verify Pacific Islands shoreline data with tide stations.
 """
 
-import geopandas as gpd
 from pathlib import Path
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
@@ -10,6 +9,9 @@ import cartopy.feature as cfeature
 import numpy as np
 import yaml
 
+from src.preprocessing.shoreline_simplify import simplify_for_display
+from src.preprocessing.vector_io import attribute_in, read_vector
+
 def plot_pacific_islands_shoreline(shapefile_path: Path, stations_path: Path, output_path: Path):
     """Create a focused map of Pacific Islands shoreline data from shapefile.
     
@@ -20,10 +22,10 @@ def plot_pacific_islands_shoreline(shapefile_path: Path, stations_path: Path, ou
     """
     # Read the shapefile and filter for Pacific Islands territories
     print("Reading shoreline shapefile...")
-    shoreline = gpd.read_file(shapefile_path)
     # Filter for Guam (GU), Northern Mariana Islands (MP), American Samoa (AS)
     pi_states = ['GU', 'MP', 'AS']
-    pi_shoreline = shoreline[shoreline['FIPS_ALPHA'].isin(pi_states)].copy()
+    pi_shoreline = read_vector(shapefile_path, where=attribute_in('FIPS_ALPHA', pi_states))
+    pi_shoreline = simplify_for_display(pi_shoreline)
     print(f"Total Pacific Islands features: {len(pi_shoreline)}")
     
     # Read tide stations configuration
@@ -2,7 +2,6 @@
 Script to verify Puerto Rico shoreline data with counties and tide stations.
 """
 
-import geopandas as gpd
 from pathlib import Path
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
@@ -10,6 +9,9 @@ import cartopy.feature as cfeature
 import numpy as np
 import yaml
 
+from src.preprocessing.shoreline_simplify import simplify_for_display
+from src.preprocessing.vector_io import attribute_in, read_vector
+
 def plot_puerto_rico_shoreline(shapefile_path: Path, county_path: Path, stations_path: Path, output_path: Path):
     """Create a focused map of Puerto Rico shoreline data from shapefile.
     
@@ -21,14 +23,13 @@ def plot_puerto_rico_shoreline(shapefile_path: Path, county_path: Path, stations
     """
     # Read the shapefile and filter for Puerto Rico
     print("Reading shoreline shapefile...")
-    shoreline = gpd.read_file(shapefile_path)
-    pr_shoreline = shoreline[shoreline['FIPS_ALPHA'] == 'PR'].copy()
+    pr_shoreline = read_vector(shapefile_path, where=attribute_in('FIPS_ALPHA', ['PR']))
+    pr_shoreline = simplify_for_display(pr_shoreline)
     print(f"Total Puerto Rico features: {len(pr_shoreline)}")
     
     # Read and filter county shapefile for Puerto Rico
     print("Reading county shapefile...")
-    counties = gpd.read_file(county_path)
-    pr_counties = counties[counties['STATEFP'] == '72'].copy()  # Puerto Rico FIPS code is 72
+    pr_counties = read_vector(county_path, where=attribute_in('STATEFP', ['72']))  # Puerto Rico FIPS code is 72
     print(f"Puerto Rico counties: {len(pr_counties)}")
     
     # Read tide stations configuration
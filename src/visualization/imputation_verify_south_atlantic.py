@@ -2,7 +2,6 @@
 Script to verify South Atlantic shoreline data with counties and tide stations.
 """
 
-import geopandas as gpd
 from pathlib import Path
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
@@ -10,6 +9,9 @@ import cartopy.feature as cfeature
 import numpy as np
 import yaml
 
+from src.preprocessing.shoreline_simplify import simplify_for_display
+from src.preprocessing.vector_io import attribute_in, read_vector
+
 def plot_south_atlantic_shoreline(shapefile_path: Path, county_path: Path, stations_path: Path, output_path: Path):
     """Create a focused map of South Atlantic shoreline data from shapefile.
     
@@ -21,16 +23,15 @@ def plot_south_atlantic_shoreline(shapefile_path: Path, county_path: Path, stati
     """
     # Read the shapefile and filter for South Atlantic states
     print("Reading shoreline shapefile...")
-    shoreline = gpd.read_file(shapefile_path)
     sa_states = ['NC', 'SC', 'GA', 'FL']  # South Atlantic states
-    sa_shoreline = shoreline[shoreline['FIPS_ALPHA'].isin(sa_states)].copy()
+    sa_shoreline = read_vector(shapefile_path, where=attribute_in('FIPS_ALPHA', sa_states))
+    sa_shoreline = simplify_for_display(sa_shoreline)
     print(f"Total South Atlantic features: {len(sa_shoreline)}")
     
     # Read and filter county shapefile for South Atlantic states
     print("Reading county shapefile...")
-    counties = gpd.read_file(county_path)
     state_fips = ['37', '45', '13', '12']  # FIPS codes for NC, SC, GA, FL
-    sa_counties = counties[counties['STATEFP'].isin(state_fips)].copy()
+    sa_counties = read_vector(county_path, where=attribute_in('STATEFP', state_fips))
     print(f"South Atlantic counties: {len(sa_counties)}")
     
     # Read tide stations configuration
@@ -2,7 +2,6 @@
 Script to verify US Virgin Islands shoreline data with tide stations.
 """
 
-import geopandas as gpd
 from pathlib import Path
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
@@ -10,6 +9,9 @@ import cartopy.feature as cfeature
 import numpy as np
 import yaml
 
+from src.preprocessing.shoreline_simplify import simplify_for_display
+from src.preprocessing.vector_io import attribute_in, read_vector
+
 def plot_virgin_islands_shoreline(shapefile_path: Path, stations_path: Path, output_path: Path):
     """Create a focused map of US Virgin Islands shoreline data from shapefile.
     
@@ -20,8 +22,8 @@ def plot_virgin_islands_shoreline(shapefile_path: Path, stations_path: Path, out
     """
     # Read the shapefile and filter for Virgin Islands
     print("Reading shoreline shapefile...")
-    shoreline = gpd.read_file(shapefile_path)
-    vi_shoreline = shoreline[shoreline['FIPS_ALPHA'] == 'VI'].copy()
+    vi_shoreline = read_vector(shapefile_path, where=attribute_in('FIPS_ALPHA', ['VI']))
+    vi_shoreline = simplify_for_display(vi_shoreline)
     print(f"Total Virgin Islands features: {len(vi_shoreline)}")
     
     # Read tide stations configuration
@@ -2,7 +2,6 @@
 Script to verify West Coast shoreline data with counties and tide stations.
 """
 
-import geopandas as gpd
 from pathlib import Path
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
@@ -10,6 +9,9 @@ import cartopy.feature as cfeature
 import numpy as np
 import yaml
 
+from src.preprocessing.shoreline_simplify import simplify_for_display
+from src.preprocessing.vector_io import attribute_in, read_vector
+
 def plot_west_coast_shoreline(shapefile_path: Path, county_path: Path, stations_path: Path, output_path: Path):
     """Create a focused map of West Coast shoreline data from shapefile.
     
@@ -21,16 +23,15 @@ def plot_west_coast_shoreline(shapefile_path: Path, county_path: Path, stations_
     """
     # Read the shapefile and filter for West Coast states
     print("Reading shoreline shapefile...")
-    shoreline = gpd.read_file(shapefile_path)
     west_states = ['CA', 'OR', 'WA']  # West Coast states
-    west_shoreline = shoreline[shoreline['FIPS_ALPHA'].isin(west_states)].copy()
+    west_shoreline = read_vector(shapefile_path, where=attribute_in('FIPS_ALPHA', west_states))
+    west_shoreline = simplify_for_display(west_shoreline)
     print(f"Total West Coast features: {len(west_shoreline)}")
     
     # Read and filter county shapefile for West Coast states
     print("Reading county shapefile...")
-    counties = gpd.read_file(county_path)
     state_fips = ['06', '41', '53']  # FIPS codes for CA, OR, WA
-    west_counties = counties[counties['STATEFP'].isin(state_fips)].copy()
+    west_counties = read_vector(county_path, where=attribute_in('STATEFP', state_fips))
     print(f"West Coast counties: {len(west_counties)}")
     
     # Read tide stations configuration
@@ -0,0 +1,134 @@
+"""Tests for per-year renormalization of station weights."""
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.assignment.common.reweighting import (
+    DynamicReweighter,
+    station_completeness,
+    station_validity
+)
+from src.assignment.historical.aggregator import HistoricalAggregator
+
+@pytest.fixture
+def mapping_df():
+    """Imputation structure with two counties and two stations."""
+    return pd.DataFrame({
+        'reference_point_id': [0, 0, 1, 1, 2],
+        'county_fips': ['34001', '34001', '34001', '34001', '34009'],
+        'region': 'mid_atlantic',
+        'station_id': ['8534720', '8536110', '8534720', '8536110', '8536110'],
+        'weight': [0.75, 0.25, 0.5, 0.5, 1.0]
+    })
+
+@pytest.fixture
+def station_data():
+    """Station x year block; 8536110 was installed in 2001."""
+    return {
+        'stations': np.array(['8536110', '8534720']),
+        'years': np.array([2000, 2001, 2002]),
+        'flood_days': np.array([[np.nan, 8.0, 4.0], [2.0, 4.0, 0.0]]),
+        'missing_days': np.array([[366.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+    }
+
+class TestStationValidity:
+    def test_fully_missing_years_are_invalid(self):
+        """Test that a year of missing days is never valid."""
+        flood = np.array([[0.0, 3.0, 5.0]])
+        missing = np.array([[365.0, 0.0, np.nan]])
+        valid = station_validity(flood, missing, np.array([1999, 2001, 2002]))
+        assert valid.tolist() == [[False, True, False]]
+
+    def test_completeness_threshold(self):
+        """Test the minimum completeness and leap-year day counts."""
+        missing = np.array([[183.0, 183.0]])
+        completeness = station_completeness(missing, np.array([2000, 2001]))
+        np.testing.assert_allclose(completeness, [[0.5, 182 / 365]])
+
+        valid = station_validity(np.zeros((1, 2)), missing, np.array([2000, 2001]), min_completeness=0.49)
+        assert valid.tolist() == [[True, True]]
+        valid = station_validity(np.zeros((1, 2)), missing, np.array([2000, 2001]), min_completeness=0.5)
+        assert valid.tolist() == [[False, False]]
+
+class TestDynamicReweighter:
+    def test_renormalizes_over_reporting_stations(self, mapping_df, station_data):
+        """Test that missing stations drop out instead of contributing zeros."""
+        reweighter = DynamicReweighter(mapping_df)
+        county_df, gaps = reweighter.aggregate(
+            station_data['stations'], station_data['years'],
+            station_data['flood_days'], station_data['missing_days']
+        )
+        values = county_df.set_index(['county_fips', 'year'])
+
+        # 2000: only 8534720 reports, so both points of 34001 take its value
+        assert values.loc[('34001', 2000), 'flood_days'] == pytest.approx(2.0)
+        assert values.loc[('34001', 2000), 'n_stations'] == 1
+        assert values.loc[('34001', 2000), 'coverage'] == pytest.approx((0.75 + 0.5) / 2)
+
+        # 2001: points are 0.75*4 + 0.25*8 = 5 and 0.5*4 + 0.5*8 = 6
+        assert values.loc[('34001', 2001), 'flood_days'] == pytest.approx(5.5)
+        assert values.loc[('34001', 2001), 'n_stations'] == 2
+        assert values.loc[('34001', 2001), 'n_reference_points'] == 2
+        assert values.loc[('34001', 2001), 'coverage'] == pytest.approx(1.0)
+        assert values.loc[('34009', 2002), 'flood_days'] == pytest.approx(4.0)
+
+        # 34009 only links to 8536110, which has no record in 2000
+        assert ('34009', 2000) not in values.index
+        assert gaps[['county_fips', 'year']].values.tolist() == [['34009', 2000]]
+
+    def test_matches_static_weights_when_complete(self, mapping_df):
+        """Test that complete records reproduce the static weighted means."""
+        rng = np.random.default_rng(0)
+        flood = rng.uniform(0, 10, size=(2, 4))
+        reweighter = DynamicReweighter(mapping_df)
+        county_df, gaps = reweighter.aggregate(
+            np.array(['8534720', '8536110']), np.arange(2000, 2004), flood, np.zeros((2, 4))
+        )
+
+        point0 = 0.75 * flood[0] + 0.25 * flood[1]
+        point1 = 0.5 * flood[0] + 0.5 * flood[1]
+        np.testing.assert_allclose(
+            county_df[county_df['county_fips'] == '34001']['flood_days'], (point0 + point1) / 2
+        )
+        assert gaps.empty
+
+    def test_aggregate_frame(self, mapping_df, station_data):
+        """Test that long station data gives the same result as the matrices."""
+        rows, cols = np.nonzero(~np.isnan(station_data['flood_days']))
+        station_df = pd.DataFrame({
+            'station_id': station_data['stations'][rows],
+            'year': station_data['years'][cols],
+            'flood_days': station_data['flood_days'][rows, cols],
+            'missing_days': station_data['missing_days'][rows, cols]
+        })
+        reweighter = DynamicReweighter(mapping_df)
+        from_frame, frame_gaps = reweighter.aggregate_frame(station_df)
+        from_matrix, matrix_gaps = reweighter.aggregate(
+            station_data['stations'], station_data['years'],
+            station_data['flood_days'], station_data['missing_days']
+        )
+        pd.testing.assert_frame_equal(from_frame, from_matrix)
+        pd.testing.assert_frame_equal(frame_gaps, matrix_gaps)
+
+    def test_unknown_stations_are_missing(self, mapping_df):
+        """Test that stations absent from the flood data count as not reporting."""
+        reweighter = DynamicReweighter(mapping_df)
+        county_df, gaps = reweighter.aggregate(
+            np.array(['8534720']), np.array([2000]), np.array([[3.0]]), np.array([[0.0]])
+        )
+        assert county_df['county_fips'].tolist() == ['34001']
+        assert county_df['flood_days'].tolist() == [pytest.approx(3.0)]
+        assert gaps['county_fips'].tolist() == ['34009']
+
+class TestHistoricalAggregator:
+    def test_aggregate_with_validity(self, mapping_df, station_data):
+        """Test aggregation from a flood matrix selection."""
+        aggregator = HistoricalAggregator(require_same_region=False)
+        county_df, gaps = aggregator.aggregate_with_validity(mapping_df, station_data)
+
+        assert {'county_fips', 'year', 'region', 'flood_days', 'n_stations',
+                'n_reference_points', 'completeness'} <= set(county_df.columns)
+        assert not county_df.duplicated(['county_fips', 'year']).any()
+        assert (county_df['region'] == 'mid_atlantic').all()
+        assert len(gaps) == 1
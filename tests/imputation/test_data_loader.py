@@ -0,0 +1,61 @@
+"""Tests for reference point loading."""
+
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import Point
+
+from src.imputation.data_loader import ReferencePointLoader
+from src.imputation.spatial_ops import LEVEL_COLUMN, REGION_COLUMN
+
+class TestReferencePointLoader:
+    def test_region_filter_pushdown(self, tmp_path):
+        """Test that only the requested regions are read when membership is precomputed."""
+        points = gpd.GeoDataFrame(
+            {
+                'county_fips': ['34001', '51001', '06001'],
+                'state_fips': ['34', '51', '06'],
+                REGION_COLUMN: ['mid_atlantic', 'mid_atlantic', 'west_coast']
+            },
+            geometry=[Point(-74.5, 39.4), Point(-75.7, 37.8), Point(-122.3, 37.8)],
+            crs="EPSG:4326"
+        )
+        path = tmp_path / "coastal_reference_points.parquet"
+        points.to_parquet(path)
+
+        loader = ReferencePointLoader(points_file=path)
+        assert len(loader.load()) == 3
+
+        loaded = loader.load(regions=['mid_atlantic'])
+        assert loaded['county_fips'].tolist() == ['34001', '51001']
+        assert loaded['state_code'].tolist() == ['NJ', 'VA']
+
+    def test_region_filter_without_column(self, tmp_path):
+        """Test that files without the membership column are read in full."""
+        points = gpd.GeoDataFrame(
+            {'county_fips': ['34001'], 'state_fips': ['34']},
+            geometry=[Point(-74.5, 39.4)],
+            crs="EPSG:4326"
+        )
+        path = tmp_path / "coastal_reference_points.parquet"
+        points.to_parquet(path)
+
+        assert len(ReferencePointLoader(points_file=path).load(regions=['west_coast'])) == 1
+
+    def test_pyramid_level(self, tmp_path):
+        """Test that one pyramid level is read with its point ids."""
+        points = gpd.GeoDataFrame(
+            {
+                'county_fips': ['34001'] * 4,
+                'state_fips': ['34'] * 4,
+                LEVEL_COLUMN: [25000, 1000, 5000, 1000]
+            },
+            geometry=[Point(-74.5, 39.4 + 0.01 * i) for i in range(4)],
+            index=pd.RangeIndex(4, name='reference_point_id'),
+            crs="EPSG:4326"
+        )
+        path = tmp_path / "coastal_reference_points.parquet"
+        points.to_parquet(path, index=True)
+
+        assert ReferencePointLoader(points_file=path).load().index.tolist() == [0, 2]
+        assert ReferencePointLoader(points_file=path, spacing=25000).load().index.tolist() == [0]
+        assert len(ReferencePointLoader(points_file=path, spacing=None).load()) == 4
@@ -0,0 +1,88 @@
+"""Tests for the global geodesic gauge index."""
+
+import pytest
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import Point
+
+from src.imputation.geodesic_index import GeodesicGaugeIndex, EARTH_RADIUS_METERS
+from src.imputation.spatial_ops import NearestGaugeFinder
+
+def haversine(lon1, lat1, lon2, lat2):
+    """Great-circle distance in meters."""
+    lon1, lat1, lon2, lat2 = map(np.radians, (lon1, lat1, lon2, lat2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(a))
+
+@pytest.fixture
+def stations():
+    """Create stations on both sides of the antimeridian."""
+    coords = {'A': (179.5, -16.0), 'B': (-179.5, -16.0), 'C': (-170.7, -14.3), 'D': (144.7, 13.4)}
+    return gpd.GeoDataFrame(
+        {'station_id': list(coords)},
+        geometry=[Point(lon, lat) for lon, lat in coords.values()],
+        crs="EPSG:4326"
+    )
+
+@pytest.fixture
+def index(stations):
+    """Create an index with two subregions."""
+    region_stations = {'pacific_islands': {
+        'A': {'name': 'A', 'sub_region': 'west'},
+        'B': {'name': 'B', 'sub_region': 'east'},
+        'C': {'name': 'C', 'sub_region': 'east'},
+        'D': {'name': 'D', 'sub_region': 'west'},
+    }}
+    return GeodesicGaugeIndex(stations, region_stations)
+
+class TestGeodesicGaugeIndex:
+    def test_antimeridian_neighbors(self, index):
+        """Test that neighbors across the antimeridian are found with great-circle distances."""
+        distances, positions = index.query(np.array([179.9]), np.array([-16.0]), k=2)
+
+        assert list(index.station_ids[positions[0]]) == ['A', 'B']
+        assert distances[0, 0] == pytest.approx(haversine(179.9, -16.0, 179.5, -16.0), rel=1e-9)
+        assert distances[0, 1] == pytest.approx(haversine(179.9, -16.0, -179.5, -16.0), rel=1e-9)
+
+    def test_masked_query(self, index):
+        """Test that subregion masks restrict candidates."""
+        mask = index.station_mask('pacific_islands', 'west')
+        distances, positions = index.query(np.array([-179.9]), np.array([-16.0]), k=3, mask=mask)
+
+        assert positions.shape == (1, 2)
+        assert list(index.station_ids[positions[0]]) == ['A', 'D']
+        assert np.all(np.diff(distances[0]) > 0)
+
+    def test_query_radius(self, index):
+        """Test radius queries against brute-force great-circle distances."""
+        lon, lat = np.array([179.9, 150.0]), np.array([-16.0, 0.0])
+        point_pos, station_pos, distances = index.query_radius(lon, lat, 100000)
+
+        assert sorted(index.station_ids[station_pos[point_pos == 0]]) == ['A', 'B']
+        assert not (point_pos == 1).any()
+        lon_s = np.array([179.5, -179.5, -170.7, 144.7])[station_pos]
+        lat_s = np.array([-16.0, -16.0, -14.3, 13.4])[station_pos]
+        np.testing.assert_allclose(distances, haversine(lon[point_pos], lat[point_pos], lon_s, lat_s), rtol=1e-9)
+
+    def test_finder_geodesic_mode(self):
+        """Test that the geodesic finder agrees with the projected finder for the nearest gauge."""
+        rng = np.random.default_rng(1)
+        points = gpd.GeoDataFrame(
+            {'county_fips': '34001', 'state_code': 'NJ'},
+            geometry=[Point(lon, lat) for lon, lat in zip(rng.uniform(-75.3, -74.2, 20), rng.uniform(38.95, 39.9, 20))],
+            index=[f"pt{i}" for i in range(20)],
+            crs="EPSG:4326"
+        )
+        gauges = gpd.GeoDataFrame(
+            {'station_id': ['8534720', '8536110', '8537121', '8545240']},
+            geometry=[Point(-74.418053, 39.356667), Point(-74.959999, 38.9683),
+                      Point(-75.376678, 39.305389), Point(-75.141667, 39.933333)],
+            crs="EPSG:4326"
+        )
+
+        planar = NearestGaugeFinder().find_nearest(points, gauges, 'mid_atlantic')
+        geodesic = NearestGaugeFinder(geodesic=True).find_nearest(points, gauges, 'mid_atlantic')
+
+        assert list(geodesic.columns) == list(planar.columns)
+        assert list(geodesic['station_id']) == list(planar['station_id'])
+        np.testing.assert_allclose(geodesic['distance_meters'], planar['distance_meters'], rtol=0.01)
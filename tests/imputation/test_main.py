@@ -0,0 +1,97 @@
+"""Tests for the imputation manager region fan-out."""
+
+import pytest
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+from shapely.geometry import Point
+
+from src.imputation import main as imputation_main
+from src.imputation.main import ImputationManager, partition_reference_points, process_region
+
+GAUGES = {
+    '8534720': (-74.418053, 39.356667),
+    '8536110': (-74.959999, 38.9683),
+    '8537121': (-75.376678, 39.305389),
+    '8638610': (-76.330017, 36.946701),
+}
+
+class StaticLoader:
+    """Data loader returning fixed inputs."""
+
+    def __init__(self, reference_points, gauge_stations):
+        self.reference_points = reference_points
+        self.gauge_stations = gauge_stations
+
+    def load_reference_points(self, regions=None, bbox=None):
+        return self.reference_points
+
+    def load_gauge_stations(self):
+        return self.gauge_stations
+
+@pytest.fixture
+def reference_points():
+    """Create reference points in New Jersey and Virginia."""
+    rng = np.random.default_rng(7)
+    nj = list(zip(rng.uniform(-75.3, -74.2, 15), rng.uniform(38.95, 39.9, 15)))
+    va = list(zip(rng.uniform(-76.5, -76.0, 10), rng.uniform(37.0, 37.5, 10)))
+    gdf = gpd.GeoDataFrame(
+        {
+            'county_fips': ['34001'] * 15 + ['51001'] * 10,
+            'state_code': ['NJ'] * 15 + ['VA'] * 10
+        },
+        geometry=[Point(lon, lat) for lon, lat in nj + va],
+        index=[f"pt{i}" for i in range(25)],
+        crs="EPSG:4326"
+    )
+    gdf.index.name = 'point_id'
+    return gdf
+
+@pytest.fixture
+def gauge_stations():
+    """Create gauge stations."""
+    return gpd.GeoDataFrame(
+        {'station_id': list(GAUGES)},
+        geometry=[Point(*c) for c in GAUGES.values()],
+        crs="EPSG:4326"
+    )
+
+@pytest.fixture
+def manager(tmp_path, reference_points, gauge_stations):
+    """Create a manager over all regions with static inputs."""
+    manager = ImputationManager(output_dir=tmp_path, n_processes=2)
+    manager.data_loader = StaticLoader(reference_points, gauge_stations)
+    return manager
+
+class TestImputationManager:
+    def test_partition_reference_points(self, reference_points, manager):
+        """Test that points are split into per-region arrays by state."""
+        partitions = partition_reference_points(reference_points, manager.region_config)
+
+        assert len(partitions['mid_atlantic']['reference_point_id']) == 25
+        assert len(partitions['north_atlantic']['x']) == 0
+        np.testing.assert_array_equal(partitions['mid_atlantic']['x'], reference_points.geometry.x)
+
+    def test_parallel_run_matches_direct(self, manager, reference_points, gauge_stations):
+        """Test that the fanned-out run reproduces a direct process_region call."""
+        output_files = manager.run()
+
+        assert list(output_files) == ['mid_atlantic']
+        result = pd.read_parquet(output_files['mid_atlantic'])
+        expected = process_region(
+            'mid_atlantic', manager.region_config['mid_atlantic'], reference_points, gauge_stations
+        )
+        pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
+        assert not imputation_main._REGION_TASKS
+
+    def test_reuses_cached_structure(self, manager, tmp_path, reference_points, gauge_stations):
+        """Test that unchanged inputs reuse the stored structure."""
+        first = manager.run()['mid_atlantic']
+        mtime = first.stat().st_mtime_ns
+
+        assert manager.run()['mid_atlantic'] == first
+        assert first.stat().st_mtime_ns == mtime
+
+        changed = ImputationManager(output_dir=tmp_path, n_processes=2, region='mid_atlantic', max_distance_meters=50000)
+        changed.data_loader = StaticLoader(reference_points, gauge_stations)
+        assert changed.run()['mid_atlantic'] != first
@@ -0,0 +1,93 @@
+"""Tests for radius-based sparse neighbor search and CSR persistence."""
+
+import pytest
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import Point
+
+from src.imputation.spatial_ops import NearestGaugeFinder
+from src.imputation.weight_calculator import WeightCalculator
+from src.imputation.neighbor_matrix import frame_to_csr, save_neighbor_matrices, load_neighbor_matrices
+
+GAUGES = {
+    '8534720': (-74.418053, 39.356667),
+    '8536110': (-74.959999, 38.9683),
+    '8537121': (-75.376678, 39.305389),
+    '8545240': (-75.141667, 39.933333),
+}
+
+@pytest.fixture
+def reference_points():
+    """Create reference points in New Jersey, including one far from every gauge."""
+    rng = np.random.default_rng(3)
+    coords = list(zip(rng.uniform(-75.3, -74.2, 30), rng.uniform(38.95, 39.9, 30))) + [(-71.5, 40.9)]
+    return gpd.GeoDataFrame(
+        {'county_fips': [f"34{i:03d}" for i in range(len(coords))], 'state_code': 'NJ'},
+        geometry=[Point(lon, lat) for lon, lat in coords],
+        index=[f"pt{i}" for i in range(len(coords))],
+        crs="EPSG:4326"
+    )
+
+@pytest.fixture
+def gauge_stations():
+    """Create gauge stations."""
+    return gpd.GeoDataFrame(
+        {'station_id': list(GAUGES)},
+        geometry=[Point(*c) for c in GAUGES.values()],
+        crs="EPSG:4326"
+    )
+
+class TestRadiusNeighbors:
+    @pytest.mark.parametrize("geodesic", [False, True])
+    def test_find_within_radius(self, geodesic, reference_points, gauge_stations):
+        """Test that the CSR matrix holds exactly the pairs within range."""
+        neighbors = NearestGaugeFinder(geodesic=geodesic).find_within_radius(
+            reference_points, gauge_stations, 'mid_atlantic', max_distance_meters=50000
+        )
+        distances = neighbors['distances']
+
+        assert distances.shape == (31, 4)
+        points = reference_points.to_crs("EPSG:5070").geometry.to_numpy()
+        stations = gauge_stations.to_crs("EPSG:5070").set_index('station_id').geometry
+        dense = np.array([[p.distance(stations[sid]) for sid in neighbors['station_ids']] for p in points])
+
+        within = dense[:30] <= 50000
+        stored = distances.toarray()[:30] > 0
+        # Planar and geodesic distances differ slightly near the radius boundary
+        boundary = np.abs(dense[:30] - 50000) < 500
+        assert np.array_equal(within[~boundary], stored[~boundary])
+        np.testing.assert_allclose(distances.toarray()[:30][stored], dense[:30][stored], rtol=0.01)
+
+        # The far point falls back to its single nearest station
+        assert distances[30].nnz == 1
+        assert neighbors['station_ids'][distances[30].indices[0]] == neighbors['station_ids'][dense[30].argmin()]
+
+    def test_sparse_weights_match_dense(self, reference_points, gauge_stations):
+        """Test that sparse weights equal dense weights on the same candidates."""
+        neighbors = NearestGaugeFinder().find_within_radius(
+            reference_points, gauge_stations, 'mid_atlantic', max_distance_meters=80000
+        )
+        calculator = WeightCalculator(max_distance_meters=1e9)
+        weights = calculator.compute_sparse_weights(neighbors['distances'])
+
+        dense_distances = np.where(neighbors['distances'].toarray() > 0, neighbors['distances'].toarray(), np.nan)
+        expected = np.nan_to_num(calculator.compute_weights(dense_distances))
+        np.testing.assert_allclose(weights.toarray(), expected, rtol=1e-12)
+        np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+
+    def test_save_and_load(self, reference_points, gauge_stations, tmp_path):
+        """Test round-tripping the imputation structure through the .npz file."""
+        finder = NearestGaugeFinder()
+        neighbors = finder.find_within_radius(reference_points, gauge_stations, 'mid_atlantic')
+        weights = WeightCalculator().compute_sparse_weights(neighbors['distances'])
+        df = finder.neighbors_to_frame(neighbors, weights, 'mid_atlantic')
+
+        path = save_neighbor_matrices(df, tmp_path / "imputation_structure_mid_atlantic.npz")
+        loaded = load_neighbor_matrices(path)
+        expected = frame_to_csr(df)
+
+        for key in ('distances', 'weights'):
+            assert (loaded[key] != expected[key]).nnz == 0
+        assert list(loaded['reference_point_ids']) == list(df['reference_point_id'].unique())
+        assert loaded['county_fips'][0] == df['county_fips'].iloc[0]
+        assert loaded['weights'].nnz == len(df)
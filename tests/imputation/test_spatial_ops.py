@@ -0,0 +1,148 @@
+"""Tests for nearest gauge search in the imputation spatial operations."""
+
+import pytest
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import Point
+
+from src.config import CONFIG_DIR
+from src.imputation.spatial_ops import (
+    NearestGaugeFinder,
+    MAPPING_COLUMNS,
+    REGION_COLUMN,
+    assign_imputation_regions,
+    bounds_mask
+)
+
+STATIONS = {
+    '8534720': (39.356667, -74.418053),  # Atlantic City (New Jersey Coast)
+    '8536110': (38.9683, -74.959999),    # Cape May (New Jersey Coast)
+    '8537121': (39.305389, -75.376678),  # Ship John Shoal (Delaware Bay)
+    '8545240': (39.933333, -75.141667),  # Philadelphia (Delaware Bay)
+}
+
+@pytest.fixture(scope="module")
+def finder():
+    """Create a gauge finder from the repository region configuration."""
+    return NearestGaugeFinder(region_config=CONFIG_DIR / "region_mappings.yaml")
+
+@pytest.fixture
+def reference_points():
+    """Create reference points along the New Jersey coast."""
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(38.9, 40.0, 25)
+    lons = rng.uniform(-75.4, -74.1, 25)
+    return gpd.GeoDataFrame(
+        {
+            'county_fips': [f"34{i:03d}" for i in range(25)],
+            'state_code': 'NJ'
+        },
+        geometry=[Point(lon, lat) for lat, lon in zip(lats, lons)],
+        index=[f"pt{i}" for i in range(25)],
+        crs="EPSG:4326"
+    )
+
+@pytest.fixture
+def gauge_stations():
+    """Create gauge stations for a subset of Mid-Atlantic stations."""
+    return gpd.GeoDataFrame(
+        {'station_id': list(STATIONS)},
+        geometry=[Point(lon, lat) for lat, lon in STATIONS.values()],
+        crs="EPSG:4326"
+    )
+
+class TestFindNearest:
+    def test_columnar_output(self, finder, reference_points, gauge_stations):
+        """Test that mappings are returned as one row per point and gauge."""
+        mappings = finder.find_nearest(reference_points, gauge_stations, 'mid_atlantic')
+
+        assert list(mappings.columns) == MAPPING_COLUMNS
+        # Two subregions with two stations each -> 2 mappings per point and subregion
+        assert len(mappings) == 25 * 2 * 2
+        assert set(mappings['sub_region']) == {'New Jersey Coast', 'Delaware Bay'}
+        assert (mappings['region'] == 'mid_atlantic').all()
+
+        for _, group in mappings.groupby(['reference_point_id', 'sub_region']):
+            assert list(group['rank']) == [0, 1]
+            assert group['distance_meters'].is_monotonic_increasing
+
+    def test_matches_point_distances(self, finder, reference_points, gauge_stations):
+        """Test that the nearest station agrees with a brute-force search."""
+        mappings = finder.find_nearest(reference_points, gauge_stations, 'mid_atlantic')
+        nearest = mappings[(mappings['rank'] == 0) & (mappings['sub_region'] == 'Delaware Bay')]
+
+        points = reference_points.to_crs("EPSG:5070")
+        stations = gauge_stations.to_crs("EPSG:5070").set_index('station_id')
+        for row in nearest.itertuples():
+            point = points.geometry[row.reference_point_id]
+            distances = {sid: point.distance(stations.geometry[sid]) for sid in ('8537121', '8545240')}
+            assert row.station_id == min(distances, key=distances.get)
+            assert row.distance_meters == pytest.approx(distances[row.station_id])
+            assert row.county_fips == reference_points.loc[row.reference_point_id, 'county_fips']
+
+    def test_mapping_dict_adapter(self, finder, reference_points, gauge_stations):
+        """Test conversion to the nested dictionary format."""
+        mappings = finder.find_nearest(reference_points, gauge_stations, 'mid_atlantic')
+        nested = NearestGaugeFinder.to_mapping_dicts(mappings)
+
+        assert len(nested) == 25 * 2
+        first = nested[0]
+        assert set(first) == {'reference_point_id', 'county_fips', 'region', 'mappings'}
+        assert len(first['mappings']) == 2
+        assert all(m['weight'] == 1.0 for m in first['mappings'])
+        assert sum(len(m['mappings']) for m in nested) == len(mappings)
+
+    def test_single_station_subregion(self, finder, reference_points, gauge_stations):
+        """Test subregions with a single station (k=1)."""
+        stations = gauge_stations[gauge_stations['station_id'] != '8536110']
+        mappings = finder.find_nearest(reference_points, stations, 'mid_atlantic')
+
+        coast = mappings[mappings['sub_region'] == 'New Jersey Coast']
+        assert len(coast) == 25
+        assert (coast['station_id'] == '8534720').all()
+        assert (coast['rank'] == 0).all()
+
+    def test_no_points_in_region(self, finder, reference_points, gauge_stations):
+        """Test that an empty frame is returned when nothing matches."""
+        reference_points['state_code'] = 'CA'
+        mappings = finder.find_nearest(reference_points, gauge_stations, 'mid_atlantic')
+        assert mappings.empty
+        assert NearestGaugeFinder.to_mapping_dicts(mappings) == []
+
+class TestRegionFilter:
+    def test_bounds_mask_is_strict(self):
+        """Test that points on the bounds are excluded, as with a 'within' join."""
+        bounds = {'min_lon': -77.0, 'max_lon': -71.0, 'min_lat': 37.0, 'max_lat': 41.0}
+        lon = np.array([-74.0, -77.0, -74.0, -80.0])
+        lat = np.array([39.0, 39.0, 41.0, 39.0])
+        assert bounds_mask(lon, lat, bounds).tolist() == [True, False, False, False]
+
+    def test_filter_by_region(self, finder, reference_points, gauge_stations):
+        """Test state and bounds filtering of points and stations."""
+        points = reference_points.copy()
+        points.loc['pt0', 'state_code'] = 'NC'
+        points.loc['pt1', 'geometry'] = Point(-70.0, 39.0)
+
+        filtered_points, filtered_stations = finder._filter_by_region(points, gauge_stations, 'mid_atlantic')
+
+        assert list(filtered_points.index) == [f"pt{i}" for i in range(2, 25)]
+        assert set(filtered_stations['station_id']) == set(STATIONS)
+        names = dict(zip(filtered_stations['station_id'], filtered_stations['station_name']))
+        assert names['8534720'] == finder.region_stations['mid_atlantic']['8534720']['name']
+
+    def test_precomputed_region_column(self, finder, reference_points, gauge_stations):
+        """Test that a precomputed membership column gives the same points."""
+        points = reference_points.copy()
+        points.loc['pt0', 'state_code'] = 'NC'
+        lon, lat = points.geometry.x.to_numpy(), points.geometry.y.to_numpy()
+        points[REGION_COLUMN] = assign_imputation_regions(
+            lon, lat, points['state_code'].to_numpy(), finder.region_config['regions']
+        )
+
+        with_column, _ = finder._filter_by_region(points, gauge_stations, 'mid_atlantic')
+        without_column, _ = finder._filter_by_region(
+            points.drop(columns=REGION_COLUMN), gauge_stations, 'mid_atlantic'
+        )
+
+        assert points[REGION_COLUMN].isna().tolist() == [True] + [False] * 24
+        assert list(with_column.index) == list(without_column.index)
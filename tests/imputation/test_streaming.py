@@ -0,0 +1,128 @@
+"""Tests for out-of-core streaming imputation."""
+
+import pytest
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import pyarrow as pa
+import shapely
+from shapely.geometry import Point
+
+from src.imputation.main import process_region
+from src.imputation.spatial_ops import NearestGaugeFinder
+from src.imputation.streaming import StreamingImputer, decode_wkb_points, iter_reference_point_batches
+from src.preprocessing.vector_io import write_geoparquet
+
+GAUGES = {
+    '8534720': (-74.418053, 39.356667),
+    '8536110': (-74.959999, 38.9683),
+    '8537121': (-75.376678, 39.305389),
+    '8638610': (-76.330017, 36.946701),
+}
+
+@pytest.fixture
+def reference_points():
+    """Create reference points in New Jersey and Virginia with a state_fips column."""
+    rng = np.random.default_rng(11)
+    coords = list(zip(rng.uniform(-75.3, -74.2, 120), rng.uniform(38.95, 39.9, 120)))
+    coords += list(zip(rng.uniform(-76.5, -76.0, 80), rng.uniform(37.0, 37.5, 80)))
+    return gpd.GeoDataFrame(
+        {
+            'county_fips': ['34001'] * 120 + ['51001'] * 80,
+            'state_fips': ['34'] * 120 + ['51'] * 80
+        },
+        geometry=[Point(lon, lat) for lon, lat in coords],
+        crs="EPSG:4326"
+    )
+
+@pytest.fixture
+def points_file(reference_points, tmp_path):
+    """Write reference points as GeoParquet with several row groups."""
+    path = tmp_path / "coastal_reference_points.parquet"
+    reference_points.to_parquet(path, row_group_size=64)
+    return path
+
+@pytest.fixture
+def gauge_stations():
+    """Create gauge stations."""
+    return gpd.GeoDataFrame(
+        {'station_id': list(GAUGES)},
+        geometry=[Point(*c) for c in GAUGES.values()],
+        crs="EPSG:4326"
+    )
+
+class TestStreamingImputation:
+    def test_decode_wkb_points(self):
+        """Test decoding little-endian, big-endian and null geometries."""
+        points = [Point(1.5, -2.25), Point(3.0, 4.0), None]
+        wkb = [shapely.to_wkb(points[0]), shapely.to_wkb(points[1], byte_order=0), None]
+        x, y = decode_wkb_points(pa.array(wkb, type=pa.binary()))
+
+        np.testing.assert_array_equal(x[:2], [1.5, 3.0])
+        np.testing.assert_array_equal(y[:2], [-2.25, 4.0])
+        assert np.isnan(x[2]) and np.isnan(y[2])
+
+    def test_iter_batches(self, points_file, reference_points):
+        """Test that batches carry keys and coordinates for every point."""
+        batches = list(iter_reference_point_batches(points_file, batch_size=50))
+
+        assert max(len(b['lon']) for b in batches) <= 50
+        ids = np.concatenate([b['reference_point_id'] for b in batches])
+        np.testing.assert_array_equal(ids, np.arange(200))
+        np.testing.assert_array_equal(np.concatenate([b['lon'] for b in batches]), reference_points.geometry.x)
+        assert set(np.concatenate([b['state_code'] for b in batches])) == {'NJ', 'VA'}
+
+    def test_iter_batches_skips_row_groups(self, reference_points, tmp_path):
+        """Test that a bbox reads only intersecting row groups and keeps the stored point ids."""
+        reference_points.index = pd.RangeIndex(len(reference_points), name='reference_point_id')
+        path = tmp_path / "sorted_points.parquet"
+        write_geoparquet(reference_points, path, index=True, row_group_size=40)
+
+        nj_bbox = (-75.5, 38.9, -74.0, 40.0)
+        batches = list(iter_reference_point_batches(path, batch_size=50, bboxes=[nj_bbox]))
+
+        ids = np.concatenate([b['reference_point_id'] for b in batches])
+        assert set(range(120)) <= set(ids)
+        assert len(ids) < len(reference_points)
+        lon = np.concatenate([b['lon'] for b in batches])
+        np.testing.assert_array_equal(lon, reference_points.geometry.x.to_numpy()[ids])
+
+    def test_iter_batches_pyramid_level(self, reference_points, tmp_path):
+        """Test that a spacing yields only the points of that pyramid level."""
+        reference_points['level'] = np.where(np.arange(len(reference_points)) % 5 == 0, 5000, 1000)
+        reference_points.index = pd.RangeIndex(len(reference_points), name='reference_point_id')
+        path = tmp_path / "pyramid_points.parquet"
+        reference_points.to_parquet(path, index=True)
+
+        batches = list(iter_reference_point_batches(path, batch_size=50, spacing=5000))
+
+        ids = np.concatenate([b['reference_point_id'] for b in batches])
+        np.testing.assert_array_equal(ids, np.arange(0, 200, 5))
+        assert sum(len(b['lon']) for b in batches) == 40
+
+    def test_matches_in_memory(self, points_file, reference_points, gauge_stations, tmp_path):
+        """Test that the streamed dataset matches the in-memory geodesic imputation."""
+        finder = NearestGaugeFinder(geodesic=True)
+        paths = StreamingImputer(gauge_stations, gauge_finder=finder).run(
+            points_file, tmp_path / "dataset", regions=['mid_atlantic'], batch_size=50
+        )
+
+        streamed = pd.read_parquet(paths['mid_atlantic'])
+        reference_points['state_code'] = reference_points['state_fips'].map({'34': 'NJ', '51': 'VA'})
+        expected = process_region(
+            'mid_atlantic', finder.region_config['regions']['mid_atlantic'],
+            reference_points, gauge_stations, geodesic=True
+        )
+
+        key = ['reference_point_id', 'station_id']
+        streamed = streamed.sort_values(key).reset_index(drop=True)
+        expected = expected.sort_values(key).reset_index(drop=True)
+        assert len(streamed) == len(expected)
+        np.testing.assert_array_equal(streamed['station_id'], expected['station_id'])
+        np.testing.assert_array_equal(streamed['county_fips'], expected['county_fips'])
+        np.testing.assert_allclose(streamed['distance_meters'], expected['distance_meters'])
+        np.testing.assert_allclose(streamed['weight'], expected['weight'])
+
+        # Read back as a partitioned dataset
+        dataset = pd.read_parquet(tmp_path / "dataset")
+        assert set(dataset['region'].astype(str)) == {'mid_atlantic'}
@@ -0,0 +1,100 @@
+"""Tests for the content-addressed imputation structure cache."""
+
+import pytest
+import json
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+from shapely.geometry import Point
+
+from src.imputation.structure_cache import (
+    ImputationStructureCache,
+    latest_structure_file,
+    structure_key
+)
+
+@pytest.fixture
+def points():
+    """Create region reference point arrays."""
+    return {
+        'reference_point_id': np.array(['pt0', 'pt1']),
+        'county_fips': np.array(['34001', '34009'], dtype=object),
+        'state_code': np.array(['NJ', 'NJ'], dtype=object),
+        'x': np.array([-74.5, -74.9]),
+        'y': np.array([39.4, 39.0])
+    }
+
+@pytest.fixture
+def gauge_stations():
+    """Create gauge stations."""
+    return gpd.GeoDataFrame({'station_id': ['8534720']}, geometry=[Point(-74.418, 39.357)], crs="EPSG:4326")
+
+@pytest.fixture
+def station_file(tmp_path):
+    """Write a tide station configuration."""
+    path = tmp_path / "mid_atlantic_tide_stations.yaml"
+    path.write_text("stations: {}\n")
+    return path
+
+def write_structure(cache, region, key):
+    """Write a dummy structure for a key."""
+    path = cache.structure_path(region, key)
+    pd.DataFrame({'weight': [1.0]}).to_parquet(path)
+    return path
+
+class TestStructureKey:
+    def test_key_is_stable(self, points, gauge_stations, station_file):
+        """Test that identical inputs give identical keys."""
+        params = {'weight_method': 'idw'}
+        first = structure_key(points, gauge_stations, {'state_codes': ['NJ']}, station_file, params)
+        second = structure_key(dict(points), gauge_stations.copy(), {'state_codes': ['NJ']}, station_file, dict(params))
+        assert first == second
+
+    def test_key_changes_with_inputs(self, points, gauge_stations, station_file):
+        """Test that points, station configs and parameters all affect the key."""
+        base = structure_key(points, gauge_stations, {}, station_file, {'weight_method': 'idw'})
+
+        moved = dict(points, x=points['x'] + 0.001)
+        assert structure_key(moved, gauge_stations, {}, station_file, {'weight_method': 'idw'}) != base
+        assert structure_key(points, gauge_stations, {}, station_file, {'weight_method': 'gaussian'}) != base
+
+        station_file.write_text("stations: {'8534720': {}}\n")
+        assert structure_key(points, gauge_stations, {}, station_file, {'weight_method': 'idw'}) != base
+
+class TestImputationStructureCache:
+    def test_lookup_and_latest(self, tmp_path):
+        """Test that committed structures are found by key and pointer."""
+        cache = ImputationStructureCache(tmp_path)
+        assert cache.lookup('mid_atlantic', 'a' * 64) is None
+
+        path = write_structure(cache, 'mid_atlantic', 'a' * 64)
+        cache.commit('mid_atlantic', 'a' * 64, [path])
+
+        assert cache.lookup('mid_atlantic', 'a' * 64) == path
+        assert cache.lookup('mid_atlantic', 'b' * 64) is None
+        assert latest_structure_file('mid_atlantic', tmp_path) == path
+
+    def test_prunes_superseded(self, tmp_path):
+        """Test that only max_versions structures are kept."""
+        cache = ImputationStructureCache(tmp_path, max_versions=2)
+        paths = []
+        for key in ('a' * 64, 'b' * 64, 'c' * 64):
+            paths.append(write_structure(cache, 'mid_atlantic', key))
+            cache.commit('mid_atlantic', key, [paths[-1]])
+
+        assert not paths[0].exists()
+        assert paths[1].exists() and paths[2].exists()
+        assert latest_structure_file('mid_atlantic', tmp_path) == paths[2]
+
+        # The retained previous version can be reused and becomes latest again
+        assert cache.lookup('mid_atlantic', 'b' * 64) == paths[1]
+        with open(cache.pointer_path('mid_atlantic')) as f:
+            assert json.load(f)['key'] == 'b' * 64
+
+    def test_legacy_fallback(self, tmp_path):
+        """Test resolving timestamped files written before the cache existed."""
+        for stamp in ('20240101_120000', '20250101_120000'):
+            pd.DataFrame({'weight': [1.0]}).to_parquet(tmp_path / f"imputation_structure_mid_atlantic_{stamp}.parquet")
+
+        assert latest_structure_file('mid_atlantic', tmp_path).name == "imputation_structure_mid_atlantic_20250101_120000.parquet"
+        assert latest_structure_file('west_coast', tmp_path) is None
@@ -0,0 +1,74 @@
+"""Tests for sparse-matrix water level imputation."""
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.imputation.temporal_ops import WaterLevelProcessor
+
+@pytest.fixture
+def structure_file(tmp_path):
+    """Write an imputation structure with three points and two gauges."""
+    df = pd.DataFrame({
+        'reference_point_id': [0, 0, 1, 1, 2],
+        'county_fips': ['34001', '34001', '34009', '34009', '34011'],
+        'station_id': ['8534720', '8536110', '8534720', '8536110', '8536110'],
+        'weight': [0.75, 0.25, 0.5, 0.5, 1.0]
+    })
+    path = tmp_path / "imputation_structure_mid_atlantic.parquet"
+    df.to_parquet(path)
+    return path
+
+@pytest.fixture
+def gauge_dir(tmp_path):
+    """Write 6-minute water levels for two gauges in different formats."""
+    gauge_dir = tmp_path / "gauges"
+    gauge_dir.mkdir()
+    times = pd.date_range("2020-01-01", periods=10 * 6, freq="6min")
+
+    pd.DataFrame({'t': times, 'v': 1.0}).to_csv(gauge_dir / "8534720.csv", index=False)
+    # Second gauge rises by hour and is missing the last hour
+    second = pd.DataFrame({'time': times[:-10], 'water_level': (np.arange(50) // 10).astype(float)})
+    second.to_parquet(gauge_dir / "8536110_2020.parquet")
+    return gauge_dir
+
+class TestWaterLevelProcessor:
+    def test_weight_matrix(self, structure_file, tmp_path):
+        """Test the sparse weight matrix layout."""
+        processor = WaterLevelProcessor(structure_file, tmp_path / "out")
+
+        assert processor.weights.shape == (3, 2)
+        np.testing.assert_allclose(processor.weights.toarray(), [[0.75, 0.25], [0.5, 0.5], [0.0, 1.0]])
+
+    @pytest.mark.parametrize("memmap_threshold", [0, 512 * 1024 ** 2])
+    def test_load_gauge_matrix(self, structure_file, gauge_dir, tmp_path, memmap_threshold):
+        """Test hourly binning into a (time x gauge) matrix, in memory or memory-mapped."""
+        processor = WaterLevelProcessor(structure_file, tmp_path / "out", memmap_threshold_bytes=memmap_threshold)
+        time_index, matrix = processor.load_gauge_matrix(gauge_dir)
+
+        assert matrix.dtype == np.float32
+        assert isinstance(matrix, np.memmap) == (memmap_threshold == 0)
+        assert len(time_index) == 6
+        np.testing.assert_array_equal(matrix[:, 0], 1.0)
+        np.testing.assert_array_equal(matrix[:5, 1], [0, 1, 2, 3, 4])
+        assert np.isnan(matrix[5, 1])
+
+    def test_process_water_levels(self, structure_file, gauge_dir, tmp_path):
+        """Test imputed levels, renormalization over reporting gauges and the output layout."""
+        processor = WaterLevelProcessor(structure_file, tmp_path / "out")
+        output = processor.process_water_levels(gauge_dir, tmp_path / "levels.parquet", time_chunk=4)
+
+        result = pd.read_parquet(output)
+        assert list(result.columns) == ['time', 'reference_point_id', 'county_fips', 'water_level']
+
+        levels = result.pivot(index='time', columns='reference_point_id', values='water_level')
+        hours = np.arange(5)
+        np.testing.assert_allclose(levels[0].iloc[:5], 0.75 + 0.25 * hours)
+        np.testing.assert_allclose(levels[1].iloc[:5], 0.5 + 0.5 * hours)
+        np.testing.assert_allclose(levels[2].iloc[:5], hours)
+
+        # Last hour: only the first gauge reports
+        assert levels[0].iloc[5] == pytest.approx(1.0)
+        assert levels[1].iloc[5] == pytest.approx(1.0)
+        assert np.isnan(levels[2].iloc[5])
+        assert len(result) == 6 * 3 - 1
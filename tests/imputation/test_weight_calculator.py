@@ -0,0 +1,98 @@
+"""Tests for vectorized gauge station weight calculation."""
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.imputation.weight_calculator import WeightCalculator, WEIGHT_METHODS
+
+def legacy_idw(distances, max_distance=100000, power=2, min_weight=0.1):
+    """Per-mapping IDW weights as computed before vectorization."""
+    distances = np.asarray(distances, dtype=float)
+    valid_mask = distances <= max_distance
+    if not any(valid_mask):
+        valid_mask = np.ones_like(distances, dtype=bool)
+    weights = 1 / (distances[valid_mask] ** power)
+    weights = weights / np.sum(weights)
+    weights = np.maximum(weights, min_weight)
+    return valid_mask, weights / np.sum(weights)
+
+@pytest.fixture
+def distance_rows():
+    """Create rows of sorted distances with 1-3 stations each."""
+    rng = np.random.default_rng(42)
+    rows = []
+    for _ in range(200):
+        k = rng.integers(1, 4)
+        rows.append(np.sort(rng.uniform(500, 250000, k)))
+    rows.append(np.array([150000.0, 180000.0, 220000.0]))  # all beyond max distance
+    return rows
+
+@pytest.fixture
+def mapping_frame(distance_rows):
+    """Create a mapping table in the find_nearest layout."""
+    records = []
+    for i, row in enumerate(distance_rows):
+        for rank, d in enumerate(row):
+            records.append({'reference_point_id': f"pt{i}", 'station_id': f"st{rank}",
+                            'distance_meters': d, 'rank': rank})
+    return pd.DataFrame(records)
+
+class TestWeightCalculator:
+    def test_idw_parity(self, distance_rows):
+        """Test that the array path reproduces the per-mapping IDW weights."""
+        distances = np.full((len(distance_rows), 3), np.nan)
+        for i, row in enumerate(distance_rows):
+            distances[i, :len(row)] = row
+
+        weights = WeightCalculator().compute_weights(distances)
+        for i, row in enumerate(distance_rows):
+            mask, expected = legacy_idw(row)
+            result = weights[i, :len(row)]
+            assert np.array_equal(~np.isnan(result), mask)
+            np.testing.assert_array_equal(result[mask], expected)
+
+    def test_frame_matches_dicts(self, mapping_frame):
+        """Test that frame and dictionary inputs give the same weights."""
+        calculator = WeightCalculator()
+        weighted = calculator.calculate_weights(mapping_frame)
+
+        nested = [
+            {'reference_point_id': pid, 'mappings': [
+                {'station_id': r.station_id, 'distance_meters': r.distance_meters, 'weight': 1.0}
+                for r in group.itertuples()
+            ]}
+            for pid, group in mapping_frame.groupby('reference_point_id', sort=False)
+        ]
+        flat = [m['weight'] for mapping in calculator.calculate_weights(nested) for m in mapping['mappings']]
+
+        np.testing.assert_array_equal(weighted['weight'].to_numpy(), flat)
+        assert (weighted['distance_meters'] <= 100000).sum() < len(mapping_frame)
+
+    @pytest.mark.parametrize("method", WEIGHT_METHODS)
+    def test_weights_normalized(self, method, mapping_frame):
+        """Test that every kernel yields floored weights summing to 1."""
+        weighted = WeightCalculator(method=method).calculate_weights(mapping_frame)
+
+        sums = weighted.groupby('reference_point_id')['weight'].sum()
+        np.testing.assert_allclose(sums, 1.0)
+        assert weighted['weight'].notna().all()
+        assert weighted['reference_point_id'].nunique() == mapping_frame['reference_point_id'].nunique()
+
+    @pytest.mark.parametrize("method", WEIGHT_METHODS)
+    def test_weights_decay_with_distance(self, method):
+        """Test that closer stations receive larger weights."""
+        weights = WeightCalculator(method=method, min_weight=0.0).compute_weights(
+            np.array([[10000.0, 40000.0, 80000.0]])
+        )[0]
+        assert weights[0] > weights[1] > weights[2]
+
+    def test_zero_distance(self):
+        """Test that a station at the reference point dominates the weights."""
+        weights = WeightCalculator(min_weight=0.0).compute_weights(np.array([[0.0, 5000.0]]))[0]
+        assert weights[0] == pytest.approx(1.0)
+
+    def test_unknown_method(self):
+        """Test that unknown methods are rejected."""
+        with pytest.raises(ValueError):
+            WeightCalculator(method='kriging')
@@ -0,0 +1,103 @@
+"""Tests for the memory-mapped station x year flood matrix."""
+
+import pytest
+import os
+import numpy as np
+import pandas as pd
+
+from src.noaa.historical.flood_matrix import FloodMatrix, build_flood_matrix, ensure_flood_matrix
+
+@pytest.fixture
+def historical_dir(tmp_path):
+    """Write two regional historical HTF files."""
+    historical_dir = tmp_path / "historical"
+    historical_dir.mkdir()
+
+    pd.DataFrame({
+        'station_id': ['8638610', '8638610', '8443970'],
+        'year': [2000, 2002, 2001],
+        'flood_days': [3, 5, 1],
+        'missing_days': [0, 10, 0],
+        'region': 'mid_atlantic'
+    }).to_parquet(historical_dir / "historical_htf_mid_atlantic.parquet")
+
+    pd.DataFrame({
+        'station_id': ['1612340'],
+        'year': [2003],
+        'flood_days': [7],
+        'missing_days': [2],
+        'region': 'hawaii'
+    }).to_parquet(historical_dir / "historical_htf_hawaii.parquet")
+
+    return historical_dir
+
+class TestFloodMatrix:
+    def test_build_and_open(self, historical_dir, tmp_path):
+        """Test the dense layout and memory-mapped loading."""
+        matrix_dir = build_flood_matrix(historical_dir, tmp_path / "matrix")
+        matrix = FloodMatrix(matrix_dir)
+
+        assert list(matrix.stations) == ['1612340', '8443970', '8638610']
+        assert list(matrix.regions) == ['hawaii', 'mid_atlantic', 'mid_atlantic']
+        assert list(matrix.years) == [2000, 2001, 2002, 2003]
+        assert matrix.shape == (3, 4)
+        assert isinstance(matrix.flood_days, np.memmap)
+        assert matrix.flood_days.dtype == np.float32
+
+        row = matrix.station_indexer(['8638610'])[0]
+        np.testing.assert_array_equal(matrix.flood_days[row], [3, np.nan, 5, np.nan])
+
+    def test_select_and_frames(self, historical_dir, tmp_path):
+        """Test region/year selection, pivots and long frames."""
+        matrix = FloodMatrix(build_flood_matrix(historical_dir, tmp_path / "matrix"))
+
+        selected = matrix.select(region='mid_atlantic', start_year=2001, end_year=2002)
+        assert list(selected['stations']) == ['8443970', '8638610']
+        assert list(selected['years']) == [2001, 2002]
+
+        pivot = matrix.pivot('missing_days', station_ids=['8638610', 'unknown'])
+        assert list(pivot.index) == ['8638610']
+        assert pivot.loc['8638610', 2002] == 10
+
+        frame = matrix.to_frame()
+        assert len(frame) == 4
+        assert set(frame.columns) == {'station_id', 'year', 'flood_days', 'missing_days', 'region'}
+        record = frame[(frame['station_id'] == '1612340')].iloc[0]
+        assert record['year'] == 2003 and record['flood_days'] == 7 and record['region'] == 'hawaii'
+
+    def test_ensure_rebuilds_when_stale(self, historical_dir):
+        """Test that newer regional files trigger a rebuild."""
+        matrix = ensure_flood_matrix(historical_dir)
+        assert matrix.matrix_dir == historical_dir / "flood_matrix"
+        assert matrix.shape == (3, 4)
+
+        region_file = historical_dir / "historical_htf_hawaii.parquet"
+        pd.DataFrame({
+            'station_id': ['1612340', '1612480'],
+            'year': [2003, 2004],
+            'flood_days': [7, 9],
+            'missing_days': [2, 0],
+            'region': 'hawaii'
+        }).to_parquet(region_file)
+        built = (historical_dir / "flood_matrix" / "flood_days.npy").stat().st_mtime
+        os.utime(region_file, (built + 10, built + 10))
+
+        matrix = ensure_flood_matrix(historical_dir)
+        assert matrix.shape == (4, 5)
+
+    def test_ensure_rebuilds_when_sources_change(self, historical_dir):
+        """Test that removed or renamed regional files trigger a rebuild."""
+        assert ensure_flood_matrix(historical_dir).shape == (3, 4)
+
+        (historical_dir / "historical_htf_hawaii.parquet").unlink()
+        matrix = ensure_flood_matrix(historical_dir)
+        assert list(matrix.stations) == ['8443970', '8638610']
+
+        (historical_dir / "historical_htf_mid_atlantic.parquet").rename(historical_dir / "mid_atlantic.parquet")
+        with pytest.raises(FileNotFoundError):
+            ensure_flood_matrix(historical_dir)
+
+    def test_missing_sources(self, tmp_path):
+        """Test that building without regional files fails clearly."""
+        with pytest.raises(FileNotFoundError):
+            build_flood_matrix(tmp_path, tmp_path / "matrix")
@@ -0,0 +1,204 @@
+"""Tests for the Projected HTF Interpolator."""
+
+import pytest
+import numpy as np
+import pandas as pd
+import yaml
+
+from src.noaa.core.cache_manager import NOAACache
+from src.noaa.projected.projected_htf_interpolator import ProjectedHTFInterpolator
+
+def make_record(station, decade, base):
+    """Build a decadal projection record with increasing scenario values."""
+    return {
+        'stnId': station,
+        'stnName': f"Station {station}",
+        'decade': decade,
+        'source': 'test',
+        'low': base,
+        'intLow': base + 10,
+        'intermediate': base + 20,
+        'intHigh': base + 30,
+        'high': base + 40
+    }
+
+SAMPLE_DATASET = {
+    '8638610': [make_record('8638610', 2020, 10), make_record('8638610', 2030, 30), make_record('8638610', 2040, 90)],
+    '8443970': [make_record('8443970', 2030, 5), make_record('8443970', 2020, 0), make_record('8443970', 2040, 5)]
+}
+
+@pytest.fixture
+def setup_config_files(tmp_path):
+    """Create temporary config files for testing."""
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+
+    settings = {
+        'api': {
+            'base_url': 'https://api.tidesandcurrents.noaa.gov/dpapi/prod/webapi',
+            'requests_per_second': 2.0,
+            'endpoints': {
+                'projected': '/htf/htf_projection_decadal.json'
+            }
+        },
+        'cache': {
+            'directory': 'data/cache',
+            'data_types': ['projected']
+        },
+        'data': {
+            'projected': {
+                'start_decade': 2020,
+                'end_decade': 2040
+            }
+        }
+    }
+    with open(config_dir / "noaa_api_settings.yaml", 'w') as f:
+        yaml.dump(settings, f)
+
+    stations_dir = config_dir / "tide_stations"
+    stations_dir.mkdir()
+    with open(stations_dir / "test_tide_stations.yaml", 'w') as f:
+        yaml.dump({'stations': {}}, f)
+
+    return config_dir
+
+@pytest.fixture
+def cache(setup_config_files):
+    """Create cache instance with temporary directory."""
+    return NOAACache(config_dir=setup_config_files)
+
+class TestProjectedHTFInterpolator:
+    def test_invalid_method(self, cache):
+        """Test that unknown interpolation methods are rejected."""
+        with pytest.raises(ValueError):
+            ProjectedHTFInterpolator(cache, method='quadratic')
+
+    def test_decadal_array_is_sorted(self):
+        """Test that records are arranged by sorted station and decade."""
+        decadal = ProjectedHTFInterpolator.build_decadal_array(SAMPLE_DATASET)
+        assert list(decadal['station_ids']) == ['8443970', '8638610']
+        assert list(decadal['decades']) == [2020, 2030, 2040]
+        assert decadal['values'].shape == (2, 3, 5)
+        assert list(decadal['values'][0, :, 0]) == [0, 5, 5]
+
+    def test_linear_interpolation(self, cache):
+        """Test linear interpolation between decade midpoints."""
+        result = ProjectedHTFInterpolator(cache, method='linear').interpolate(SAMPLE_DATASET)
+        years = list(result['years'])
+        assert years[0] == 2020 and years[-1] == 2040
+        low = result['values'][1, :, 0]
+
+        # Held before the first anchor and after the last one
+        assert low[years.index(2020)] == pytest.approx(10)
+        assert low[years.index(2025)] == pytest.approx(10)
+        assert low[years.index(2030)] == pytest.approx(20)
+        assert low[years.index(2035)] == pytest.approx(30)
+        assert low[years.index(2040)] == pytest.approx(60)
+        assert result['values'].dtype == np.float32
+        assert not result['observed'].any()
+
+    def test_step_interpolation(self, cache):
+        """Test that step interpolation holds each decade's value."""
+        result = ProjectedHTFInterpolator(cache, method='step').interpolate(SAMPLE_DATASET, end_year=2045)
+        years = list(result['years'])
+        low = result['values'][1, :, 0]
+        assert low[years.index(2029)] == pytest.approx(10)
+        assert low[years.index(2030)] == pytest.approx(30)
+        assert low[years.index(2045)] == pytest.approx(90)
+
+    def test_monotone_cubic_does_not_overshoot(self, cache):
+        """Test that PCHIP stays within the decadal range of a plateauing station."""
+        result = ProjectedHTFInterpolator(cache, method='monotone_cubic').interpolate(SAMPLE_DATASET)
+        low = result['values'][0, :, 0]
+        assert low.min() >= 0
+        assert low.max() <= 5
+        assert np.all(np.diff(low) >= 0)
+
+    def test_monotone_cubic_with_missing_decades(self, cache):
+        """Test that PCHIP interpolates a gappy station over its own decades."""
+        dataset = dict(SAMPLE_DATASET)
+        dataset['8720030'] = [make_record('8720030', 2020, 0), make_record('8720030', 2040, 40)]
+        dataset['8723970'] = [make_record('8723970', 2030, 7)]
+
+        result = ProjectedHTFInterpolator(cache, method='monotone_cubic').interpolate(dataset, end_year=2045)
+        years = list(result['years'])
+        gappy = result['values'][list(result['station_ids']).index('8720030')]
+        single = result['values'][list(result['station_ids']).index('8723970')]
+
+        assert not np.isnan(gappy).any()
+        assert gappy[years.index(2035), 0] == pytest.approx(20)
+        assert np.all(np.diff(gappy[:, 0]) >= 0)
+        assert gappy[years.index(2045), 4] == pytest.approx(80)
+        # A station with a single decade holds it from that decade on
+        assert np.isnan(single[years.index(2029)]).all()
+        assert single[years.index(2030), 0] == pytest.approx(7)
+        assert single[years.index(2045), 0] == pytest.approx(7)
+        # Complete stations are unchanged by the gappy ones
+        complete = ProjectedHTFInterpolator(cache, method='monotone_cubic').interpolate(SAMPLE_DATASET, end_year=2045)
+        np.testing.assert_allclose(result['values'][:2], complete['values'])
+
+    def test_linear_with_missing_decades(self, cache):
+        """Test that a missing decade does not blank out the years around it."""
+        dataset = dict(SAMPLE_DATASET)
+        dataset['8720030'] = [make_record('8720030', 2020, 0), make_record('8720030', 2040, 40)]
+        dataset['8723970'] = [make_record('8723970', 2030, 7)]
+
+        result = ProjectedHTFInterpolator(cache, method='linear').interpolate(dataset, end_year=2045)
+        years = list(result['years'])
+        gappy = result['values'][list(result['station_ids']).index('8720030')]
+        single = result['values'][list(result['station_ids']).index('8723970')]
+
+        assert not np.isnan(gappy).any()
+        assert gappy[years.index(2020), 0] == pytest.approx(0)
+        assert gappy[years.index(2035), 0] == pytest.approx(20)
+        assert gappy[years.index(2045), 4] == pytest.approx(80)
+        assert np.isnan(single[years.index(2029)]).all()
+        assert not np.isnan(single[years.index(2030):]).any()
+        complete = ProjectedHTFInterpolator(cache, method='linear').interpolate(SAMPLE_DATASET, end_year=2045)
+        np.testing.assert_allclose(result['values'][:2], complete['values'])
+
+    def test_historical_splice(self, cache):
+        """Test that observed years override and extend the projection."""
+        historical = pd.DataFrame({
+            'station_id': ['8638610', '8638610', '8638610', '9999999'],
+            'year': [2018, 2021, 2022, 2021],
+            'flood_days': [3, 7, 99, 1],
+            'missing_days': [0, 0, 300, 0]
+        })
+        result = ProjectedHTFInterpolator(cache).interpolate(SAMPLE_DATASET, historical=historical)
+        years = list(result['years'])
+        assert years[0] == 2018
+
+        values = result['values'][1, :, :]
+        assert np.all(values[years.index(2018)] == 3)
+        assert np.all(values[years.index(2021)] == 7)
+        # Year with too many missing days falls back to the projection
+        assert values[years.index(2022), 0] == pytest.approx(10)
+        # No observation and before the first decade
+        assert np.isnan(values[years.index(2019), 0])
+        assert result['observed'][1].sum() == 2
+        assert not result['observed'][0].any()
+
+    def test_cache_reuse(self, cache):
+        """Test that identical inputs reuse the cached array product."""
+        interpolator = ProjectedHTFInterpolator(cache)
+        first = interpolator.interpolate(SAMPLE_DATASET)
+        cache_files = list(interpolator.cache_dir.glob("*.npz"))
+        assert len(cache_files) == 1
+        assert cache_files[0].stem == first['key']
+
+        second = interpolator.interpolate(SAMPLE_DATASET)
+        assert second['key'] == first['key']
+        np.testing.assert_array_equal(second['values'], first['values'])
+
+        other = ProjectedHTFInterpolator(cache, method='step').interpolate(SAMPLE_DATASET)
+        assert other['key'] != first['key']
+
+    def test_to_dataframe(self, cache):
+        """Test flattening to one row per station-year."""
+        interpolator = ProjectedHTFInterpolator(cache)
+        df = interpolator.to_dataframe(interpolator.interpolate(SAMPLE_DATASET))
+        assert len(df) == 2 * 21
+        assert 'high_scenario' in df.columns
+        row = df[(df['station_id'] == '8638610') & (df['year'] == 2035)].iloc[0]
+        assert row['high_scenario'] == pytest.approx(70)
@@ -0,0 +1,133 @@
+"""Tests for the bit-packed daily flood store."""
+
+import pytest
+from datetime import date
+import numpy as np
+import pandas as pd
+import yaml
+
+from src.noaa.core.cache_manager import NOAACache
+from src.noaa.core.daily_flood_store import DailyFloodStore
+from src.noaa.core.water_levels import WaterLevelIngestor
+
+@pytest.fixture
+def setup_config_files(tmp_path):
+    """Create temporary config files for testing."""
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+
+    settings = {
+        'api': {'base_url': 'https://api.tidesandcurrents.noaa.gov/dpapi/prod/webapi'},
+        'cache': {'directory': 'data/cache', 'data_types': ['historical']}
+    }
+    with open(config_dir / "noaa_api_settings.yaml", 'w') as f:
+        yaml.dump(settings, f)
+
+    stations_dir = config_dir / "tide_stations"
+    stations_dir.mkdir()
+    with open(stations_dir / "test_tide_stations.yaml", 'w') as f:
+        yaml.dump({'stations': {}}, f)
+
+    return config_dir
+
+@pytest.fixture
+def store(setup_config_files):
+    """Create a store with two stations of daily flags."""
+    store = DailyFloodStore(NOAACache(config_dir=setup_config_files))
+
+    # Station A: full 2020 (leap) and 2021 records
+    dates = pd.date_range('2020-01-01', '2021-12-31', freq='D')
+    flooded = dates.isin(pd.to_datetime([
+        '2020-01-10', '2020-02-28', '2020-02-29', '2020-03-01',
+        '2021-02-27', '2021-02-28', '2021-03-01', '2021-03-02', '2021-07-04'
+    ]))
+    station_a = pd.DataFrame({'station_id': 'A', 'date': dates, 'flooded': flooded, 'valid': True})
+    # Drop June 2021 and mark one December day invalid
+    station_a = station_a[~((station_a['date'].dt.year == 2021) & (station_a['date'].dt.month == 6))]
+    station_a.loc[station_a['date'] == '2021-12-25', 'valid'] = False
+
+    # Station B: a single observed week
+    station_b = pd.DataFrame({
+        'station_id': 'B',
+        'date': pd.date_range('2021-07-01', periods=7, freq='D'),
+        'flooded': [True, True, False, True, False, False, False]
+    })
+
+    store.add_daily(pd.concat([station_a, station_b]))
+    return store
+
+class TestDailyFloodStore:
+    def test_annual_counts(self, store):
+        """Test annual counts and calendar-aware missing days."""
+        counts = store.annual_counts().set_index(['station_id', 'year'])
+
+        assert counts.loc[('A', 2020), 'flood_days'] == 4
+        assert counts.loc[('A', 2020), 'missing_days'] == 0
+        assert counts.loc[('A', 2020), 'dry_days'] == 362
+        assert counts.loc[('A', 2021), 'flood_days'] == 5
+        assert counts.loc[('A', 2021), 'missing_days'] == 31
+        assert counts.loc[('B', 2021), 'flood_days'] == 3
+        assert counts.loc[('B', 2021), 'missing_days'] == 358
+
+    def test_month_and_season_counts(self, store):
+        """Test month and season masks."""
+        feb = store.month_counts([2], station_ids=['A']).set_index('year')
+        assert feb.loc[2020, 'flood_days'] == 2
+        assert feb.loc[2020, 'dry_days'] == 27
+        assert feb.loc[2021, 'dry_days'] == 26
+
+        summer = store.season_counts('summer').set_index(['station_id', 'year'])
+        assert summer.loc[('A', 2021), 'flood_days'] == 1
+        assert summer.loc[('A', 2021), 'missing_days'] == 30
+
+        with pytest.raises(ValueError):
+            store.season_counts('monsoon')
+
+    def test_window_counts(self, store):
+        """Test date windows spanning a year boundary."""
+        counts = store.window_counts(date(2020, 2, 29), date(2021, 2, 28), station_ids=['A']).set_index('year')
+        assert counts.loc[2020, 'flood_days'] == 2
+        assert counts.loc[2021, 'flood_days'] == 2
+        assert counts[['flood_days', 'dry_days', 'missing_days']].to_numpy().sum() == 366
+
+    def test_flood_runs(self, store):
+        """Test that runs cross the February 29 slot in non-leap years."""
+        runs = store.flood_runs(min_length=2).set_index(['station_id', 'year'])
+        assert runs.loc[('A', 2020), 'longest_run'] == 3
+        assert runs.loc[('A', 2020), 'run_count'] == 1
+        assert runs.loc[('A', 2021), 'longest_run'] == 4
+        assert runs.loc[('A', 2021), 'run_count'] == 1
+        assert runs.loc[('B', 2021), 'longest_run'] == 2
+
+    def test_persistence(self, store):
+        """Test saving and reloading packed data."""
+        store.save()
+        reloaded = DailyFloodStore(store.cache)
+        assert reloaded.get_stations() == ['A', 'B']
+
+        bits_file = reloaded.store_dir / "A.npz"
+        with np.load(bits_file) as data:
+            assert data['bits'].shape == (2, 3, 46)
+
+        pd.testing.assert_frame_equal(reloaded.annual_counts(), store.annual_counts())
+
+    def test_save_empty_selection(self, store):
+        """Test that saving an empty station list writes nothing."""
+        store.save([])
+        assert not list(store.store_dir.glob("*.npz"))
+
+        store.save(['B'])
+        assert [f.stem for f in store.store_dir.glob("*.npz")] == ['B']
+
+    def test_add_daily_summary(self, setup_config_files):
+        """Test feeding the store from water level ingestion."""
+        times = pd.date_range('2022-03-01', periods=48, freq='h')
+        levels = pd.DataFrame({'station_id': 'C', 't': times, 'v': np.where(times.day == 2, 0.9, 0.1)})
+        ingestor = WaterLevelIngestor(thresholds={'C': {'minor': 0.7}})
+
+        store = DailyFloodStore(NOAACache(config_dir=setup_config_files))
+        store.add_daily_summary(ingestor.daily_summary([levels]), ingestor)
+        counts = store.annual_counts().iloc[0]
+        assert counts['flood_days'] == 1
+        assert counts['dry_days'] == 1
+        assert counts['missing_days'] == 363
@@ -0,0 +1,132 @@
+"""Tests for the offline NOAA API stand-in server."""
+
+import pytest
+import json
+import time
+import requests
+import yaml
+
+from src.noaa.core.noaa_client import NOAAClient, NOAAApiError
+from src.noaa.core.cache_manager import NOAACache
+from src.noaa.core.standin_server import NOAAStandInServer
+from src.noaa.projected.projected_htf_fetcher import ProjectedHTFFetcher
+
+ANNUAL_RECORDS = [
+    {"stnId": "8638610", "stnName": "Sewells Point, VA", "year": year,
+     "majCount": 0, "modCount": 1, "minCount": year - 2000, "nanCount": 0}
+    for year in range(2000, 2010)
+]
+
+DECADAL_RECORDS = [
+    {"stnId": "8638610", "stnName": "Sewells Point, VA", "decade": decade, "source": "test",
+     "low": 10, "intLow": 20, "intermediate": 30, "intHigh": 40, "high": 50}
+    for decade in range(2020, 2110, 10)
+]
+
+@pytest.fixture
+def fixture_dirs(tmp_path):
+    """Write recorded fixtures for one station."""
+    historical_dir = tmp_path / "historical"
+    projected_dir = tmp_path / "projected"
+    historical_dir.mkdir()
+    projected_dir.mkdir()
+
+    with open(historical_dir / "8638610.json", 'w') as f:
+        json.dump(ANNUAL_RECORDS, f)
+    with open(projected_dir / "8638610.json", 'w') as f:
+        json.dump(DECADAL_RECORDS, f)
+
+    return historical_dir, projected_dir
+
+@pytest.fixture
+def standin(fixture_dirs):
+    """Run a stand-in server without fault injection."""
+    historical_dir, projected_dir = fixture_dirs
+    with NOAAStandInServer(historical_dir=historical_dir, projected_dir=projected_dir) as server:
+        yield server
+
+class TestNOAAStandInServer:
+    def test_replay_annual(self, standin):
+        """Test replaying annual flood counts with year and range filters."""
+        client = NOAAClient(api_base_url=standin.base_url, requests_per_second=100)
+
+        assert len(client.fetch_annual_flood_counts(station='8638610')) == 10
+        records = client.fetch_annual_flood_counts(station='8638610', year=2003, range=2)
+        assert [r['year'] for r in records] == [2003, 2004, 2005]
+        assert standin.stats['served'] == 2
+
+    def test_replay_decadal(self, standin):
+        """Test replaying decadal projections with a decade filter."""
+        client = NOAAClient(api_base_url=standin.base_url, requests_per_second=100)
+        records = client.fetch_decadal_projections(station='8638610', decade=2050)
+        assert len(records) == 1
+        assert records[0]['intermediate'] == 30
+
+    def test_unknown_station(self, standin):
+        """Test that stations without fixtures produce an API error."""
+        client = NOAAClient(api_base_url=standin.base_url, requests_per_second=100)
+        with pytest.raises(NOAAApiError):
+            client.fetch_annual_flood_counts(station='0000000')
+        assert standin.stats['not_found'] == 1
+
+    def test_fault_injection(self, fixture_dirs):
+        """Test injected errors, throttling and latency."""
+        historical_dir, projected_dir = fixture_dirs
+        url_suffix = "/htf/htf_annual.json?station=8638610"
+
+        with NOAAStandInServer(historical_dir, projected_dir, error_rate=1.0) as server:
+            assert requests.get(server.base_url + url_suffix).status_code == 500
+
+        with NOAAStandInServer(historical_dir, projected_dir, throttle_rate=1.0, retry_after=7) as server:
+            response = requests.get(server.base_url + url_suffix)
+            assert response.status_code == 429
+            assert response.headers['Retry-After'] == '7'
+
+        with NOAAStandInServer(historical_dir, projected_dir, latency=0.2) as server:
+            start = time.monotonic()
+            assert requests.get(server.base_url + url_suffix).status_code == 200
+            assert time.monotonic() - start >= 0.2
+
+    def test_rate_limit(self, fixture_dirs):
+        """Test that requests beyond the rate limit receive 429 with Retry-After."""
+        historical_dir, projected_dir = fixture_dirs
+        with NOAAStandInServer(historical_dir, projected_dir, rate_limit=1.0, burst=2) as server:
+            codes = [requests.get(server.base_url + "/htf/htf_annual.json?station=8638610").status_code for _ in range(4)]
+            assert codes[:2] == [200, 200]
+            assert 429 in codes[2:]
+            assert server.stats['rate_limited'] >= 1
+
+    def test_record_from_upstream(self, fixture_dirs, tmp_path):
+        """Test proxying unknown stations upstream and recording the fixtures."""
+        historical_dir, projected_dir = fixture_dirs
+        record_dir = tmp_path / "recorded"
+
+        # A second stand-in plays the role of the real API
+        with NOAAStandInServer(historical_dir, projected_dir) as upstream:
+            with NOAAStandInServer(record_dir, record_dir / "projected", upstream_url=upstream.base_url, record=True) as server:
+                client = NOAAClient(api_base_url=server.base_url, requests_per_second=100)
+                records = client.fetch_annual_flood_counts(station='8638610', year=2001)
+                assert records[0]['minCount'] == 1
+                assert server.stats['recorded'] == 1
+
+        with open(record_dir / "8638610.json") as f:
+            assert json.load(f) == [ANNUAL_RECORDS[1]]
+
+    def test_fetcher_uses_api_base_url(self, standin, tmp_path):
+        """Test pointing a fetcher at the stand-in through api_base_url."""
+        config_dir = tmp_path / "config"
+        (config_dir / "tide_stations").mkdir(parents=True)
+        with open(config_dir / "noaa_api_settings.yaml", 'w') as f:
+            yaml.dump({
+                'cache': {'directory': 'data/cache', 'data_types': ['projected']},
+                'data': {'projected': {'start_decade': 2020, 'end_decade': 2100}}
+            }, f)
+        with open(config_dir / "tide_stations" / "mid_atlantic_tide_stations.yaml", 'w') as f:
+            yaml.dump({'stations': {'8638610': {'name': 'Sewells Point, VA', 'region': 'mid_atlantic'}}}, f)
+        with open(config_dir / "region_mappings.yaml", 'w') as f:
+            yaml.dump({'regions': {'mid_atlantic': {'name': 'Mid-Atlantic'}}}, f)
+
+        fetcher = ProjectedHTFFetcher(NOAACache(config_dir=config_dir), 'mid_atlantic', api_base_url=standin.base_url)
+        assert fetcher.client.api_base_url == standin.base_url
+        records = fetcher.client.fetch_decadal_projections(station='8638610')
+        assert len(records) == len(DECADAL_RECORDS)
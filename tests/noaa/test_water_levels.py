@@ -0,0 +1,107 @@
+"""Tests for water level ingestion."""
+
+import pytest
+import json
+import numpy as np
+import pandas as pd
+
+from src.noaa.core.noaa_client import NOAAClient
+from src.noaa.core.water_levels import WaterLevelIngestor
+
+def make_series(station_id, start, days, peaks, freq='h'):
+    """Build a water level series with one peak value per day."""
+    times = pd.date_range(start, periods=days * 24 if freq == 'h' else days * 240, freq=freq if freq == 'h' else '6min')
+    values = np.zeros(len(times))
+    per_day = len(times) // days
+    for day, peak in enumerate(peaks):
+        values[day * per_day + per_day // 2] = peak
+    return pd.DataFrame({'station_id': station_id, 't': times, 'v': values})
+
+class TestWaterLevelIngestor:
+    def test_daily_summary_merges_chunks(self):
+        """Test that days split across chunks are combined."""
+        df = make_series('8638610', '2020-01-01', 3, [0.6, 0.1, 1.3])
+        ingestor = WaterLevelIngestor()
+        daily = ingestor.daily_summary([df.iloc[:30], df.iloc[30:]])
+
+        assert len(daily) == 3
+        assert list(daily['n_obs']) == [24, 24, 24]
+        assert list(daily['max_level']) == pytest.approx([0.6, 0.1, 1.3])
+        assert daily['valid'].all()
+
+    def test_annual_counts_per_threshold(self):
+        """Test minor/moderate/major counts and missing days."""
+        df = make_series('8638610', '2020-01-01', 4, [0.6, 0.9, 1.3, 0.1])
+        ingestor = WaterLevelIngestor()
+        annual = ingestor.annual_counts(ingestor.daily_summary([df]))
+
+        record = annual.iloc[0]
+        assert record['year'] == 2020
+        assert record['minCount'] == 3
+        assert record['modCount'] == 2
+        assert record['majCount'] == 1
+        # 2020 is a leap year with four observed days
+        assert record['nanCount'] == 362
+
+    def test_station_specific_thresholds(self):
+        """Test that configured station thresholds override the defaults."""
+        df = pd.concat([
+            make_series('A', '2021-06-01', 2, [0.6, 0.6]),
+            make_series('B', '2021-06-01', 2, [0.6, 0.6])
+        ])
+        ingestor = WaterLevelIngestor(thresholds={'B': {'minor': 0.7}})
+        annual = ingestor.annual_counts(ingestor.daily_summary([df])).set_index('stnId')
+
+        assert annual.loc['A', 'minCount'] == 2
+        assert annual.loc['B', 'minCount'] == 0
+
+    def test_sparse_days_are_missing(self):
+        """Test that days below the coverage threshold count as missing."""
+        df = make_series('8638610', '2021-01-01', 2, [1.0, 1.0], freq='6min')
+        # Keep only a quarter of the second day's observations, including its peak
+        second_day = df['t'].dt.day == 2
+        keep = ~second_day | (np.arange(len(df)) % 4 == 0)
+        ingestor = WaterLevelIngestor()
+        daily = ingestor.daily_summary([df[keep]])
+
+        assert daily['expected_obs'].iloc[0] == pytest.approx(240)
+        assert list(daily['valid']) == [True, False]
+        annual = ingestor.annual_counts(daily)
+        assert annual['minCount'].iloc[0] == 1
+        assert annual['nanCount'].iloc[0] == 364
+
+    def test_ingest_files(self, tmp_path):
+        """Test chunked ingestion of CSV and datagetter JSON files."""
+        csv_df = make_series('8638610', '2020-12-31', 2, [0.6, 0.6])
+        csv_df.to_csv(tmp_path / "levels.csv", index=False)
+
+        json_df = make_series('x', '2021-03-01', 1, [1.5])
+        with open(tmp_path / "8443970.json", 'w') as f:
+            json.dump({
+                'metadata': {'id': '8443970'},
+                'data': [{'t': str(t), 'v': f"{v:.3f}", 'f': '0,0,0,0'} for t, v in zip(json_df['t'], json_df['v'])]
+            }, f)
+
+        ingestor = WaterLevelIngestor(chunksize=10)
+        result = ingestor.ingest([tmp_path / "levels.csv", tmp_path / "8443970.json"])
+        annual = result['annual'].set_index(['stnId', 'year'])
+
+        assert annual.loc[('8638610', 2020), 'minCount'] == 1
+        assert annual.loc[('8638610', 2021), 'minCount'] == 1
+        assert annual.loc[('8443970', 2021), 'majCount'] == 1
+
+        records = ingestor.to_records(result['annual'])
+        assert set(records[0].keys()) == {'stnId', 'year', 'majCount', 'modCount', 'minCount', 'nanCount'}
+
+    def test_client_water_level_processing(self):
+        """Test that the client computes nanCount through the ingestor."""
+        df = make_series('8638610', '2021-01-01', 2, [0.6, 1.3])
+        data = [{'t': t.strftime('%Y-%m-%d %H:%M'), 'v': str(v)} for t, v in zip(df['t'], df['v'])]
+
+        result = NOAAClient()._process_water_level_data(data)
+        assert result == {'minCount': 2, 'modCount': 1, 'majCount': 1, 'nanCount': 363}
+
+    def test_client_empty_water_level_data(self):
+        """Test that the client returns zero counts when there are no measurements."""
+        result = NOAAClient()._process_water_level_data([])
+        assert result == {'minCount': 0, 'modCount': 0, 'majCount': 0, 'nanCount': 0}
@@ -0,0 +1,54 @@
+"""Tests for spatial-index coastal county detection."""
+
+import geopandas as gpd
+from shapely.geometry import LineString, box
+
+from src.preprocessing.coastal_counties_finder import find_coastal_counties_for_region
+
+REGION_DEF = {
+    'state_codes': ['NJ', 'PA'],
+    'bounds': {'min_lat': 37.0, 'max_lat': 41.0, 'min_lon': -77.0, 'max_lon': -71.0}
+}
+
+class TestFindCoastalCounties:
+    def test_matches_shoreline_union(self):
+        """Test that the index query finds the same counties as the shoreline union."""
+        counties = gpd.GeoDataFrame(
+            {
+                'GEOID': ['34001', '34009', '42101', '34021', '36061'],
+                'STATEFP': ['34', '34', '42', '34', '36']
+            },
+            geometry=[
+                box(-74.8, 39.2, -74.3, 39.6),   # Crossed by the coast line
+                box(-75.0, 38.8, -74.7, 39.2),   # Touches the bay line
+                box(-75.3, 39.8, -74.9, 40.1),   # Inland
+                box(-74.9, 40.1, -74.5, 40.4),   # Inland
+                box(-74.3, 39.3, -73.9, 39.5)    # Crossed, but not a region state
+            ],
+            crs="EPSG:4326"
+        )
+        shoreline = gpd.GeoDataFrame(
+            geometry=[
+                LineString([(-74.6, 39.0), (-74.0, 39.5)]),
+                LineString([(-75.2, 39.2), (-74.9, 39.2)])
+            ],
+            crs="EPSG:4326"
+        )
+
+        coastal = find_coastal_counties_for_region(shoreline, counties, 'mid_atlantic', REGION_DEF)
+
+        region_counties = counties[counties['STATEFP'].isin(['34', '42'])]
+        expected = region_counties[region_counties.intersects(shoreline.union_all())]['GEOID']
+        assert coastal['GEOID'].tolist() == expected.tolist() == ['34001', '34009']
+        assert (coastal['region'] == 'mid_atlantic').all()
+        assert coastal.crs.to_epsg() == 4326
+
+    def test_no_intersections(self):
+        """Test that a region without coastal counties returns an empty frame."""
+        counties = gpd.GeoDataFrame(
+            {'GEOID': ['42101'], 'STATEFP': ['42']},
+            geometry=[box(-75.3, 39.8, -74.9, 40.1)],
+            crs="EPSG:4326"
+        )
+        shoreline = gpd.GeoDataFrame(geometry=[LineString([(-74.6, 39.0), (-74.0, 39.5)])], crs="EPSG:4326")
+        assert find_coastal_counties_for_region(shoreline, counties, 'mid_atlantic', REGION_DEF).empty
@@ -0,0 +1,155 @@
+"""Tests for vectorized coastal reference point generation."""
+
+import pytest
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import LineString, MultiLineString, Point, box
+
+from src.preprocessing.coastal_points import (
+    create_reference_points,
+    interpolation_distances,
+    pack_geometries,
+    process_region,
+    pyramid_distances,
+    run_region_tiles,
+    tile_shoreline
+)
+
+REGION_DEF = {
+    'name': 'Mid-Atlantic',
+    'bounds': {'min_lat': 37.0, 'max_lat': 41.0, 'min_lon': -77.0, 'max_lon': -71.0}
+}
+
+@pytest.fixture
+def counties():
+    """Two adjacent counties split at longitude -74.5."""
+    return gpd.GeoDataFrame(
+        {
+            'county_fips': ['34001', '34009'],
+            'county_name': ['Atlantic', 'Cape May'],
+            'region': 'mid_atlantic'
+        },
+        geometry=[box(-74.5, 38.5, -73.5, 40.0), box(-75.5, 38.5, -74.5, 40.0)],
+        crs="EPSG:4326"
+    )
+
+class TestInterpolation:
+    def test_distances(self):
+        """Test point counts and offsets per line."""
+        line_idx, distances = interpolation_distances(np.array([12000.0, 3000.0, 5000.0]), 5000)
+        assert line_idx.tolist() == [0, 0, 1, 2]
+        assert distances.tolist() == [0.0, 5000.0, 0.0, 0.0]
+
+    def test_matches_per_point_interpolation(self):
+        """Test that vectorized points match LineString.interpolate."""
+        line = LineString([(0, 0), (7000, 0), (7000, 9000)])
+        points = create_reference_points(line, 5000)
+        expected = [line.interpolate(i * 5000) for i in range(3)]
+        assert [p.coords[0] for p in points] == [p.coords[0] for p in expected]
+
+    def test_multilinestring(self):
+        """Test that each part of a MultiLineString gets points."""
+        line = MultiLineString([[(0, 0), (10000, 0)], [(0, 100), (6000, 100)]])
+        points = create_reference_points(line, 5000)
+        assert [p.coords[0] for p in points] == [(0, 0), (5000, 0), (0, 100)]
+
+class TestPyramid:
+    def test_levels_match_single_spacing_runs(self):
+        """Test that each level holds exactly the points of a run at its spacing."""
+        lengths = np.array([61000.0, 12000.0, 3000.0, 26000.0])
+        line_idx, distances, levels = pyramid_distances(lengths, [25000, 1000, 5000])
+
+        fine_idx, fine_distances = interpolation_distances(lengths, 1000)
+        np.testing.assert_array_equal(line_idx, fine_idx)
+        np.testing.assert_array_equal(distances, fine_distances)
+
+        for spacing in [1000, 5000, 25000]:
+            in_level = levels >= spacing
+            expected_idx, expected_distances = interpolation_distances(lengths, spacing)
+            np.testing.assert_array_equal(line_idx[in_level], expected_idx)
+            np.testing.assert_array_equal(distances[in_level], expected_distances)
+
+    def test_rejects_non_nested_spacings(self):
+        """Test that spacings must be multiples of each other."""
+        with pytest.raises(ValueError):
+            pyramid_distances(np.array([10000.0]), [2000, 5000])
+
+    def test_region_levels_are_nested(self, counties):
+        """Test that coarser levels of a region are subsets of finer ones."""
+        shoreline = gpd.GeoDataFrame(geometry=[LineString([(-75.3, 39.0), (-73.7, 39.0)])], crs="EPSG:4326")
+        points = process_region(shoreline, counties, 'mid_atlantic', REGION_DEF, spacings=[1000, 5000, 25000])
+        single = process_region(shoreline, counties, 'mid_atlantic', REGION_DEF)
+
+        assert set(points['level']) == {1000, 5000, 25000}
+        assert len(points) > 5 * (points['level'] >= 5000).sum() - 5
+        coarse = points[points['level'] >= 5000]
+        np.testing.assert_allclose(coarse.geometry.x, single.geometry.x)
+        np.testing.assert_allclose(coarse.geometry.y, single.geometry.y)
+
+class TestProcessRegion:
+    def test_points_in_wgs84_with_counties(self, counties):
+        """Test that points are returned in WGS84 and joined to counties."""
+        shoreline = gpd.GeoDataFrame(
+            geometry=[
+                LineString([(-75.3, 39.0), (-73.7, 39.0)]),
+                MultiLineString([[(-75.3, 39.5), (-74.7, 39.5)], [(-74.3, 39.5), (-73.7, 39.5)]]),
+                Point(-74.0, 39.0)
+            ],
+            crs="EPSG:4326"
+        )
+        points = process_region(shoreline, counties, 'mid_atlantic', REGION_DEF)
+
+        assert points.crs.to_epsg() == 4326
+        assert list(points.columns) == ['geometry', 'county_fips', 'county_name', 'region', 'region_display', 'level']
+        assert (points['level'] == 5000).all()
+        assert points.geometry.x.between(-75.5, -73.5).all()
+        assert points.geometry.y.between(38.9, 39.6).all()
+        assert set(points['county_fips']) == {'34001', '34009'}
+        assert (points['region'] == 'mid_atlantic').all()
+
+        # Both parts of the MultiLineString produce points
+        on_second_line = points[np.isclose(points.geometry.y, 39.5, atol=0.01)]
+        assert set(on_second_line['county_fips']) == {'34001', '34009'}
+
+        # Points are roughly 5km apart along the first line (~138km long)
+        on_first_line = points[np.isclose(points.geometry.y, 39.0, atol=0.01)]
+        assert len(on_first_line) == pytest.approx(138000 / 5000, abs=2)
+
+    def test_no_counties(self, counties):
+        """Test that a region without counties yields an empty frame."""
+        shoreline = gpd.GeoDataFrame(geometry=[LineString([(-75.3, 39.0), (-73.7, 39.0)])], crs="EPSG:4326")
+        points = process_region(shoreline, counties, 'gulf_coast', REGION_DEF)
+        assert points.empty
+
+class TestParallelTiles:
+    @pytest.fixture
+    def shoreline(self):
+        """Parallel shoreline segments crossing both counties."""
+        return gpd.GeoDataFrame(
+            geometry=[LineString([(-75.3, lat), (-73.7, lat)]) for lat in np.linspace(38.7, 39.8, 12)],
+            crs="EPSG:4326"
+        )
+
+    def test_tile_shoreline(self, shoreline):
+        """Test that tiles partition the shoreline features."""
+        tiles = tile_shoreline(shoreline, tile_features=5)
+        assert [len(t) for t in tiles] == [5, 5, 2]
+        assert sorted(i for t in tiles for i in t.index) == list(range(12))
+        assert tile_shoreline(shoreline, tile_features=20)[0] is shoreline
+
+    def test_workers_match_sequential(self, shoreline, counties):
+        """Test that pooled tiles give the same points as in-process tiles."""
+        tasks = [
+            {'region': 'mid_atlantic', 'region_def': REGION_DEF, 'shoreline': pack_geometries(tile)}
+            for tile in tile_shoreline(shoreline, tile_features=4)
+        ]
+        packed_counties = pack_geometries(counties)
+
+        sequential = run_region_tiles(tasks, packed_counties, workers=1)
+        pooled = run_region_tiles(tasks, packed_counties, workers=2)
+
+        assert [r['region'] for r in pooled] == ['mid_atlantic'] * 3
+        for a, b in zip(sequential, pooled):
+            assert len(a['points']) > 0
+            assert a['points'].geometry.equals(b['points'].geometry)
+            assert a['points']['county_fips'].tolist() == b['points']['county_fips'].tolist()
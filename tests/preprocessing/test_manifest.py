@@ -0,0 +1,165 @@
+"""Tests for the preprocessing manifest and incremental per-region rebuilds."""
+
+import json
+import geopandas as gpd
+import pytest
+import yaml
+from shapely.geometry import LineString, box
+
+from src.preprocessing import coastal_points
+from src.preprocessing.manifest import PreprocessingManifest, fingerprint, source_digest
+from src.preprocessing.shapefile_converter import SHORELINE_STEP, process_shared_region
+
+REGIONS = {
+    'north_atlantic': {'bounds': {'min_lat': 41.0, 'max_lat': 45.0, 'min_lon': -71.0, 'max_lon': -67.0}},
+    'mid_atlantic': {'bounds': {'min_lat': 37.0, 'max_lat': 41.0, 'min_lon': -77.0, 'max_lon': -71.0}}
+}
+
+@pytest.fixture
+def manifest(tmp_path):
+    """Empty manifest in a temporary directory."""
+    return PreprocessingManifest(tmp_path / "manifest.json")
+
+@pytest.fixture
+def shoreline_shapefile(tmp_path):
+    """Shared shoreline shapefile with features in two regions."""
+    gdf = gpd.GeoDataFrame(
+        {'feature': [1, 2, 3]},
+        geometry=[
+            LineString([(-70.5, 42.0), (-70.0, 42.5)]),
+            LineString([(-74.5, 39.0), (-74.0, 39.5)]),
+            LineString([(-75.5, 38.0), (-75.0, 38.5)])
+        ],
+        crs="EPSG:4326"
+    )
+    path = tmp_path / "source" / "shoreline.shp"
+    path.parent.mkdir()
+    gdf.to_file(path, engine='pyogrio')
+    return path
+
+class TestPreprocessingManifest:
+    def test_record_and_reload(self, manifest, tmp_path):
+        """Test that recorded regions are current after a reload with the same inputs."""
+        output = tmp_path / "region.parquet"
+        output.write_bytes(b"data")
+        manifest.record('step', 'mid_atlantic', fingerprint({'a': 1}), [output])
+
+        reloaded = PreprocessingManifest(manifest.path)
+        assert reloaded.is_current('step', 'mid_atlantic', fingerprint({'a': 1}))
+        assert not reloaded.is_current('step', 'mid_atlantic', fingerprint({'a': 2}))
+        assert not reloaded.is_current('other', 'mid_atlantic', fingerprint({'a': 1}))
+
+        # A missing output makes the region stale
+        output.unlink()
+        assert reloaded.stale_regions('step', {'mid_atlantic': fingerprint({'a': 1})}) == ['mid_atlantic']
+
+    def test_ignores_other_versions(self, manifest):
+        """Test that a manifest with another layout version has no entries."""
+        manifest.record('step', 'mid_atlantic', fingerprint({}))
+        manifest.path.write_text(json.dumps({'version': 0, 'steps': manifest.steps}))
+
+        assert PreprocessingManifest(manifest.path).entry('step', 'mid_atlantic') is None
+
+    def test_shapefile_digest_includes_sidecars(self, shoreline_shapefile):
+        """Test that changing an attribute file changes a shapefile's digest."""
+        before = source_digest(shoreline_shapefile)
+        with open(shoreline_shapefile.with_suffix('.dbf'), 'ab') as f:
+            f.write(b' ')
+        assert source_digest(shoreline_shapefile) != before
+
+class TestSharedRegionShorelines:
+    def test_rebuilds_only_changed_regions(self, shoreline_shapefile, manifest, tmp_path):
+        """Test that unchanged regions are skipped and changed ones rebuilt."""
+        output_dir = tmp_path / "regional"
+        output_dir.mkdir()
+        regions = {name: dict(region_def) for name, region_def in REGIONS.items()}
+
+        process_shared_region(shoreline_shapefile, output_dir, regions, list(regions), manifest)
+        assert len(gpd.read_parquet(output_dir / "north_atlantic.parquet")) == 1
+        assert len(gpd.read_parquet(output_dir / "mid_atlantic.parquet")) == 2
+
+        # Mark both outputs so a rebuild can be told apart from a skip
+        for name in regions:
+            gpd.read_parquet(output_dir / f"{name}.parquet").assign(feature=0).to_parquet(output_dir / f"{name}.parquet")
+
+        regions['mid_atlantic']['bounds'] = dict(REGIONS['mid_atlantic']['bounds'], min_lat=38.8)
+        process_shared_region(shoreline_shapefile, output_dir, regions, list(regions), manifest)
+
+        assert set(gpd.read_parquet(output_dir / "north_atlantic.parquet")['feature']) == {0}
+        assert list(gpd.read_parquet(output_dir / "mid_atlantic.parquet")['feature']) == [2]
+
+    def test_removes_stale_output(self, shoreline_shapefile, manifest, tmp_path):
+        """Test that a region left without features loses its earlier output."""
+        output_dir = tmp_path / "regional"
+        output_dir.mkdir()
+        (output_dir / "north_atlantic.parquet").write_bytes(b"stale")
+        regions = {'north_atlantic': {'bounds': {'min_lat': 43.0, 'max_lat': 45.0, 'min_lon': -71.0, 'max_lon': -67.0}}}
+
+        process_shared_region(shoreline_shapefile, output_dir, regions, ['north_atlantic'], manifest)
+
+        assert not (output_dir / "north_atlantic.parquet").exists()
+        assert manifest.entry(SHORELINE_STEP, 'north_atlantic')['outputs'] == []
+
+class TestIncrementalCoastalCounties:
+    @pytest.fixture
+    def county_setup(self, tmp_path, monkeypatch):
+        """County mappings, Census counties and output paths in a temporary directory."""
+        census = gpd.GeoDataFrame(
+            {'GEOID': ['25001', '34001', '34009']},
+            geometry=[box(-70.5, 41.5, -69.9, 42.1), box(-74.8, 39.2, -74.3, 39.6), box(-75.0, 38.8, -74.7, 39.2)],
+            crs="EPSG:4326"
+        )
+        mappings = {'regions': {
+            'north_atlantic': {'name': 'North Atlantic', 'counties': [{'fips': '25001', 'name': 'Barnstable'}]},
+            'mid_atlantic': {'name': 'Mid-Atlantic', 'counties': [{'fips': '34001', 'name': 'Atlantic'}]}
+        }}
+        config_file = tmp_path / "county_region_mappings.yaml"
+        config_file.write_text(yaml.safe_dump(mappings, sort_keys=False))
+        census_file = tmp_path / "census.shp"
+        census_file.write_bytes(b"census")
+
+        loads = []
+        def load_census_counties():
+            loads.append(1)
+            return census
+
+        monkeypatch.setattr(coastal_points, 'COUNTY_REGION_CONFIG', config_file)
+        monkeypatch.setattr(coastal_points, 'CENSUS_COUNTY_SHAPEFILE', census_file)
+        monkeypatch.setattr(coastal_points, 'COASTAL_COUNTIES_FILE', tmp_path / "coastal_counties.parquet")
+        monkeypatch.setattr(coastal_points, 'COASTAL_COUNTIES_REGION_DIR', tmp_path / "regions")
+        monkeypatch.setattr(coastal_points, 'load_census_counties', load_census_counties)
+        return mappings, config_file, loads
+
+    def test_rebuilds_changed_region(self, county_setup, manifest):
+        """Test that a county mapping change rebuilds only its region."""
+        mappings, config_file, loads = county_setup
+
+        first = coastal_points.generate_coastal_counties(manifest=manifest)
+        assert first['GEOID'].tolist() == ['25001', '34001']
+        assert len(loads) == 1
+
+        # Unchanged inputs reuse every region without reading the Census counties
+        again = coastal_points.generate_coastal_counties(manifest=manifest)
+        assert again['GEOID'].tolist() == ['25001', '34001']
+        assert len(loads) == 1
+
+        north_entry = manifest.entry(coastal_points.COUNTIES_STEP, 'north_atlantic')
+        mappings['regions']['mid_atlantic']['counties'].append({'fips': '34009', 'name': 'Cape May'})
+        config_file.write_text(yaml.safe_dump(mappings, sort_keys=False))
+
+        changed = coastal_points.generate_coastal_counties(manifest=manifest)
+        assert changed['GEOID'].tolist() == ['25001', '34001', '34009']
+        assert len(loads) == 2
+        assert manifest.entry(coastal_points.COUNTIES_STEP, 'north_atlantic') == north_entry
+
+    def test_census_change_rebuilds_all(self, county_setup, manifest):
+        """Test that a changed Census source rebuilds every region."""
+        _, _, loads = county_setup
+        coastal_points.generate_coastal_counties(manifest=manifest)
+
+        coastal_points.CENSUS_COUNTY_SHAPEFILE.write_bytes(b"census 2025")
+        coastal_points.generate_coastal_counties(manifest=manifest)
+
+        assert len(loads) == 2
+        assert coastal_points.generate_coastal_counties(manifest=manifest, force=True)['GEOID'].tolist() == ['25001', '34001']
+        assert len(loads) == 3
@@ -0,0 +1,83 @@
+"""Tests for shoreline simplification and its cache."""
+
+import json
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import LineString
+
+from src.preprocessing.shoreline_simplify import (
+    load_simplified_shoreline,
+    simplify_for_display,
+    simplify_shoreline
+)
+
+UTM_18N = "EPSG:32618"
+
+@pytest.fixture
+def shoreline():
+    """Two finely digitized wiggly lines near the New Jersey coast."""
+    t = np.linspace(0.0, 1.0, 2001)
+    lines = [
+        LineString(np.column_stack([-74.6 + 0.5 * t, 39.0 + 0.5 * t + 0.0002 * np.sin(400 * t)])),
+        LineString(np.column_stack([-75.2 + 0.3 * t, 39.2 + 0.0002 * np.cos(300 * t)]))
+    ]
+    return gpd.GeoDataFrame({'feature': [1, 2]}, geometry=lines, crs="EPSG:4326")
+
+@pytest.fixture
+def shoreline_file(shoreline, tmp_path):
+    """Write the shoreline as a regional parquet file."""
+    path = tmp_path / "mid_atlantic.parquet"
+    shoreline.to_parquet(path)
+    return path
+
+class TestSimplifyShoreline:
+    def test_reduces_vertices_within_tolerance(self, shoreline):
+        """Test that vertices drop and no feature moves further than the tolerance."""
+        simplified, report = simplify_shoreline(shoreline, UTM_18N, tolerance=100.0)
+
+        assert simplified.crs == shoreline.crs
+        assert list(simplified['feature']) == [1, 2]
+        assert report['vertices_before'] == 4002
+        assert report['vertices_after'] < report['vertices_before'] / 10
+        assert 0.9 < report['vertex_reduction'] < 1.0
+        assert 0.0 < report['max_displacement_m'] <= 100.0 + 1e-6
+        assert shapely.is_valid(simplified.geometry.to_numpy()).all()
+
+    def test_display_simplification_keeps_crs(self, shoreline):
+        """Test that the display simplification returns geographic coordinates."""
+        simplified = simplify_for_display(shoreline, tolerance=100.0)
+
+        assert simplified.crs == shoreline.crs
+        assert shapely.get_num_coordinates(simplified.geometry.to_numpy()).sum() < 4002
+
+class TestSimplifiedShorelineCache:
+    def test_reuses_cached_layer(self, shoreline_file, tmp_path):
+        """Test that a repeated load reads the cached layer and report."""
+        cache_dir = tmp_path / "cache"
+        first, report = load_simplified_shoreline('mid_atlantic', shoreline_file, UTM_18N, 100.0, cache_dir)
+
+        layers = list(cache_dir.glob("mid_atlantic_*.parquet"))
+        reports = list(cache_dir.glob("mid_atlantic_*.json"))
+        assert len(layers) == 1 and len(reports) == 1
+        assert json.loads(reports[0].read_text())['vertices_after'] == report['vertices_after']
+
+        # Mark the cached layer so a second load can be told apart from a recomputation
+        first.assign(feature=0).to_parquet(layers[0])
+
+        second, cached_report = load_simplified_shoreline('mid_atlantic', shoreline_file, UTM_18N, 100.0, cache_dir)
+        assert set(second['feature']) == {0}
+        assert cached_report == report
+
+    def test_key_depends_on_tolerance_and_source(self, shoreline, shoreline_file, tmp_path):
+        """Test that a new tolerance or changed source produces a new layer."""
+        cache_dir = tmp_path / "cache"
+        load_simplified_shoreline('mid_atlantic', shoreline_file, UTM_18N, 100.0, cache_dir)
+        load_simplified_shoreline('mid_atlantic', shoreline_file, UTM_18N, 250.0, cache_dir)
+        assert len(list(cache_dir.glob("*.parquet"))) == 2
+
+        shoreline.iloc[:1].to_parquet(shoreline_file)
+        _, report = load_simplified_shoreline('mid_atlantic', shoreline_file, UTM_18N, 100.0, cache_dir)
+        assert len(list(cache_dir.glob("*.parquet"))) == 3
+        assert report['features'] == 1
@@ -0,0 +1,71 @@
+"""Tests for vectorized shoreline region splitting."""
+
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import LineString, MultiLineString
+
+from src.preprocessing.split_regions import (
+    intersects_bounds,
+    split_by_region,
+    split_florida
+)
+
+REGIONS = {
+    'south_atlantic': {
+        'state_codes': ['NC', 'SC', 'GA', 'FL'],
+        'bounds': {'min_lat': 25.0, 'max_lat': 37.0, 'min_lon': -82.0, 'max_lon': -75.0}
+    },
+    'gulf_coast': {
+        'state_codes': ['AL', 'LA', 'MS', 'TX', 'FL'],
+        'bounds': {'min_lat': 25.0, 'max_lat': 31.0, 'min_lon': -98.0, 'max_lon': -88.0}
+    }
+}
+
+@pytest.fixture
+def shoreline():
+    """Shoreline features in Florida, Georgia and Alabama."""
+    return gpd.GeoDataFrame(
+        {'FIPS_ALPHA': ['FL', 'FL', 'GA', 'AL', 'FL', 'FL', 'FL', 'AL']},
+        geometry=[
+            LineString([(-80.2, 26.0), (-80.1, 26.5), (-80.0, 27.0)]),                  # Florida Atlantic
+            MultiLineString([[(-87.5, 30.3), (-87.3, 30.4)], [(-88.5, 30.2), (-88.9, 30.3)]]),  # Panhandle, straddles -88
+            LineString([(-81.4, 31.0), (-81.3, 31.5)]),                                 # Georgia
+            LineString([(-88.1, 30.2), (-88.3, 30.3)]),                                 # Alabama
+            LineString([(-86.0, 30.2), (-85.5, 30.1)]),                                 # Panhandle, in neither box
+            LineString([(-88.2, 30.4), (-87.0, 30.4)]),                                 # Panhandle, crosses -88
+            LineString([(-89.0, 30.0), (-81.0, 30.0)]),                                 # Spans both regions
+            LineString([(-88.4, 31.5), (-87.4, 30.5)])                                  # Box overlaps the gulf, line misses it
+        ],
+        crs="EPSG:4326"
+    )
+
+class TestSplitRegions:
+    def test_intersects_bounds(self, shoreline):
+        """Test that the mask matches an intersects test against the bounds polygon."""
+        bounds = REGIONS['gulf_coast']['bounds']
+        region_box = shapely.box(bounds['min_lon'], bounds['min_lat'], bounds['max_lon'], bounds['max_lat'])
+        geometries = np.append(shoreline.geometry.to_numpy(), [LineString(), None])
+
+        mask = intersects_bounds(geometries, bounds)
+
+        assert mask.tolist() == [bool(shapely.intersects(g, region_box)) for g in geometries]
+        assert list(np.flatnonzero(mask)) == [1, 3, 5, 6]
+
+    def test_split_by_region(self, shoreline):
+        """Test that features need a region state and to intersect the bounds."""
+        feature_bounds = shapely.bounds(shoreline.geometry.to_numpy())
+
+        atlantic = split_by_region(shoreline, 'south_atlantic', REGIONS['south_atlantic'], feature_bounds)
+        gulf = split_by_region(shoreline, 'gulf_coast', REGIONS['gulf_coast'])
+
+        assert list(atlantic.index) == [0, 2, 6]
+        assert list(gulf.index) == [1, 3, 5, 6]
+
+    def test_split_florida(self, shoreline):
+        """Test that Florida features crossing both regions land in both splits."""
+        atlantic, gulf = split_florida(shoreline, REGIONS)
+
+        assert list(atlantic.index) == [0, 6]
+        assert list(gulf.index) == [1, 5, 6]
@@ -0,0 +1,151 @@
+"""Tests for filtered vector reads, the extract cache and GeoParquet outputs."""
+
+import geopandas as gpd
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+from shapely.geometry import Point, box
+
+from src.preprocessing.vector_io import (
+    attribute_in,
+    has_bbox_covering,
+    intersecting_row_groups,
+    read_geoparquet,
+    read_vector,
+    region_bbox,
+    within_bounds_mask,
+    write_geoparquet
+)
+
+BOUNDS = {'min_lat': 38.0, 'max_lat': 41.0, 'min_lon': -76.0, 'max_lon': -73.0}
+
+@pytest.fixture
+def shapefile(tmp_path):
+    """Small county shapefile spanning several states."""
+    gdf = gpd.GeoDataFrame(
+        {
+            'STATEFP': ['34', '34', '10', '06'],
+            'GEOID': ['34001', '34009', '10001', '06075']
+        },
+        geometry=[
+            box(-74.8, 39.2, -74.3, 39.6),
+            box(-75.0, 38.8, -74.7, 39.2),
+            box(-75.8, 38.9, -75.3, 39.4),
+            box(-122.6, 37.6, -122.3, 37.9)
+        ],
+        crs="EPSG:4326"
+    )
+    path = tmp_path / "counties.shp"
+    gdf.to_file(path, engine='pyogrio')
+    return path
+
+@pytest.fixture
+def points():
+    """Random points over two separate areas, in scattered order."""
+    rng = np.random.default_rng(3)
+    coords = np.vstack([
+        np.column_stack([rng.uniform(-75.0, -74.0, 300), rng.uniform(39.0, 40.0, 300)]),
+        np.column_stack([rng.uniform(-123.0, -122.0, 300), rng.uniform(37.0, 38.0, 300)])
+    ])
+    order = rng.permutation(len(coords))
+    return gpd.GeoDataFrame(
+        {'point_id': order},
+        geometry=[Point(x, y) for x, y in coords[order]],
+        crs="EPSG:4326"
+    )
+
+class TestAttributeIn:
+    def test_quotes_values(self):
+        """Test that values are quoted and embedded quotes escaped."""
+        assert attribute_in('STATEFP', ['34', "O'B"]) == "STATEFP IN ('34', 'O''B')"
+
+class TestWithinBoundsMask:
+    def test_requires_feature_inside_bounds(self):
+        """Test that features crossing the bounds are excluded."""
+        gdf = gpd.GeoDataFrame(geometry=[
+            box(-75.0, 39.0, -74.0, 40.0),
+            box(-76.5, 39.0, -75.5, 40.0),
+            box(-120.0, 35.0, -119.0, 36.0)
+        ], crs="EPSG:4326")
+
+        np.testing.assert_array_equal(within_bounds_mask(gdf, BOUNDS), [True, False, False])
+
+class TestReadVector:
+    def test_where_pushdown(self, shapefile, tmp_path):
+        """Test that only features matching the attribute filter are read."""
+        gdf = read_vector(shapefile, where=attribute_in('STATEFP', ['34']), cache_dir=tmp_path / "cache")
+
+        assert sorted(gdf['GEOID']) == ['34001', '34009']
+
+    def test_bbox_pushdown(self, shapefile, tmp_path):
+        """Test that only features intersecting the bbox are read."""
+        gdf = read_vector(shapefile, bbox=region_bbox(BOUNDS), cache=False)
+
+        assert sorted(gdf['GEOID']) == ['10001', '34001', '34009']
+
+    def test_reuses_cached_extract(self, shapefile, tmp_path):
+        """Test that a repeated read is served from the GeoParquet extract."""
+        cache_dir = tmp_path / "cache"
+        where = attribute_in('STATEFP', ['10'])
+
+        first = read_vector(shapefile, where=where, cache_dir=cache_dir)
+        cached = list(cache_dir.glob("*.parquet"))
+        assert len(cached) == 1
+
+        # Mark the extract so a second read can be told apart from a source read
+        marked = first.assign(GEOID='cached')
+        marked.to_parquet(cached[0])
+
+        second = read_vector(shapefile, where=where, cache_dir=cache_dir)
+        assert list(second['GEOID']) == ['cached']
+
+        # A different filter is a separate extract
+        read_vector(shapefile, where=attribute_in('STATEFP', ['06']), cache_dir=cache_dir)
+        assert len(list(cache_dir.glob("*.parquet"))) == 2
+
+class TestGeoParquet:
+    def test_write_covering_and_row_groups(self, points, tmp_path):
+        """Test that outputs have a bbox covering column and bounded row groups."""
+        path = tmp_path / "points.parquet"
+        write_geoparquet(points, path, index=False, row_group_size=100)
+
+        assert has_bbox_covering(path)
+        metadata = pq.ParquetFile(path).metadata
+        assert metadata.num_row_groups == 6
+        assert all(metadata.row_group(i).num_rows <= 100 for i in range(metadata.num_row_groups))
+
+        # Same features, spatially sorted
+        written = gpd.read_parquet(path)
+        assert sorted(written['point_id']) == sorted(points['point_id'])
+        assert 'bbox' not in written.columns
+
+    def test_row_groups_are_spatially_compact(self, points, tmp_path):
+        """Test that one area's bbox selects only the row groups holding its points."""
+        path = tmp_path / "points.parquet"
+        write_geoparquet(points, path, index=False, row_group_size=100)
+
+        east = intersecting_row_groups(pq.ParquetFile(path), [(-75.0, 39.0, -74.0, 40.0)])
+        assert len(east) == 3
+
+    def test_read_bbox(self, points, tmp_path):
+        """Test that a bbox read returns exactly the intersecting features."""
+        path = tmp_path / "points.parquet"
+        write_geoparquet(points, path, index=False, row_group_size=100)
+        bbox = (-74.8, 39.2, -74.4, 39.6)
+
+        result = read_geoparquet(path, bbox=bbox)
+
+        x, y = points.geometry.x, points.geometry.y
+        expected = points[(x >= bbox[0]) & (x <= bbox[2]) & (y >= bbox[1]) & (y <= bbox[3])]
+        assert sorted(result['point_id']) == sorted(expected['point_id'])
+
+    def test_read_bbox_without_covering(self, points, tmp_path):
+        """Test that files without a covering column are filtered after a full read."""
+        path = tmp_path / "legacy.parquet"
+        points.to_parquet(path)
+        assert not has_bbox_covering(path)
+        assert intersecting_row_groups(pq.ParquetFile(path), [(-75.0, 39.0, -74.0, 40.0)]) is None
+
+        result = read_geoparquet(path, bbox=(-75.0, 39.0, -74.0, 40.0))
+
+        assert len(result) == 300
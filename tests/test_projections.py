@@ -0,0 +1,93 @@
+"""Tests for the shared projection registry."""
+
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely.geometry import LineString, Point
+
+from src.config import DEFAULT_REGION_PROJECTION
+from src.projections import (
+    ProjectionRegistry,
+    get_projection_registry,
+    get_transformer,
+    reproject,
+    transform_xy,
+    utm_crs
+)
+
+HAWAII = "+proj=aea +lat_1=8 +lat_2=18 +lat_0=13 +lon_0=-157 +x_0=0 +y_0=0 +ellps=GRS80 +datum=NAD83 +units=m +no_defs"
+
+@pytest.fixture
+def registry():
+    """Registry over one configured and one unconfigured region."""
+    return ProjectionRegistry({
+        'hawaii': {
+            'bounds': {'min_lat': 19.0, 'max_lat': 22.0, 'min_lon': -160.0, 'max_lon': -154.0},
+            'projection': HAWAII
+        },
+        'mid_atlantic': {
+            'bounds': {'min_lat': 37.0, 'max_lat': 41.0, 'min_lon': -77.0, 'max_lon': -71.0}
+        }
+    })
+
+class TestProjectionRegistry:
+    def test_region_crs(self, registry):
+        """Test that regions use their configured projection or the default."""
+        assert registry.crs('hawaii') == HAWAII
+        assert registry.crs('mid_atlantic') == DEFAULT_REGION_PROJECTION
+        assert registry.crs('unknown') == DEFAULT_REGION_PROJECTION
+
+    def test_utm_crs(self, registry):
+        """Test the UTM zone at the region center."""
+        assert registry.utm_crs('mid_atlantic') == "EPSG:32618"
+        assert utm_crs({'min_lat': -15.0, 'max_lat': -13.0, 'min_lon': -171.0, 'max_lon': -169.0}) == "EPSG:32702"
+
+    def test_transformers_are_cached(self, registry):
+        """Test that repeated lookups return the same transformer."""
+        assert registry.transformer('hawaii') is registry.transformer('hawaii')
+        assert registry.transformer('hawaii') is get_transformer("EPSG:4326", HAWAII)
+        assert registry.transformer('hawaii', inverse=True) is not registry.transformer('hawaii')
+
+    def test_transform_xy_matches_to_crs(self, registry):
+        """Test that the array path matches a GeoDataFrame reprojection."""
+        lon = np.array([-157.9, -155.5, -159.4])
+        lat = np.array([21.3, 19.7, 22.0])
+        points = gpd.GeoSeries(gpd.points_from_xy(lon, lat), crs="EPSG:4326").to_crs(HAWAII)
+
+        xy = registry.transform_xy(lon, lat, 'hawaii')
+
+        assert xy.shape == (3, 2)
+        np.testing.assert_allclose(xy, np.column_stack([points.x, points.y]))
+
+    def test_configured_regions(self):
+        """Test that every configured region has a projection."""
+        registry = get_projection_registry()
+        assert registry is get_projection_registry()
+        assert all('projection' in region_def for region_def in registry.regions.values())
+        assert registry.crs('gulf_coast') == "EPSG:5070"
+        assert transform_xy([-90.0], [29.0], 'gulf_coast').shape == (1, 2)
+
+class TestReproject:
+    def test_matches_to_crs(self):
+        """Test that reprojection matches to_crs and keeps attributes and Z."""
+        gdf = gpd.GeoDataFrame(
+            {'name': ['line', 'point']},
+            geometry=[LineString([(-74.0, 39.0, 1.0), (-73.5, 39.5, 2.0)]), Point(-75.0, 38.5)],
+            index=[10, 20],
+            crs="EPSG:4326"
+        )
+
+        projected = reproject(gdf, "EPSG:5070")
+        expected = gdf.to_crs("EPSG:5070")
+
+        assert projected.crs == expected.crs
+        assert list(projected.index) == [10, 20]
+        assert list(projected['name']) == ['line', 'point']
+        assert projected.geom_equals_exact(expected, tolerance=1e-6).all()
+        assert projected.has_z.tolist() == [True, False]
+        assert reproject(projected, "EPSG:4326").geom_equals_exact(gdf, tolerance=1e-9).all()
+
+    def test_requires_crs(self):
+        """Test that geometries without a CRS are rejected."""
+        with pytest.raises(ValueError):
+            reproject(gpd.GeoSeries([Point(0, 0)]), "EPSG:5070")